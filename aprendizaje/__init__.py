@@ -9,10 +9,16 @@ Componentes:
 - AjustadorGrounding: Ajusta grounding de conceptos
 - AplicadorInsights: Convierte insights en acciones
 - Estrategias: Define cómo calcular ajustes
+- TablaGrounding: Grounding del vocabulario en arrays (ajustes por lotes)
+- RegistroUsos / ConsumidorUsos: Aprendizaje por uso en micro-lotes
+- ProgramadorCiclos: Ciclos disparados por las consolidaciones del bucle largo
 """
 from aprendizaje.motor_aprendizaje import MotorAprendizaje
 from aprendizaje.ajustador_grounding import AjustadorGrounding
 from aprendizaje.aplicador_insights import AplicadorInsights
+from aprendizaje.tabla_grounding import TablaGrounding
+from aprendizaje.registro_usos import RegistroUsos, ConsumidorUsos
+from aprendizaje.programador_ciclos import ProgramadorCiclos
 from aprendizaje.estrategias import (
     EstrategiaAprendizaje,
     EstrategiaUsoFrecuente,
@@ -26,6 +32,10 @@ __all__ = [
     'MotorAprendizaje',
     'AjustadorGrounding',
     'AplicadorInsights',
+    'TablaGrounding',
+    'RegistroUsos',
+    'ConsumidorUsos',
+    'ProgramadorCiclos',
     'EstrategiaAprendizaje',
     'EstrategiaUsoFrecuente',
     'EstrategiaExitoFallido',
@@ -4,9 +4,11 @@ Ajustador de Grounding - Modifica grounding de conceptos.
 Utiliza estrategias de aprendizaje para ajustar el grounding
 de conceptos basado en su uso y efectividad.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
+import numpy as np
 
+from memoria.serie_ajustes import SerieAjustes
 from aprendizaje.estrategias import (
     EstrategiaAprendizaje,
     EstrategiaUsoFrecuente,
@@ -26,12 +28,19 @@ class AjustadorGrounding:
     - Validar cambios propuestos
     """
     
-    def __init__(self, estrategia: Optional[EstrategiaAprendizaje] = None):
+    def __init__(
+        self,
+        estrategia: Optional[EstrategiaAprendizaje] = None,
+        capacidad_historial: int = 10_000,
+        directorio_historial: Optional[str] = None
+    ):
         """
         Inicializa ajustador.
         
         Args:
             estrategia: Estrategia de aprendizaje (None = usar por defecto)
+            capacidad_historial: Ajustes que se mantienen en memoria
+            directorio_historial: Donde volcar el historial (None = solo memoria)
         """
         # Usar estrategia por defecto si no se especifica
         if estrategia is None:
@@ -43,8 +52,8 @@ class AjustadorGrounding:
         else:
             self.estrategia = estrategia
         
-        # Historial de ajustes
-        self.historial_ajustes: List[Dict[str, Any]] = []
+        # Historial de ajustes (anillo acotado, ver SerieAjustes)
+        self.historial_ajustes = SerieAjustes(capacidad_historial, directorio_historial)
         
         # Límites de seguridad
         self.grounding_minimo = 0.1  # Nunca bajar de 0.1
@@ -141,6 +150,57 @@ class AjustadorGrounding:
             )
             return False
     
+    def proponer_ajustes_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Propone ajustes para muchos conceptos en una pasada.
+        
+        Mismo criterio que proponer_ajuste, con la estrategia y la
+        validación vectorizadas.
+        
+        Args:
+            concepto_ids: IDs de los conceptos
+            grounding: Array con el grounding actual
+            contexto: Contexto por lotes (arrays paralelos o escalares)
+        
+        Returns:
+            Array con el grounding propuesto (NaN = sin ajuste)
+        """
+        nuevos = self.estrategia.calcular_ajuste_lote(concepto_ids, grounding, contexto)
+        return np.where(self._validar_ajustes_lote(grounding, nuevos), nuevos, np.nan)
+    
+    def aplicar_ajustes_lote(
+        self,
+        tabla: Any,  # TablaGrounding
+        nuevos: np.ndarray,
+        razon: str = 'Ajuste automático'
+    ) -> List[Dict[str, Any]]:
+        """
+        Aplica ajustes propuestos a la tabla y a sus conceptos.
+        
+        Args:
+            tabla: TablaGrounding con el grounding actual
+            nuevos: Propuestas de proponer_ajustes_lote
+            razon: Razón registrada en el historial
+        
+        Returns:
+            Registros de historial de los ajustes aplicados
+        """
+        anteriores = tabla.grounding.copy()
+        cambiados = tabla.aplicar(nuevos)
+        
+        # Un solo agregado columnar al historial
+        return self.historial_ajustes.agregar_lote(
+            [tabla.ids[indice] for indice in cambiados.tolist()],
+            anteriores[cambiados],
+            tabla.grounding[cambiados],
+            razon
+        )
+    
     def _validar_ajuste(
         self,
         grounding_actual: float,
@@ -173,6 +233,20 @@ class AjustadorGrounding:
         
         return True
     
+    def _validar_ajustes_lote(
+        self,
+        grounding_actual: np.ndarray,
+        grounding_nuevo: np.ndarray
+    ) -> np.ndarray:
+        """Forma vectorizada de _validar_ajuste (NaN = inválido)."""
+        cambio = np.abs(grounding_nuevo - grounding_actual)
+        return (
+            (grounding_nuevo >= self.grounding_minimo)
+            & (grounding_nuevo <= self.grounding_maximo)
+            & (cambio <= self.max_ajuste_por_vez)
+            & (cambio >= 0.01)
+        )
+    
     def _registrar_ajuste(
         self,
         concepto_id: str,
@@ -180,19 +254,15 @@ class AjustadorGrounding:
         grounding_nuevo: float,
         razon: str,
         aplicado: bool
-    ):
-        """Registra un ajuste en el historial."""
-        registro = {
-            'concepto_id': concepto_id,
-            'grounding_anterior': grounding_anterior,
-            'grounding_nuevo': grounding_nuevo,
-            'cambio': grounding_nuevo - grounding_anterior,
-            'razon': razon,
-            'aplicado': aplicado,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        self.historial_ajustes.append(registro)
+    ) -> Dict[str, Any]:
+        """Registra un ajuste en el historial (y lo devuelve)."""
+        return self.historial_ajustes.agregar(
+            concepto_id,
+            grounding_anterior,
+            grounding_nuevo,
+            razon,
+            aplicado
+        )
     
     def obtener_historial(
         self,
@@ -209,11 +279,11 @@ class AjustadorGrounding:
         Returns:
             Lista de ajustes
         """
-        ajustes = self.historial_ajustes.copy()
-        
-        # Filtrar por concepto
+        # Filtrar por concepto (vía índice)
         if concepto_id:
-            ajustes = [a for a in ajustes if a['concepto_id'] == concepto_id]
+            ajustes = self.historial_ajustes.por_concepto(concepto_id)
+        else:
+            ajustes = self.historial_ajustes.registros()
         
         # Filtrar por aplicados
         if solo_aplicados:
@@ -228,8 +298,9 @@ class AjustadorGrounding:
         Returns:
             Dict con estadísticas
         """
-        total = len(self.historial_ajustes)
-        aplicados = sum(1 for a in self.historial_ajustes if a['aplicado'])
+        serie = self.historial_ajustes.estadisticas()
+        total = serie['total']
+        aplicados = serie['aplicados']
         
         if total == 0:
             return {
@@ -240,17 +311,12 @@ class AjustadorGrounding:
                 'conceptos_ajustados': 0
             }
         
-        cambios = [abs(a['cambio']) for a in self.historial_ajustes if a['aplicado']]
-        cambio_promedio = sum(cambios) / len(cambios) if cambios else 0.0
-        
-        conceptos_unicos = len(set(a['concepto_id'] for a in self.historial_ajustes))
-        
         return {
             'total_ajustes': total,
             'ajustes_aplicados': aplicados,
             'tasa_aplicacion': (aplicados / total) * 100,
-            'cambio_promedio': cambio_promedio,
-            'conceptos_ajustados': conceptos_unicos
+            'cambio_promedio': serie['cambio_promedio'],
+            'conceptos_ajustados': serie['conceptos']
         }
     
     def configurar_limites(
@@ -3,8 +3,25 @@ Aplicador de Insights - Convierte insights en acciones.
 
 Toma insights generados por bucles y los convierte en
 acciones concretas sobre el sistema.
+
+El motor pide todos los insights del bucle largo en cada ciclo, así que
+cada insight se identifica por un hash de su contenido y se procesa una
+sola vez (los hashes vistos se recuerdan en un LRU acotado; no se usa el
+timestamp, porque las consolidaciones en otro proceso pueden terminar
+tarde). Las acciones pendientes viven en un cubo por prioridad,
+indexadas por su clave de duplicado: leerlas en orden de prioridad
+cuesta O(k) y marcarlas aplicadas, O(1). Una acción nueva reemplaza a
+la pendiente con su misma clave, y las que nadie aplica vencen tras
+`vida_pendientes` lotes.
 """
-from typing import Dict, Any, List, Optional
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import json
+
+# De mayor a menor
+PRIORIDADES = ('ALTA', 'MEDIA', 'BAJA')
 
 class AplicadorInsights:
     """
@@ -17,10 +34,89 @@ class AplicadorInsights:
     - Registrar resultados de aplicación
     """
     
-    def __init__(self):
-        """Inicializa aplicador."""
-        self.insights_procesados: List[Dict[str, Any]] = []
-        self.acciones_generadas: List[Dict[str, Any]] = []
+    def __init__(
+        self,
+        max_historial: int = 1000,
+        max_vistos: int = 10_000,
+        vida_pendientes: int = 10
+    ):
+        """
+        Inicializa aplicador.
+        
+        Args:
+            max_historial: Insights y acciones recientes que se conservan
+            max_vistos: Hashes de insights procesados que se recuerdan
+            vida_pendientes: Lotes que una acción sigue pendiente sin aplicarse
+        """
+        self.insights_procesados: deque = deque(maxlen=max_historial)
+        self.acciones_generadas: deque = deque(maxlen=max_historial)
+        
+        # Insights ya procesados
+        self.max_vistos = max_vistos
+        self._vistos: OrderedDict = OrderedDict()
+        
+        # Acciones pendientes: prioridad -> {clave: acción} (de la más vieja
+        # a la más nueva) y el lote en que se registró cada una
+        self._pendientes: Dict[str, OrderedDict] = {p: OrderedDict() for p in PRIORIDADES}
+        self.vida_pendientes = vida_pendientes
+        self._lote_pendiente: Dict[Tuple[str, str, str], int] = {}
+        self._lotes = 0
+        
+        # Contadores (el historial está acotado)
+        self.total_insights = 0
+        self.total_acciones = 0
+        self.total_aplicadas = 0
+        self._por_tipo: Counter = Counter()
+        self._por_prioridad: Counter = Counter()
+    
+    @staticmethod
+    def clave_insight(insight: Dict[str, Any]) -> str:
+        """
+        Hash del contenido de un insight.
+        
+        Un ajuste recomendado se identifica solo por concepto, tipo y
+        ventana: su razón lleva la cuenta de usos, que cambia entre
+        consolidaciones de la misma ventana.
+        """
+        if insight.get('tipo') == 'AUMENTAR_GROUNDING':
+            insight = {
+                'tipo': insight['tipo'],
+                'concepto_id': insight.get('concepto_id'),
+                'ventana': insight.get('ventana')
+            }
+        contenido = json.dumps(insight, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+    
+    def es_nuevo(self, insight: Dict[str, Any]) -> bool:
+        """¿Falta procesar este insight? (por el hash de su contenido)"""
+        return self.clave_insight(insight) not in self._vistos
+    
+    def filtrar_nuevos(self, insights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insights aún no procesados (sin repetidos dentro de la lista).
+        
+        Args:
+            insights: Insights candidatos
+        
+        Returns:
+            Lista de insights nuevos, en el mismo orden
+        """
+        nuevos = []
+        claves = set()
+        for insight in insights:
+            if not self.es_nuevo(insight):
+                continue
+            clave = self.clave_insight(insight)
+            if clave not in claves:
+                claves.add(clave)
+                nuevos.append(insight)
+        return nuevos
+    
+    def _marcar_visto(self, insight: Dict[str, Any]):
+        """Recuerda un insight procesado (olvida el más antiguo si hay demasiados)."""
+        self._vistos[self.clave_insight(insight)] = None
+        if len(self._vistos) > self.max_vistos:
+            self._vistos.popitem(last=False)
     
     def procesar_insight(self, insight: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -37,6 +133,8 @@ class AplicadorInsights:
         
         # Registrar insight procesado
         self.insights_procesados.append(insight)
+        self.total_insights += 1
+        self._marcar_visto(insight)
         
         # Generar acciones según tipo
         acciones = []
@@ -53,13 +151,40 @@ class AplicadorInsights:
         elif tipo == 'CERTEZA_BAJA':
             acciones = self._procesar_certeza_baja(insight)
         
+        elif tipo == 'AUMENTAR_GROUNDING':
+            acciones = self._procesar_ajuste_recomendado(insight)
+        
         # Registrar acciones generadas
         for accion in acciones:
             accion['relevancia_insight'] = relevancia
-            self.acciones_generadas.append(accion)
+            self._registrar_accion(accion)
         
         return acciones
     
+    def _registrar_accion(self, accion: Dict[str, Any]):
+        """Cuenta una acción y la deja pendiente (reemplaza la de su misma clave)."""
+        prioridad = accion.get('prioridad', 'BAJA')
+        
+        self.acciones_generadas.append(accion)
+        self.total_acciones += 1
+        self._por_tipo[accion.get('tipo', 'DESCONOCIDO')] += 1
+        self._por_prioridad[prioridad] += 1
+        
+        clave = self._clave_accion(accion)
+        for cubo in self._pendientes.values():
+            cubo.pop(clave, None)
+        self._pendientes.get(prioridad, self._pendientes['BAJA'])[clave] = accion
+        self._lote_pendiente[clave] = self._lotes
+    
+    @staticmethod
+    def _clave_accion(accion: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Clave de duplicado de una acción."""
+        return (
+            accion['tipo'],
+            accion.get('concepto_id', ''),
+            accion.get('area', '')
+        )
+    
     def _procesar_concepto_dominante(
         self,
         insight: Dict[str, Any]
@@ -180,6 +305,27 @@ class AplicadorInsights:
             'prioridad': 'MEDIA'
         }]
     
+    def _procesar_ajuste_recomendado(
+        self,
+        recomendacion: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Procesa un ajuste recomendado por el bucle largo.
+        
+        Acción: Ajustar el grounding del concepto en lo sugerido.
+        """
+        concepto_id = recomendacion.get('concepto_id')
+        if not concepto_id:
+            return []
+        
+        return [{
+            'tipo': 'AJUSTAR_GROUNDING',
+            'concepto_id': concepto_id,
+            'ajuste_sugerido': recomendacion.get('ajuste_sugerido', 0.0),
+            'razon': recomendacion.get('razon', 'Ajuste recomendado'),
+            'prioridad': recomendacion.get('prioridad', 'MEDIA')
+        }]
+    
     def procesar_multiples_insights(
         self,
         insights: List[Dict[str, Any]]
@@ -187,6 +333,8 @@ class AplicadorInsights:
         """
         Procesa múltiples insights y prioriza acciones.
         
+        Los insights ya procesados se saltean.
+        
         Args:
             insights: Lista de insights
         
@@ -194,9 +342,11 @@ class AplicadorInsights:
             Lista priorizada de acciones
         """
         todas_acciones = []
+        self._lotes += 1
+        self._vencer_pendientes()
         
-        # Procesar cada insight
-        for insight in insights:
+        # Procesar cada insight nuevo
+        for insight in self.filtrar_nuevos(insights):
             acciones = self.procesar_insight(insight)
             todas_acciones.extend(acciones)
         
@@ -217,12 +367,7 @@ class AplicadorInsights:
         unicas = []
         
         for accion in acciones:
-            # Crear clave única
-            clave = (
-                accion['tipo'],
-                accion.get('concepto_id', ''),
-                accion.get('area', '')
-            )
+            clave = self._clave_accion(accion)
             
             if clave not in vistas:
                 vistas.add(clave)
@@ -234,43 +379,42 @@ class AplicadorInsights:
         self,
         acciones: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Ordena acciones por prioridad."""
-        prioridades = {'ALTA': 3, 'MEDIA': 2, 'BAJA': 1}
+        """Ordena acciones por prioridad (estable, por cubos)."""
+        cubos: Dict[str, List[Dict[str, Any]]] = {p: [] for p in PRIORIDADES}
+        otras = []
         
-        return sorted(
-            acciones,
-            key=lambda a: prioridades.get(a.get('prioridad', 'BAJA'), 0),
-            reverse=True
-        )
+        for accion in acciones:
+            cubo = cubos.get(accion.get('prioridad', 'BAJA'))
+            (otras if cubo is None else cubo).append(accion)
+        
+        return [a for p in PRIORIDADES for a in cubos[p]] + otras
     
     def obtener_acciones_pendientes(
         self,
-        prioridad_minima: Optional[str] = None
+        prioridad_minima: Optional[str] = None,
+        n: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        Obtiene acciones pendientes de aplicar.
+        Obtiene acciones pendientes de aplicar, de mayor a menor prioridad.
         
         Args:
             prioridad_minima: Prioridad mínima ('ALTA', 'MEDIA', 'BAJA')
+            n: Máximo de acciones (None = todas); cuesta O(n)
         
         Returns:
             Lista de acciones pendientes
         """
-        acciones = self.acciones_generadas.copy()
-        
-        if prioridad_minima:
-            prioridades_incluir = []
-            if prioridad_minima == 'ALTA':
-                prioridades_incluir = ['ALTA']
-            elif prioridad_minima == 'MEDIA':
-                prioridades_incluir = ['ALTA', 'MEDIA']
-            else:
-                prioridades_incluir = ['ALTA', 'MEDIA', 'BAJA']
-            
-            acciones = [
-                a for a in acciones
-                if a.get('prioridad', 'BAJA') in prioridades_incluir
-            ]
+        if prioridad_minima in PRIORIDADES:
+            prioridades = PRIORIDADES[:PRIORIDADES.index(prioridad_minima) + 1]
+        else:
+            prioridades = PRIORIDADES
+        
+        acciones = []
+        for prioridad in prioridades:
+            for accion in self._pendientes[prioridad].values():
+                if n is not None and len(acciones) >= n:
+                    return acciones
+                acciones.append(accion)
         
         return acciones
     
@@ -278,6 +422,28 @@ class AplicadorInsights:
         """Marca una acción como aplicada."""
         accion['aplicada'] = True
         accion['timestamp_aplicacion'] = datetime.now().isoformat()
+        self.total_aplicadas += 1
+        self.retirar_accion(accion)
+    
+    def retirar_accion(self, accion: Dict[str, Any]):
+        """Quita una acción de las pendientes (aplicada o descartada)."""
+        clave = self._clave_accion(accion)
+        for cubo in self._pendientes.values():
+            if cubo.get(clave) is accion:
+                del cubo[clave]
+                del self._lote_pendiente[clave]
+                return
+    
+    def _vencer_pendientes(self):
+        """Retira las acciones que llevan vida_pendientes lotes sin aplicarse."""
+        limite = self._lotes - self.vida_pendientes
+        for cubo in self._pendientes.values():
+            while cubo:
+                clave = next(iter(cubo))
+                if self._lote_pendiente[clave] > limite:
+                    break
+                del cubo[clave]
+                del self._lote_pendiente[clave]
     
     def obtener_estadisticas(self) -> Dict[str, Any]:
         """
@@ -287,27 +453,28 @@ class AplicadorInsights:
             Dict con estadísticas
         """
         return {
-            'insights_procesados': len(self.insights_procesados),
-            'acciones_generadas': len(self.acciones_generadas),
-            'acciones_aplicadas': sum(
-                1 for a in self.acciones_generadas if a.get('aplicada', False)
-            ),
+            'insights_procesados': self.total_insights,
+            'acciones_generadas': self.total_acciones,
+            'acciones_aplicadas': self.total_aplicadas,
+            'acciones_pendientes': sum(len(cubo) for cubo in self._pendientes.values()),
             'por_tipo': self._contar_por_tipo(),
             'por_prioridad': self._contar_por_prioridad()
         }
     
+    def reiniciar_estadisticas(self):
+        """Reinicia contadores e historial (no olvida los insights vistos)."""
+        self.insights_procesados.clear()
+        self.acciones_generadas.clear()
+        self.total_insights = 0
+        self.total_acciones = 0
+        self.total_aplicadas = 0
+        self._por_tipo.clear()
+        self._por_prioridad.clear()
+    
     def _contar_por_tipo(self) -> Dict[str, int]:
         """Cuenta acciones por tipo."""
-        conteo: Dict[str, int] = {}
-        for accion in self.acciones_generadas:
-            tipo = accion.get('tipo', 'DESCONOCIDO')
-            conteo[tipo] = conteo.get(tipo, 0) + 1
-        return conteo
+        return dict(self._por_tipo)
     
     def _contar_por_prioridad(self) -> Dict[str, int]:
         """Cuenta acciones por prioridad."""
-        conteo: Dict[str, int] = {}
-        for accion in self.acciones_generadas:
-            prio = accion.get('prioridad', 'BAJA')
-            conteo[prio] = conteo.get(prio, 0) + 1
-        return conteo
\ No newline at end of file
+        return dict(self._por_prioridad)
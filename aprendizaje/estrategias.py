@@ -3,9 +3,20 @@ Estrategias de Aprendizaje - Define cómo ajustar grounding.
 
 Diferentes estrategias para ajustar el grounding de conceptos
 basado en uso, éxito y patrones detectados.
+
+Cada estrategia tiene dos formas con los mismos resultados:
+- calcular_ajuste: un concepto, contexto con valores sueltos
+- calcular_ajuste_lote: todo el vocabulario de una vez, contexto con
+  arrays paralelos al de grounding (ver TablaGrounding); NaN = sin ajuste
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from abc import ABC, abstractmethod
+import numpy as np
+
+def _columna(contexto: Dict[str, Any], clave: str, defecto: float, n: int) -> np.ndarray:
+    """Valor de contexto como array de n elementos (escalares se repiten)."""
+    valor = contexto.get(clave, defecto)
+    return np.broadcast_to(np.asarray(valor, dtype=np.float64), (n,))
 
 class EstrategiaAprendizaje(ABC):
     """
@@ -33,6 +44,41 @@ class EstrategiaAprendizaje(ABC):
             Nuevo grounding o None si no hay ajuste
         """
         pass
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Calcula nuevo grounding para muchos conceptos a la vez.
+        
+        Esta implementación recorre calcular_ajuste concepto por concepto;
+        las estrategias con forma vectorizada la redefinen.
+        
+        Args:
+            concepto_ids: IDs de los conceptos (mismo orden que grounding)
+            grounding: Array con el grounding actual
+            contexto: Mismas claves que calcular_ajuste; cada valor es un
+                      array paralelo a grounding o un escalar común a todos
+        
+        Returns:
+            Array con el nuevo grounding (NaN donde no hay ajuste)
+        """
+        n = len(grounding)
+        resultado = np.full(n, np.nan)
+        
+        for i in range(n):
+            contexto_i = {
+                clave: valor[i].item() if isinstance(valor, np.ndarray) and valor.ndim == 1 else valor
+                for clave, valor in contexto.items()
+            }
+            nuevo = self.calcular_ajuste(concepto_ids[i], float(grounding[i]), contexto_i)
+            if nuevo is not None:
+                resultado[i] = nuevo
+        
+        return resultado
 
 
 class EstrategiaUsoFrecuente(EstrategiaAprendizaje):
@@ -86,6 +132,25 @@ class EstrategiaUsoFrecuente(EstrategiaAprendizaje):
             return None
         
         return nuevo
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """Forma vectorizada de calcular_ajuste."""
+        n = len(grounding)
+        usos = _columna(contexto, 'usos', 0, n)
+        tasa_exito = _columna(contexto, 'tasa_exito', 1.0, n)
+        
+        nuevo = np.minimum(1.0, grounding + self.incremento)
+        ajustar = (
+            (usos >= self.umbral_usos)
+            & (tasa_exito >= 0.7)
+            & (np.abs(nuevo - grounding) >= 0.01)
+        )
+        return np.where(ajustar, nuevo, np.nan)
 
 
 class EstrategiaExitoFallido(EstrategiaAprendizaje):
@@ -145,6 +210,32 @@ class EstrategiaExitoFallido(EstrategiaAprendizaje):
             return None
         
         return nuevo
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """Forma vectorizada de calcular_ajuste."""
+        n = len(grounding)
+        exitos = _columna(contexto, 'usos_exitosos', 0, n)
+        fallos = _columna(contexto, 'usos_fallidos', 0, n)
+        total = exitos + fallos
+        
+        tasa_exito = np.zeros(n)
+        np.divide(exitos, total, out=tasa_exito, where=total > 0)
+        
+        sube = (total > 0) & (tasa_exito >= 0.8)
+        baja = (total > 0) & ~sube & (tasa_exito <= 0.4)
+        
+        nuevo = np.where(
+            sube,
+            np.minimum(1.0, grounding + self.incremento_exito),
+            np.maximum(0.0, grounding - self.decremento_fallo)
+        )
+        ajustar = (sube | baja) & (np.abs(nuevo - grounding) >= 0.01)
+        return np.where(ajustar, nuevo, np.nan)
 
 
 class EstrategiaInsights(EstrategiaAprendizaje):
@@ -182,6 +273,19 @@ class EstrategiaInsights(EstrategiaAprendizaje):
             return None
         
         return nuevo
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """Forma vectorizada de calcular_ajuste."""
+        ajuste = _columna(contexto, 'ajuste_sugerido', 0.0, len(grounding))
+        
+        nuevo = np.maximum(0.0, np.minimum(1.0, grounding + ajuste))
+        ajustar = (ajuste != 0.0) & (np.abs(nuevo - grounding) >= 0.01)
+        return np.where(ajustar, nuevo, np.nan)
 
 
 class EstrategiaConservadora(EstrategiaAprendizaje):
@@ -232,6 +336,36 @@ class EstrategiaConservadora(EstrategiaAprendizaje):
             return None
         
         return nuevo
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Forma vectorizada de calcular_ajuste.
+        
+        'direccion' puede ser un array de 'aumentar'/'disminuir' o de
+        signos (+1 aumentar, -1 disminuir, 0 nada).
+        """
+        n = len(grounding)
+        direccion = np.asarray(contexto.get('direccion', 0))
+        if direccion.dtype.kind in 'UO':
+            direccion = np.where(direccion == 'aumentar', 1, np.where(direccion == 'disminuir', -1, 0))
+        direccion = np.broadcast_to(direccion, (n,))
+        confianza = _columna(contexto, 'confianza', 0.5, n)
+        
+        # Calcular ajuste proporcional a confianza
+        cambio = self.max_cambio * confianza
+        
+        nuevo = np.where(
+            direccion > 0,
+            np.minimum(1.0, grounding + cambio),
+            np.maximum(0.0, grounding - cambio)
+        )
+        ajustar = (direccion != 0) & (np.abs(nuevo - grounding) >= 0.005)
+        return np.where(ajustar, nuevo, np.nan)
 
 
 class EstrategiaComposite(EstrategiaAprendizaje):
@@ -268,4 +402,25 @@ class EstrategiaComposite(EstrategiaAprendizaje):
             if ajuste is not None:
                 return ajuste
         
-        return None
\ No newline at end of file
+        return None
+    
+    def calcular_ajuste_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding: np.ndarray,
+        contexto: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Forma vectorizada: cada concepto toma el ajuste de la primera
+        estrategia que genere uno.
+        """
+        resultado = np.full(len(grounding), np.nan)
+        
+        for estrategia in self.estrategias:
+            pendientes = np.isnan(resultado)
+            if not pendientes.any():
+                break
+            ajuste = estrategia.calcular_ajuste_lote(concepto_ids, grounding, contexto)
+            resultado = np.where(pendientes, ajuste, resultado)
+        
+        return resultado
@@ -9,10 +9,17 @@ Motor principal que integra:
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import threading
+import time
+import numpy as np
 
+from core.instantanea_grounding import PublicadorGrounding
 from aprendizaje.ajustador_grounding import AjustadorGrounding
 from aprendizaje.aplicador_insights import AplicadorInsights
 from aprendizaje.estrategias import EstrategiaAprendizaje
+from aprendizaje.tabla_grounding import TablaGrounding
+from aprendizaje.registro_usos import RegistroUsos, ConsumidorUsos, EventoUso
+from aprendizaje.programador_ciclos import ProgramadorCiclos
 
 class MotorAprendizaje:
     """
@@ -26,15 +33,26 @@ class MotorAprendizaje:
     2. Motor procesa insights y genera acciones
     3. Ajustador propone cambios de grounding
     4. Motor aplica cambios a conceptos
-    5. Memoria guarda todo para futuro
+    5. Motor publica una instantánea nueva del grounding
+    6. Memoria guarda todo para futuro
     """
     
-    def __init__(self, estrategia: Optional[EstrategiaAprendizaje] = None):
+    def __init__(
+        self,
+        estrategia: Optional[EstrategiaAprendizaje] = None,
+        aprendizaje_por_lotes: bool = False,
+        instantaneas: Optional[PublicadorGrounding] = None
+    ):
         """
         Inicializa motor de aprendizaje.
         
         Args:
             estrategia: Estrategia de aprendizaje (None = por defecto)
+            aprendizaje_por_lotes: Si True, procesar_uso_concepto solo
+                                   acumula contadores y cada ciclo ajusta
+                                   todo el vocabulario en una pasada
+            instantaneas: Publicador donde dejar el grounding tras cada
+                          lote (None = uno propio)
         """
         self.ajustador = AjustadorGrounding(estrategia)
         self.aplicador = AplicadorInsights()
@@ -44,6 +62,21 @@ class MotorAprendizaje:
         self.gestor_memoria = None
         self.gestor_bucles = None
         
+        # Grounding del vocabulario en arrays (se crea al primer uso)
+        self.aprendizaje_por_lotes = aprendizaje_por_lotes
+        self.tabla_grounding: Optional[TablaGrounding] = None
+        self._lock_tabla = threading.Lock()
+        
+        # Grounding publicado para lectores concurrentes (razonamiento)
+        self.instantaneas = instantaneas if instantaneas is not None else PublicadorGrounding()
+        
+        # Usos diferidos (ver iniciar_consumidor_usos)
+        self.registro_usos = RegistroUsos()
+        self.consumidor_usos: Optional[ConsumidorUsos] = None
+        
+        # Ciclos disparados por el bucle largo (ver iniciar_ciclos_automaticos)
+        self.programador_ciclos: Optional[ProgramadorCiclos] = None
+        
         # Estado
         self.activo = False
         self.ciclos_ejecutados = 0
@@ -65,14 +98,39 @@ class MotorAprendizaje:
         self.gestor_vocabulario = vocabulario
         self.gestor_memoria = memoria
         self.gestor_bucles = bucles
+        self.tabla_grounding = None
+        
+        if vocabulario:
+            try:
+                self.instantaneas.publicar_todo(vocabulario.obtener_todos())
+            except Exception:
+                pass
+    
+    def _obtener_tabla(self) -> Optional[TablaGrounding]:
+        """Tabla de grounding del vocabulario (None si no hay vocabulario)."""
+        if self.tabla_grounding is None and self.gestor_vocabulario:
+            with self._lock_tabla:
+                if self.tabla_grounding is None:
+                    try:
+                        self.tabla_grounding = TablaGrounding.desde_vocabulario(self.gestor_vocabulario)
+                    except Exception:
+                        return None
+        return self.tabla_grounding
     
-    def ejecutar_ciclo_aprendizaje(self) -> Dict[str, Any]:
+    def ejecutar_ciclo_aprendizaje(
+        self,
+        insights: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Ejecuta un ciclo completo de aprendizaje.
         
+        Args:
+            insights: Insights a procesar (None = pedirlos a bucles o memoria)
+        
         Returns:
-            Dict con resultados del ciclo
+            Dict con resultados del ciclo (incluye 'duracion_ms')
         """
+        inicio = time.perf_counter()
         self.ciclos_ejecutados += 1
         
         resultado = {
@@ -82,16 +140,23 @@ class MotorAprendizaje:
             'acciones_generadas': 0,
             'ajustes_propuestos': 0,
             'ajustes_aplicados': 0,
+            'ajustes_por_uso': 0,
             'errores': []
         }
         
         try:
-            # Paso 1: Obtener insights de bucles
-            insights = self._obtener_insights()
+            # Paso 0: Ajustar por los usos acumulados (modo por lotes)
+            if self.aprendizaje_por_lotes:
+                resultado['ajustes_por_uso'] = self.aplicar_usos_acumulados()
+            
+            # Paso 1: Obtener insights nuevos de bucles
+            if insights is None:
+                insights = self._obtener_insights()
+            insights = self.aplicador.filtrar_nuevos(insights)
             resultado['insights_procesados'] = len(insights)
             
             if not insights:
-                resultado['mensaje'] = 'Sin insights para procesar'
+                resultado['mensaje'] = 'Sin insights nuevos para procesar'
                 return resultado
             
             # Paso 2: Procesar insights y generar acciones
@@ -111,8 +176,62 @@ class MotorAprendizaje:
             resultado['errores'].append(str(e))
             resultado['mensaje'] = f'Error en ciclo: {str(e)}'
         
+        finally:
+            resultado['duracion_ms'] = (time.perf_counter() - inicio) * 1000
+        
         return resultado
     
+    def iniciar_ciclos_automaticos(self, retardo_coalescencia: float = 1.0) -> bool:
+        """
+        Corre un ciclo cada vez que el bucle largo consolida datos nuevos.
+        
+        Las consolidaciones que llegan dentro de `retardo_coalescencia`
+        segundos se procesan en un solo ciclo (ver ProgramadorCiclos).
+        
+        Args:
+            retardo_coalescencia: Segundos para juntar consolidaciones
+        
+        Returns:
+            False si no hay bucles integrados
+        """
+        if not self.gestor_bucles:
+            return False
+        
+        if self.programador_ciclos and self.programador_ciclos.esta_activo():
+            return True
+        
+        self.programador_ciclos = ProgramadorCiclos(
+            self._ciclo_por_consolidaciones,
+            retardo_coalescencia=retardo_coalescencia
+        )
+        self.gestor_bucles.suscribir_consolidaciones(self.programador_ciclos.notificar)
+        self.programador_ciclos.iniciar()
+        self.activo = True
+        return True
+    
+    def detener_ciclos_automaticos(self, timeout: float = 5.0):
+        """Deja de escuchar al bucle largo tras correr el ciclo pendiente."""
+        if not self.programador_ciclos:
+            return
+        
+        self.gestor_bucles.desuscribir_consolidaciones(self.programador_ciclos.notificar)
+        self.programador_ciclos.detener(timeout)
+        self.activo = False
+    
+    def _ciclo_por_consolidaciones(self, consolidaciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Un ciclo con los insights y ajustes de varias consolidaciones.
+        
+        Los ajustes recomendados se procesan como insights
+        (tipo AUMENTAR_GROUNDING). El bucle largo entrega cada uno a lo
+        sumo una vez por concepto y ventana de usos.
+        """
+        insights = []
+        for consolidacion in consolidaciones:
+            insights.extend(consolidacion.get('insights', []))
+            insights.extend(consolidacion.get('ajustes', []))
+        return self.ejecutar_ciclo_aprendizaje(insights)
+    
     def _obtener_insights(self) -> List[Dict[str, Any]]:
         """Obtiene insights de bucles o memoria."""
         insights = []
@@ -137,6 +256,10 @@ class MotorAprendizaje:
         """
         Aplica acciones de ajuste de grounding.
         
+        Proponer, aplicar y publicar corren bajo _lock_tabla, igual que
+        los lotes de usos: un lote nunca pisa un ajuste por insight a
+        medio aplicar (relee el grounding de los conceptos bajo el lock).
+        
         Args:
             acciones: Lista de acciones
         
@@ -146,7 +269,8 @@ class MotorAprendizaje:
         if not self.gestor_vocabulario:
             return 0
         
-        ajustes_aplicados = 0
+        ajustados = []
+        registros = []
         
         # Filtrar acciones de ajuste de grounding
         acciones_grounding = [
@@ -154,51 +278,55 @@ class MotorAprendizaje:
             if a.get('tipo') == 'AJUSTAR_GROUNDING'
         ]
         
-        for accion in acciones_grounding:
-            try:
-                # Obtener concepto
-                concepto_id = accion.get('concepto_id')
-                concepto = self.gestor_vocabulario.buscar_por_id(concepto_id)
-                
-                if not concepto:
-                    continue
-                
-                # Crear contexto para ajuste
-                contexto = {
-                    'ajuste_sugerido': accion.get('ajuste_sugerido', 0.0),
-                    'razon': accion.get('razon', ''),
-                    'prioridad': accion.get('prioridad', 'MEDIA')
-                }
-                
-                # Proponer ajuste
-                propuesta = self.ajustador.proponer_ajuste(
-                    concepto_id,
-                    concepto.confianza_grounding,
-                    contexto
-                )
+        with self._lock_tabla:
+            for accion in acciones_grounding:
+                try:
+                    # Obtener concepto
+                    concepto_id = accion.get('concepto_id')
+                    concepto = self.gestor_vocabulario.buscar_por_id(concepto_id)
+                    
+                    if not concepto:
+                        continue
+                    
+                    # Crear contexto para ajuste
+                    contexto = {
+                        'ajuste_sugerido': accion.get('ajuste_sugerido', 0.0),
+                        'razon': accion.get('razon', ''),
+                        'prioridad': accion.get('prioridad', 'MEDIA')
+                    }
+                    
+                    # Proponer ajuste
+                    propuesta = self.ajustador.proponer_ajuste(
+                        concepto_id,
+                        concepto.confianza_grounding,
+                        contexto
+                    )
+                    
+                    if not propuesta:
+                        continue
+                    
+                    # Aplicar ajuste
+                    if self.ajustador.aplicar_ajuste(concepto, propuesta):
+                        ajustados.append(concepto)
+                        self.aplicador.marcar_accion_aplicada(accion)
+                        registros.append(self._registro_propuesta(propuesta))
                 
-                if not propuesta:
+                except Exception as e:
+                    # Continuar con siguiente acción en caso de error
                     continue
-                
-                # Aplicar ajuste
-                if self.ajustador.aplicar_ajuste(concepto, propuesta):
-                    ajustes_aplicados += 1
-                    
-                    # Guardar en memoria si está disponible
-                    if self.gestor_memoria:
-                        self.gestor_memoria.guardar_ajuste_grounding(
-                            concepto_id,
-                            propuesta['grounding_actual'],
-                            propuesta['grounding_propuesto'],
-                            propuesta['razon'],
-                            True
-                        )
             
-            except Exception as e:
-                # Continuar con siguiente acción en caso de error
-                continue
+            # Todo el ciclo se publica como una sola versión
+            self._publicar_conceptos(ajustados)
+        
+        # Guardar en memoria si está disponible
+        self._guardar_ajustes(registros)
+        
+        # Las que no se pudieron aplicar no quedan pendientes
+        for accion in acciones_grounding:
+            if not accion.get('aplicada'):
+                self.aplicador.retirar_accion(accion)
         
-        return ajustes_aplicados
+        return len(ajustados)
     
     def _guardar_en_memoria(
         self,
@@ -217,6 +345,160 @@ class MotorAprendizaje:
         except:
             pass
     
+    def aplicar_usos_acumulados(self) -> int:
+        """
+        Ajusta el grounding por los usos acumulados desde el último ciclo.
+        
+        Una sola pasada vectorizada de la estrategia sobre todo el
+        vocabulario; los conceptos sin usos no se tocan.
+        
+        Returns:
+            Número de ajustes aplicados
+        """
+        tabla = self._obtener_tabla()
+        if tabla is None:
+            return 0
+        
+        with self._lock_tabla:
+            if tabla.conceptos_con_uso() == 0:
+                return 0
+            
+            # Los insights pudieron ajustar conceptos de a uno
+            tabla.refrescar()
+            
+            nuevos = self.ajustador.proponer_ajustes_lote(
+                tabla.ids,
+                tabla.grounding,
+                tabla.contexto_lote()
+            )
+            nuevos[tabla.usos == 0] = np.nan
+            
+            registros = self.ajustador.aplicar_ajustes_lote(tabla, nuevos, 'Ajuste por uso')
+            tabla.reiniciar_contadores()
+            self._publicar_registros(registros)
+        
+        self._guardar_ajustes(registros)
+        return len(registros)
+    
+    def iniciar_consumidor_usos(
+        self,
+        intervalo_segundos: float = 0.5,
+        tamano_lote: int = 256
+    ):
+        """
+        Saca el aprendizaje por uso del thread de la petición.
+        
+        procesar_uso_concepto pasa a solo registrar el evento; un thread
+        lo consume en micro-lotes con procesar_lote_usos.
+        
+        Args:
+            intervalo_segundos: Latencia máxima de un uso sin procesar
+            tamano_lote: Eventos por micro-lote
+        """
+        if self.consumidor_usos and self.consumidor_usos.esta_activo():
+            return
+        
+        self.consumidor_usos = ConsumidorUsos(
+            self.registro_usos,
+            self.procesar_lote_usos,
+            intervalo_segundos=intervalo_segundos,
+            tamano_lote=tamano_lote
+        )
+        self.consumidor_usos.iniciar()
+    
+    def detener_consumidor_usos(self, timeout: float = 5.0):
+        """Detiene el consumidor tras procesar los usos pendientes."""
+        if self.consumidor_usos:
+            self.consumidor_usos.detener(timeout)
+    
+    def procesar_lote_usos(self, eventos: List[EventoUso]) -> int:
+        """
+        Procesa un micro-lote de eventos de uso.
+        
+        Los usos se suman por concepto y la estrategia corre una vez por
+        concepto tocado, con el mismo contexto que el ajuste por uso
+        (usos_exitosos / usos_fallidos) pero con los totales del lote.
+        En modo por lotes solo se acumulan para el próximo ciclo.
+        
+        Args:
+            eventos: Lista de (concepto_id, exitoso, certeza)
+        
+        Returns:
+            Número de ajustes aplicados
+        """
+        tabla = self._obtener_tabla()
+        if tabla is None:
+            return 0
+        
+        with self._lock_tabla:
+            indices = []
+            exitosos = []
+            for concepto_id, exitoso, _ in eventos:
+                indice = self._indice_concepto(tabla, concepto_id)
+                if indice is not None:
+                    indices.append(indice)
+                    exitosos.append(exitoso)
+            
+            if not indices:
+                return 0
+            
+            indices = np.array(indices, dtype=np.int64)
+            exitosos = np.array(exitosos, dtype=bool)
+            
+            if self.aprendizaje_por_lotes:
+                tabla.registrar_usos_lote(indices, exitosos)
+                return 0
+            
+            # Totales del lote por concepto tocado
+            tocados, inversa = np.unique(indices, return_inverse=True)
+            exitos = np.bincount(inversa, weights=exitosos, minlength=len(tocados)).astype(np.int64)
+            fallos = np.bincount(inversa, minlength=len(tocados)) - exitos
+            
+            tabla.refrescar(tocados)
+            propuestos = self.ajustador.proponer_ajustes_lote(
+                [tabla.ids[i] for i in tocados.tolist()],
+                tabla.grounding[tocados],
+                {'usos_exitosos': exitos, 'usos_fallidos': fallos}
+            )
+            
+            nuevos = np.full(len(tabla), np.nan)
+            nuevos[tocados] = propuestos
+            registros = self.ajustador.aplicar_ajustes_lote(tabla, nuevos, 'Ajuste por uso')
+            self._publicar_registros(registros)
+        
+        self._guardar_ajustes(registros)
+        return len(registros)
+    
+    def _publicar_registros(self, registros: List[Dict[str, Any]]):
+        """Publica los ajustes de un lote (llamar con _lock_tabla tomado)."""
+        self.instantaneas.publicar({
+            registro['concepto_id']: registro['grounding_nuevo']
+            for registro in registros
+        })
+    
+    def _publicar_conceptos(self, conceptos: List[Any]):
+        """Publica el grounding de conceptos ajustados de a uno (llamar con _lock_tabla tomado)."""
+        if conceptos:
+            self.instantaneas.publicar({c.id: c.confianza_grounding for c in conceptos})
+    
+    @staticmethod
+    def _registro_propuesta(propuesta: Dict[str, Any]) -> Dict[str, Any]:
+        """Ajuste aplicado desde una propuesta, en el formato de _guardar_ajustes."""
+        return {
+            'concepto_id': propuesta['concepto_id'],
+            'grounding_anterior': propuesta['grounding_actual'],
+            'grounding_nuevo': propuesta['grounding_propuesto'],
+            'razon': propuesta['razon'],
+            'aplicado': True
+        }
+    
+    def _guardar_ajustes(self, registros: List[Dict[str, Any]]):
+        """Guarda en memoria ajustes aplicados por lotes (una escritura por lote)."""
+        if not self.gestor_memoria:
+            return
+        
+        self.gestor_memoria.guardar_ajustes_grounding(registros)
+    
     def procesar_uso_concepto(
         self,
         concepto_id: str,
@@ -226,6 +508,10 @@ class MotorAprendizaje:
         """
         Procesa el uso de un concepto para aprendizaje.
         
+        Con el consumidor de usos activo solo registra el evento (O(1));
+        en modo por lotes solo cuenta el uso y el ajuste se hace en el
+        próximo ciclo (ver aplicar_usos_acumulados).
+        
         Args:
             concepto_id: ID del concepto usado
             exitoso: Si el uso fue exitoso
@@ -234,6 +520,15 @@ class MotorAprendizaje:
         if not self.gestor_vocabulario:
             return
         
+        if self.consumidor_usos and self.consumidor_usos.esta_activo():
+            self.registro_usos.registrar(concepto_id, exitoso, certeza)
+            self.consumidor_usos.avisar()
+            return
+        
+        if self.aprendizaje_por_lotes:
+            self._contar_uso(concepto_id, exitoso)
+            return
+        
         try:
             # Obtener concepto
             concepto = self.gestor_vocabulario.buscar_por_id(concepto_id)
@@ -247,29 +542,51 @@ class MotorAprendizaje:
                 'razon': 'Ajuste por uso'
             }
             
-            # Proponer ajuste
-            propuesta = self.ajustador.proponer_ajuste(
-                concepto_id,
-                concepto.confianza_grounding,
-                contexto
-            )
+            # Proponer, aplicar y publicar sin que un lote se cruce
+            with self._lock_tabla:
+                propuesta = self.ajustador.proponer_ajuste(
+                    concepto_id,
+                    concepto.confianza_grounding,
+                    contexto
+                )
+                if not propuesta or not self.ajustador.aplicar_ajuste(concepto, propuesta):
+                    return
+                self._publicar_conceptos([concepto])
             
-            if propuesta:
-                # Aplicar ajuste
-                if self.ajustador.aplicar_ajuste(concepto, propuesta):
-                    # Guardar en memoria
-                    if self.gestor_memoria:
-                        self.gestor_memoria.guardar_ajuste_grounding(
-                            concepto_id,
-                            propuesta['grounding_actual'],
-                            propuesta['grounding_propuesto'],
-                            propuesta['razon'],
-                            True
-                        )
+            # Guardar en memoria
+            if self.gestor_memoria:
+                self.gestor_memoria.guardar_ajuste_grounding(
+                    concepto_id,
+                    propuesta['grounding_actual'],
+                    propuesta['grounding_propuesto'],
+                    propuesta['razon'],
+                    True
+                )
         
         except Exception:
             pass
     
+    def _contar_uso(self, concepto_id: str, exitoso: bool):
+        """Suma un uso a la tabla (agrega el concepto si es nuevo)."""
+        tabla = self._obtener_tabla()
+        if tabla is None:
+            return
+        
+        with self._lock_tabla:
+            if self._indice_concepto(tabla, concepto_id) is not None:
+                tabla.registrar_uso(concepto_id, exitoso)
+    
+    def _indice_concepto(self, tabla: TablaGrounding, concepto_id: str) -> Optional[int]:
+        """Ordinal de un concepto en la tabla (lo agrega si es nuevo)."""
+        indice = tabla.indice(concepto_id)
+        if indice is not None:
+            return indice
+        
+        concepto = self.gestor_vocabulario.buscar_por_id(concepto_id)
+        if not concepto:
+            return None
+        return tabla.agregar(concepto)
+    
     def obtener_estadisticas(self) -> Dict[str, Any]:
         """
         Obtiene estadísticas del motor.
@@ -280,6 +597,11 @@ class MotorAprendizaje:
         return {
             'ciclos_ejecutados': self.ciclos_ejecutados,
             'activo': self.activo,
+            'aprendizaje_por_lotes': self.aprendizaje_por_lotes,
+            'usos_pendientes': int(self.tabla_grounding.usos.sum()) if self.tabla_grounding else 0,
+            'consumidor_usos': self.consumidor_usos.obtener_estadisticas() if self.consumidor_usos else None,
+            'instantaneas': self.instantaneas.obtener_estadisticas(),
+            'ciclos_automaticos': self.programador_ciclos.obtener_estadisticas() if self.programador_ciclos else None,
             'ajustador': self.ajustador.obtener_estadisticas(),
             'aplicador': self.aplicador.obtener_estadisticas(),
             'integraciones': {
@@ -317,5 +639,4 @@ class MotorAprendizaje:
         """Reinicia contadores de estadísticas."""
         self.ciclos_ejecutados = 0
         self.ajustador.historial_ajustes.clear()
-        self.aplicador.insights_procesados.clear()
-        self.aplicador.acciones_generadas.clear()
\ No newline at end of file
+        self.aplicador.reiniciar_estadisticas()
\ No newline at end of file
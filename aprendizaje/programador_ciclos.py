@@ -0,0 +1,169 @@
+"""
+Programador de Ciclos - Ciclos de aprendizaje disparados por el bucle largo.
+
+ejecutar_ciclo_aprendizaje solo corría a mano, mientras BucleLargo
+generaba insights y ajustes recomendados que nadie consumía. El
+programador se suscribe a las consolidaciones del bucle largo: cada
+consolidación con datos nuevos se encola y despierta a un thread que
+corre un ciclo con ella. Las consolidaciones que llegan juntas (por
+ejemplo, al restaurar estado o con intervalos cortos) se juntan en un
+solo ciclo esperando `retardo_coalescencia` segundos desde el primer
+aviso. Sin consolidaciones no hay ciclos.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+class ProgramadorCiclos:
+    """
+    Thread que corre un ciclo de aprendizaje por ráfaga de consolidaciones.
+
+    notificar() no bloquea: se puede llamar desde el thread del
+    planificador o desde el callback del proceso de consolidación.
+    """
+
+    def __init__(
+        self,
+        ejecutar_ciclo: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+        retardo_coalescencia: float = 1.0,
+        max_historial: int = 100
+    ):
+        """
+        Args:
+            ejecutar_ciclo: Recibe las consolidaciones pendientes y
+                            devuelve el resultado del ciclo
+            retardo_coalescencia: Segundos a esperar desde el primer aviso
+                                  para juntar los que lleguen después
+            max_historial: Ciclos recientes que se conservan con su tiempo
+        """
+        self.ejecutar_ciclo = ejecutar_ciclo
+        self.retardo_coalescencia = retardo_coalescencia
+
+        self._pendientes: deque = deque()      # (instante del aviso, consolidación)
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_ciclo = threading.Lock()
+
+        self.historial: deque = deque(maxlen=max_historial)
+        self.notificaciones = 0
+        self.ciclos = 0
+        self.errores = 0
+        self.ultimo_error: Optional[str] = None
+        self.duracion_total_ms = 0.0
+        self.duracion_max_ms = 0.0
+
+    def notificar(self, consolidacion: Dict[str, Any]):
+        """Encola una consolidación y despierta al thread."""
+        self._pendientes.append((time.perf_counter(), consolidacion))
+        self.notificaciones += 1
+        self._despertar.set()
+
+    def iniciar(self):
+        """Arranca el thread."""
+        if self.esta_activo():
+            return
+
+        self._detener.clear()
+        self._thread = threading.Thread(target=self._correr, name="ProgramadorCiclos", daemon=True)
+        self._thread.start()
+
+    def detener(self, timeout: float = 5.0):
+        """Detiene el thread tras correr un ciclo con lo pendiente."""
+        self._detener.set()
+        self._despertar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def esta_activo(self) -> bool:
+        """¿Está corriendo el thread?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def pendientes(self) -> int:
+        """Consolidaciones esperando ciclo."""
+        return len(self._pendientes)
+
+    def vaciar(self) -> Optional[Dict[str, Any]]:
+        """
+        Corre ya un ciclo con lo pendiente (en este thread).
+
+        Returns:
+            Resultado del ciclo (None si no había nada pendiente)
+        """
+        with self._lock_ciclo:
+            lote = []
+            while True:
+                try:
+                    lote.append(self._pendientes.popleft())
+                except IndexError:
+                    break
+
+            if not lote:
+                return None
+
+            return self._correr_ciclo(lote)
+
+    def _correr(self):
+        """Bucle del thread: espera un aviso, junta la ráfaga y corre el ciclo."""
+        while not self._detener.is_set():
+            self._despertar.wait()
+            self._despertar.clear()
+            if self._detener.is_set():
+                break
+
+            # Los avisos que lleguen en esta ventana van al mismo ciclo
+            self._detener.wait(self.retardo_coalescencia)
+            self.vaciar()
+
+        # Lo que llegó antes de detener no se pierde
+        self.vaciar()
+
+    def _correr_ciclo(self, lote: List[Tuple[float, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Corre un ciclo y registra su tiempo."""
+        inicio = time.perf_counter()
+        try:
+            resultado = self.ejecutar_ciclo([consolidacion for _, consolidacion in lote])
+        except Exception as e:
+            self.errores += 1
+            self.ultimo_error = str(e)
+            resultado = {'errores': [str(e)]}
+
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        self.ciclos += 1
+        self.duracion_total_ms += duracion_ms
+        self.duracion_max_ms = max(self.duracion_max_ms, duracion_ms)
+
+        self.historial.append({
+            'timestamp': datetime.now().isoformat(),
+            'consolidaciones': len(lote),
+            'espera_ms': (inicio - lote[0][0]) * 1000,
+            'duracion_ms': duracion_ms,
+            'insights_procesados': resultado.get('insights_procesados', 0),
+            'ajustes_aplicados': resultado.get('ajustes_aplicados', 0),
+            'errores': len(resultado.get('errores', []))
+        })
+        return resultado
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict con avisos, ciclos, avisos juntados y tiempos por ciclo
+        """
+        ultimo = self.historial[-1] if self.historial else None
+        return {
+            'activo': self.esta_activo(),
+            'notificaciones': self.notificaciones,
+            'ciclos': self.ciclos,
+            # Avisos que no necesitaron un ciclo propio
+            'coalescidas': max(0, self.notificaciones - self.pendientes() - self.ciclos),
+            'pendientes': self.pendientes(),
+            'duracion_promedio_ms': self.duracion_total_ms / self.ciclos if self.ciclos else 0.0,
+            'duracion_max_ms': self.duracion_max_ms,
+            'ultima_espera_ms': ultimo['espera_ms'] if ultimo else 0.0,
+            'ultima_duracion_ms': ultimo['duracion_ms'] if ultimo else 0.0,
+            'errores': self.errores,
+            'ultimo_error': self.ultimo_error
+        }
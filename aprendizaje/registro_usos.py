@@ -0,0 +1,194 @@
+"""
+Registro de Usos - Aprendizaje por uso fuera del camino de la petición.
+
+Belladonna.procesar llamaba a procesar_uso_concepto por cada concepto
+del turno, y cada llamada buscaba el concepto, armaba un contexto y
+corría la estrategia en el thread de la petición. Con el consumidor
+activo, la petición solo agrega el evento a un registro y un thread en
+segundo plano lo consume en micro-lotes: los usos de un lote se suman
+por concepto y la estrategia corre una vez por concepto tocado.
+
+El registro es un deque: append y popleft son atómicos, así que
+productores y consumidor no comparten ningún lock.
+"""
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+# (concepto_id, exitoso, certeza)
+EventoUso = Tuple[str, bool, float]
+
+class RegistroUsos:
+    """Cola de eventos de uso, sin locks y con capacidad acotada."""
+
+    def __init__(self, capacidad: int = 100_000):
+        """
+        Args:
+            capacidad: Máximo de eventos sin consumir (los que sobran se descartan)
+        """
+        self.capacidad = capacidad
+        self._eventos: deque = deque()
+        self.registrados = 0
+        self.descartados = 0
+
+    def registrar(self, concepto_id: str, exitoso: bool, certeza: float = 0.0) -> bool:
+        """
+        Agrega un evento de uso.
+
+        Returns:
+            False si el registro estaba lleno y el evento se descartó
+        """
+        if len(self._eventos) >= self.capacidad:
+            self.descartados += 1
+            return False
+
+        self._eventos.append((concepto_id, exitoso, certeza))
+        self.registrados += 1
+        return True
+
+    def drenar(self, max_eventos: Optional[int] = None) -> List[EventoUso]:
+        """
+        Saca eventos en orden de llegada.
+
+        Args:
+            max_eventos: Máximo a sacar (None = todos los presentes)
+
+        Returns:
+            Lista de eventos (concepto_id, exitoso, certeza)
+        """
+        lote = []
+        limite = len(self._eventos) if max_eventos is None else max_eventos
+
+        while len(lote) < limite:
+            try:
+                lote.append(self._eventos.popleft())
+            except IndexError:
+                break
+
+        return lote
+
+    def __len__(self) -> int:
+        return len(self._eventos)
+
+class ConsumidorUsos:
+    """
+    Thread que consume el registro en micro-lotes.
+
+    Procesa un lote cuando se juntan `tamano_lote` eventos o pasan
+    `intervalo_segundos` desde el último, lo que ocurra primero.
+    """
+
+    def __init__(
+        self,
+        registro: RegistroUsos,
+        procesar_lote: Callable[[List[EventoUso]], Any],
+        intervalo_segundos: float = 0.5,
+        tamano_lote: int = 256
+    ):
+        """
+        Args:
+            registro: Registro de donde consumir
+            procesar_lote: Función que recibe cada lote de eventos
+            intervalo_segundos: Latencia máxima de un evento en el registro
+            tamano_lote: Eventos por lote
+        """
+        self.registro = registro
+        self.procesar_lote = procesar_lote
+        self.intervalo_segundos = intervalo_segundos
+        self.tamano_lote = tamano_lote
+
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.lotes_procesados = 0
+        self.eventos_procesados = 0
+        self.errores = 0
+        self.ultimo_error: Optional[str] = None
+        self.ultima_duracion_ms = 0.0
+
+    def iniciar(self):
+        """Arranca el thread consumidor."""
+        if self.esta_activo():
+            return
+
+        self._detener.clear()
+        self._thread = threading.Thread(target=self._correr, name="ConsumidorUsos", daemon=True)
+        self._thread.start()
+
+    def detener(self, timeout: float = 5.0):
+        """Detiene el consumidor tras procesar lo que quede en el registro."""
+        self._detener.set()
+        self._despertar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def esta_activo(self) -> bool:
+        """¿Está corriendo el thread?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def avisar(self):
+        """Despierta al consumidor si ya hay un lote completo."""
+        if len(self.registro) >= self.tamano_lote:
+            self._despertar.set()
+
+    def vaciar(self) -> int:
+        """
+        Procesa ahora todo lo que haya en el registro (en este thread).
+
+        Returns:
+            Número de eventos procesados
+        """
+        total = 0
+        while True:
+            procesados = self._procesar_siguiente()
+            if procesados == 0:
+                return total
+            total += procesados
+
+    def _correr(self):
+        """Bucle del thread: espera un lote completo o el intervalo."""
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo_segundos)
+            self._despertar.clear()
+            while self._procesar_siguiente() >= self.tamano_lote:
+                pass
+
+        # Lo que llegó antes de detener no se pierde
+        self.vaciar()
+
+    def _procesar_siguiente(self) -> int:
+        """Procesa un lote; devuelve cuántos eventos tenía."""
+        lote = self.registro.drenar(self.tamano_lote)
+        if not lote:
+            return 0
+
+        inicio = time.perf_counter()
+        try:
+            self.procesar_lote(lote)
+        except Exception as e:
+            self.errores += 1
+            self.ultimo_error = str(e)
+
+        self.lotes_procesados += 1
+        self.eventos_procesados += len(lote)
+        self.ultima_duracion_ms = (time.perf_counter() - inicio) * 1000
+        return len(lote)
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict con lotes, eventos, pendientes, descartados y errores
+        """
+        return {
+            'activo': self.esta_activo(),
+            'lotes_procesados': self.lotes_procesados,
+            'eventos_procesados': self.eventos_procesados,
+            'pendientes': len(self.registro),
+            'descartados': self.registro.descartados,
+            'ultima_duracion_ms': self.ultima_duracion_ms,
+            'errores': self.errores,
+            'ultimo_error': self.ultimo_error
+        }
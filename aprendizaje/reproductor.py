@@ -0,0 +1,276 @@
+"""
+Reproductor de Aprendizaje - Evalúa estrategias sobre usos registrados.
+
+Para comparar estrategias (o calibrar EstrategiaComposite) hay que ver
+cómo habría evolucionado el grounding con meses de uso real. Manejar
+MotorAprendizaje evento por evento es demasiado lento para eso, así que
+el reproductor:
+
+1. Lee los eventos de uso (concepto, exitoso) de la memoria persistente
+   (cada decisión aporta un uso por concepto principal, con
+   puede_ejecutar como resultado) o de un archivo JSON Lines, y los
+   codifica una vez como arrays de ordinales.
+2. Simula cada estrategia candidata en su propio proceso, con el mismo
+   esquema que el consumidor de usos: micro-lotes, usos sumados por
+   concepto y una pasada vectorizada de la estrategia por lote, con los
+   límites de AjustadorGrounding. El contexto de cada lote trae éxitos y
+   fallos, como en vivo; con usos_por_lote=True trae además usos y tasa
+   de éxito (ver contexto_usos), para evaluar estrategias como
+   EstrategiaUsoFrecuente que el consumidor en vivo no dispara.
+3. Devuelve por estrategia la trayectoria muestreada del grounding y
+   métricas de resumen.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import multiprocessing
+import time
+import numpy as np
+
+from aprendizaje.ajustador_grounding import AjustadorGrounding
+from aprendizaje.estrategias import EstrategiaAprendizaje
+from aprendizaje.tabla_grounding import contexto_usos
+
+def eventos_desde_memoria(directorio: str = "memoria_bell") -> Iterator[Tuple[str, bool]]:
+    """
+    Eventos de uso a partir de las decisiones guardadas en memoria.
+
+    Args:
+        directorio: Directorio del AlmacenJSON
+
+    Yields:
+        (concepto_id, exitoso) por cada concepto principal de cada decisión
+    """
+    from memoria.almacen import AlmacenJSON
+
+    for decision in AlmacenJSON(directorio).cargar('decisiones'):
+        exitoso = bool(decision.get('puede_ejecutar', False))
+        for concepto_id in decision.get('conceptos_principales', []):
+            yield concepto_id, exitoso
+
+def eventos_desde_jsonl(ruta: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Eventos de uso de un archivo JSON Lines, leído de a una línea.
+
+    Cada línea es un evento {"concepto_id": ..., "exitoso": ...} o una
+    decisión {"conceptos_principales": [...], "puede_ejecutar": ...}.
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            registro = json.loads(linea)
+            if 'concepto_id' in registro:
+                yield registro['concepto_id'], bool(registro.get('exitoso', False))
+            else:
+                exitoso = bool(registro.get('puede_ejecutar', False))
+                for concepto_id in registro.get('conceptos_principales', []):
+                    yield concepto_id, exitoso
+
+def codificar_eventos(
+    eventos: Iterable[Tuple[str, bool]],
+    ids: Optional[Sequence[str]] = None
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Convierte eventos en arrays de ordinales (una sola pasada).
+
+    Args:
+        eventos: (concepto_id, exitoso)
+        ids: Orden de conceptos a respetar (los nuevos se agregan al final)
+
+    Returns:
+        (ids, ordinales int32, exitosos bool)
+    """
+    ids = list(ids or [])
+    indice = {concepto_id: i for i, concepto_id in enumerate(ids)}
+    ordinales = []
+    exitosos = []
+
+    for concepto_id, exitoso in eventos:
+        ordinal = indice.get(concepto_id)
+        if ordinal is None:
+            ordinal = indice[concepto_id] = len(ids)
+            ids.append(concepto_id)
+        ordinales.append(ordinal)
+        exitosos.append(exitoso)
+
+    return ids, np.array(ordinales, dtype=np.int32), np.array(exitosos, dtype=bool)
+
+def simular(
+    estrategia: EstrategiaAprendizaje,
+    ids: Sequence[str],
+    grounding_inicial: np.ndarray,
+    ordinales: np.ndarray,
+    exitosos: np.ndarray,
+    tamano_lote: int = 256,
+    muestras: int = 100,
+    usos_por_lote: bool = False
+) -> Dict[str, Any]:
+    """
+    Evolución del grounding bajo una estrategia.
+
+    Args:
+        estrategia: Estrategia candidata
+        ids: IDs de los conceptos (orden de los ordinales)
+        grounding_inicial: Grounding de partida por concepto
+        ordinales: Concepto de cada evento
+        exitosos: Resultado de cada evento
+        tamano_lote: Eventos por micro-lote
+        muestras: Puntos de la trayectoria a guardar
+        usos_por_lote: Pasar también 'usos' y 'tasa_exito' de cada lote
+            (False = el mismo contexto que el consumidor de usos)
+
+    Returns:
+        Dict con 'trayectoria' (muestras x conceptos), 'eventos_muestra'
+        (eventos procesados en cada punto) y 'metricas'
+    """
+    inicio = time.perf_counter()
+    ajustador = AjustadorGrounding(estrategia, capacidad_historial=1)
+    grounding = np.array(grounding_inicial, dtype=np.float64)
+    ids = list(ids)
+
+    total = len(ordinales)
+    lotes = max(1, -(-total // tamano_lote))
+    cada = max(1, lotes // max(1, muestras))
+
+    trayectoria = [grounding.copy()]
+    eventos_muestra = [0]
+    ajustes = 0
+    cambio_total = 0.0
+    ajustes_por_concepto = np.zeros(len(grounding), dtype=np.int64)
+
+    for numero, desde in enumerate(range(0, total, tamano_lote), start=1):
+        lote = ordinales[desde:desde + tamano_lote]
+        tocados, inversa = np.unique(lote, return_inverse=True)
+        exitos = np.bincount(inversa, weights=exitosos[desde:desde + tamano_lote],
+                             minlength=len(tocados)).astype(np.int64)
+        fallos = np.bincount(inversa, minlength=len(tocados)) - exitos
+
+        actual = grounding[tocados]
+        propuestos = ajustador.proponer_ajustes_lote(
+            [ids[i] for i in tocados.tolist()],
+            actual,
+            contexto_usos(exitos, fallos) if usos_por_lote
+            else {'usos_exitosos': exitos, 'usos_fallidos': fallos}
+        )
+        cambiados = ~np.isnan(propuestos)
+        if cambiados.any():
+            grounding[tocados[cambiados]] = propuestos[cambiados]
+            ajustes += int(np.count_nonzero(cambiados))
+            cambio_total += float(np.abs(propuestos[cambiados] - actual[cambiados]).sum())
+            ajustes_por_concepto[tocados[cambiados]] += 1
+
+        if numero % cada == 0 or desde + tamano_lote >= total:
+            trayectoria.append(grounding.copy())
+            eventos_muestra.append(min(desde + tamano_lote, total))
+
+    usados = np.zeros(len(grounding), dtype=bool)
+    usados[ordinales] = True
+    deriva = np.abs(grounding - grounding_inicial)
+
+    return {
+        'trayectoria': np.array(trayectoria),
+        'eventos_muestra': eventos_muestra,
+        'metricas': {
+            'eventos': total,
+            'lotes': lotes if total else 0,
+            'ajustes': ajustes,
+            'cambio_promedio': cambio_total / ajustes if ajustes else 0.0,
+            'grounding_promedio_inicial': float(np.mean(grounding_inicial)) if len(grounding) else 0.0,
+            'grounding_promedio_final': float(np.mean(grounding)) if len(grounding) else 0.0,
+            'deriva_promedio': float(deriva[usados].mean()) if usados.any() else 0.0,
+            'conceptos_ajustados': int(np.count_nonzero(ajustes_por_concepto)),
+            'en_minimo': int(np.count_nonzero(grounding <= ajustador.grounding_minimo + 1e-9)),
+            'en_maximo': int(np.count_nonzero(grounding >= ajustador.grounding_maximo - 1e-9)),
+            'segundos': time.perf_counter() - inicio
+        }
+    }
+
+def reproducir(
+    estrategias: Dict[str, EstrategiaAprendizaje],
+    eventos: Iterable[Tuple[str, bool]],
+    grounding_inicial: Optional[Dict[str, float]] = None,
+    grounding_por_defecto: float = 0.5,
+    procesos: Optional[int] = None,
+    tamano_lote: int = 256,
+    muestras: int = 100,
+    usos_por_lote: bool = False
+) -> Dict[str, Any]:
+    """
+    Reproduce los mismos eventos bajo varias estrategias en paralelo.
+
+    Args:
+        estrategias: Nombre -> estrategia candidata (debe ser picklable)
+        eventos: (concepto_id, exitoso) en orden cronológico
+        grounding_inicial: Grounding de partida por concepto
+        grounding_por_defecto: Para conceptos sin grounding inicial
+        procesos: Procesos del pool (None = uno por estrategia, 0 = sin pool)
+        tamano_lote: Eventos por micro-lote
+        muestras: Puntos de trayectoria por estrategia
+        usos_por_lote: Ver simular
+
+    Returns:
+        Dict con 'ids', 'eventos', 'segundos' y 'resultados'
+        (nombre -> resultado de simular)
+    """
+    inicio = time.perf_counter()
+    grounding_inicial = grounding_inicial or {}
+    ids, ordinales, exitosos = codificar_eventos(eventos, list(grounding_inicial))
+    inicial = np.array(
+        [grounding_inicial.get(i, grounding_por_defecto) for i in ids], dtype=np.float64
+    )
+    argumentos = (ids, inicial, ordinales, exitosos, tamano_lote, muestras, usos_por_lote)
+
+    if procesos == 0 or len(estrategias) <= 1:
+        resultados = {
+            nombre: simular(estrategia, *argumentos)
+            for nombre, estrategia in estrategias.items()
+        }
+    else:
+        with ProcessPoolExecutor(
+            max_workers=procesos or len(estrategias),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as ejecutor:
+            futuros = {
+                nombre: ejecutor.submit(simular, estrategia, *argumentos)
+                for nombre, estrategia in estrategias.items()
+            }
+            resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+    return {
+        'ids': ids,
+        'eventos': len(ordinales),
+        'segundos': time.perf_counter() - inicio,
+        'resultados': resultados
+    }
+
+def guardar_resultados(reproduccion: Dict[str, Any], directorio: str) -> Path:
+    """
+    Escribe métricas (resumen.json) y trayectorias (<estrategia>.npz).
+
+    Returns:
+        Ruta de resumen.json
+    """
+    destino = Path(directorio)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    for nombre, resultado in reproduccion['resultados'].items():
+        np.savez_compressed(
+            destino / f"{nombre}.npz",
+            trayectoria=resultado['trayectoria'],
+            eventos_muestra=np.array(resultado['eventos_muestra']),
+            ids=np.array(reproduccion['ids'])
+        )
+
+    resumen = destino / 'resumen.json'
+    with open(resumen, 'w', encoding='utf-8') as f:
+        json.dump({
+            'eventos': reproduccion['eventos'],
+            'conceptos': len(reproduccion['ids']),
+            'segundos': reproduccion['segundos'],
+            'metricas': {n: r['metricas'] for n, r in reproduccion['resultados'].items()}
+        }, f, indent=2, ensure_ascii=False)
+
+    return resumen
@@ -0,0 +1,207 @@
+"""
+Tabla de Grounding - Estado de grounding de todo el vocabulario en arrays.
+
+El grounding vive como atributo de cada ConceptoAnclado y los ajustes se
+calculaban de a un concepto, armando un dict de contexto por uso. La
+tabla guarda el grounding y los contadores de uso (éxitos, fallos,
+usos) en arrays NumPy paralelos indexados por el ordinal del concepto,
+así un ciclo de aprendizaje ajusta todo el vocabulario en una pasada
+(ver EstrategiaAprendizaje.calcular_ajuste_lote).
+
+Los ConceptoAnclado siguen siendo la fuente que lee el resto del
+sistema: la tabla se refresca desde ellos al empezar un ciclo y solo
+escribe de vuelta los conceptos que cambiaron.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+_COLUMNAS = (
+    ('grounding', np.float64),
+    ('exitos', np.int64),
+    ('fallos', np.int64),
+    ('usos', np.int64)
+)
+
+def contexto_usos(exitos: np.ndarray, fallos: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Contexto de ajuste por lotes a partir de éxitos y fallos por concepto.
+
+    Returns:
+        Dict con arrays 'usos', 'usos_exitosos', 'usos_fallidos' y
+        'tasa_exito' (1.0 para conceptos sin usos)
+    """
+    usos = exitos + fallos
+    tasa_exito = np.ones(len(usos), dtype=np.float64)
+    np.divide(exitos, usos, out=tasa_exito, where=usos > 0)
+    return {
+        'usos': usos,
+        'usos_exitosos': exitos,
+        'usos_fallidos': fallos,
+        'tasa_exito': tasa_exito
+    }
+
+class TablaGrounding:
+    """
+    Grounding y contadores de uso por concepto, en arrays paralelos.
+
+    - grounding: float64, confianza_grounding de cada concepto
+    - exitos / fallos / usos: int64, acumulados desde el último ciclo
+    """
+
+    def __init__(self, conceptos: Iterable[Any]):
+        """
+        Args:
+            conceptos: ConceptoAnclado del vocabulario (el orden fija el ordinal)
+        """
+        self.conceptos: List[Any] = []
+        self.ids: List[str] = []
+        self._indice: Dict[str, int] = {}
+
+        for concepto in conceptos:
+            # Con IDs repetidos gana el primero (como buscar_por_id)
+            if concepto.id in self._indice:
+                continue
+            self._indice[concepto.id] = len(self.ids)
+            self.ids.append(concepto.id)
+            self.conceptos.append(concepto)
+
+        # Los arrays públicos son vistas [:n] de buffers con capacidad de
+        # sobra, que se duplican al llenarse (agregar es O(1) amortizado)
+        self._reservar(len(self.ids))
+        self._vistas(len(self.ids))
+        self.grounding[:] = np.fromiter(
+            (c.confianza_grounding for c in self.conceptos), dtype=np.float64, count=len(self.ids)
+        )
+
+    @classmethod
+    def desde_vocabulario(cls, gestor_vocabulario) -> 'TablaGrounding':
+        """Crea la tabla con todos los conceptos de un GestorVocabulario."""
+        return cls(gestor_vocabulario.obtener_todos())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, concepto_id: str) -> bool:
+        return concepto_id in self._indice
+
+    def indice(self, concepto_id: str) -> Optional[int]:
+        """Ordinal de un concepto (None si no está en la tabla)."""
+        return self._indice.get(concepto_id)
+
+    def agregar(self, concepto: Any) -> int:
+        """
+        Agrega un concepto nuevo al final de la tabla.
+
+        Returns:
+            Ordinal del concepto (el existente si ya estaba)
+        """
+        if concepto.id in self._indice:
+            return self._indice[concepto.id]
+
+        indice = len(self.ids)
+        self._indice[concepto.id] = indice
+        self.ids.append(concepto.id)
+        self.conceptos.append(concepto)
+
+        if indice == len(self._buffer_grounding):
+            self._reservar(2 * indice)
+        self._vistas(indice + 1)
+        self.grounding[indice] = concepto.confianza_grounding
+        return indice
+
+    def registrar_uso(self, concepto_id: str, exitoso: bool) -> bool:
+        """
+        Cuenta un uso de un concepto (O(1)).
+
+        Returns:
+            False si el concepto no está en la tabla
+        """
+        indice = self._indice.get(concepto_id)
+        if indice is None:
+            return False
+
+        self.usos[indice] += 1
+        if exitoso:
+            self.exitos[indice] += 1
+        else:
+            self.fallos[indice] += 1
+        return True
+
+    def registrar_usos_lote(self, indices: np.ndarray, exitosos: np.ndarray):
+        """
+        Cuenta muchos usos a la vez (ordinales repetidos se suman).
+
+        Args:
+            indices: Ordinales de los conceptos usados
+            exitosos: Array booleano paralelo a indices
+        """
+        np.add.at(self.usos, indices, 1)
+        np.add.at(self.exitos, indices[exitosos], 1)
+        np.add.at(self.fallos, indices[~exitosos], 1)
+
+    def contexto_lote(self) -> Dict[str, np.ndarray]:
+        """
+        Contexto de ajuste de todos los conceptos (forma por lotes).
+
+        Returns:
+            Dict con arrays 'usos', 'usos_exitosos', 'usos_fallidos' y
+            'tasa_exito' (1.0 para conceptos sin usos)
+        """
+        return contexto_usos(self.exitos, self.fallos)
+
+    def refrescar(self, indices: Optional[np.ndarray] = None):
+        """
+        Relee el grounding de los conceptos (por si se ajustaron de a uno).
+
+        Args:
+            indices: Ordinales a releer (None = todos)
+        """
+        if indices is None:
+            self.grounding[:] = np.fromiter(
+                (c.confianza_grounding for c in self.conceptos),
+                dtype=np.float64, count=len(self.conceptos)
+            )
+            return
+
+        for indice in indices.tolist():
+            self.grounding[indice] = self.conceptos[indice].confianza_grounding
+
+    def aplicar(self, nuevos: np.ndarray) -> np.ndarray:
+        """
+        Aplica groundings nuevos (NaN = sin cambio) a la tabla y a los conceptos.
+
+        Args:
+            nuevos: Array del tamaño de la tabla
+
+        Returns:
+            Ordinales de los conceptos que cambiaron
+        """
+        cambiados = np.flatnonzero(~np.isnan(nuevos))
+        self.grounding[cambiados] = nuevos[cambiados]
+        for indice in cambiados.tolist():
+            self.conceptos[indice].confianza_grounding = float(self.grounding[indice])
+        return cambiados
+
+    def reiniciar_contadores(self):
+        """Pone en cero los contadores de uso (al cerrar un ciclo)."""
+        self.exitos.fill(0)
+        self.fallos.fill(0)
+        self.usos.fill(0)
+
+    def conceptos_con_uso(self) -> int:
+        """Conceptos usados desde el último ciclo."""
+        return int(np.count_nonzero(self.usos))
+
+    def _reservar(self, capacidad: int):
+        """Copia los datos a buffers nuevos de esta capacidad (el resto en cero)."""
+        for nombre, dtype in _COLUMNAS:
+            buffer = np.zeros(max(capacidad, 16), dtype=dtype)
+            actual = getattr(self, nombre, None)
+            if actual is not None:
+                buffer[:len(actual)] = actual
+            setattr(self, f'_buffer_{nombre}', buffer)
+
+    def _vistas(self, n: int):
+        """Apunta grounding/exitos/fallos/usos a los primeros n ordinales."""
+        for nombre, _ in _COLUMNAS:
+            setattr(self, nombre, getattr(self, f'_buffer_{nombre}')[:n])
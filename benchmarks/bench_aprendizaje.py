@@ -0,0 +1,365 @@
+"""
+Benchmark de Aprendizaje - Costo por concepto de estrategias, ajustador y ciclo.
+
+Mide con timeit, sobre vocabularios sintéticos de varios tamaños:
+- cada estrategia de estrategias.py y la composite por defecto, en su
+  forma por concepto (calcular_ajuste) y por lotes (calcular_ajuste_lote)
+- AjustadorGrounding: proponer y aplicar, por concepto y por lotes
+- un ejecutar_ciclo_aprendizaje completo (modo por lotes, todos los
+  conceptos con usos y algunos ajustes recomendados)
+
+Cada caso recorre todo el vocabulario; se reporta el mejor tiempo por
+llamada y por concepto. Los resultados se guardan como línea base JSON
+y se comparan contra una anterior: una regresión (más lento que la base
+más la tolerancia) termina con código 1.
+
+Uso:
+    python benchmarks/bench_aprendizaje.py
+    python benchmarks/bench_aprendizaje.py --guardar benchmarks/baselines/aprendizaje.json
+    python benchmarks/bench_aprendizaje.py --comparar benchmarks/baselines/aprendizaje.json
+    python benchmarks/bench_aprendizaje.py --casos estrategia.composite ciclo --tamanos 3000
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from aprendizaje.ajustador_grounding import AjustadorGrounding
+from aprendizaje.estrategias import (
+    EstrategiaConservadora,
+    EstrategiaExitoFallido,
+    EstrategiaInsights,
+    EstrategiaUsoFrecuente
+)
+from aprendizaje.motor_aprendizaje import MotorAprendizaje
+from aprendizaje.tabla_grounding import TablaGrounding
+from core.concepto_anclado import ConceptoAnclado
+from core.tipos import TipoConcepto
+
+TAMANOS = [300, 3_000, 30_000]
+LINEA_BASE = Path(__file__).parent / 'baselines' / 'aprendizaje.json'
+
+# Estrategias sueltas (la composite es la del ajustador por defecto)
+ESTRATEGIAS = {
+    'uso_frecuente': lambda: EstrategiaUsoFrecuente(umbral_usos=5, incremento=0.05),
+    'exito_fallido': lambda: EstrategiaExitoFallido(),
+    'insights': lambda: EstrategiaInsights(),
+    'conservadora': lambda: EstrategiaConservadora()
+}
+
+class VocabularioSintetico:
+    """Lo que MotorAprendizaje usa de GestorVocabulario."""
+
+    def __init__(self, conceptos: List[ConceptoAnclado]):
+        self._conceptos = conceptos
+        self._por_id = {c.id: c for c in conceptos}
+
+    def obtener_todos(self) -> List[ConceptoAnclado]:
+        return self._conceptos
+
+    def buscar_por_id(self, concepto_id: str) -> Optional[ConceptoAnclado]:
+        return self._por_id.get(concepto_id)
+
+class Escenario:
+    """Vocabulario de n conceptos con un contexto de uso por concepto."""
+
+    def __init__(self, n: int, semilla: int = 0):
+        rng = np.random.default_rng(semilla)
+        self.n = n
+        self.ids = [f"CONCEPTO_BENCH_{i}" for i in range(n)]
+        self.grounding = rng.uniform(0.3, 0.9, n)
+
+        usos = rng.integers(0, 20, n)
+        exitos = rng.binomial(usos, 0.7)
+        ajuste = np.where(rng.random(n) < 0.1, rng.choice([-0.05, 0.05], n), 0.0)
+        direccion = rng.choice(['aumentar', 'disminuir', ''], n)
+        confianza = rng.uniform(0.2, 1.0, n)
+
+        tasa_exito = np.ones(n)
+        np.divide(exitos, usos, out=tasa_exito, where=usos > 0)
+        self.contexto_lote = {
+            'usos': usos,
+            'usos_exitosos': exitos,
+            'usos_fallidos': usos - exitos,
+            'tasa_exito': tasa_exito,
+            'ajuste_sugerido': ajuste,
+            'direccion': direccion,
+            'confianza': confianza
+        }
+
+        # Mismos datos como dicts de escalares (camino por concepto)
+        columnas = {clave: valor.tolist() for clave, valor in self.contexto_lote.items()}
+        self.contextos = [
+            {clave: columna[i] for clave, columna in columnas.items()}
+            for i in range(n)
+        ]
+        self.grounding_lista = self.grounding.tolist()
+
+    def conceptos(self) -> List[ConceptoAnclado]:
+        """ConceptoAnclado nuevos con el grounding del escenario."""
+        return [
+            ConceptoAnclado(
+                id=concepto_id,
+                tipo=TipoConcepto.OPERACION_SISTEMA,
+                palabras_español=[concepto_id.lower()],
+                confianza_grounding=g
+            )
+            for concepto_id, g in zip(self.ids, self.grounding_lista)
+        ]
+
+# Un caso: escenario -> (stmt, setup por repetición o None)
+Caso = Callable[[Escenario], Tuple[Callable[[], Any], Optional[Callable[[], Any]]]]
+
+def _estrategia_escalar(fabrica) -> Caso:
+    def caso(e: Escenario):
+        estrategia = fabrica()
+        def correr():
+            for i in range(e.n):
+                estrategia.calcular_ajuste(e.ids[i], e.grounding_lista[i], e.contextos[i])
+        return correr, None
+    return caso
+
+def _estrategia_lote(fabrica) -> Caso:
+    def caso(e: Escenario):
+        estrategia = fabrica()
+        return lambda: estrategia.calcular_ajuste_lote(e.ids, e.grounding, e.contexto_lote), None
+    return caso
+
+def _proponer(e: Escenario):
+    ajustador = AjustadorGrounding()
+    def correr():
+        for i in range(e.n):
+            ajustador.proponer_ajuste(e.ids[i], e.grounding_lista[i], e.contextos[i])
+    return correr, None
+
+def _proponer_lote(e: Escenario):
+    ajustador = AjustadorGrounding()
+    return lambda: ajustador.proponer_ajustes_lote(e.ids, e.grounding, e.contexto_lote), None
+
+def _aplicar(e: Escenario):
+    ajustador = AjustadorGrounding()
+    conceptos = e.conceptos()
+    propuestas = [
+        {
+            'concepto_id': c.id,
+            'grounding_actual': c.confianza_grounding,
+            'grounding_propuesto': min(1.0, c.confianza_grounding + 0.01),
+            'razon': 'Benchmark'
+        }
+        for c in conceptos
+    ]
+    def correr():
+        for concepto, propuesta in zip(conceptos, propuestas):
+            ajustador.aplicar_ajuste(concepto, propuesta)
+    return correr, None
+
+def _aplicar_lote(e: Escenario):
+    ajustador = AjustadorGrounding()
+    tabla = TablaGrounding(e.conceptos())
+    nuevos = np.minimum(1.0, e.grounding + 0.01)
+    return lambda: ajustador.aplicar_ajustes_lote(tabla, nuevos, 'Benchmark'), None
+
+def _ciclo(e: Escenario):
+    conceptos = e.conceptos()
+    motor = MotorAprendizaje(aprendizaje_por_lotes=True)
+    motor.configurar_integraciones(vocabulario=VocabularioSintetico(conceptos))
+    tabla = motor._obtener_tabla()
+    indices = np.arange(e.n)
+    exitosos = np.random.default_rng(1).random(e.n) < 0.7
+    ronda = [0]
+    insights: List[Dict[str, Any]] = []
+
+    def preparar():
+        # Mismo punto de partida, usos de todo el vocabulario y
+        # recomendaciones nuevas en cada ronda
+        ronda[0] += 1
+        for concepto, g in zip(conceptos, e.grounding_lista):
+            concepto.confianza_grounding = g
+        tabla.registrar_usos_lote(indices, exitosos)
+        insights[:] = [
+            {
+                'tipo': 'AUMENTAR_GROUNDING',
+                'concepto_id': e.ids[i],
+                'razon': f"Benchmark ronda {ronda[0]}",
+                'ajuste_sugerido': 0.05,
+                'prioridad': 'ALTA'
+            }
+            for i in range(min(10, e.n))
+        ]
+
+    return lambda: motor.ejecutar_ciclo_aprendizaje(insights), preparar
+
+CASOS: Dict[str, Caso] = {}
+for _nombre, _fabrica in ESTRATEGIAS.items():
+    CASOS[f'estrategia.{_nombre}'] = _estrategia_escalar(_fabrica)
+    CASOS[f'estrategia.{_nombre}.lote'] = _estrategia_lote(_fabrica)
+CASOS['estrategia.composite'] = _estrategia_escalar(lambda: AjustadorGrounding().estrategia)
+CASOS['estrategia.composite.lote'] = _estrategia_lote(lambda: AjustadorGrounding().estrategia)
+CASOS['ajustador.proponer'] = _proponer
+CASOS['ajustador.proponer.lote'] = _proponer_lote
+CASOS['ajustador.aplicar'] = _aplicar
+CASOS['ajustador.aplicar.lote'] = _aplicar_lote
+CASOS['ciclo'] = _ciclo
+
+def medir(caso: Caso, escenario: Escenario, repeticiones: int = 5) -> Dict[str, Any]:
+    """
+    Mejor tiempo de un caso sobre un escenario.
+
+    Sin setup, timeit elige cuántas llamadas por repetición (autorange);
+    con setup, cada repetición es una llamada precedida por el setup y
+    se hacen las repeticiones que entren en ~0.2 s (mínimo `repeticiones`).
+
+    Returns:
+        Dict con 'por_llamada_us', 'por_concepto_ns', 'llamadas' y 'repeticiones'
+    """
+    correr, preparar = caso(escenario)
+
+    if preparar is None:
+        timer = timeit.Timer(correr)
+        llamadas, _ = timer.autorange()
+    else:
+        timer = timeit.Timer(correr, setup=preparar)
+        llamadas = 1
+        primera = timer.timeit(number=1)
+        repeticiones = max(repeticiones, min(100, int(0.2 / max(primera, 1e-6))))
+
+    mejor = min(timer.repeat(repeat=repeticiones, number=llamadas)) / llamadas
+    return {
+        'por_llamada_us': mejor * 1e6,
+        'por_concepto_ns': mejor * 1e9 / escenario.n,
+        'llamadas': llamadas,
+        'repeticiones': repeticiones
+    }
+
+def correr_suite(
+    casos: List[str],
+    tamanos: List[int],
+    repeticiones: int = 5,
+    al_medir: Optional[Callable[[str, int, Dict[str, Any]], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Mide los casos en cada tamaño.
+
+    Returns:
+        Línea base: metadatos del entorno y 'resultados'
+        {caso: {tamaño: medición}}
+    """
+    resultados: Dict[str, Dict[str, Any]] = {caso: {} for caso in casos}
+
+    for n in tamanos:
+        escenario = Escenario(n)
+        for caso in casos:
+            medicion = medir(CASOS[caso], escenario, repeticiones)
+            resultados[caso][str(n)] = medicion
+            if al_medir:
+                al_medir(caso, n, medicion)
+
+    return {
+        'version': 1,
+        'fecha': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'resultados': resultados
+    }
+
+def comparar(actual: Dict[str, Any], base: Dict[str, Any], tolerancia: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compara por concepto cada caso y tamaño contra la línea base.
+
+    Args:
+        actual: Resultado de correr_suite
+        base: Línea base guardada
+        tolerancia: Fracción más lenta que se acepta (0.25 = 25%)
+
+    Returns:
+        Filas con caso, tamaño, base_ns, actual_ns, razon y estado
+        ('REGRESION', 'MEJORA', 'OK' o 'NUEVO')
+    """
+    filas = []
+    for caso, por_tamano in actual['resultados'].items():
+        for tamano, medicion in por_tamano.items():
+            referencia = base.get('resultados', {}).get(caso, {}).get(tamano)
+            actual_ns = medicion['por_concepto_ns']
+
+            if referencia is None:
+                filas.append({'caso': caso, 'tamano': int(tamano), 'base_ns': None,
+                              'actual_ns': actual_ns, 'razon': None, 'estado': 'NUEVO'})
+                continue
+
+            razon = actual_ns / referencia['por_concepto_ns']
+            if razon > 1 + tolerancia:
+                estado = 'REGRESION'
+            elif razon < 1 / (1 + tolerancia):
+                estado = 'MEJORA'
+            else:
+                estado = 'OK'
+
+            filas.append({'caso': caso, 'tamano': int(tamano), 'base_ns': referencia['por_concepto_ns'],
+                          'actual_ns': actual_ns, 'razon': razon, 'estado': estado})
+    return filas
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por concepto del aprendizaje (timeit)")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS, help="Conceptos por escenario")
+    parser.add_argument('--casos', nargs='+', default=None,
+                        help="Casos o prefijos (p. ej. estrategia, ajustador.aplicar, ciclo)")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Repeticiones por medición")
+    parser.add_argument('--guardar', nargs='?', const=str(LINEA_BASE), help="Escribir línea base JSON")
+    parser.add_argument('--comparar', nargs='?', const=str(LINEA_BASE), help="Comparar con una línea base")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="Fracción más lenta aceptada")
+    args = parser.parse_args()
+
+    casos = list(CASOS)
+    if args.casos:
+        casos = [c for c in casos if any(c == p or c.startswith(p + '.') for p in args.casos)]
+        if not casos:
+            parser.error(f"Ningún caso coincide; disponibles: {', '.join(CASOS)}")
+
+    print("=" * 80)
+    print(f"BENCHMARK APRENDIZAJE - {len(casos)} casos, tamaños {args.tamanos}")
+    print("=" * 80)
+    print(f"{'caso':<32} {'conceptos':>10} {'por llamada':>14} {'por concepto':>14}")
+
+    def mostrar(caso, n, m):
+        print(f"{caso:<32} {n:>10,} {m['por_llamada_us'] / 1000:>11.3f} ms {m['por_concepto_ns']:>11.1f} ns")
+
+    actual = correr_suite(casos, args.tamanos, args.repeticiones, al_medir=mostrar)
+
+    if args.guardar:
+        destino = Path(args.guardar)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        with open(destino, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, indent=2, ensure_ascii=False)
+        print(f"\nLínea base en {destino}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        filas = comparar(actual, base, args.tolerancia)
+
+        print()
+        print(f"COMPARACIÓN con {args.comparar} (tolerancia {args.tolerancia:.0%})")
+        print(f"{'caso':<32} {'conceptos':>10} {'base ns':>10} {'actual ns':>10} {'razón':>7}  estado")
+        for fila in filas:
+            base_ns = f"{fila['base_ns']:.1f}" if fila['base_ns'] is not None else '-'
+            razon = f"{fila['razon']:.2f}" if fila['razon'] is not None else '-'
+            print(f"{fila['caso']:<32} {fila['tamano']:>10,} {base_ns:>10} "
+                  f"{fila['actual_ns']:>10.1f} {razon:>7}  {fila['estado']}")
+
+        regresiones = [f for f in filas if f['estado'] == 'REGRESION']
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones")
+            sys.exit(1)
+        print("\nSin regresiones")
+    print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark de Bucles - Costo de CPU por hora simulada.
+
+Usa un RelojVirtual para recorrer horas de tráfico en segundos: en cada
+segundo simulado se registran los eventos que tocan según la tasa y se
+avanza el planificador. Mide cuánto CPU gastan los bucles (procesar())
+y cuánto el registro de eventos, para dimensionar intervalos y
+disparadores.
+
+Uso:
+    python benchmarks/bench_bucles.py --horas 1 --tasas 0.1 1 10 50
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bucles import GestorBucles, RelojVirtual
+
+CONCEPTOS = [f"CONCEPTO_{i}" for i in range(40)]
+TIPOS = ['AFIRMATIVA', 'NEGATIVA', 'SALUDO', 'NO_ENTENDIDO']
+
+def simular(tasa: float, horas: float, semilla: int = 0) -> dict:
+    """
+    Simula `horas` de tráfico a `tasa` eventos por segundo.
+
+    Returns:
+        Dict con ejecuciones y milisegundos de CPU por hora simulada
+    """
+    rng = random.Random(semilla)
+    gestor = GestorBucles(reloj=RelojVirtual())
+    gestor.iniciar_todos()
+
+    segundos = int(horas * 3600)
+    acumulado = 0.0
+    cpu_eventos = 0.0
+    cpu_inicio = time.process_time()
+
+    for _ in range(segundos):
+        acumulado += tasa
+        eventos = int(acumulado)
+        acumulado -= eventos
+
+        inicio = time.process_time()
+        for _ in range(eventos):
+            gestor.registrar_concepto_usado(rng.choice(CONCEPTOS))
+            gestor.registrar_decision({
+                'tipo': rng.choice(TIPOS),
+                'puede_ejecutar': rng.random() < 0.6,
+                'certeza': rng.random()
+            })
+        cpu_eventos += time.process_time() - inicio
+
+        gestor.planificador.avanzar(1)
+
+    cpu_total = time.process_time() - cpu_inicio
+    gestor.detener_todos()
+
+    rendimiento = gestor.obtener_rendimiento()
+    ms_bucles = sum(r['duracion_ms']['promedio'] * r['ejecuciones'] for r in rendimiento.values())
+
+    return {
+        'tasa': tasa,
+        'ejecuciones': {nombre: r['ejecuciones'] for nombre, r in rendimiento.items()},
+        'omitidas': sum(r['omitidas'] for r in rendimiento.values()),
+        'disparos': sum(r['disparos'] for r in rendimiento.values()),
+        'ms_bucles_por_hora': ms_bucles / horas,
+        'ms_eventos_por_hora': cpu_eventos * 1000 / horas,
+        'ms_total_por_hora': cpu_total * 1000 / horas
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de CPU de los bucles por hora simulada")
+    parser.add_argument('--horas', type=float, default=1.0, help="Horas simuladas por tasa")
+    parser.add_argument('--tasas', type=float, nargs='+', default=[0.1, 1.0, 10.0, 50.0],
+                        help="Eventos por segundo")
+    args = parser.parse_args()
+
+    print("=" * 90)
+    print(f"BENCHMARK BUCLES - {args.horas:g} h simuladas por tasa (reloj virtual)")
+    print("=" * 90)
+    print(f"{'eventos/s':>10} {'corto':>7} {'medio':>7} {'largo':>7} {'omitidas':>9} "
+          f"{'disparos':>9} {'bucles ms/h':>12} {'eventos ms/h':>13} {'total ms/h':>11}")
+
+    for tasa in args.tasas:
+        inicio = time.perf_counter()
+        r = simular(tasa, args.horas)
+        e = r['ejecuciones']
+        print(f"{tasa:>10g} {e['corto']:>7} {e['medio']:>7} {e['largo']:>7} {r['omitidas']:>9} "
+              f"{r['disparos']:>9} {r['ms_bucles_por_hora']:>12.1f} "
+              f"{r['ms_eventos_por_hora']:>13.1f} {r['ms_total_por_hora']:>11.1f}"
+              f"   ({time.perf_counter() - inicio:.2f}s reales)")
+    print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Reproducción de Estrategias - Compara estrategias sobre usos registrados.
+
+Reproduce los usos guardados en memoria (o un archivo JSON Lines, o
+eventos sintéticos) bajo varias estrategias, cada una en su proceso, e
+imprime las métricas. Con --salida guarda resumen.json y la trayectoria
+de cada estrategia (.npz).
+
+Uso:
+    python benchmarks/reproducir_estrategias.py --memoria memoria_bell
+    python benchmarks/reproducir_estrategias.py --jsonl usos.jsonl --salida reproduccion/
+    python benchmarks/reproducir_estrategias.py --sinteticos 2000000 --conceptos 300
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aprendizaje.estrategias import (
+    EstrategiaComposite,
+    EstrategiaExitoFallido,
+    EstrategiaInsights,
+    EstrategiaUsoFrecuente
+)
+from aprendizaje.reproductor import (
+    eventos_desde_jsonl,
+    eventos_desde_memoria,
+    guardar_resultados,
+    reproducir
+)
+
+# Candidatas (nombre -> fábrica)
+ESTRATEGIAS = {
+    'por_defecto': lambda: EstrategiaComposite([
+        EstrategiaInsights(),
+        EstrategiaUsoFrecuente(umbral_usos=5, incremento=0.05),
+        EstrategiaExitoFallido()
+    ]),
+    'exito_fallido': lambda: EstrategiaExitoFallido(),
+    'exito_fallido_suave': lambda: EstrategiaExitoFallido(incremento_exito=0.015, decremento_fallo=0.025),
+    'exito_fallido_severo': lambda: EstrategiaExitoFallido(incremento_exito=0.02, decremento_fallo=0.08),
+    'uso_frecuente': lambda: EstrategiaUsoFrecuente(umbral_usos=5, incremento=0.05)
+}
+
+def eventos_sinteticos(n: int, conceptos: int, semilla: int = 0):
+    """Usos con popularidad Zipf y tasa de éxito propia por concepto."""
+    rng = random.Random(semilla)
+    ids = [f"CONCEPTO_{i}" for i in range(conceptos)]
+    pesos = [1 / (i + 1) for i in range(conceptos)]
+    tasas = [rng.uniform(0.2, 0.95) for _ in range(conceptos)]
+    for i in rng.choices(range(conceptos), weights=pesos, k=n):
+        yield ids[i], rng.random() < tasas[i]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara estrategias de aprendizaje reproduciendo usos")
+    origen = parser.add_mutually_exclusive_group()
+    origen.add_argument('--memoria', default='memoria_bell', help="Directorio de memoria persistente")
+    origen.add_argument('--jsonl', help="Archivo JSON Lines con eventos o decisiones")
+    origen.add_argument('--sinteticos', type=int, help="Generar N eventos sintéticos")
+    parser.add_argument('--conceptos', type=int, default=300, help="Conceptos para eventos sintéticos")
+    parser.add_argument('--estrategias', nargs='+', default=list(ESTRATEGIAS), choices=list(ESTRATEGIAS))
+    parser.add_argument('--lote', type=int, default=256, help="Eventos por micro-lote")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos (0 = sin pool)")
+    parser.add_argument('--salida', help="Directorio para resumen.json y trayectorias")
+    args = parser.parse_args()
+
+    if args.sinteticos:
+        eventos = eventos_sinteticos(args.sinteticos, args.conceptos)
+    elif args.jsonl:
+        eventos = eventos_desde_jsonl(args.jsonl)
+    else:
+        eventos = eventos_desde_memoria(args.memoria)
+
+    # Grounding inicial del vocabulario si está disponible
+    try:
+        from vocabulario.gestor_vocabulario import GestorVocabulario
+        inicial = {c.id: c.confianza_grounding for c in GestorVocabulario().obtener_todos()}
+    except Exception:
+        inicial = {}
+
+    reproduccion = reproducir(
+        {nombre: ESTRATEGIAS[nombre]() for nombre in args.estrategias},
+        eventos,
+        grounding_inicial=inicial,
+        procesos=args.procesos,
+        tamano_lote=args.lote
+    )
+
+    print("=" * 100)
+    print(f"REPRODUCCIÓN - {reproduccion['eventos']:,} eventos, {len(reproduccion['ids'])} conceptos, "
+          f"{reproduccion['segundos']:.2f}s")
+    print("=" * 100)
+    print(f"{'estrategia':<22} {'ajustes':>9} {'cambio':>8} {'g inicial':>10} {'g final':>8} "
+          f"{'deriva':>7} {'mínimo':>7} {'máximo':>7} {'segundos':>9}")
+    for nombre, resultado in reproduccion['resultados'].items():
+        m = resultado['metricas']
+        print(f"{nombre:<22} {m['ajustes']:>9} {m['cambio_promedio']:>8.4f} "
+              f"{m['grounding_promedio_inicial']:>10.3f} {m['grounding_promedio_final']:>8.3f} "
+              f"{m['deriva_promedio']:>7.3f} {m['en_minimo']:>7} {m['en_maximo']:>7} {m['segundos']:>9.2f}")
+
+    if args.salida:
+        print(f"\nResultados en {guardar_resultados(reproduccion, args.salida)}")
+    print()
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,15 @@ Componentes:
 - BucleMedio (120s): Detección de patrones conversacionales
 - BucleLargo (600s): Consolidación de aprendizaje
 - GestorBucles: Coordinación de todos los bucles
+- Planificador: Thread único que ejecuta los bucles
+- PlanificadorAsincrono: Los bucles como tareas de un event loop
+- RelojSistema / RelojVirtual: Tiempo real o simulado (tests, benchmarks)
+- Disparador: Ejecución por eventos o umbral, además del intervalo
 """
+from bucles.planificador import Planificador
+from bucles.planificador_asincrono import PlanificadorAsincrono
+from bucles.reloj import RelojSistema, RelojVirtual
+from bucles.disparador import Disparador
 from bucles.base_bucle import BaseBucle
 from bucles.bucle_corto import BucleCorto
 from bucles.bucle_medio import BucleMedio
@@ -22,5 +30,10 @@ __all__ = [
     'BucleCorto',
     'BucleMedio',
     'BucleLargo',
-    'GestorBucles'
+    'GestorBucles',
+    'Planificador',
+    'PlanificadorAsincrono',
+    'RelojSistema',
+    'RelojVirtual',
+    'Disparador'
 ]
\ No newline at end of file
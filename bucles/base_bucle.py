@@ -3,12 +3,25 @@ Bucle Base - Clase abstracta para bucles autónomos.
 
 Los bucles autónomos permiten que Bell "piense" en segundo plano,
 revisando sus propias operaciones, patrones y aprendizajes.
+
+Los bucles no tienen thread propio: los ejecuta un Planificador. Un
+bucle suelto usa uno privado; GestorBucles comparte uno entre todos
+(o un PlanificadorAsincrono si se aloja en un event loop).
+
+Con un Disparador configurado, notificar_evento() adelanta la ejecución
+al llegar a N eventos o a un umbral, y el intervalo pasa a ser un máximo.
 """
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import time
 import threading
+import time
+from bucles.planificador import Planificador
+from bucles.planificador_asincrono import PlanificadorAsincrono
+from bucles.reloj import RELOJ_SISTEMA, RelojSistema, RelojVirtual
+from bucles.disparador import Disparador
+from bucles.metricas_bucle import MetricasBucle
+from bucles.buffer_circular import BufferCircular
 
 class BaseBucle(ABC):
     """
@@ -21,6 +34,9 @@ class BaseBucle(ABC):
     - Control de inicio/parada
     """
     
+    # En un event loop, procesar() pesado corre en un executor
+    pesado = False
+    
     def __init__(self, nombre: str, intervalo_segundos: int):
         """
         Inicializa bucle.
@@ -32,27 +48,95 @@ class BaseBucle(ABC):
         self.nombre = nombre
         self.intervalo_segundos = intervalo_segundos
         
+        # Fuente de tiempo (la del planificador al compartirlo)
+        self.reloj: RelojSistema | RelojVirtual = RELOJ_SISTEMA
+        
         # Estado del bucle
         self._activo = False
-        self._thread: Optional[threading.Thread] = None
-        self._detener = False
+        self._planificador: Optional[Planificador | PlanificadorAsincrono] = None
+        self._planificador_propio = False
         
         # Estadísticas
         self.estadisticas = {
             'ejecuciones': 0,
             'ultima_ejecucion': None,
-            'tiempo_total_ms': 0,
+            'tiempo_total_ms': 0.0,
             'errores': 0,
-            'ultima_duracion_ms': 0
+            'ultima_duracion_ms': 0.0,
+            'disparos': 0,
+            'omitidas': 0
         }
         
+        # Disparo por eventos (None = solo intervalo)
+        self.disparador: Optional[Disparador] = None
+        self._eventos_pendientes = 0
+        self._peso_pendiente = 0.0
+        self._disparo_solicitado = False
+        self._lock_eventos = threading.Lock()
+        
+        # Salud: retraso, sobrecarga, jitter, tasa de error
+        self.metricas = MetricasBucle()
+        
         # Historial de resultados (últimas N ejecuciones)
-        self.historial: List[Dict[str, Any]] = []
-        self.max_historial = 10
+        self.historial = BufferCircular(capacidad=10)
     
-    def iniciar(self) -> bool:
+    def usar_planificador(self, planificador: 'Planificador | PlanificadorAsincrono'):
         """
-        Inicia el bucle en un thread separado.
+        Hace que el bucle se ejecute en un planificador compartido.
+        
+        Debe llamarse con el bucle detenido. El bucle adopta el reloj
+        del planificador.
+        """
+        self._planificador = planificador
+        self._planificador_propio = False
+        self.usar_reloj(planificador.reloj)
+    
+    def usar_reloj(self, reloj: 'RelojSistema | RelojVirtual'):
+        """
+        Cambia la fuente de tiempo del bucle.
+        
+        Las subclases con ventanas de tiempo la propagan a ellas.
+        """
+        self.reloj = reloj
+    
+    def configurar_disparador(self, disparador: Optional[Disparador]):
+        """
+        Configura (o quita, con None) el disparo por eventos.
+        
+        Si el disparador trae intervalo_maximo, reemplaza al intervalo.
+        """
+        self.disparador = disparador
+        if disparador is not None and disparador.intervalo_maximo is not None:
+            self.intervalo_segundos = disparador.intervalo_maximo
+    
+    def notificar_evento(self, peso: float = 1.0):
+        """
+        Registra un evento nuevo para el disparador (O(1)).
+        
+        Lo llama el thread de peticiones; si se cumple el disparador,
+        pide al planificador adelantar la ejecución (una sola vez hasta
+        que el bucle corra).
+        """
+        with self._lock_eventos:
+            self._eventos_pendientes += 1
+            self._peso_pendiente += peso
+            
+            disparador = self.disparador
+            if disparador is None or self._disparo_solicitado or not self._activo:
+                return
+            if not disparador.se_cumple(self._eventos_pendientes, self._peso_pendiente):
+                return
+            self._disparo_solicitado = True
+        
+        if self._planificador.adelantar(self):
+            self.estadisticas['disparos'] += 1
+    
+    def iniciar(self, retraso: float = 0.0) -> bool:
+        """
+        Inicia el bucle (primera ejecución inmediata).
+        
+        Args:
+            retraso: Segundos hasta la primera ejecución
         
         Returns:
             True si se inició correctamente
@@ -60,16 +144,18 @@ class BaseBucle(ABC):
         if self._activo:
             return False
         
+        if self._planificador is None:
+            self._planificador = Planificador(self.reloj)
+            self._planificador_propio = True
+        
         self._activo = True
-        self._detener = False
-        self._thread = threading.Thread(target=self._ejecutar_loop, daemon=True)
-        self._thread.start()
+        self._planificador.agregar(self, retraso)
         
         return True
     
     def detener(self) -> bool:
         """
-        Detiene el bucle.
+        Detiene el bucle (inmediato: no hay sleeps que esperar).
         
         Returns:
             True si se detuvo correctamente
@@ -77,59 +163,90 @@ class BaseBucle(ABC):
         if not self._activo:
             return False
         
-        self._detener = True
         self._activo = False
         
-        # Esperar a que termine el thread (timeout corto porque sleep es interrumpible)
-        if self._thread:
-            self._thread.join(timeout=3)  # Máximo 3 segundos
+        if self._planificador_propio:
+            self._planificador.detener()
+        else:
+            self._planificador.quitar(self)
         
         return True
     
-    def _ejecutar_loop(self):
-        """Loop principal del bucle (corre en thread separado)."""
-        while not self._detener:
-            try:
-                # Ejecutar procesamiento
-                inicio = time.time()
-                resultado = self.procesar()
-                duracion_ms = int((time.time() - inicio) * 1000)
-                
-                # Actualizar estadísticas
-                self.estadisticas['ejecuciones'] += 1
-                self.estadisticas['ultima_ejecucion'] = datetime.now().isoformat()
-                self.estadisticas['tiempo_total_ms'] += duracion_ms
-                self.estadisticas['ultima_duracion_ms'] = duracion_ms
-                
-                # Guardar en historial
-                self._agregar_a_historial({
-                    'timestamp': datetime.now().isoformat(),
-                    'duracion_ms': duracion_ms,
-                    'resultado': resultado,
-                    'exito': True
-                })
-                
-            except Exception as e:
-                # Manejar errores sin detener el bucle
-                self.estadisticas['errores'] += 1
-                self._agregar_a_historial({
-                    'timestamp': datetime.now().isoformat(),
-                    'error': str(e),
-                    'exito': False
-                })
+    def _ejecutar_una_vez(self, momento_programado: Optional[float] = None):
+        """
+        Ejecuta procesar() y registra el resultado (lo llama el planificador).
+        
+        Args:
+            momento_programado: Cuándo debía arrancar (según self.reloj),
+                                para medir el retraso
+        """
+        if momento_programado is not None:
+            retraso_ms = max(0.0, (self.reloj.ahora() - momento_programado) * 1000)
+        else:
+            retraso_ms = None
+        
+        # Los eventos que lleguen desde aquí cuentan para la próxima ejecución
+        with self._lock_eventos:
+            hubo_eventos = self._eventos_pendientes > 0
+            self._eventos_pendientes = 0
+            self._peso_pendiente = 0.0
+            self._disparo_solicitado = False
+        
+        disparador = self.disparador
+        if disparador is not None and disparador.solo_con_eventos and \
+           not hubo_eventos and self.estadisticas['ejecuciones'] > 0:
+            # Nada nuevo que analizar: el resultado sería el mismo
+            self.estadisticas['omitidas'] += 1
+            if retraso_ms is not None:
+                self.metricas.registrar_retraso(retraso_ms)
+            return
+        
+        inicio = time.perf_counter()
+        try:
+            # Ejecutar procesamiento
+            resultado = self.procesar()
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            self.metricas.registrar(duracion_ms, self.intervalo_segundos, retraso_ms)
+            
+            # Actualizar estadísticas
+            self.estadisticas['ejecuciones'] += 1
+            self.estadisticas['ultima_ejecucion'] = datetime.now().isoformat()
+            self.estadisticas['tiempo_total_ms'] += duracion_ms
+            self.estadisticas['ultima_duracion_ms'] = duracion_ms
+            
+            # Guardar en historial
+            self._agregar_a_historial({
+                'timestamp': datetime.now().isoformat(),
+                'duracion_ms': duracion_ms,
+                'resultado': resultado,
+                'exito': True
+            })
             
-            # Esperar hasta la próxima ejecución (sleep interrumpible)
-            # Dividir en sleeps de 1 segundo para poder detener rápido
-            tiempo_restante = self.intervalo_segundos
-            while tiempo_restante > 0 and not self._detener:
-                time.sleep(min(1, tiempo_restante))
-                tiempo_restante -= 1
+        except Exception as e:
+            # Manejar errores sin detener el bucle
+            self.metricas.registrar(
+                (time.perf_counter() - inicio) * 1000,
+                self.intervalo_segundos, retraso_ms, exito=False
+            )
+            self.estadisticas['errores'] += 1
+            self._agregar_a_historial({
+                'timestamp': datetime.now().isoformat(),
+                'error': str(e),
+                'exito': False
+            })
+    
+    @property
+    def max_historial(self) -> int:
+        """Ejecuciones que conserva el historial."""
+        return self.historial.capacidad
+    
+    @max_historial.setter
+    def max_historial(self, valor: int):
+        self.historial.capacidad = valor
     
     def _agregar_a_historial(self, entrada: Dict[str, Any]):
         """Agrega entrada al historial, manteniendo max_historial elementos."""
-        self.historial.append(entrada)
-        if len(self.historial) > self.max_historial:
-            self.historial.pop(0)
+        self.historial.agregar(entrada)
     
     @abstractmethod
     def procesar(self) -> Dict[str, Any]:
@@ -141,6 +258,24 @@ class BaseBucle(ABC):
         """
         pass
     
+    def exportar_estado(self) -> Dict[str, Any]:
+        """
+        Estado del bucle serializable a JSON (para arrancar en caliente).
+        
+        Por defecto no hay nada que guardar; las subclases lo extienden.
+        """
+        return {}
+    
+    def restaurar_estado(self, estado: Dict[str, Any], transcurrido: float = 0.0):
+        """
+        Restaura lo que devolvió exportar_estado().
+        
+        Args:
+            estado: Salida de exportar_estado()
+            transcurrido: Segundos desde que se exportó
+        """
+        pass
+    
     def esta_activo(self) -> bool:
         """Retorna si el bucle está activo."""
         return self._activo
@@ -167,6 +302,20 @@ class BaseBucle(ABC):
         
         return stats
     
+    def obtener_rendimiento(self) -> Dict[str, Any]:
+        """
+        Retorna la salud del bucle (retraso, sobrecarga, jitter, errores).
+        
+        Returns:
+            Dict con el resumen de MetricasBucle más nombre e intervalo
+        """
+        rendimiento = self.metricas.resumen(self.intervalo_segundos)
+        rendimiento['nombre'] = self.nombre
+        rendimiento['intervalo_segundos'] = self.intervalo_segundos
+        rendimiento['omitidas'] = self.estadisticas['omitidas']
+        rendimiento['disparos'] = self.estadisticas['disparos']
+        return rendimiento
+    
     def obtener_historial(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Retorna historial de ejecuciones.
@@ -178,8 +327,8 @@ class BaseBucle(ABC):
             Lista de resultados de ejecuciones
         """
         if n is None:
-            return self.historial.copy()
-        return self.historial[-n:] if n > 0 else []
+            return self.historial.snapshot()
+        return self.historial.ultimos(n)
     
     def __repr__(self):
         estado = "ACTIVO" if self._activo else "DETENIDO"
@@ -6,7 +6,8 @@ Propósito: Revisar qué conceptos se están usando más frecuentemente.
 """
 from typing import Dict, Any, List
 from bucles.base_bucle import BaseBucle
-from collections import Counter
+from bucles.buffer_circular import BufferCircular
+from bucles.ventana_temporal import VentanaTemporal, PuntuacionDecaida
 
 class BucleCorto(BaseBucle):
     """
@@ -16,85 +17,162 @@ class BucleCorto(BaseBucle):
     - Revisar conceptos más usados recientemente
     - Detectar patrones inmediatos de uso
     - Identificar conceptos "calientes"
+    
+    Los usos se cuentan en una ventana de TIEMPO (últimos 5 minutos) y
+    los calientes se ordenan por una puntuación con decaimiento, así el
+    resultado no depende de cuánto tráfico haya. Ambas estructuras se
+    actualizan en cada registro (la puntuación queda ordenada), así que
+    los calientes se responden al momento sin recontar.
     """
     
-    def __init__(self):
+    def __init__(self, ventana_segundos: float = 300, vida_media_segundos: float = 120):
+        """
+        Args:
+            ventana_segundos: Tiempo que cubre la ventana de usos
+            vida_media_segundos: Vida media de la puntuación de cada concepto
+        """
         super().__init__(nombre="BucleCorto", intervalo_segundos=60)
         
-        # Datos compartidos con el sistema
-        self.conceptos_recientes: List[str] = []
-        self.max_conceptos_recientes = 50
+        # Datos compartidos con el sistema (escribe el thread de peticiones)
+        # Últimos usos, en orden (muestra acotada para inspección)
+        self.conceptos_recientes = BufferCircular(capacidad=50)
+        
+        # Usos por concepto en los últimos `ventana_segundos`
+        self.ventana_usos = VentanaTemporal(ventana_segundos, ancho_bucket=10)
+        
+        # Recencia: cada uso suma 1 y la puntuación cae a la mitad cada vida media
+        self.puntuaciones = PuntuacionDecaida(vida_media_segundos)
         
         # Análisis
         self.conceptos_calientes: List[Dict[str, Any]] = []
         self.umbral_caliente = 3  # Usado 3+ veces en ventana
     
+    @property
+    def max_conceptos_recientes(self) -> int:
+        """Tamaño de la muestra de conceptos recientes."""
+        return self.conceptos_recientes.capacidad
+    
+    @max_conceptos_recientes.setter
+    def max_conceptos_recientes(self, valor: int):
+        self.conceptos_recientes.capacidad = valor
+    
+    def usar_reloj(self, reloj):
+        """Cambia la fuente de tiempo del bucle y de sus ventanas."""
+        super().usar_reloj(reloj)
+        self.ventana_usos.usar_reloj(reloj)
+        self.puntuaciones.usar_reloj(reloj)
+    
     def registrar_concepto_usado(self, concepto_id: str):
         """
-        Registra que un concepto fue usado.
+        Registra que un concepto fue usado (O(1)).
         
         Args:
             concepto_id: ID del concepto usado
         """
-        self.conceptos_recientes.append(concepto_id)
-        
-        # Mantener ventana de conceptos recientes
-        if len(self.conceptos_recientes) > self.max_conceptos_recientes:
-            self.conceptos_recientes.pop(0)
+        self.conceptos_recientes.agregar(concepto_id)
+        self.ventana_usos.agregar(concepto_id)
+        self.puntuaciones.registrar(concepto_id)
     
     def procesar(self) -> Dict[str, Any]:
         """
         Analiza conceptos usados recientemente.
         
+        Los conteos ya están al día; aquí se leen y se compactan las
+        estructuras (buckets vencidos, puntuaciones casi en cero).
+        
         Returns:
             Dict con análisis de conceptos recientes
         """
-        if not self.conceptos_recientes:
+        self.ventana_usos.compactar()
+        self.puntuaciones.compactar()
+        
+        total = int(round(self.ventana_usos.suma()))
+        
+        if not total:
+            self.conceptos_calientes = []
             return {
                 'conceptos_analizados': 0,
                 'conceptos_calientes': [],
                 'mensaje': 'Sin conceptos para analizar'
             }
         
-        # Contar frecuencias
-        contador = Counter(self.conceptos_recientes)
-        
         # Identificar conceptos "calientes" (usados frecuentemente)
-        calientes = [
-            {
-                'concepto_id': concepto_id,
-                'usos': count,
-                'porcentaje': round((count / len(self.conceptos_recientes)) * 100, 1)
-            }
-            for concepto_id, count in contador.most_common(10)
-            if count >= self.umbral_caliente
-        ]
-        
+        calientes = self._calcular_calientes(total)
         self.conceptos_calientes = calientes
         
         # Análisis de diversidad
-        conceptos_unicos = len(contador)
-        diversidad = round((conceptos_unicos / len(self.conceptos_recientes)) * 100, 1) if self.conceptos_recientes else 0
+        conceptos_unicos = len(self.ventana_usos)
+        diversidad = round((conceptos_unicos / total) * 100, 1)
         
         return {
-            'conceptos_analizados': len(self.conceptos_recientes),
+            'conceptos_analizados': total,
             'conceptos_unicos': conceptos_unicos,
             'diversidad_porcentaje': diversidad,
             'conceptos_calientes': calientes,
             'top_3': [c['concepto_id'] for c in calientes[:3]],
-            'mensaje': f'Analizados {conceptos_unicos} conceptos únicos en {len(self.conceptos_recientes)} usos'
+            'mensaje': f'Analizados {conceptos_unicos} conceptos únicos en {total} usos'
         }
     
+    def _calcular_calientes(self, total: int) -> List[Dict[str, Any]]:
+        """
+        Top 10 de conceptos con al menos umbral_caliente usos en la ventana,
+        ordenados por puntuación (los usos recientes pesan más).
+        
+        Se recorre el orden por puntuación desde la punta y se salta a
+        los que no llegan al umbral: no se tocan todos los conceptos.
+        """
+        usos: Dict[str, int] = {}
+        
+        def admitir(concepto_id: str) -> bool:
+            count = int(round(self.ventana_usos.total(concepto_id)))
+            usos[concepto_id] = count
+            return count >= self.umbral_caliente
+        
+        return [
+            {
+                'concepto_id': concepto_id,
+                'usos': usos[concepto_id],
+                'porcentaje': round((usos[concepto_id] / total) * 100, 1),
+                'puntuacion': round(puntuacion, 3)
+            }
+            for concepto_id, puntuacion in self.puntuaciones.mayores(10, admitir)
+        ]
+    
     def obtener_conceptos_calientes(self) -> List[Dict[str, Any]]:
         """
         Retorna conceptos que se están usando frecuentemente.
         
+        Se calcula en el momento con los conteos al día (no hace falta
+        esperar a la próxima ejecución del bucle).
+        
         Returns:
             Lista de conceptos calientes con estadísticas
         """
-        return self.conceptos_calientes.copy()
+        total = int(round(self.ventana_usos.suma()))
+        if not total:
+            return []
+        return self._calcular_calientes(total)
+    
+    def exportar_estado(self) -> Dict[str, Any]:
+        """Usos recientes, ventana de tiempo y puntuaciones."""
+        return {
+            'conceptos_recientes': self.conceptos_recientes.snapshot(),
+            'ventana_usos': self.ventana_usos.exportar(),
+            'puntuaciones': self.puntuaciones.exportar()
+        }
+    
+    def restaurar_estado(self, estado: Dict[str, Any], transcurrido: float = 0.0):
+        """Restaura usos y puntuaciones, envejecidos `transcurrido` segundos."""
+        self.conceptos_recientes.clear()
+        for concepto_id in estado.get('conceptos_recientes', []):
+            self.conceptos_recientes.agregar(concepto_id)
+        self.ventana_usos.restaurar(estado.get('ventana_usos', []), transcurrido)
+        self.puntuaciones.restaurar(estado.get('puntuaciones', []), transcurrido)
+        self.conceptos_calientes = self.obtener_conceptos_calientes()
     
     def limpiar_historial(self):
         """Limpia el historial de conceptos recientes."""
         self.conceptos_recientes.clear()
+        self.ventana_usos.clear()
+        self.puntuaciones.clear()
         self.conceptos_calientes.clear()
\ No newline at end of file
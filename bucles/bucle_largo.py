@@ -3,10 +3,149 @@ Bucle Largo - Consolidación de aprendizaje.
 
 Ejecuta cada 600 segundos (10 minutos).
 Propósito: Consolidar aprendizajes, ajustar confianzas, generar insights.
+
+La consolidación es una función pura (consolidar) sobre una instantánea
+del estado de los bucles corto y medio. Con en_proceso=True se ejecuta
+en un proceso aparte, así no compite por el GIL con las peticiones; el
+resultado vuelve por la cola del ProcessPoolExecutor y se aplica al
+terminar.
+
+Cada consolidación con insights o ajustes nuevos se entrega a los
+suscriptores (ver suscribir), p. ej. el motor de aprendizaje. Los ajustes
+recomendados se recalculan en cada consolidación; a los suscriptores
+llega cada (concepto_id, tipo) a lo sumo una vez por ventana de usos,
+marcado con el número de esa ventana.
 """
-from typing import Dict, Any, List, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from bucles.base_bucle import BaseBucle
 from datetime import datetime
+import multiprocessing
+import threading
+import time
+
+def consolidar(instantanea: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Genera insights y ajustes a partir de una instantánea.
+    
+    Es pura y solo recibe/retorna datos serializables: puede correr en
+    otro proceso.
+    
+    Args:
+        instantanea: Ver BucleLargo.instantanea()
+    
+    Returns:
+        Dict con 'insights', 'ajustes', 'conceptos_analizados' y
+        'patrones_procesados'
+    """
+    conceptos_calientes = instantanea.get('conceptos_calientes', [])
+    patrones = instantanea.get('patrones', [])
+    
+    return {
+        'insights': generar_insights(
+            conceptos_calientes,
+            patrones,
+            instantanea.get('estadisticas_conversacion', {})
+        ),
+        'ajustes': generar_recomendaciones_ajuste(conceptos_calientes),
+        'conceptos_analizados': len(conceptos_calientes),
+        'patrones_procesados': len(patrones)
+    }
+
+def generar_insights(
+    conceptos_calientes: List[Dict[str, Any]],
+    patrones: List[Dict[str, Any]],
+    stats: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Genera insights a partir de los datos consolidados.
+    
+    Returns:
+        Lista de insights generados
+    """
+    insights = []
+    
+    # Insight 1: Conceptos dominantes
+    if conceptos_calientes:
+        top_concepto = conceptos_calientes[0]
+        if top_concepto['porcentaje'] > 30:
+            insights.append({
+                'tipo': 'CONCEPTO_DOMINANTE',
+                'descripcion': f"Concepto {top_concepto['concepto_id']} domina el uso ({top_concepto['porcentaje']}%)",
+                'concepto_id': top_concepto['concepto_id'],
+                'relevancia': 'ALTA',
+                'timestamp': datetime.now().isoformat()
+            })
+    
+    # Insight 2: Patrones de comportamiento
+    for patron in patrones:
+        if patron.get('confianza', 0) >= 0.8:
+            insights.append({
+                'tipo': 'PATRON_CONDUCTUAL',
+                'descripcion': patron['descripcion'],
+                'patron': patron['tipo'],
+                'relevancia': 'MEDIA',
+                'timestamp': datetime.now().isoformat()
+            })
+    
+    # Insight 3: Tasa de éxito
+    if stats.get('tasa_ejecucion_porcentaje'):
+        tasa = stats['tasa_ejecucion_porcentaje']
+        if tasa > 80:
+            relevancia = 'ALTA'
+            descripcion = f"Alta efectividad: {tasa}% de decisiones ejecutables"
+        elif tasa < 40:
+            relevancia = 'ALTA'
+            descripcion = f"Baja efectividad: solo {tasa}% ejecutable, revisar capacidades"
+        else:
+            relevancia = 'BAJA'
+            descripcion = f"Efectividad normal: {tasa}% ejecutable"
+    
+        if tasa > 80 or tasa < 40:
+            insights.append({
+                'tipo': 'EFECTIVIDAD_SISTEMA',
+                'descripcion': descripcion,
+                'tasa_ejecucion': tasa,
+                'relevancia': relevancia,
+                'timestamp': datetime.now().isoformat()
+            })
+    
+    # Insight 4: Certeza promedio
+    certeza = stats.get('certeza_promedio', 0)
+    if certeza < 0.6:
+        insights.append({
+            'tipo': 'CERTEZA_BAJA',
+            'descripcion': f"Certeza promedio baja ({certeza}), posible ambigüedad en comunicación",
+            'certeza_promedio': certeza,
+            'relevancia': 'MEDIA',
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    return insights
+
+def generar_recomendaciones_ajuste(
+    conceptos_calientes: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Genera recomendaciones de ajuste de grounding.
+    
+    Returns:
+        Lista de recomendaciones de ajuste
+    """
+    ajustes = []
+    
+    # Recomendar aumentar grounding de conceptos muy usados
+    for concepto in conceptos_calientes[:5]:  # Top 5
+        if concepto['usos'] >= 5:
+            ajustes.append({
+                'tipo': 'AUMENTAR_GROUNDING',
+                'concepto_id': concepto['concepto_id'],
+                'razon': f"Usado {concepto['usos']} veces ({concepto['porcentaje']}%)",
+                'ajuste_sugerido': +0.05,  # Aumentar 0.05
+                'prioridad': 'ALTA' if concepto['porcentaje'] > 20 else 'MEDIA'
+            })
+    
+    return ajustes
 
 class BucleLargo(BaseBucle):
     """
@@ -18,7 +157,13 @@ class BucleLargo(BaseBucle):
     - Generar insights de largo plazo
     """
     
-    def __init__(self):
+    pesado = True
+    
+    def __init__(self, en_proceso: bool = False):
+        """
+        Args:
+            en_proceso: Consolidar en un proceso aparte (ver usar_proceso)
+        """
         super().__init__(nombre="BucleLargo", intervalo_segundos=600)
         
         # Referencias a otros bucles (inyectadas)
@@ -29,8 +174,43 @@ class BucleLargo(BaseBucle):
         self.insights: List[Dict[str, Any]] = []
         self.max_insights = 20
         
-        # Recomendaciones de ajuste
+        # Recomendaciones de ajuste (la última consolidación) y, por
+        # (concepto_id, tipo), la ventana en que se entregó
         self.ajustes_recomendados: List[Dict[str, Any]] = []
+        self._ajustes_entregados: Dict[Tuple[str, str], int] = {}
+        
+        # Consolidación en otro proceso
+        self.en_proceso = en_proceso
+        self._ejecutor: Optional[ProcessPoolExecutor] = None
+        self._consolidacion: Optional[Future] = None
+        self._aplicada = threading.Event()     # Resultado ya aplicado
+        self._aplicada.set()
+        self._lock_resultados = threading.Lock()
+        
+        # Suscriptores a las consolidaciones
+        self._suscriptores: List[Callable[[Dict[str, Any]], Any]] = []
+        self.estadisticas['errores_suscriptores'] = 0
+    
+    def suscribir(self, suscriptor: Callable[[Dict[str, Any]], Any]):
+        """
+        Recibe cada consolidación con insights o ajustes nuevos.
+        
+        El suscriptor se llama en el thread que aplica la consolidación
+        (planificador o callback del proceso): debe volver enseguida.
+        
+        Args:
+            suscriptor: Función que recibe {'insights': [...], 'ajustes': [...]};
+                cada ajuste trae 'ventana' (ver _ajustes_por_entregar)
+        """
+        with self._lock_resultados:
+            if suscriptor not in self._suscriptores:
+                self._suscriptores.append(suscriptor)
+    
+    def desuscribir(self, suscriptor: Callable[[Dict[str, Any]], Any]):
+        """Deja de entregar consolidaciones a un suscriptor."""
+        with self._lock_resultados:
+            if suscriptor in self._suscriptores:
+                self._suscriptores.remove(suscriptor)
     
     def configurar_bucles(self, bucle_corto, bucle_medio):
         """
@@ -43,43 +223,215 @@ class BucleLargo(BaseBucle):
         self.bucle_corto = bucle_corto
         self.bucle_medio = bucle_medio
     
+    def usar_proceso(self, activo: bool = True):
+        """
+        Activa o desactiva la consolidación en un proceso aparte.
+        
+        El proceso se crea en la primera consolidación y se cierra al
+        desactivar o detener el bucle.
+        """
+        self.en_proceso = activo
+        if not activo:
+            self.cerrar_proceso()
+    
+    def instantanea(self) -> Dict[str, Any]:
+        """
+        Copia serializable del estado que necesita consolidar().
+        
+        Returns:
+            Dict con 'conceptos_calientes', 'patrones' y
+            'estadisticas_conversacion'
+        """
+        return {
+            'conceptos_calientes': self._obtener_conceptos_calientes(),
+            'patrones': self._obtener_patrones(),
+            'estadisticas_conversacion': self._obtener_estadisticas_conversacion()
+        }
+    
     def procesar(self) -> Dict[str, Any]:
         """
         Consolida información de bucles cortos/medios.
         
+        Con en_proceso=True solo envía la instantánea al proceso de
+        consolidación; los insights y ajustes se aplican al terminar.
+        
         Returns:
             Dict con análisis consolidado y recomendaciones
         """
-        # Obtener datos de otros bucles
-        conceptos_calientes = self._obtener_conceptos_calientes()
-        patrones = self._obtener_patrones()
-        stats_conversacion = self._obtener_estadisticas_conversacion()
+        instantanea = self.instantanea()
         
-        # Generar insights
-        insights_nuevos = self._generar_insights(
-            conceptos_calientes,
-            patrones,
-            stats_conversacion
-        )
+        if not self.en_proceso:
+            return self._aplicar_consolidacion(consolidar(instantanea))
+        
+        # No encolar otra si la anterior sigue en curso
+        if self._consolidacion is not None and not self._consolidacion.done():
+            return {
+                'en_proceso': True,
+                'enviada': False,
+                'mensaje': 'Consolidación anterior aún en curso'
+            }
         
-        # Agregar al historial de insights
-        for insight in insights_nuevos:
-            self._agregar_insight(insight)
+        if self._ejecutor is None:
+            # spawn: el hijo no hereda los threads ni locks del proceso principal
+            self._ejecutor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
         
-        # Generar recomendaciones de ajuste
-        ajustes = self._generar_recomendaciones_ajuste(conceptos_calientes)
-        self.ajustes_recomendados = ajustes
+        self._aplicada.clear()
+        self._consolidacion = self._ejecutor.submit(consolidar, instantanea)
+        self._consolidacion.add_done_callback(self._al_terminar_consolidacion)
         
+        return {
+            'en_proceso': True,
+            'enviada': True,
+            'conceptos_analizados': len(instantanea['conceptos_calientes']),
+            'patrones_procesados': len(instantanea['patrones']),
+            'mensaje': 'Consolidación enviada al proceso de consolidación'
+        }
+    
+    def esperar_consolidacion(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que la consolidación en curso (si la hay) esté aplicada.
+        
+        Returns:
+            True si no queda ninguna pendiente
+        """
+        return self._aplicada.wait(timeout)
+    
+    def cerrar_proceso(self):
+        """Cierra el proceso de consolidación (descarta lo pendiente)."""
+        ejecutor = self._ejecutor
+        self._ejecutor = None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+        self._aplicada.set()
+    
+    def detener(self) -> bool:
+        """Detiene el bucle y cierra el proceso de consolidación."""
+        detenido = super().detener()
+        self.cerrar_proceso()
+        return detenido
+    
+    def _al_terminar_consolidacion(self, consolidacion: Future):
+        """Aplica el resultado del proceso (corre en un thread del ejecutor)."""
+        try:
+            self._registrar_consolidacion(consolidacion)
+        finally:
+            self._aplicada.set()
+    
+    def _registrar_consolidacion(self, consolidacion: Future):
+        """Guarda el resultado (o el error) de una consolidación en otro proceso."""
+        if consolidacion.cancelled():
+            return
+        
+        error = consolidacion.exception()
+        if error is not None:
+            self.estadisticas['errores'] += 1
+            self._agregar_a_historial({
+                'timestamp': datetime.now().isoformat(),
+                'error': str(error),
+                'exito': False,
+                'en_proceso': True
+            })
+            return
+        
+        self._agregar_a_historial({
+            'timestamp': datetime.now().isoformat(),
+            'resultado': self._aplicar_consolidacion(consolidacion.result()),
+            'exito': True,
+            'en_proceso': True
+        })
+    
+    def _aplicar_consolidacion(self, consolidacion: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Guarda insights y ajustes de una consolidación.
+        
+        Returns:
+            Dict con análisis consolidado y recomendaciones
+        """
+        insights_nuevos = consolidacion['insights']
+        ajustes = consolidacion['ajustes']
+        
+        with self._lock_resultados:
+            # Agregar al historial de insights
+            for insight in insights_nuevos:
+                self._agregar_insight(insight)
+            
+            self.ajustes_recomendados = ajustes
+            ajustes_nuevos = self._ajustes_por_entregar(ajustes)
+            insights_totales = len(self.insights)
+            suscriptores = list(self._suscriptores)
+        
+        if insights_nuevos or ajustes_nuevos:
+            self._notificar_suscriptores(suscriptores, {
+                'insights': insights_nuevos,
+                'ajustes': ajustes_nuevos
+            })
+        
+        conceptos = consolidacion['conceptos_analizados']
         return {
             'insights_generados': len(insights_nuevos),
-            'insights_totales': len(self.insights),
+            'insights_totales': insights_totales,
             'ajustes_recomendados': len(ajustes),
-            'conceptos_analizados': len(conceptos_calientes),
-            'patrones_procesados': len(patrones),
+            'conceptos_analizados': conceptos,
+            'patrones_procesados': consolidacion['patrones_procesados'],
             'insights': insights_nuevos,
             'ajustes': ajustes,
-            'mensaje': f'Consolidados {len(conceptos_calientes)} conceptos, {len(insights_nuevos)} insights generados'
+            'mensaje': f'Consolidados {conceptos} conceptos, {len(insights_nuevos)} insights generados'
+        }
+    
+    def _ajustes_por_entregar(self, ajustes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Ajustes que aún no se entregaron en la ventana actual (con el lock tomado).
+        
+        La ventana es la de usos del bucle corto (o el intervalo de este
+        bucle), numerada por la hora de pared (se persiste y debe seguir
+        valiendo tras reiniciar); con un RelojVirtual, por el reloj simulado.
+        Un concepto que sigue caliente se vuelve a recomendar recién con
+        usos de la ventana siguiente.
+        
+        Returns:
+            Copias de los ajustes nuevos, con su 'ventana'
+        """
+        duracion = self.intervalo_segundos
+        if self.bucle_corto is not None:
+            duracion = self.bucle_corto.ventana_usos.duracion_segundos
+        instante = time.time() if self.reloj.tiempo_real else self.reloj.ahora()
+        ventana = int(instante // duracion)
+        
+        # Lo entregado en ventanas anteriores ya no bloquea
+        self._ajustes_entregados = {
+            clave: entregado for clave, entregado in self._ajustes_entregados.items()
+            if entregado == ventana
         }
+        
+        nuevos = []
+        for ajuste in ajustes:
+            clave = (ajuste['concepto_id'], ajuste['tipo'])
+            if clave not in self._ajustes_entregados:
+                self._ajustes_entregados[clave] = ventana
+                nuevos.append(dict(ajuste, ventana=ventana))
+        return nuevos
+    
+    def _notificar_suscriptores(self, suscriptores: List[Callable], consolidacion: Dict[str, Any]):
+        """
+        Entrega una consolidación.
+        
+        Un suscriptor que falla no afecta al bucle ni al resto: el error se
+        cuenta en estadisticas['errores_suscriptores'] y queda en el historial.
+        """
+        for suscriptor in suscriptores:
+            try:
+                suscriptor(consolidacion)
+            except Exception as e:
+                self.estadisticas['errores_suscriptores'] += 1
+                self._agregar_a_historial({
+                    'timestamp': datetime.now().isoformat(),
+                    'error': str(e),
+                    'exito': False,
+                    'suscriptor': getattr(suscriptor, '__name__', repr(suscriptor))
+                })
     
     def _obtener_conceptos_calientes(self) -> List[Dict[str, Any]]:
         """Obtiene conceptos calientes del bucle corto."""
@@ -99,103 +451,6 @@ class BucleLargo(BaseBucle):
             return self.bucle_medio.obtener_estadisticas_conversacion()
         return {}
     
-    def _generar_insights(
-        self,
-        conceptos_calientes: List[Dict[str, Any]],
-        patrones: List[Dict[str, Any]],
-        stats: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """
-        Genera insights a partir de los datos consolidados.
-        
-        Returns:
-            Lista de insights generados
-        """
-        insights = []
-        
-        # Insight 1: Conceptos dominantes
-        if conceptos_calientes:
-            top_concepto = conceptos_calientes[0]
-            if top_concepto['porcentaje'] > 30:
-                insights.append({
-                    'tipo': 'CONCEPTO_DOMINANTE',
-                    'descripcion': f"Concepto {top_concepto['concepto_id']} domina el uso ({top_concepto['porcentaje']}%)",
-                    'concepto_id': top_concepto['concepto_id'],
-                    'relevancia': 'ALTA',
-                    'timestamp': datetime.now().isoformat()
-                })
-        
-        # Insight 2: Patrones de comportamiento
-        for patron in patrones:
-            if patron.get('confianza', 0) >= 0.8:
-                insights.append({
-                    'tipo': 'PATRON_CONDUCTUAL',
-                    'descripcion': patron['descripcion'],
-                    'patron': patron['tipo'],
-                    'relevancia': 'MEDIA',
-                    'timestamp': datetime.now().isoformat()
-                })
-        
-        # Insight 3: Tasa de éxito
-        if stats.get('tasa_ejecucion_porcentaje'):
-            tasa = stats['tasa_ejecucion_porcentaje']
-            if tasa > 80:
-                relevancia = 'ALTA'
-                descripcion = f"Alta efectividad: {tasa}% de decisiones ejecutables"
-            elif tasa < 40:
-                relevancia = 'ALTA'
-                descripcion = f"Baja efectividad: solo {tasa}% ejecutable, revisar capacidades"
-            else:
-                relevancia = 'BAJA'
-                descripcion = f"Efectividad normal: {tasa}% ejecutable"
-            
-            if tasa > 80 or tasa < 40:
-                insights.append({
-                    'tipo': 'EFECTIVIDAD_SISTEMA',
-                    'descripcion': descripcion,
-                    'tasa_ejecucion': tasa,
-                    'relevancia': relevancia,
-                    'timestamp': datetime.now().isoformat()
-                })
-        
-        # Insight 4: Certeza promedio
-        certeza = stats.get('certeza_promedio', 0)
-        if certeza < 0.6:
-            insights.append({
-                'tipo': 'CERTEZA_BAJA',
-                'descripcion': f"Certeza promedio baja ({certeza}), posible ambigüedad en comunicación",
-                'certeza_promedio': certeza,
-                'relevancia': 'MEDIA',
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        return insights
-    
-    def _generar_recomendaciones_ajuste(
-        self,
-        conceptos_calientes: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """
-        Genera recomendaciones de ajuste de grounding.
-        
-        Returns:
-            Lista de recomendaciones de ajuste
-        """
-        ajustes = []
-        
-        # Recomendar aumentar grounding de conceptos muy usados
-        for concepto in conceptos_calientes[:5]:  # Top 5
-            if concepto['usos'] >= 5:
-                ajustes.append({
-                    'tipo': 'AUMENTAR_GROUNDING',
-                    'concepto_id': concepto['concepto_id'],
-                    'razon': f"Usado {concepto['usos']} veces ({concepto['porcentaje']}%)",
-                    'ajuste_sugerido': +0.05,  # Aumentar 0.05
-                    'prioridad': 'ALTA' if concepto['porcentaje'] > 20 else 'MEDIA'
-                })
-        
-        return ajustes
-    
     def _agregar_insight(self, insight: Dict[str, Any]):
         """Agrega insight al historial."""
         self.insights.append(insight)
@@ -213,7 +468,8 @@ class BucleLargo(BaseBucle):
         Returns:
             Lista de insights
         """
-        insights = self.insights.copy()
+        with self._lock_resultados:
+            insights = self.insights.copy()
         
         # Filtrar por tipo
         if tipo:
@@ -234,7 +490,31 @@ class BucleLargo(BaseBucle):
         """
         return self.ajustes_recomendados.copy()
     
+    def exportar_estado(self) -> Dict[str, Any]:
+        """Insights y ajustes recomendados."""
+        with self._lock_resultados:
+            return {
+                'insights': list(self.insights),
+                'ajustes_recomendados': list(self.ajustes_recomendados),
+                'ajustes_entregados': [
+                    [concepto_id, tipo, ventana]
+                    for (concepto_id, tipo), ventana in self._ajustes_entregados.items()
+                ]
+            }
+    
+    def restaurar_estado(self, estado: Dict[str, Any], transcurrido: float = 0.0):
+        """Restaura insights y ajustes (siguen valiendo tras el reinicio)."""
+        with self._lock_resultados:
+            self.insights = list(estado.get('insights', []))[-self.max_insights:]
+            self.ajustes_recomendados = list(estado.get('ajustes_recomendados', []))
+            self._ajustes_entregados = {
+                (concepto_id, tipo): ventana
+                for concepto_id, tipo, ventana in estado.get('ajustes_entregados', [])
+            }
+    
     def limpiar_historial(self):
         """Limpia historial de insights y ajustes."""
-        self.insights.clear()
-        self.ajustes_recomendados.clear()
\ No newline at end of file
+        with self._lock_resultados:
+            self.insights.clear()
+            self.ajustes_recomendados = []
+            self._ajustes_entregados.clear()
\ No newline at end of file
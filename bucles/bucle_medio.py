@@ -6,6 +6,8 @@ Propósito: Detectar patrones en las conversaciones y tipos de interacción.
 """
 from typing import Dict, Any, List
 from bucles.base_bucle import BaseBucle
+from bucles.buffer_circular import BufferCircular
+from bucles.ventana_temporal import VentanaTemporal, PuntuacionDecaida
 from collections import Counter
 from datetime import datetime
 
@@ -17,19 +19,61 @@ class BucleMedio(BaseBucle):
     - Analizar tipos de decisiones tomadas
     - Detectar patrones de interacción
     - Identificar tendencias conversacionales
+    
+    Las estadísticas (tipos, tasa de ejecución, certeza) cubren una
+    ventana de TIEMPO. Los patrones de secuencia ("3 de las últimas 5
+    decisiones") usan una puntuación decaída por tipo: cuántas decisiones
+    recientes de cada tipo hubo, con las viejas pesando menos, sin
+    importar cuánto tráfico hubo en medio.
     """
     
-    def __init__(self):
+    # Patrón -> (tipos, mínimo de decisiones recientes, proporción mínima)
+    # Equivalen a las reglas por conteo: 3 de 5, 4 de 10, 2 de 5
+    PATRONES_SECUENCIA = {
+        'EXPLORACION_CAPACIDADES': (('PREGUNTA_CAPACIDAD',), 3, 0.6),
+        'COMUNICACION_PROBLEMATICA': (('NO_ENTENDIDO',), 4, 0.4),
+        'INTERACCION_SOCIAL': (('SALUDO', 'AGRADECIMIENTO'), 2, 0.4),
+    }
+    
+    def __init__(self, ventana_segundos: float = 900, vida_media_patrones: float = 60):
+        """
+        Args:
+            ventana_segundos: Tiempo que cubren las estadísticas
+            vida_media_patrones: Vida media de la puntuación por tipo de
+                decisión que usan los patrones de secuencia
+        """
         super().__init__(nombre="BucleMedio", intervalo_segundos=120)
         
-        # Datos compartidos con el sistema
-        self.decisiones_recientes: List[Dict[str, Any]] = []
-        self.max_decisiones = 30
+        # Datos compartidos con el sistema (escribe el thread de peticiones)
+        # Últimas decisiones en orden (muestra acotada para inspección)
+        self.decisiones_recientes = BufferCircular(capacidad=30)
+        
+        # Agregados por tiempo: ('tipo', X), 'total', 'ejecutables',
+        # 'certeza_suma', 'con_certeza'
+        self.ventana_decisiones = VentanaTemporal(ventana_segundos, ancho_bucket=30)
+        
+        # Decisiones recientes por tipo (con decaimiento) para los patrones
+        self.puntuaciones_tipos = PuntuacionDecaida(vida_media_patrones)
         
         # Análisis
         self.patrones_detectados: List[Dict[str, Any]] = []
         self.estadisticas_conversacion: Dict[str, Any] = {}
     
+    @property
+    def max_decisiones(self) -> int:
+        """Tamaño de la ventana de decisiones."""
+        return self.decisiones_recientes.capacidad
+    
+    @max_decisiones.setter
+    def max_decisiones(self, valor: int):
+        self.decisiones_recientes.capacidad = valor
+    
+    def usar_reloj(self, reloj):
+        """Cambia la fuente de tiempo del bucle y de su ventana."""
+        super().usar_reloj(reloj)
+        self.ventana_decisiones.usar_reloj(reloj)
+        self.puntuaciones_tipos.usar_reloj(reloj)
+    
     def registrar_decision(self, decision_info: Dict[str, Any]):
         """
         Registra una decisión tomada por Bell.
@@ -42,11 +86,20 @@ class BucleMedio(BaseBucle):
             **decision_info
         }
         
-        self.decisiones_recientes.append(entrada)
+        # La ventana descarta sola la decisión más vieja
+        self.decisiones_recientes.agregar(entrada)
         
-        # Mantener ventana de decisiones
-        if len(self.decisiones_recientes) > self.max_decisiones:
-            self.decisiones_recientes.pop(0)
+        tipo = decision_info.get('tipo', 'DESCONOCIDO')
+        self.puntuaciones_tipos.registrar(tipo)
+        
+        ventana = self.ventana_decisiones
+        ventana.agregar(('tipo', tipo))
+        ventana.agregar('total')
+        if decision_info.get('puede_ejecutar', False):
+            ventana.agregar('ejecutables')
+        if 'certeza' in decision_info:
+            ventana.agregar('certeza_suma', decision_info['certeza'])
+            ventana.agregar('con_certeza')
     
     def procesar(self) -> Dict[str, Any]:
         """
@@ -55,7 +108,13 @@ class BucleMedio(BaseBucle):
         Returns:
             Dict con análisis de patrones conversacionales
         """
-        if not self.decisiones_recientes:
+        # Copias consistentes: el thread de peticiones sigue registrando
+        self.puntuaciones_tipos.compactar()
+        recientes = self.puntuaciones_tipos.puntuaciones()
+        agregados = self.ventana_decisiones.totales()
+        total = int(round(agregados.get('total', 0)))
+        
+        if not total:
             return {
                 'decisiones_analizadas': 0,
                 'patrones': [],
@@ -63,23 +122,27 @@ class BucleMedio(BaseBucle):
             }
         
         # Análisis de tipos de decisión
-        tipos = Counter(d.get('tipo', 'DESCONOCIDO') for d in self.decisiones_recientes)
+        tipos = Counter({
+            clave[1]: int(round(valor))
+            for clave, valor in agregados.items()
+            if isinstance(clave, tuple)
+        })
         
         # Análisis de capacidad de ejecución
-        ejecutables = sum(1 for d in self.decisiones_recientes if d.get('puede_ejecutar', False))
-        tasa_ejecucion = round((ejecutables / len(self.decisiones_recientes)) * 100, 1)
+        ejecutables = int(round(agregados.get('ejecutables', 0)))
+        tasa_ejecucion = round((ejecutables / total) * 100, 1)
         
         # Análisis de certeza promedio
-        certezas = [d.get('certeza', 0.0) for d in self.decisiones_recientes if 'certeza' in d]
-        certeza_promedio = round(sum(certezas) / len(certezas), 2) if certezas else 0.0
+        con_certeza = agregados.get('con_certeza', 0)
+        certeza_promedio = round(agregados.get('certeza_suma', 0.0) / con_certeza, 2) if con_certeza else 0.0
         
         # Detectar patrones
-        patrones = self._detectar_patrones()
+        patrones = self._detectar_patrones(recientes, total, ejecutables)
         self.patrones_detectados = patrones
         
         # Estadísticas generales
         self.estadisticas_conversacion = {
-            'total_decisiones': len(self.decisiones_recientes),
+            'total_decisiones': total,
             'tipos_decision': dict(tipos.most_common()),
             'tasa_ejecucion_porcentaje': tasa_ejecucion,
             'certeza_promedio': certeza_promedio,
@@ -87,73 +150,78 @@ class BucleMedio(BaseBucle):
         }
         
         return {
-            'decisiones_analizadas': len(self.decisiones_recientes),
+            'decisiones_analizadas': total,
             'tipos_detectados': len(tipos),
             'tasa_ejecucion': tasa_ejecucion,
             'certeza_promedio': certeza_promedio,
             'patrones_detectados': len(patrones),
             'patrones': patrones,
-            'mensaje': f'Analizadas {len(self.decisiones_recientes)} decisiones, {len(patrones)} patrones detectados'
+            'mensaje': f'Analizadas {total} decisiones, {len(patrones)} patrones detectados'
         }
     
-    def _detectar_patrones(self) -> List[Dict[str, Any]]:
+    def _detectar_patrones(self, recientes: Dict[str, float],
+                           total: int, ejecutables: int) -> List[Dict[str, Any]]:
         """
         Detecta patrones en las decisiones.
         
+        Args:
+            recientes: Puntuación decaída por tipo de decisión
+            total: Decisiones en la ventana de tiempo
+            ejecutables: Decisiones ejecutables en la ventana de tiempo
+        
         Returns:
             Lista de patrones detectados
         """
         patrones = []
         
-        if len(self.decisiones_recientes) < 3:
+        total_reciente = sum(recientes.values())
+        if round(total_reciente) < 3:
             return patrones
         
+        def frecuencia(patron: str) -> int:
+            """Decisiones recientes del patrón (0 si no llega a los umbrales)."""
+            tipos, minimo, proporcion = self.PATRONES_SECUENCIA[patron]
+            valor = sum(recientes.get(tipo, 0.0) for tipo in tipos)
+            if round(valor) >= minimo and valor >= proporcion * total_reciente:
+                return int(round(valor))
+            return 0
+        
         # Patrón 1: Secuencia de preguntas sobre capacidades
-        preguntas_capacidad = [
-            d for d in self.decisiones_recientes[-5:]
-            if d.get('tipo') == 'PREGUNTA_CAPACIDAD'
-        ]
-        if len(preguntas_capacidad) >= 3:
+        preguntas_capacidad = frecuencia('EXPLORACION_CAPACIDADES')
+        if preguntas_capacidad:
             patrones.append({
                 'tipo': 'EXPLORACION_CAPACIDADES',
                 'descripcion': 'Usuario explorando capacidades de Bell',
-                'frecuencia': len(preguntas_capacidad),
+                'frecuencia': preguntas_capacidad,
                 'confianza': 0.8
             })
         
         # Patrón 2: Muchas decisiones no entendidas
-        no_entendidas = [
-            d for d in self.decisiones_recientes[-10:]
-            if d.get('tipo') == 'NO_ENTENDIDO'
-        ]
-        if len(no_entendidas) >= 4:
+        no_entendidas = frecuencia('COMUNICACION_PROBLEMATICA')
+        if no_entendidas:
             patrones.append({
                 'tipo': 'COMUNICACION_PROBLEMATICA',
                 'descripcion': 'Dificultad para entender al usuario',
-                'frecuencia': len(no_entendidas),
+                'frecuencia': no_entendidas,
                 'confianza': 0.9
             })
         
         # Patrón 3: Conversación social (saludos, agradecimientos)
-        social = [
-            d for d in self.decisiones_recientes[-5:]
-            if d.get('tipo') in ['SALUDO', 'AGRADECIMIENTO']
-        ]
-        if len(social) >= 2:
+        social = frecuencia('INTERACCION_SOCIAL')
+        if social:
             patrones.append({
                 'tipo': 'INTERACCION_SOCIAL',
                 'descripcion': 'Conversación social/cortés',
-                'frecuencia': len(social),
+                'frecuencia': social,
                 'confianza': 0.7
             })
         
-        # Patrón 4: Alta tasa de ejecución
-        ejecutables = [d for d in self.decisiones_recientes if d.get('puede_ejecutar', False)]
-        if len(ejecutables) >= len(self.decisiones_recientes) * 0.7:
+        # Patrón 4: Alta tasa de ejecución (en la ventana de tiempo)
+        if ejecutables >= total * 0.7:
             patrones.append({
                 'tipo': 'USO_PRODUCTIVO',
                 'descripcion': 'Alta proporción de tareas ejecutables',
-                'frecuencia': len(ejecutables),
+                'frecuencia': ejecutables,
                 'confianza': 0.85
             })
         
@@ -177,8 +245,30 @@ class BucleMedio(BaseBucle):
         """
         return self.patrones_detectados.copy()
     
+    def exportar_estado(self) -> Dict[str, Any]:
+        """Decisiones recientes, ventana de tiempo y último análisis."""
+        return {
+            'decisiones_recientes': self.decisiones_recientes.snapshot(),
+            'ventana_decisiones': self.ventana_decisiones.exportar(),
+            'puntuaciones_tipos': self.puntuaciones_tipos.exportar(),
+            'patrones_detectados': list(self.patrones_detectados),
+            'estadisticas_conversacion': dict(self.estadisticas_conversacion)
+        }
+    
+    def restaurar_estado(self, estado: Dict[str, Any], transcurrido: float = 0.0):
+        """Restaura decisiones y análisis (la ventana envejece `transcurrido` s)."""
+        self.decisiones_recientes.clear()
+        for entrada in estado.get('decisiones_recientes', []):
+            self.decisiones_recientes.agregar(entrada)
+        self.ventana_decisiones.restaurar(estado.get('ventana_decisiones', []), transcurrido)
+        self.puntuaciones_tipos.restaurar(estado.get('puntuaciones_tipos', []), transcurrido)
+        self.patrones_detectados = list(estado.get('patrones_detectados', []))
+        self.estadisticas_conversacion = dict(estado.get('estadisticas_conversacion', {}))
+    
     def limpiar_historial(self):
         """Limpia el historial de decisiones."""
         self.decisiones_recientes.clear()
+        self.ventana_decisiones.clear()
+        self.puntuaciones_tipos.clear()
         self.patrones_detectados.clear()
         self.estadisticas_conversacion.clear()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Buffer Circular - Ventana de capacidad fija para los datos de los bucles.
+
+El thread de peticiones agrega (registrar_concepto_usado, registrar_decision)
+mientras el thread del planificador analiza. Con listas esto era un
+pop(0) O(n) por inserción y una iteración sin protección frente a
+inserciones concurrentes.
+
+Con deque(maxlen) agregar es O(1) y atómico (descarta el más viejo), y
+el lector obtiene una copia consistente con snapshot(), sin que los
+escritores tengan que tomar ningún lock.
+"""
+from collections import deque
+from typing import Any, Iterator, List
+
+class BufferCircular:
+    """
+    Ventana de los últimos N elementos.
+
+    - agregar(): O(1), sin locks (deque.append es atómico).
+    - snapshot(): copia consistente para analizar sin carreras.
+    - capacidad: se puede cambiar en caliente (conserva los más recientes).
+    """
+
+    def __init__(self, capacidad: int):
+        """
+        Args:
+            capacidad: Máximo de elementos que se conservan
+        """
+        self._datos: deque = deque(maxlen=capacidad)
+
+    @property
+    def capacidad(self) -> int:
+        """Máximo de elementos que se conservan."""
+        return self._datos.maxlen
+
+    @capacidad.setter
+    def capacidad(self, capacidad: int):
+        # Reemplazo atómico de la referencia: los escritores siguientes
+        # ya agregan al deque nuevo (uno simultáneo al cambio puede perderse,
+        # como cualquier elemento descartado de la ventana)
+        self._datos = deque(self.snapshot(), maxlen=capacidad)
+
+    def agregar(self, elemento: Any):
+        """Agrega un elemento (descarta el más viejo si está lleno)."""
+        self._datos.append(elemento)
+
+    def snapshot(self) -> List[Any]:
+        """
+        Copia consistente del contenido (del más viejo al más nuevo).
+
+        Si un escritor modifica el deque a mitad de la copia, deque lanza
+        RuntimeError y se reintenta.
+        """
+        while True:
+            try:
+                return list(self._datos)
+            except RuntimeError:
+                continue
+
+    def ultimos(self, n: int) -> List[Any]:
+        """Los últimos n elementos."""
+        if n <= 0:
+            return []
+        return self.snapshot()[-n:]
+
+    def clear(self):
+        """Vacía el buffer."""
+        self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.snapshot())
+
+    def __bool__(self) -> bool:
+        return len(self._datos) > 0
+
+    def __repr__(self) -> str:
+        return f"<BufferCircular {len(self._datos)}/{self.capacidad}>"
@@ -0,0 +1,32 @@
+"""
+Disparadores - Cuándo debe ejecutarse un bucle además de su intervalo.
+
+Con intervalos fijos un bucle corre aunque no haya pasado nada y, en una
+ráfaga de actividad, tarda hasta un intervalo completo en reaccionar.
+Un Disparador combina tres condiciones (la primera que se cumpla gana):
+
+- eventos: ejecutar tras N eventos nuevos
+- umbral: ejecutar cuando el peso acumulado de los eventos llega al umbral
+- intervalo_maximo: ejecutar como mucho cada tantos segundos
+
+Los disparos se fusionan: mil eventos en una ráfaga producen una sola
+ejecución adelantada, no mil.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class Disparador:
+    """Configuración de disparo de un bucle."""
+    eventos: Optional[int] = None            # N eventos nuevos
+    umbral: Optional[float] = None           # Peso acumulado
+    intervalo_maximo: Optional[float] = None # Segundos (None = intervalo del bucle)
+    solo_con_eventos: bool = False           # Sin eventos nuevos, no procesar
+
+    def se_cumple(self, eventos: int, peso: float) -> bool:
+        """¿Los eventos pendientes justifican adelantar la ejecución?"""
+        if self.eventos is not None and eventos >= self.eventos:
+            return True
+        if self.umbral is not None and peso >= self.umbral:
+            return True
+        return False
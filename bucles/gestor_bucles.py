@@ -5,13 +5,38 @@ Gestiona los 3 bucles:
 - BucleCorto (60s): Análisis rápido de conceptos
 - BucleMedio (120s): Análisis de patrones
 - BucleLargo (600s): Consolidación de aprendizaje
+
+Los tres comparten un único Planificador (un solo thread), o un
+PlanificadorAsincrono si se pasa un event loop (servidor asyncio).
+
+Con ruta_estado, el estado de los bucles se guarda periódicamente y se
+restaura al crear el gestor (arranque en caliente tras un reinicio).
+
+Además del intervalo, corto y medio se adelantan con la actividad (ver
+DISPARADORES_POR_DEFECTO). Sin actividad siguen corriendo a su
+intervalo (compactan ventanas y decaimiento); saltarse las ejecuciones
+sin eventos nuevos es opcional (Disparador(solo_con_eventos=True)).
 """
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
+import asyncio
 from bucles.base_bucle import BaseBucle
+from bucles.planificador import Planificador
+from bucles.planificador_asincrono import PlanificadorAsincrono
+from bucles.reloj import RELOJ_SISTEMA, RelojSistema, RelojVirtual
+from bucles.disparador import Disparador
+from bucles.persistencia import BuclePersistencia, guardar_estado, cargar_estado
 from bucles.bucle_corto import BucleCorto
 from bucles.bucle_medio import BucleMedio
 from bucles.bucle_largo import BucleLargo
 
+# Disparo por eventos de cada bucle (configurable con configurar_disparador).
+# Solo adelantan la ejecución: el intervalo se mantiene.
+DISPARADORES_POR_DEFECTO = {
+    'corto': Disparador(eventos=25),
+    'medio': Disparador(eventos=10),
+    'largo': None
+}
+
 class GestorBucles:
     """
     Gestor central de bucles autónomos.
@@ -22,12 +47,30 @@ class GestorBucles:
     - Proporcionar interfaz unificada
     """
     
-    def __init__(self):
-        """Inicializa gestor y crea bucles."""
+    def __init__(self, disparadores: Optional[Dict[str, Optional[Disparador]]] = None,
+                 consolidar_en_proceso: bool = False,
+                 ruta_estado: Optional[str] = None,
+                 intervalo_guardado: float = 60,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 reloj: Optional[RelojSistema | RelojVirtual] = None):
+        """
+        Inicializa gestor y crea bucles.
+        
+        Args:
+            disparadores: Disparador por bucle ('corto', 'medio', 'largo');
+                          los que falten usan DISPARADORES_POR_DEFECTO
+            consolidar_en_proceso: El bucle largo consolida en otro proceso
+            ruta_estado: Archivo de instantáneas (None = sin persistencia)
+            intervalo_guardado: Segundos entre instantáneas
+            loop: Event loop donde correr los bucles como tareas
+                  (None = thread propio del planificador)
+            reloj: Fuente de tiempo del planificador y los bucles; con un
+                   RelojVirtual se avanza con planificador.avanzar()
+        """
         # Crear instancias de bucles
         self.bucle_corto = BucleCorto()
         self.bucle_medio = BucleMedio()
-        self.bucle_largo = BucleLargo()
+        self.bucle_largo = BucleLargo(en_proceso=consolidar_en_proceso)
         
         # Configurar dependencias del bucle largo
         self.bucle_largo.configurar_bucles(
@@ -35,9 +78,75 @@ class GestorBucles:
             self.bucle_medio
         )
         
+        # Un solo planificador para todos los bucles
+        if loop is not None:
+            self.planificador = PlanificadorAsincrono(loop)
+        else:
+            self.planificador = Planificador(reloj or RELOJ_SISTEMA)
+        for bucle in (self.bucle_corto, self.bucle_medio, self.bucle_largo):
+            bucle.usar_planificador(self.planificador)
+        
+        configuracion = dict(DISPARADORES_POR_DEFECTO)
+        configuracion.update(disparadores or {})
+        for nombre, disparador in configuracion.items():
+            self.configurar_disparador(nombre, disparador)
+        
+        # Persistencia (arranque en caliente)
+        self.ruta_estado = ruta_estado
+        self.bucle_persistencia: Optional[BuclePersistencia] = None
+        self.estado_restaurado = False
+        if ruta_estado:
+            self.bucle_persistencia = BuclePersistencia(
+                self.guardar_estado, intervalo_segundos=intervalo_guardado
+            )
+            self.bucle_persistencia.usar_planificador(self.planificador)
+            self.estado_restaurado = self.restaurar_estado()
+        
         # Estado
         self._todos_activos = False
     
+    def guardar_estado(self) -> bool:
+        """
+        Escribe una instantánea del estado de los bucles (atómica).
+        
+        Returns:
+            True si se guardó (False sin ruta_estado)
+        
+        Raises:
+            OSError: Si no se pudo escribir
+        """
+        if not self.ruta_estado:
+            return False
+        
+        guardar_estado(self.ruta_estado, {
+            'corto': self.bucle_corto.exportar_estado(),
+            'medio': self.bucle_medio.exportar_estado(),
+            'largo': self.bucle_largo.exportar_estado()
+        })
+        return True
+    
+    def restaurar_estado(self) -> bool:
+        """
+        Restaura la última instantánea (si existe y es válida).
+        
+        Returns:
+            True si se restauró
+        """
+        if not self.ruta_estado:
+            return False
+        
+        instantanea = cargar_estado(self.ruta_estado)
+        if instantanea is None:
+            return False
+        
+        transcurrido = instantanea['transcurrido']
+        for nombre, estado in instantanea['bucles'].items():
+            bucle = self._obtener_bucle(nombre)
+            if bucle is not None and isinstance(estado, dict):
+                bucle.restaurar_estado(estado, transcurrido)
+        
+        return True
+    
     def iniciar_todos(self) -> Dict[str, bool]:
         """
         Inicia todos los bucles.
@@ -51,6 +160,10 @@ class GestorBucles:
             'largo': self.bucle_largo.iniciar()
         }
         
+        if self.bucle_persistencia is not None:
+            # Primera instantánea tras un intervalo (la actual es la restaurada)
+            self.bucle_persistencia.iniciar(retraso=self.bucle_persistencia.intervalo_segundos)
+        
         self._todos_activos = all(resultados.values())
         
         return resultados
@@ -68,6 +181,13 @@ class GestorBucles:
             'largo': self.bucle_largo.detener()
         }
         
+        if self.bucle_persistencia is not None:
+            self.bucle_persistencia.detener()
+            # Última instantánea (un error queda en el bucle de persistencia)
+            self.bucle_persistencia.guardar_ahora()
+        
+        # Sin bucles programados, liberar también el thread
+        self.planificador.detener()
         self._todos_activos = False
         
         return resultados
@@ -102,6 +222,27 @@ class GestorBucles:
             return bucle.detener()
         return False
     
+    def configurar_disparador(self, nombre: str, disparador: Optional[Disparador]) -> bool:
+        """
+        Configura el disparo por eventos de un bucle.
+        
+        Args:
+            nombre: 'corto', 'medio' o 'largo'
+            disparador: Configuración (None = solo intervalo fijo)
+        
+        Returns:
+            True si el bucle existe
+        """
+        bucle = self._obtener_bucle(nombre)
+        if bucle is None:
+            return False
+        
+        if disparador is not None:
+            # Copia: el mismo Disparador no se comparte entre gestores
+            disparador = Disparador(**vars(disparador))
+        bucle.configurar_disparador(disparador)
+        return True
+    
     def _obtener_bucle(self, nombre: str) -> Optional[BaseBucle]:
         """Obtiene instancia de bucle por nombre."""
         nombre_lower = nombre.lower()
@@ -121,6 +262,7 @@ class GestorBucles:
             concepto_id: ID del concepto usado
         """
         self.bucle_corto.registrar_concepto_usado(concepto_id)
+        self.bucle_corto.notificar_evento()
     
     def registrar_decision(self, decision_info: Dict[str, Any]):
         """
@@ -130,6 +272,7 @@ class GestorBucles:
             decision_info: Info de la decisión
         """
         self.bucle_medio.registrar_decision(decision_info)
+        self.bucle_medio.notificar_evento()
     
     def obtener_estadisticas(self, nombre: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -153,6 +296,19 @@ class GestorBucles:
             'largo': self.bucle_largo.obtener_estadisticas()
         }
     
+    def obtener_rendimiento(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Salud de cada bucle: retraso, sobrecarga, jitter y tasa de error.
+        
+        Returns:
+            Dict {'corto'|'medio'|'largo': resumen de rendimiento}
+        """
+        return {
+            'corto': self.bucle_corto.obtener_rendimiento(),
+            'medio': self.bucle_medio.obtener_rendimiento(),
+            'largo': self.bucle_largo.obtener_rendimiento()
+        }
+    
     def obtener_conceptos_calientes(self) -> List[Dict[str, Any]]:
         """
         Obtiene conceptos calientes del bucle corto.
@@ -188,6 +344,19 @@ class GestorBucles:
         """
         return self.bucle_largo.obtener_insights(tipo, n)
     
+    def suscribir_consolidaciones(self, suscriptor: Callable[[Dict[str, Any]], Any]):
+        """
+        Entrega cada consolidación del bucle largo a un suscriptor.
+        
+        Args:
+            suscriptor: Función que recibe {'insights': [...], 'ajustes': [...]}
+        """
+        self.bucle_largo.suscribir(suscriptor)
+    
+    def desuscribir_consolidaciones(self, suscriptor: Callable[[Dict[str, Any]], Any]):
+        """Deja de entregar consolidaciones a un suscriptor."""
+        self.bucle_largo.desuscribir(suscriptor)
+    
     def obtener_ajustes_recomendados(self) -> List[Dict[str, Any]]:
         """
         Obtiene ajustes de grounding recomendados del bucle largo.
@@ -210,17 +379,21 @@ class GestorBucles:
                 'corto': {
                     'activo': self.bucle_corto.esta_activo(),
                     'ejecuciones': self.bucle_corto.estadisticas['ejecuciones'],
-                    'intervalo_segundos': self.bucle_corto.intervalo_segundos
+                    'intervalo_segundos': self.bucle_corto.intervalo_segundos,
+                    'disparador': self._describir_disparador(self.bucle_corto)
                 },
                 'medio': {
                     'activo': self.bucle_medio.esta_activo(),
                     'ejecuciones': self.bucle_medio.estadisticas['ejecuciones'],
-                    'intervalo_segundos': self.bucle_medio.intervalo_segundos
+                    'intervalo_segundos': self.bucle_medio.intervalo_segundos,
+                    'disparador': self._describir_disparador(self.bucle_medio)
                 },
                 'largo': {
                     'activo': self.bucle_largo.esta_activo(),
                     'ejecuciones': self.bucle_largo.estadisticas['ejecuciones'],
-                    'intervalo_segundos': self.bucle_largo.intervalo_segundos
+                    'intervalo_segundos': self.bucle_largo.intervalo_segundos,
+                    'en_proceso': self.bucle_largo.en_proceso,
+                    'disparador': self._describir_disparador(self.bucle_largo)
                 }
             },
             'resumen': {
@@ -231,6 +404,12 @@ class GestorBucles:
             }
         }
     
+    def _describir_disparador(self, bucle: BaseBucle) -> Optional[Dict[str, Any]]:
+        """Configuración de disparo de un bucle (None = solo intervalo)."""
+        if bucle.disparador is None:
+            return None
+        return vars(bucle.disparador).copy()
+    
     def limpiar_historial_todos(self):
         """Limpia historial de todos los bucles."""
         self.bucle_corto.limpiar_historial()
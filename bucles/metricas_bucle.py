@@ -0,0 +1,133 @@
+"""
+Métricas de Salud de Bucles - Retraso, sobrecarga y jitter.
+
+Para dimensionar intervalos bajo carga no alcanza con contar
+ejecuciones: hace falta saber cuánto tarde arranca cada bucle respecto
+de lo programado (retraso), si procesar() tarda más que su intervalo
+(sobrecarga) y cuánto varía el retraso entre ejecuciones (jitter).
+
+Todo se mide con time.perf_counter/time.monotonic (alta resolución,
+inmune a cambios de hora del sistema) y se acumula en O(1); los
+percentiles salen de una ventana con las últimas ejecuciones.
+"""
+from typing import Any, Dict, List, Optional
+import math
+from bucles.buffer_circular import BufferCircular
+
+def _percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0-100) por rango más cercano."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+class MetricasBucle:
+    """
+    Acumula la salud de las ejecuciones de un bucle.
+
+    Lo escribe solo el thread del planificador; las lecturas desde otros
+    threads pueden ver una ejecución a medio registrar, lo que basta
+    para un tablero.
+    """
+
+    def __init__(self, muestras: int = 100):
+        """
+        Args:
+            muestras: Ejecuciones recientes que se guardan para percentiles
+        """
+        self.ejecuciones = 0
+        self.errores = 0
+        self.sobrecargas = 0
+
+        self.duracion_total_ms = 0.0
+        self.duracion_max_ms = 0.0
+
+        # Retraso: Welford para media y varianza (jitter) en O(1)
+        self.retrasos_medidos = 0
+        self.retraso_medio_ms = 0.0
+        self._retraso_m2 = 0.0
+        self.retraso_max_ms = 0.0
+
+        self._recientes = BufferCircular(capacidad=muestras)   # (retraso_ms, duracion_ms)
+
+    def registrar(self, duracion_ms: float, intervalo_segundos: float,
+                  retraso_ms: Optional[float] = None, exito: bool = True):
+        """
+        Registra una ejecución de procesar().
+
+        Args:
+            duracion_ms: Lo que tardó procesar()
+            intervalo_segundos: Intervalo del bucle (para detectar sobrecarga)
+            retraso_ms: Arranque real menos arranque programado (None = sin programar)
+            exito: False si procesar() lanzó una excepción
+        """
+        self.ejecuciones += 1
+        if not exito:
+            self.errores += 1
+
+        self.duracion_total_ms += duracion_ms
+        if duracion_ms > self.duracion_max_ms:
+            self.duracion_max_ms = duracion_ms
+        if duracion_ms > intervalo_segundos * 1000:
+            self.sobrecargas += 1
+
+        if retraso_ms is not None:
+            self.registrar_retraso(retraso_ms)
+        self._recientes.agregar((retraso_ms, duracion_ms))
+
+    def registrar_retraso(self, retraso_ms: float):
+        """Acumula un retraso de arranque (también de ejecuciones omitidas)."""
+        self.retrasos_medidos += 1
+        delta = retraso_ms - self.retraso_medio_ms
+        self.retraso_medio_ms += delta / self.retrasos_medidos
+        self._retraso_m2 += delta * (retraso_ms - self.retraso_medio_ms)
+        if retraso_ms > self.retraso_max_ms:
+            self.retraso_max_ms = retraso_ms
+
+    @property
+    def jitter_ms(self) -> float:
+        """Desviación estándar del retraso de arranque."""
+        if self.retrasos_medidos < 2:
+            return 0.0
+        return math.sqrt(self._retraso_m2 / (self.retrasos_medidos - 1))
+
+    def resumen(self, intervalo_segundos: float) -> Dict[str, Any]:
+        """
+        Resumen de salud del bucle.
+
+        Args:
+            intervalo_segundos: Intervalo actual (para la utilización)
+
+        Returns:
+            Dict con duración, retraso, jitter, sobrecargas y tasa de error
+        """
+        recientes = self._recientes.snapshot()
+        duraciones = [d for _, d in recientes]
+        retrasos = [r for r, _ in recientes if r is not None]
+
+        promedio = self.duracion_total_ms / self.ejecuciones if self.ejecuciones else 0.0
+
+        return {
+            'ejecuciones': self.ejecuciones,
+            'errores': self.errores,
+            'tasa_error': round(self.errores / self.ejecuciones, 4) if self.ejecuciones else 0.0,
+            'sobrecargas': self.sobrecargas,
+            'tasa_sobrecarga': round(self.sobrecargas / self.ejecuciones, 4) if self.ejecuciones else 0.0,
+            'utilizacion': round(promedio / (intervalo_segundos * 1000), 4) if intervalo_segundos else 0.0,
+            'duracion_ms': {
+                'promedio': round(promedio, 3),
+                'p95': round(_percentil(duraciones, 95), 3),
+                'max': round(self.duracion_max_ms, 3)
+            },
+            'retraso_ms': {
+                'promedio': round(self.retraso_medio_ms, 3),
+                'p95': round(_percentil(retrasos, 95), 3),
+                'max': round(self.retraso_max_ms, 3)
+            },
+            'jitter_ms': round(self.jitter_ms, 3)
+        }
+
+    def clear(self):
+        """Reinicia todas las métricas."""
+        self.__init__(self._recientes.capacidad)
@@ -0,0 +1,123 @@
+"""
+Persistencia de Bucles - Instantáneas del estado para arrancar en caliente.
+
+Sin persistencia, tras un reinicio los bucles empiezan vacíos y el bucle
+largo tarda varios ciclos en volver a producir insights. GestorBucles
+guarda periódicamente una instantánea compacta (JSON) del estado de los
+tres bucles y la restaura al construirse.
+
+La escritura es atómica: se escribe a un archivo temporal en el mismo
+directorio y se reemplaza con os.replace, así un corte a mitad de
+escritura deja la instantánea anterior intacta.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import json
+import os
+import tempfile
+import time
+from bucles.base_bucle import BaseBucle
+
+# Cambiar si cambia el formato (las instantáneas viejas se ignoran)
+VERSION_ESTADO = 1
+
+def guardar_estado(ruta: str, bucles: Dict[str, Any]):
+    """
+    Escribe una instantánea de forma atómica.
+
+    Args:
+        ruta: Archivo destino
+        bucles: Estado exportado por bucle ({'corto': {...}, ...})
+
+    Raises:
+        OSError: Si no se pudo escribir (la instantánea anterior queda intacta)
+    """
+    destino = Path(ruta)
+    instantanea = {
+        'version': VERSION_ESTADO,
+        'guardado': time.time(),
+        'bucles': bucles
+    }
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(
+        dir=destino.parent, prefix=f'.{destino.name}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(instantanea, f, ensure_ascii=False, separators=(',', ':'), default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, destino)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+def cargar_estado(ruta: str) -> Optional[Dict[str, Any]]:
+    """
+    Lee una instantánea.
+
+    Returns:
+        Dict con 'bucles' y 'transcurrido' (segundos desde que se guardó),
+        o None si no existe, está dañada o es de otra versión
+    """
+    origen = Path(ruta)
+    if not origen.exists():
+        return None
+
+    try:
+        with open(origen, 'r', encoding='utf-8') as f:
+            instantanea = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(instantanea, dict) or instantanea.get('version') != VERSION_ESTADO:
+        return None
+
+    return {
+        'bucles': instantanea.get('bucles', {}),
+        'transcurrido': max(0.0, time.time() - instantanea.get('guardado', time.time()))
+    }
+
+class BuclePersistencia(BaseBucle):
+    """
+    Bucle que guarda la instantánea del gestor cada `intervalo_segundos`.
+
+    Corre en el mismo planificador que los demás bucles. Si la escritura
+    falla, el error queda en sus estadísticas e historial como el de
+    cualquier bucle.
+    """
+
+    # Escribe a disco: en un event loop va a un executor
+    pesado = True
+
+    def __init__(self, guardar: Callable[[], Any], intervalo_segundos: float = 60):
+        """
+        Args:
+            guardar: Función que escribe la instantánea (lanza si falla)
+            intervalo_segundos: Segundos entre instantáneas
+        """
+        super().__init__(nombre="BuclePersistencia", intervalo_segundos=intervalo_segundos)
+        self._guardar = guardar
+
+    def procesar(self) -> Dict[str, Any]:
+        """Escribe la instantánea (los errores los registra BaseBucle)."""
+        self._guardar()
+        return {
+            'guardado': True,
+            'mensaje': 'Estado de bucles guardado'
+        }
+
+    def guardar_ahora(self) -> bool:
+        """
+        Escribe una instantánea fuera de turno (p. ej. al detener los bucles).
+
+        Pasa por el mismo camino que las periódicas: un error queda en las
+        estadísticas e historial de este bucle en lugar de lanzarse.
+
+        Returns:
+            True si se guardó
+        """
+        errores = self.estadisticas['errores']
+        self._ejecutar_una_vez()
+        return self.estadisticas['errores'] == errores
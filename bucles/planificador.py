@@ -0,0 +1,230 @@
+"""
+Planificador de Bucles - Un solo thread para todos los bucles autónomos.
+
+En lugar de un thread por bucle que despierta cada segundo para revisar
+si debe detenerse, el planificador mantiene un heap con la próxima
+ejecución de cada bucle y duerme (Condition) hasta la más cercana.
+Agregar o quitar un bucle lo despierta al instante.
+
+adelantar() permite que un bucle corra antes de su intervalo (disparado
+por eventos); las peticiones repetidas se fusionan en una sola ejecución.
+
+Con un RelojVirtual no hay thread: avanzar(segundos) ejecuta en orden,
+en el thread que llama, todo lo que toque en ese lapso simulado.
+"""
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import heapq
+import itertools
+import threading
+from bucles.reloj import RELOJ_SISTEMA, RelojSistema, RelojVirtual
+
+if TYPE_CHECKING:
+    from bucles.base_bucle import BaseBucle
+
+class Planificador:
+    """
+    Ejecuta bucles en su intervalo desde un único thread.
+
+    - Sin bucles pendientes de ejecutar, el thread no despierta.
+    - Detener es inmediato (no hay sleeps que esperar).
+    - Escala a docenas de bucles sin threads extra.
+    """
+
+    def __init__(self, reloj: 'RelojSistema | RelojVirtual' = RELOJ_SISTEMA):
+        """
+        Args:
+            reloj: Fuente de tiempo (RelojVirtual = sin thread, ver avanzar())
+        """
+        self.reloj = reloj
+        self._condicion = threading.Condition()
+        self._heap: List[Tuple[float, int, 'BaseBucle']] = []
+        self._turnos: Dict['BaseBucle', int] = {}   # Entrada vigente de cada bucle
+        self._secuencia = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._generacion = 0        # Cambia al detener: el thread viejo termina
+        self._momentos: Dict['BaseBucle', float] = {}   # Próxima ejecución
+        self._en_curso: Optional['BaseBucle'] = None
+        self._repetir: Set['BaseBucle'] = set()         # Adelantados mientras corrían
+
+    def agregar(self, bucle: 'BaseBucle', retraso: float = 0.0):
+        """
+        Programa un bucle (la primera ejecución tras `retraso` segundos).
+
+        Si el bucle ya estaba programado, se reprograma.
+        """
+        with self._condicion:
+            self._programar(bucle, self.reloj.ahora() + retraso)
+            self._asegurar_thread()
+            self._condicion.notify()
+
+    def quitar(self, bucle: 'BaseBucle'):
+        """Deja de ejecutar un bucle (su entrada en el heap queda obsoleta)."""
+        with self._condicion:
+            self._turnos.pop(bucle, None)
+            self._momentos.pop(bucle, None)
+            self._repetir.discard(bucle)
+            self._condicion.notify()
+    
+    def adelantar(self, bucle: 'BaseBucle') -> bool:
+        """
+        Ejecuta un bucle programado lo antes posible.
+        
+        Si ya está por ejecutarse no hace nada; si está ejecutándose,
+        vuelve a correr apenas termine (una sola vez).
+        
+        Returns:
+            True si se adelantó la ejecución
+        """
+        with self._condicion:
+            if bucle not in self._turnos:
+                return False
+            
+            if bucle is self._en_curso:
+                if bucle in self._repetir:
+                    return False
+                self._repetir.add(bucle)
+                return True
+            
+            ahora = self.reloj.ahora()
+            if self._momentos.get(bucle, ahora) <= ahora:
+                return False
+            
+            self._programar(bucle, ahora)
+            self._condicion.notify()
+            return True
+
+    def contiene(self, bucle: 'BaseBucle') -> bool:
+        """¿Está el bucle programado?"""
+        with self._condicion:
+            return bucle in self._turnos
+
+    def detener(self, timeout: float = 1.0):
+        """
+        Detiene el thread del planificador.
+
+        No espera a un procesar() en curso más de `timeout` segundos.
+        """
+        with self._condicion:
+            self._generacion += 1
+            self._turnos.clear()
+            self._heap.clear()
+            self._momentos.clear()
+            self._repetir.clear()
+            self._condicion.notify()
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def esta_activo(self) -> bool:
+        """¿Está corriendo el thread del planificador?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def avanzar(self, segundos: float) -> int:
+        """
+        Avanza un reloj virtual ejecutando, en orden, lo que toque.
+
+        El reloj se detiene en el momento de cada ejecución, así los
+        bucles ven el instante simulado correcto.
+
+        Returns:
+            Cantidad de ejecuciones realizadas
+        """
+        if self.reloj.tiempo_real:
+            raise RuntimeError("avanzar() requiere un RelojVirtual")
+
+        fin = self.reloj.ahora() + segundos
+        ejecuciones = 0
+        while True:
+            with self._condicion:
+                self._descartar_obsoletas()
+                if not self._heap or self._heap[0][0] > fin:
+                    break
+                bucle, turno, momento = self._tomar()
+                self.reloj.fijar(max(self.reloj.ahora(), momento))
+
+            self._correr(bucle, turno, momento)
+            ejecuciones += 1
+
+        self.reloj.fijar(fin)
+        return ejecuciones
+
+    def _programar(self, bucle: 'BaseBucle', momento: float):
+        """Inserta una entrada nueva; las anteriores del bucle quedan obsoletas."""
+        turno = next(self._secuencia)
+        self._turnos[bucle] = turno
+        self._momentos[bucle] = momento
+        heapq.heappush(self._heap, (momento, turno, bucle))
+
+    def _asegurar_thread(self):
+        """Arranca el thread si no está corriendo (con la condición tomada)."""
+        if not self.reloj.tiempo_real:
+            # Tiempo simulado: lo conduce avanzar()
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._ejecutar, args=(self._generacion,),
+                name="PlanificadorBucles", daemon=True
+            )
+            self._thread.start()
+
+    def _ejecutar(self, generacion: int):
+        """Loop del planificador (corre en su propio thread)."""
+        while True:
+            with self._condicion:
+                if not self._esperar_turno(generacion):
+                    return
+                bucle, turno, momento = self._tomar()
+
+            self._correr(bucle, turno, momento)
+
+    def _correr(self, bucle: 'BaseBucle', turno: int, momento: float):
+        """Ejecuta un bucle y lo reprograma (sin la condición tomada)."""
+        try:
+            bucle._ejecutar_una_vez(momento)
+        finally:
+            with self._condicion:
+                self._en_curso = None
+                # Reprogramar si nadie lo quitó ni reprogramó mientras corría
+                if self._turnos.get(bucle) == turno:
+                    if bucle in self._repetir:
+                        self._repetir.discard(bucle)
+                        retraso = 0.0
+                    else:
+                        retraso = bucle.intervalo_segundos
+                    self._programar(bucle, self.reloj.ahora() + retraso)
+
+    def _esperar_turno(self, generacion: int) -> bool:
+        """
+        Espera hasta que toque ejecutar algún bucle (con la condición tomada).
+
+        Returns:
+            True si hay uno listo en el tope del heap, False si hay que detenerse
+        """
+        while self._generacion == generacion:
+            self._descartar_obsoletas()
+
+            if not self._heap:
+                self._condicion.wait()
+                continue
+
+            espera = self._heap[0][0] - self.reloj.ahora()
+            if espera > 0:
+                self._condicion.wait(espera)
+                continue
+
+            return True
+
+        return False
+
+    def _descartar_obsoletas(self):
+        """Quita del tope las entradas reemplazadas o de bucles quitados."""
+        while self._heap and self._turnos.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _tomar(self) -> Tuple['BaseBucle', int, float]:
+        """Saca la entrada del tope y la marca en curso (con la condición tomada)."""
+        momento, turno, bucle = heapq.heappop(self._heap)
+        self._en_curso = bucle
+        return bucle, turno, momento
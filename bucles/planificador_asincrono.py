@@ -0,0 +1,189 @@
+"""
+Planificador Asíncrono - Los bucles como tareas de un bucle de eventos.
+
+Para alojar a Bell dentro de un servidor asyncio, un thread de bucles
+aparte es el modelo equivocado: este planificador ofrece la misma
+interfaz que Planificador (agregar, quitar, adelantar, detener...) pero
+cada bucle es una tarea del event loop.
+
+- Bucles baratos: procesar() corre directamente en el event loop.
+- Bucles pesados (BaseBucle.pesado): procesar() corre con
+  run_in_executor para no bloquear al servidor.
+
+Los métodos se pueden llamar desde cualquier thread (p.ej. el de
+peticiones al notificar eventos); lo que toca el event loop se agenda
+con call_soon_threadsafe.
+"""
+from typing import Dict, Set, TYPE_CHECKING
+import asyncio
+import itertools
+import threading
+from bucles.reloj import RELOJ_SISTEMA
+
+if TYPE_CHECKING:
+    from bucles.base_bucle import BaseBucle
+
+class PlanificadorAsincrono:
+    """
+    Ejecuta bucles en su intervalo como tareas de asyncio.
+
+    Mismo comportamiento que Planificador: reprogramación tras cada
+    ejecución, adelantar() fusionado y detención inmediata.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """
+        Args:
+            loop: Event loop que aloja a los bucles
+        """
+        self.loop = loop
+        self.reloj = RELOJ_SISTEMA     # asyncio espera en tiempo real
+        self._lock = threading.Lock()
+        self._momentos: Dict['BaseBucle', float] = {}    # Próxima ejecución
+        self._turnos: Dict['BaseBucle', int] = {}        # Programación vigente
+        self._secuencia = itertools.count()
+        self._en_curso: Set['BaseBucle'] = set()
+        self._repetir: Set['BaseBucle'] = set()          # Adelantados mientras corrían
+
+        # Solo se tocan desde el event loop
+        self._tareas: Dict['BaseBucle', asyncio.Task] = {}
+        self._despertadores: Dict['BaseBucle', asyncio.Event] = {}
+
+    def agregar(self, bucle: 'BaseBucle', retraso: float = 0.0):
+        """
+        Programa un bucle (la primera ejecución tras `retraso` segundos).
+
+        Si el bucle ya estaba programado, se reprograma.
+        """
+        with self._lock:
+            self._programar(bucle, self.reloj.ahora() + retraso)
+        self._en_loop(self._despertar, bucle)
+
+    def quitar(self, bucle: 'BaseBucle'):
+        """Deja de ejecutar un bucle (su tarea termina al despertar)."""
+        with self._lock:
+            self._momentos.pop(bucle, None)
+            self._turnos.pop(bucle, None)
+            self._repetir.discard(bucle)
+        self._en_loop(self._despertar, bucle, False)
+
+    def contiene(self, bucle: 'BaseBucle') -> bool:
+        """¿Está el bucle programado?"""
+        with self._lock:
+            return bucle in self._turnos
+
+    def adelantar(self, bucle: 'BaseBucle') -> bool:
+        """
+        Ejecuta un bucle programado lo antes posible.
+
+        Si ya está por ejecutarse no hace nada; si está ejecutándose,
+        vuelve a correr apenas termine (una sola vez).
+
+        Returns:
+            True si se adelantó la ejecución
+        """
+        with self._lock:
+            if bucle not in self._turnos:
+                return False
+
+            if bucle in self._en_curso:
+                if bucle in self._repetir:
+                    return False
+                self._repetir.add(bucle)
+                return True
+
+            ahora = self.reloj.ahora()
+            if self._momentos[bucle] <= ahora:
+                return False
+            self._programar(bucle, ahora)
+
+        self._en_loop(self._despertar, bucle)
+        return True
+
+    def detener(self, timeout: float = 1.0):
+        """
+        Quita todos los bucles; sus tareas terminan al despertar.
+
+        No espera: un procesar() pesado en curso termina en su executor.
+        `timeout` se acepta por compatibilidad con Planificador.
+        """
+        with self._lock:
+            bucles = list(self._turnos)
+            self._momentos.clear()
+            self._turnos.clear()
+            self._repetir.clear()
+        for bucle in bucles:
+            self._en_loop(self._despertar, bucle, False)
+
+    def esta_activo(self) -> bool:
+        """¿Queda alguna tarea de bucle viva?"""
+        return any(not tarea.done() for tarea in list(self._tareas.values()))
+
+    def _programar(self, bucle: 'BaseBucle', momento: float):
+        """Fija la próxima ejecución (con el lock tomado)."""
+        self._momentos[bucle] = momento
+        self._turnos[bucle] = next(self._secuencia)
+
+    def _en_loop(self, funcion, *args):
+        """Ejecuta `funcion` en el event loop (directo si ya estamos en él)."""
+        try:
+            en_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            en_loop = False
+
+        if en_loop:
+            funcion(*args)
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(funcion, *args)
+
+    def _despertar(self, bucle: 'BaseBucle', crear: bool = True):
+        """Despierta la tarea del bucle, creándola si hace falta (en el event loop)."""
+        tarea = self._tareas.get(bucle)
+        if tarea is None or tarea.done():
+            if not crear:
+                return
+            self._despertadores[bucle] = asyncio.Event()
+            self._tareas[bucle] = self.loop.create_task(
+                self._correr(bucle), name=f"Bucle-{bucle.nombre}"
+            )
+        self._despertadores[bucle].set()
+
+    async def _correr(self, bucle: 'BaseBucle'):
+        """Tarea de un bucle: espera su momento, ejecuta y reprograma."""
+        despertador = self._despertadores[bucle]
+
+        while True:
+            # Limpiar antes de leer: un cambio posterior vuelve a despertar
+            despertador.clear()
+            with self._lock:
+                if bucle not in self._turnos:
+                    return
+                momento = self._momentos[bucle]
+                turno = self._turnos[bucle]
+
+            espera = momento - self.reloj.ahora()
+            if espera > 0:
+                try:
+                    await asyncio.wait_for(despertador.wait(), espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            with self._lock:
+                self._en_curso.add(bucle)
+            try:
+                if bucle.pesado:
+                    await self.loop.run_in_executor(None, bucle._ejecutar_una_vez, momento)
+                else:
+                    bucle._ejecutar_una_vez(momento)
+            finally:
+                with self._lock:
+                    self._en_curso.discard(bucle)
+                    # Reprogramar si nadie lo quitó ni reprogramó mientras corría
+                    if self._turnos.get(bucle) == turno:
+                        if bucle in self._repetir:
+                            self._repetir.discard(bucle)
+                            retraso = 0.0
+                        else:
+                            retraso = bucle.intervalo_segundos
+                        self._programar(bucle, self.reloj.ahora() + retraso)
@@ -0,0 +1,70 @@
+"""
+Relojes - Fuente de tiempo inyectable para bucles y planificador.
+
+Los bucles miden su retraso y el planificador decide cuándo ejecutar
+leyendo un reloj. Con RelojSistema (por defecto) es el tiempo real; con
+RelojVirtual el tiempo solo avanza cuando se pide, así una hora de
+tráfico simulado se recorre en milisegundos y los tests no dependen de
+sleeps.
+
+Los relojes son invocables (reloj() == reloj.ahora()), así que también
+sirven como `reloj` de VentanaTemporal y PuntuacionDecaida.
+"""
+import time
+
+class RelojSistema:
+    """Tiempo real (time.monotonic)."""
+
+    tiempo_real = True
+
+    def ahora(self) -> float:
+        """Segundos de un reloj monótono."""
+        return time.monotonic()
+
+    def __call__(self) -> float:
+        return time.monotonic()
+
+    def __repr__(self) -> str:
+        return "<RelojSistema>"
+
+class RelojVirtual:
+    """
+    Tiempo simulado: solo cambia con avanzar() o fijar().
+
+    Un Planificador con reloj virtual no arranca su thread; se lo hace
+    avanzar con Planificador.avanzar(segundos).
+    """
+
+    tiempo_real = False
+
+    def __init__(self, inicio: float = 0.0):
+        """
+        Args:
+            inicio: Instante inicial en segundos
+        """
+        self._ahora = float(inicio)
+
+    def ahora(self) -> float:
+        """Instante simulado actual."""
+        return self._ahora
+
+    def avanzar(self, segundos: float):
+        """Adelanta el tiempo simulado."""
+        if segundos < 0:
+            raise ValueError("El reloj virtual no puede retroceder")
+        self._ahora += segundos
+
+    def fijar(self, instante: float):
+        """Lleva el tiempo simulado a `instante` (nunca hacia atrás)."""
+        if instante < self._ahora:
+            raise ValueError("El reloj virtual no puede retroceder")
+        self._ahora = float(instante)
+
+    def __call__(self) -> float:
+        return self._ahora
+
+    def __repr__(self) -> str:
+        return f"<RelojVirtual t={self._ahora:.3f}s>"
+
+# Reloj compartido por defecto
+RELOJ_SISTEMA = RelojSistema()
@@ -0,0 +1,325 @@
+"""
+Ventanas Temporales - Conteos por tiempo, no por cantidad de eventos.
+
+Una ventana de "los últimos 50 usos" cubre segundos con mucho tráfico y
+horas con poco. Aquí las ventanas cubren un tiempo fijo:
+
+- VentanaTemporal: totales por clave de los últimos N segundos, en
+  buckets de ancho fijo. Al avanzar el tiempo se descartan buckets
+  enteros y se restan de los totales (O(1) amortizado).
+- PuntuacionDecaida: puntuación por clave con decaimiento exponencial
+  (vida media configurable). Las claves se mantienen ordenadas por
+  puntuación al registrar cada evento (búsqueda binaria), así que el
+  top-k se lee de la punta del orden sin recorrer todas las claves.
+
+La memoria depende de cuántas claves distintas hay, no del tráfico.
+
+Ambas se pueden exportar a listas JSON y restaurar en otro proceso: los
+instantes se guardan como antigüedad (el reloj monótono no sobrevive a
+un reinicio) y al restaurar se descuenta el tiempo transcurrido.
+"""
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import math
+import threading
+import time
+
+# Claves con peso menor a esto se consideran en cero
+_EPSILON = 1e-9
+
+class VentanaTemporal:
+    """
+    Totales por clave de los últimos `duracion_segundos`.
+
+    La ventana avanza de a un bucket: un evento deja de contar entre
+    duracion - ancho y duracion segundos después de registrarse.
+    """
+
+    def __init__(self, duracion_segundos: float, ancho_bucket: float,
+                 reloj: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            duracion_segundos: Tiempo que cubre la ventana
+            ancho_bucket: Granularidad con la que expiran los eventos
+            reloj: Fuente de tiempo en segundos (monótona)
+        """
+        self.duracion_segundos = duracion_segundos
+        self.ancho_bucket = ancho_bucket
+        self.reloj = reloj
+        self._max_buckets = max(1, math.ceil(duracion_segundos / ancho_bucket))
+
+        self._buckets: Deque[Tuple[int, Dict[Hashable, float]]] = deque()
+        self._totales: Dict[Hashable, float] = {}
+        self._suma = 0.0
+        self._lock = threading.Lock()
+
+    def agregar(self, clave: Hashable, peso: float = 1.0):
+        """Registra un evento de `clave` (O(1) amortizado)."""
+        ahora = self.reloj()
+        indice = int(ahora // self.ancho_bucket)
+
+        with self._lock:
+            self._expirar(indice)
+
+            if not self._buckets or self._buckets[-1][0] != indice:
+                self._buckets.append((indice, {}))
+            bucket = self._buckets[-1][1]
+
+            bucket[clave] = bucket.get(clave, 0.0) + peso
+            self._totales[clave] = self._totales.get(clave, 0.0) + peso
+            self._suma += peso
+
+    def totales(self) -> Dict[Hashable, float]:
+        """Copia de los totales vigentes por clave."""
+        indice = int(self.reloj() // self.ancho_bucket)
+        with self._lock:
+            self._expirar(indice)
+            return dict(self._totales)
+
+    def total(self, clave: Hashable) -> float:
+        """Total vigente de una clave (sin copiar los demás)."""
+        indice = int(self.reloj() // self.ancho_bucket)
+        with self._lock:
+            self._expirar(indice)
+            return self._totales.get(clave, 0.0)
+
+    def suma(self) -> float:
+        """Suma de los totales vigentes de todas las claves."""
+        indice = int(self.reloj() // self.ancho_bucket)
+        with self._lock:
+            self._expirar(indice)
+            return self._suma if self._totales else 0.0
+
+    def compactar(self):
+        """Descarta los buckets vencidos aunque no lleguen eventos nuevos."""
+        indice = int(self.reloj() // self.ancho_bucket)
+        with self._lock:
+            self._expirar(indice)
+
+    def clear(self):
+        """Vacía la ventana."""
+        with self._lock:
+            self._buckets.clear()
+            self._totales = {}
+            self._suma = 0.0
+
+    def __len__(self) -> int:
+        """Claves distintas con eventos en la ventana."""
+        return len(self._totales)
+
+    def usar_reloj(self, reloj: Callable[[], float]):
+        """Cambia la fuente de tiempo conservando los eventos (y su antigüedad)."""
+        buckets = self.exportar()
+        self.reloj = reloj
+        self.restaurar(buckets)
+
+    def exportar(self) -> List[List[Any]]:
+        """
+        Buckets vigentes como [antiguedad_segundos, [[clave, peso], ...]].
+
+        Del más viejo al más nuevo; las claves tupla quedan como listas
+        al pasar por JSON (restaurar() las vuelve a convertir).
+        """
+        indice = int(self.reloj() // self.ancho_bucket)
+        with self._lock:
+            self._expirar(indice)
+            return [
+                [(indice - indice_bucket) * self.ancho_bucket,
+                 [[clave, peso] for clave, peso in bucket.items()]]
+                for indice_bucket, bucket in self._buckets
+            ]
+
+    def restaurar(self, buckets: List[List[Any]], transcurrido: float = 0.0):
+        """
+        Reemplaza el contenido por buckets de exportar().
+
+        Args:
+            buckets: Salida de exportar()
+            transcurrido: Segundos desde que se exportaron (envejece los buckets)
+        """
+        indice_actual = int(self.reloj() // self.ancho_bucket)
+        limite = indice_actual - self._max_buckets
+
+        with self._lock:
+            self._buckets.clear()
+            self._totales = {}
+            self._suma = 0.0
+
+            for antiguedad, pares in buckets:
+                indice = indice_actual - int((antiguedad + transcurrido) // self.ancho_bucket)
+                if indice <= limite:
+                    continue
+
+                if not self._buckets or self._buckets[-1][0] != indice:
+                    self._buckets.append((indice, {}))
+                bucket = self._buckets[-1][1]
+
+                for clave, peso in pares:
+                    if isinstance(clave, list):
+                        clave = tuple(clave)
+                    bucket[clave] = bucket.get(clave, 0.0) + peso
+                    self._totales[clave] = self._totales.get(clave, 0.0) + peso
+                    self._suma += peso
+
+    def _expirar(self, indice_actual: int):
+        """Quita los buckets fuera de la ventana (con el lock tomado)."""
+        limite = indice_actual - self._max_buckets
+        while self._buckets and self._buckets[0][0] <= limite:
+            _, bucket = self._buckets.popleft()
+            for clave, peso in bucket.items():
+                self._suma -= peso
+                restante = self._totales[clave] - peso
+                if restante > _EPSILON:
+                    self._totales[clave] = restante
+                else:
+                    del self._totales[clave]
+
+
+class PuntuacionDecaida:
+    """
+    Puntuación por clave con decaimiento exponencial.
+
+    Cada evento suma `peso` y la puntuación se reduce a la mitad cada
+    `vida_media_segundos`. Para no tocar todas las claves al pasar el
+    tiempo, se guarda la puntuación referida a un instante base; solo
+    compactar() la re-escala (y descarta las claves casi en cero).
+
+    El decaimiento es el mismo factor para todas las claves, así que el
+    orden por puntuación referida es el orden por puntuación actual. Se
+    mantiene una lista ordenada de (referida, clave) que cada registro
+    actualiza en O(log n) (más el desplazamiento de la lista); mayores()
+    lee el top-k desde la punta. Las claves deben poder compararse
+    entre sí (todas str, o todas tuplas) para desempatar.
+    """
+
+    # Re-escalar antes de que 2**exponente pierda precisión
+    _MAX_EXPONENTE = 60.0
+
+    def __init__(self, vida_media_segundos: float,
+                 reloj: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            vida_media_segundos: Tiempo en que una puntuación cae a la mitad
+            reloj: Fuente de tiempo en segundos (monótona)
+        """
+        self.vida_media_segundos = vida_media_segundos
+        self.reloj = reloj
+        self._base = reloj()
+        self._referidas: Dict[Hashable, float] = {}
+        self._orden: List[Tuple[float, Hashable]] = []   # (referida, clave), ascendente
+        self._lock = threading.Lock()
+
+    def registrar(self, clave: Hashable, peso: float = 1.0):
+        """Suma un evento a la puntuación de `clave` (O(log n))."""
+        ahora = self.reloj()
+        with self._lock:
+            exponente = (ahora - self._base) / self.vida_media_segundos
+            if exponente > self._MAX_EXPONENTE:
+                self._rebasar(ahora)
+                exponente = 0.0
+
+            anterior = self._referidas.get(clave)
+            if anterior is None:
+                nueva = peso * 2.0 ** exponente
+            else:
+                nueva = anterior + peso * 2.0 ** exponente
+                del self._orden[bisect_left(self._orden, (anterior, clave))]
+            self._referidas[clave] = nueva
+            insort(self._orden, (nueva, clave))
+
+    def mayores(self, k: int,
+                admitir: Optional[Callable[[Hashable], bool]] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Las `k` claves de mayor puntuación actual, de mayor a menor.
+
+        Args:
+            k: Cuántas claves retornar
+            admitir: Filtro opcional; las claves rechazadas se saltan
+
+        Returns:
+            Lista de (clave, puntuación actual)
+        """
+        with self._lock:
+            factor = 2.0 ** (-(self.reloj() - self._base) / self.vida_media_segundos)
+            resultado = []
+            for referida, clave in reversed(self._orden):
+                if len(resultado) >= k:
+                    break
+                if admitir is None or admitir(clave):
+                    resultado.append((clave, referida * factor))
+            return resultado
+
+    def puntuaciones(self) -> Dict[Hashable, float]:
+        """Puntuaciones actuales de todas las claves."""
+        with self._lock:
+            factor = 2.0 ** (-(self.reloj() - self._base) / self.vida_media_segundos)
+            return {clave: valor * factor for clave, valor in self._referidas.items()}
+
+    def puntuacion(self, clave: Hashable) -> float:
+        """Puntuación actual de una clave."""
+        with self._lock:
+            factor = 2.0 ** (-(self.reloj() - self._base) / self.vida_media_segundos)
+            return self._referidas.get(clave, 0.0) * factor
+
+    def compactar(self, minimo: float = 0.01):
+        """
+        Re-escala al instante actual y descarta claves con puntuación < minimo.
+
+        Es O(claves); la llama el bucle en segundo plano, no el registro.
+        """
+        with self._lock:
+            self._rebasar(self.reloj())
+            self._referidas = {
+                clave: valor for clave, valor in self._referidas.items()
+                if valor >= minimo
+            }
+            self._orden = [par for par in self._orden if par[0] >= minimo]
+
+    def clear(self):
+        """Borra todas las puntuaciones."""
+        with self._lock:
+            self._referidas = {}
+            self._orden = []
+            self._base = self.reloj()
+
+    def __len__(self) -> int:
+        return len(self._referidas)
+
+    def usar_reloj(self, reloj: Callable[[], float]):
+        """Cambia la fuente de tiempo conservando las puntuaciones actuales."""
+        pares = self.exportar()
+        self.reloj = reloj
+        self.restaurar(pares)
+
+    def exportar(self) -> List[List[Any]]:
+        """Puntuaciones actuales como [[clave, puntuacion], ...]."""
+        return [[clave, valor] for clave, valor in self.puntuaciones().items()]
+
+    def restaurar(self, pares: List[List[Any]], transcurrido: float = 0.0):
+        """
+        Reemplaza las puntuaciones por las de exportar().
+
+        Args:
+            pares: Salida de exportar()
+            transcurrido: Segundos desde que se exportaron (se aplica el decaimiento)
+        """
+        factor = 2.0 ** (-transcurrido / self.vida_media_segundos)
+        with self._lock:
+            self._base = self.reloj()
+            self._referidas = {
+                tuple(clave) if isinstance(clave, list) else clave: valor * factor
+                for clave, valor in pares
+            }
+            self._reordenar()
+
+    def _rebasar(self, ahora: float):
+        """Refiere todas las puntuaciones a `ahora` (con el lock tomado)."""
+        factor = 2.0 ** (-(ahora - self._base) / self.vida_media_segundos)
+        self._referidas = {clave: valor * factor for clave, valor in self._referidas.items()}
+        self._base = ahora
+        self._reordenar()
+
+    def _reordenar(self):
+        """Rehace el orden desde las referidas (con el lock tomado)."""
+        self._orden = sorted((valor, clave) for clave, valor in self._referidas.items())
@@ -4,8 +4,9 @@ Sistema de Consejeras de Belladonna.
 FASE 1: Vega, Nova, Echo
 FASE 2: + Lyra, Luna, Iris, Sage
 """
-from .base_consejera import Consejera
+from .base_consejera import Consejera, ConsejeraAsincrona
 from .gestor_consejeras import GestorConsejeras
+from .opinion import Opinion
 
 # Fase 1
 from .vega import Vega
@@ -20,7 +21,9 @@ from .sage import Sage
 
 __all__ = [
     'Consejera',
+    'ConsejeraAsincrona',
     'GestorConsejeras',
+    'Opinion',
     'Vega',
     'Nova',
     'Echo',
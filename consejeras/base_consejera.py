@@ -3,10 +3,80 @@ Clase Base para Consejeras - Definición abstracta.
 
 TODAS las consejeras heredan de aquí.
 Define interfaz común y comportamiento compartido.
+
+Cada consejera implementa opinar() (Opinion compacta, camino caliente) y
+_renderizar() (texto legible, solo cuando se pide). revisar() sigue
+devolviendo el dict clásico.
+
+La telemetría (conteos, latencia, reglas activadas, razones de veto) la
+lleva la clase base: el opinar() de cada subclase se envuelve
+automáticamente y los códigos de la Opinion cuentan como reglas
+activadas, así que las consejeras NO deben tocar los contadores.
+
+Las consejeras lentas (modelos locales, servicios externos) heredan de
+ConsejeraAsincrona e implementan aopinar(); el gestor puede consultarlas
+con un plazo y contar como abstención a las que no lleguen a tiempo.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import threading
+import time
 from razonamiento.tipos_decision import Decision
+from consejeras.escaner import TextoAnalizado
+from consejeras.opinion import Opinion
+from core.principios import Principio
+
+# Límites superiores (ms) de los buckets del histograma de latencia
+BUCKETS_LATENCIA_MS = (0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0)
+
+def _con_telemetria(opinar):
+    """Envuelve opinar() para medir latencia y contar resultados."""
+    @wraps(opinar)
+    def envoltura(self, decision, contexto):
+        local = self._telemetria_local
+        
+        # Llamada anidada (p.ej. super().opinar): no contar dos veces
+        if getattr(local, 'revisando', False):
+            return opinar(self, decision, contexto)
+        
+        local.revisando = True
+        inicio = time.perf_counter()
+        try:
+            resultado = opinar(self, decision, contexto)
+        except Exception:
+            self.errores += 1
+            raise
+        finally:
+            local.revisando = False
+        
+        self._registrar_telemetria(resultado, (time.perf_counter() - inicio) * 1000)
+        return resultado
+    
+    envoltura._con_telemetria = True
+    return envoltura
+
+def _con_telemetria_async(aopinar):
+    """Como _con_telemetria, para el aopinar() de consejeras asíncronas."""
+    @wraps(aopinar)
+    async def envoltura(self, decision, contexto):
+        inicio = time.perf_counter()
+        try:
+            resultado = await aopinar(self, decision, contexto)
+        except asyncio.CancelledError:
+            # Cancelada por plazo: el gestor la registra como abstención
+            raise
+        except Exception:
+            self.errores += 1
+            raise
+        
+        self._registrar_telemetria(resultado, (time.perf_counter() - inicio) * 1000)
+        return resultado
+    
+    envoltura._con_telemetria = True
+    return envoltura
 
 class Consejera(ABC):
     """
@@ -29,18 +99,48 @@ class Consejera(ABC):
         self.revisiones_realizadas = 0
         self.vetos_aplicados = 0
         self.opiniones_dadas = 0
+        self.errores = 0
+        self.abstenciones = 0
+        
+        # Telemetría
+        self.latencia_total_ms = 0.0
+        self.latencia_max_ms = 0.0
+        self.histograma_latencia = [0] * (len(BUCKETS_LATENCIA_MS) + 1)
+        self.reglas_activadas: Dict[str, int] = {}
+        self.razones_veto: Dict[str, int] = {}
+        self._telemetria_local = threading.local()
+    
+    def __init_subclass__(cls, **kwargs):
+        """Envuelve el opinar() de cada subclase con telemetría."""
+        super().__init_subclass__(**kwargs)
+        opinar = cls.__dict__.get('opinar')
+        if opinar is not None and not getattr(opinar, '_con_telemetria', False):
+            cls.opinar = _con_telemetria(opinar)
+        
+        aopinar = cls.__dict__.get('aopinar')
+        if aopinar is not None and not getattr(aopinar, '_con_telemetria', False):
+            cls.aopinar = _con_telemetria_async(aopinar)
     
     @abstractmethod
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
-        Revisa una decisión y retorna opinión.
+        Revisa una decisión y retorna una Opinion compacta.
         
         TODAS las consejeras DEBEN implementar este método.
+        Solo calcula banderas, confianza y códigos; el texto lo
+        genera _renderizar() cuando se pide.
         
         Args:
             decision: Decision del motor de razonamiento
             contexto: Contexto adicional (traducción, etc.)
-            
+        """
+        pass
+    
+    @abstractmethod
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """
+        Genera el texto legible de una Opinion (formato dict clásico).
+        
         Returns:
             {
                 'consejera': str,           # Nombre de la consejera
@@ -54,6 +154,106 @@ class Consejera(ABC):
         """
         pass
     
+    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+        """
+        Revisa una decisión y retorna la opinión con todo su texto.
+        
+        Equivale a opinar() + renderizar; ver _renderizar() para el formato.
+        """
+        return self.opinar(decision, contexto).a_dict()
+    
+    async def aopinar(self, decision: Decision, contexto: Dict) -> Opinion:
+        """
+        Variante asíncrona de opinar().
+        
+        Por defecto ejecuta opinar() en un hilo para no bloquear el
+        bucle de eventos; ConsejeraAsincrona la implementa de forma nativa.
+        
+        El hilo no se puede cancelar: si el gestor cancela la tarea por
+        plazo, opinar() termina igual, pero su resultado se descarta y
+        no cuenta en la telemetría (ya contó como abstención).
+        """
+        try:
+            resultado, duracion_ms = await asyncio.to_thread(
+                self._opinar_medido, decision, contexto
+            )
+        except Exception:
+            self.errores += 1
+            raise
+        
+        # Se registra aquí, en el bucle de eventos, solo si nadie canceló
+        self._registrar_telemetria(resultado, duracion_ms)
+        return resultado
+    
+    def _opinar_medido(self, decision: Decision, contexto: Dict) -> Tuple[Opinion, float]:
+        """Ejecuta opinar() sin telemetría y retorna (opinión, duración en ms)."""
+        local = self._telemetria_local
+        local.revisando = True  # La envoltura no registra llamadas anidadas
+        inicio = time.perf_counter()
+        try:
+            resultado = self.opinar(decision, contexto)
+        finally:
+            local.revisando = False
+        return resultado, (time.perf_counter() - inicio) * 1000
+    
+    async def arevisar(self, decision: Decision, contexto: Dict) -> Dict:
+        """Variante asíncrona de revisar()."""
+        opinion = await self.aopinar(decision, contexto)
+        return opinion.a_dict()
+    
+    def opinar_lote(self, decisiones: List[Decision],
+                    contextos: List[Dict]) -> List[Opinion]:
+        """
+        Opina sobre una columna completa de decisiones (una por mensaje).
+        
+        Por defecto delega en opinar(); las consejeras pueden
+        sobreescribirlo si tienen una forma más eficiente por lotes.
+        """
+        return [
+            self.opinar(decision, contexto)
+            for decision, contexto in zip(decisiones, contextos)
+        ]
+    
+    def revisar_lote(self, decisiones: List[Decision],
+                     contextos: List[Dict]) -> List[Dict]:
+        """Como opinar_lote(), pero con el texto de cada opinión."""
+        return [
+            opinion.a_dict()
+            for opinion in self.opinar_lote(decisiones, contextos)
+        ]
+    
+    def _opinion(self, aprobada: bool, confianza: float,
+                 codigos: Tuple[str, ...] = (), veto: bool = False,
+                 principio_violado: Optional[Principio] = None,
+                 datos: Optional[Dict] = None) -> Opinion:
+        """Crea una Opinion de esta consejera (se renderiza con _renderizar)."""
+        return Opinion(
+            consejera=self.nombre,
+            aprobada=aprobada,
+            veto=veto,
+            confianza=confianza,
+            codigos=codigos,
+            principio_violado=principio_violado,
+            datos=datos,
+            renderizador=self._renderizar
+        )
+    
+    def palabras_clave(self) -> Set[str]:
+        """
+        Palabras que la consejera busca en el texto.
+        
+        El gestor las usa para escanear cada texto una sola vez en la
+        revisión por lotes. Cada consejera que busca palabras declara
+        las suyas; por defecto no busca ninguna.
+        """
+        return set()
+    
+    def _analizar_texto(self, contexto: Dict) -> TextoAnalizado:
+        """Extrae el texto original del contexto (en minúsculas)."""
+        traduccion = contexto.get('traduccion', {})
+        texto = traduccion.get('texto_original', '').lower()
+        return TextoAnalizado(texto, contexto.get('palabras_detectadas'))
+    
     def activar(self):
         """Activa la consejera."""
         self.activa = True
@@ -70,6 +270,50 @@ class Consejera(ABC):
         if veto:
             self.vetos_aplicados += 1
     
+    def registrar_abstencion(self):
+        """Registra que la consejera no opinó dentro del plazo."""
+        self.abstenciones += 1
+    
+    def registrar_regla(self, regla: str):
+        """Cuenta que una regla de detección se activó."""
+        self.reglas_activadas[regla] = self.reglas_activadas.get(regla, 0) + 1
+    
+    def _registrar_telemetria(self, opinion: Opinion, duracion_ms: float):
+        """Actualiza conteos, reglas y latencia tras una revisión."""
+        self.registrar_revision(opinion.aprobada, opinion.veto)
+        
+        for codigo in opinion.codigos:
+            self.registrar_regla(codigo)
+        
+        self.latencia_total_ms += duracion_ms
+        if duracion_ms > self.latencia_max_ms:
+            self.latencia_max_ms = duracion_ms
+        self.histograma_latencia[bisect_left(BUCKETS_LATENCIA_MS, duracion_ms)] += 1
+        
+        if opinion.veto:
+            if opinion.principio_violado is not None:
+                razon = opinion.principio_violado.name
+            else:
+                razon = opinion.codigos[0] if opinion.codigos else 'SIN_RAZON'
+            self.razones_veto[razon] = self.razones_veto.get(razon, 0) + 1
+    
+    def _estadisticas_latencia(self) -> Dict:
+        """Resumen de latencia de opinar()."""
+        etiquetas = [f'<={limite}ms' for limite in BUCKETS_LATENCIA_MS]
+        etiquetas.append(f'>{BUCKETS_LATENCIA_MS[-1]}ms')
+        
+        if self.revisiones_realizadas > 0:
+            promedio = self.latencia_total_ms / self.revisiones_realizadas
+        else:
+            promedio = 0.0
+        
+        return {
+            'total_ms': round(self.latencia_total_ms, 3),
+            'promedio_ms': round(promedio, 4),
+            'max_ms': round(self.latencia_max_ms, 3),
+            'histograma': dict(zip(etiquetas, self.histograma_latencia))
+        }
+    
     def estadisticas(self) -> Dict:
         """Retorna estadísticas de la consejera."""
         # Calcular tasa de veto
@@ -85,8 +329,36 @@ class Consejera(ABC):
             'revisiones': self.revisiones_realizadas,
             'vetos': self.vetos_aplicados,
             'opiniones': self.opiniones_dadas,
-            'tasa_veto': round(tasa_veto, 2)  # ← AGREGADO
+            'tasa_veto': round(tasa_veto, 2),  # ← AGREGADO
+            'errores': self.errores,
+            'abstenciones': self.abstenciones,
+            'latencia': self._estadisticas_latencia(),
+            'reglas': dict(self.reglas_activadas),
+            'razones_veto': dict(self.razones_veto)
         }
     
     def __repr__(self) -> str:
-        return f"<{self.nombre} ({self.especialidad})>"
\ No newline at end of file
+        return f"<{self.nombre} ({self.especialidad})>"
+
+
+class ConsejeraAsincrona(Consejera):
+    """
+    Consejera cuyo análisis es lento o externo (modelo local, servicio).
+    
+    Las subclases implementan aopinar() como corrutina. opinar() queda
+    como adaptador síncrono para el flujo clásico (revisar(),
+    consultar_todas()); no debe llamarse desde un bucle de eventos en
+    ejecución: ahí se usa aopinar() directamente.
+    """
+    
+    @abstractmethod
+    async def aopinar(self, decision: Decision, contexto: Dict) -> Opinion:
+        """Revisa una decisión sin bloquear el bucle de eventos."""
+        pass
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
+        """Adaptador síncrono: ejecuta aopinar() hasta terminar."""
+        return asyncio.run(self.aopinar(decision, contexto))
+    
+    # La telemetría ya la lleva aopinar(): no envolver el adaptador
+    opinar._con_telemetria = True
@@ -3,8 +3,9 @@ Echo - Consejera Lógica.
 
 Especialidad: Razonamiento puro, consistencia lógica, detección de falacias.
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 from consejeras.base_consejera import Consejera
+from consejeras.opinion import Opinion
 from razonamiento.tipos_decision import Decision
 
 class Echo(Consejera):
@@ -34,7 +35,14 @@ class Echo(Consejera):
             'contradice', 'opuesto', 'contrario'
         ]
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def palabras_clave(self) -> Set[str]:
+        """Palabras que busca en el texto."""
+        return set(
+            self.conectores_logicos +
+            self.palabras_contradiccion
+        )
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa desde perspectiva lógica.
         
@@ -43,46 +51,55 @@ class Echo(Consejera):
         - Contradicciones
         - Razonamiento inconsistente
         """
-        self.revisiones_realizadas += 1
-        self.opiniones_dadas += 1
-        
-        traduccion = contexto.get('traduccion', {})
-        texto_original = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # Detectar estructura lógica
-        tiene_logica = any(conector in texto_original for conector in self.conectores_logicos)
-        tiene_contradiccion = any(palabra in texto_original for palabra in self.palabras_contradiccion)
+        codigos = []
+        if texto.contiene_alguna(self.conectores_logicos):
+            codigos.append('ESTRUCTURA_LOGICA')
+        if texto.contiene_alguna(self.palabras_contradiccion):
+            codigos.append('CONTRADICCION')
         
-        if tiene_logica or tiene_contradiccion:
-            return self._generar_opinion_logica(texto_original, tiene_contradiccion)
+        if not codigos:
+            confianza = 0.5
+        elif 'CONTRADICCION' in codigos:
+            confianza = 0.7
         else:
-            return self._generar_opinion_neutral()
+            confianza = 0.8
+        
+        return self._opinion(True, confianza, tuple(codigos))
+    
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la opinión lógica."""
+        if opinion.codigos:
+            return self._generar_opinion_logica(
+                opinion, 'CONTRADICCION' in opinion.codigos
+            )
+        return self._generar_opinion_neutral(opinion)
     
-    def _generar_opinion_logica(self, texto: str, tiene_contradiccion: bool) -> Dict:
+    def _generar_opinion_logica(self, opinion: Opinion, tiene_contradiccion: bool) -> Dict:
         """Genera opinión sobre estructura lógica."""
         if tiene_contradiccion:
-            opinion = "Detectada posible contradicción o estructura lógica compleja."
+            texto_opinion = "Detectada posible contradicción o estructura lógica compleja."
             sugerencias = [
                 "Verificar consistencia del razonamiento",
                 "Identificar si hay contradicción real",
                 "Clarificar relaciones lógicas"
             ]
-            confianza = 0.7
         else:
-            opinion = "Detectada estructura lógica (si/entonces). Validar coherencia."
+            texto_opinion = "Detectada estructura lógica (si/entonces). Validar coherencia."
             sugerencias = [
                 "Verificar premisas",
                 "Validar implicaciones",
                 "Asegurar conclusión lógica"
             ]
-            confianza = 0.8
         
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
-            'opinion': opinion,
-            'confianza': confianza,
+            'opinion': texto_opinion,
+            'confianza': opinion.confianza,
             'razonamiento': [
                 "1. Análisis: estructura lógica detectada",
                 f"2. Contradicción potencial: {tiene_contradiccion}",
@@ -91,14 +108,14 @@ class Echo(Consejera):
             'sugerencias': sugerencias
         }
     
-    def _generar_opinion_neutral(self) -> Dict:
+    def _generar_opinion_neutral(self, opinion: Opinion) -> Dict:
         """Genera opinión neutral (no hay estructura lógica compleja)."""
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
             'opinion': 'Sin estructura lógica compleja detectada.',
-            'confianza': 0.5,
+            'confianza': opinion.confianza,
             'razonamiento': ["No hay conectores lógicos o contradicciones evidentes"],
             'sugerencias': []
         }
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Escáner de Palabras Clave - Detección compartida por las consejeras.
+
+Todas las consejeras buscan listas de palabras dentro del texto original
+(`any(palabra in texto for palabra in lista)`). Para revisar lotes grandes,
+el escáner compila TODAS las palabras en una sola expresión y recorre cada
+texto una única vez, obteniendo el conjunto de palabras presentes.
+"""
+import re
+from typing import FrozenSet, Iterable, List, Optional
+
+class EscanerPalabras:
+    """
+    Detecta en una sola pasada qué palabras clave aparecen en un texto.
+
+    Mantiene la semántica de subcadena de las consejeras:
+    una palabra está presente si aparece en cualquier posición del texto
+    (por eso 'todo' se detecta dentro de 'todos').
+    """
+
+    def __init__(self, palabras: Iterable[str]):
+        """
+        Args:
+            palabras: Vocabulario a detectar (se normaliza a minúsculas)
+        """
+        self.palabras: FrozenSet[str] = frozenset(p.lower() for p in palabras if p)
+
+        # Más largas primero: en cada posición el lookahead captura la
+        # palabra más larga que empieza ahí
+        ordenadas = sorted(self.palabras, key=lambda p: (-len(p), p))
+        self._patron = None
+        if ordenadas:
+            alternativas = '|'.join(re.escape(p) for p in ordenadas)
+            self._patron = re.compile(f'(?=({alternativas}))')
+
+        # Cualquier otra palabra que empiece en la misma posición es
+        # prefijo de la capturada → se agrega sin volver a buscar
+        self._prefijos = {
+            palabra: frozenset(p for p in self.palabras if palabra.startswith(p))
+            for palabra in self.palabras
+        }
+
+    def escanear(self, texto: str) -> FrozenSet[str]:
+        """
+        Retorna las palabras del vocabulario presentes en el texto.
+
+        Args:
+            texto: Texto ya normalizado a minúsculas
+        """
+        if self._patron is None or not texto:
+            return frozenset()
+
+        capturadas = {m.group(1) for m in self._patron.finditer(texto)}
+
+        detectadas = set()
+        for palabra in capturadas:
+            detectadas.update(self._prefijos[palabra])
+
+        return frozenset(detectadas)
+
+    def escanear_lote(self, textos: Iterable[str]) -> List[FrozenSet[str]]:
+        """Escanea varios textos, uno por posición."""
+        return [self.escanear(texto) for texto in textos]
+
+
+class TextoAnalizado:
+    """
+    Texto de un mensaje tal como lo ven las consejeras.
+
+    Si el gestor ya escaneó el texto (revisión por lotes), las búsquedas
+    se responden con el conjunto de palabras detectadas; si no, se busca
+    directamente en el texto como siempre.
+    """
+
+    __slots__ = ('texto', 'detectadas')
+
+    def __init__(self, texto: str, detectadas: Optional[FrozenSet[str]] = None):
+        self.texto = texto
+        self.detectadas = detectadas
+
+    def contiene_alguna(self, palabras: Iterable[str]) -> bool:
+        """¿Aparece alguna de las palabras en el texto?"""
+        if self.detectadas is not None:
+            return not self.detectadas.isdisjoint(palabras)
+        return any(palabra in self.texto for palabra in palabras)
+
+    def __repr__(self) -> str:
+        return f"TextoAnalizado({self.texto[:30]!r})"
@@ -3,8 +3,13 @@ Gestor de Consejeras - Coordina todas las consejeras de Belladonna.
 
 FASE 2: 7 Consejeras activas.
 """
-from typing import List, Dict
+from collections import ChainMap
+from typing import List, Dict, Optional
+import asyncio
+import time
 from consejeras.base_consejera import Consejera
+from consejeras.escaner import EscanerPalabras
+from consejeras.opinion import Opinion
 from consejeras.vega import Vega
 from consejeras.nova import Nova
 from consejeras.echo import Echo
@@ -32,6 +37,9 @@ class GestorConsejeras:
         self.fase = fase
         self.consejeras: List[Consejera] = []
         self._cargar_consejeras()
+        
+        # Escáner compartido para revisión por lotes (se crea al primer uso)
+        self._escaner: Optional[EscanerPalabras] = None
     
     def _cargar_consejeras(self):
         """Carga consejeras según fase."""
@@ -48,7 +56,8 @@ class GestorConsejeras:
             self.consejeras.append(Iris())  # Visión
             self.consejeras.append(Sage())  # Síntesis (ÚLTIMA)
     
-    def consultar_todas(self, decision: Decision, contexto: Dict) -> Dict:
+    def consultar_todas(self, decision: Decision, contexto: Dict,
+                        detallado: bool = True) -> Dict:
         """
         Consulta a TODAS las consejeras en orden.
         
@@ -57,61 +66,268 @@ class GestorConsejeras:
         2. Nova, Echo, Lyra, Luna, Iris (opinan)
         3. Sage (sintetiza todo)
         
+        Args:
+            decision: Decision del motor de razonamiento
+            contexto: Contexto (con 'traduccion')
+            detallado: Si es False, las opiniones se devuelven como Opinion
+                compactas (el texto se genera solo si se accede a él). Por
+                defecto son dicts con su texto, como siempre.
+                'sugerencias_finales' es siempre una lista (en modo compacto
+                se obtiene renderizando la síntesis)
+        
         Returns:
             {
                 'aprobada': bool,
                 'veto': bool,
                 'veto_por': str or None,
-                'opiniones': List[Dict],
+                'opiniones': List[Dict],  # List[Opinion] si no detallado
                 'sintesis': Dict,
                 'sugerencias_finales': List[str]
             }
         """
-        opiniones = []
+        opiniones: List[Opinion] = []
         
         # 1. Vega primero (puede vetar)
         if self.consejeras:
             vega = self.consejeras[0]  # Vega es siempre la primera
-            opinion_vega = vega.revisar(decision, contexto)
+            opinion_vega = vega.opinar(decision, contexto)
             opiniones.append(opinion_vega)
             
-            if opinion_vega.get('veto', False):
+            if opinion_vega.veto:
                 # VETO - detener consulta
-                return {
-                    'aprobada': False,
-                    'veto': True,
-                    'veto_por': vega.nombre,
-                    'opiniones': [opinion_vega],
-                    'sintesis': opinion_vega,
-                    'sugerencias_finales': opinion_vega.get('sugerencias', [])
-                }
+                return self._veredicto(opiniones, vega.nombre, detallado)
         
         # 2. Consultar demás consejeras (excepto Sage)
         for consejera in self.consejeras[1:-1]:  # Todas menos Vega y Sage
-            opinion = consejera.revisar(decision, contexto)
-            opiniones.append(opinion)
+            opiniones.append(consejera.opinar(decision, contexto))
         
         # 3. Sage al final (sintetiza)
         if len(self.consejeras) > 1:
             sage = self.consejeras[-1]  # Sage es siempre la última
-            contexto_sage = contexto.copy()
-            contexto_sage['opiniones_consejeras'] = opiniones
-            
-            sintesis = sage.revisar(decision, contexto_sage)
-            opiniones.append(sintesis)
-        else:
-            # Sin Sage, usar opinión de Vega como síntesis
-            sintesis = opiniones[0] if opiniones else {}
+            contexto_sage = ChainMap({'opiniones_consejeras': opiniones}, contexto)
+            opiniones.append(sage.opinar(decision, contexto_sage))
         
         # 4. Generar resultado final
-        return {
-            'aprobada': sintesis.get('aprobada', True),
-            'veto': False,  # No hay veto si llegamos aquí
-            'veto_por': None,
+        return self._veredicto(opiniones, None, detallado)
+    
+    async def aconsultar_todas(self, decision: Decision, contexto: Dict,
+                               plazo: float = 1.0, detallado: bool = True) -> Dict:
+        """
+        Consulta a todas las consejeras sin pasar del plazo.
+        
+        Las consejeras intermedias opinan a la vez; las que no terminan
+        antes del plazo se cancelan y cuentan como abstenciones (igual que
+        las que fallan). Una consejera síncrona corre en un hilo que no se
+        puede interrumpir: termina en segundo plano, pero su resultado se
+        descarta y no se registra como revisión.
+        
+        Vega y Sage quedan FUERA del plazo: se ejecutan en línea y siempre
+        opinan. Vega es la puerta de seguridad (no se puede saltar) y Sage
+        solo mira banderas; ambas son síncronas y tardan microsegundos. Si
+        Vega agotara el plazo, las intermedias se abstienen todas.
+        
+        Args:
+            decision: Decision del motor de razonamiento
+            contexto: Contexto (con 'traduccion')
+            plazo: Segundos máximos para las consejeras intermedias (ver arriba)
+            detallado: Igual que en consultar_todas()
+        
+        Returns:
+            Mismo formato que consultar_todas(), más
+            'abstenciones': List[str] (nombres de las consejeras)
+        """
+        loop = asyncio.get_running_loop()
+        limite = loop.time() + plazo
+        opiniones: List[Opinion] = []
+        abstenciones: List[str] = []
+        
+        # 1. Vega primero (puede vetar)
+        if self.consejeras:
+            vega = self.consejeras[0]
+            opinion_vega = vega.opinar(decision, contexto)
+            opiniones.append(opinion_vega)
+            
+            if opinion_vega.veto:
+                return self._veredicto(opiniones, vega.nombre, detallado, abstenciones)
+        
+        # 2. Demás consejeras (excepto Sage) en paralelo, con plazo
+        tareas = {
+            asyncio.create_task(consejera.aopinar(decision, contexto)): consejera
+            for consejera in self.consejeras[1:-1]
+        }
+        if tareas:
+            restante = max(0.0, limite - loop.time())
+            _, pendientes = await asyncio.wait(tareas, timeout=restante)
+            
+            for tarea in pendientes:
+                tarea.cancel()
+            # Esperar a que las canceladas terminen de cancelarse
+            await asyncio.gather(*pendientes, return_exceptions=True)
+            
+            # Mantener el orden de consulta
+            for tarea, consejera in tareas.items():
+                if tarea in pendientes or tarea.exception() is not None:
+                    consejera.registrar_abstencion()
+                    abstenciones.append(consejera.nombre)
+                else:
+                    opiniones.append(tarea.result())
+        
+        # 3. Sage al final (sintetiza)
+        if len(self.consejeras) > 1:
+            sage = self.consejeras[-1]
+            contexto_sage = ChainMap({'opiniones_consejeras': opiniones}, contexto)
+            opiniones.append(sage.opinar(decision, contexto_sage))
+        
+        return self._veredicto(opiniones, None, detallado, abstenciones)
+    
+    def _veredicto(self, opiniones: List[Opinion], veto_por: Optional[str],
+                   detallado: bool, abstenciones: Optional[List[str]] = None) -> Dict:
+        """
+        Arma el resultado de una consulta.
+        
+        La síntesis es la última opinión: la de Sage, o la de Vega si vetó.
+        """
+        if detallado:
+            opiniones = [opinion.a_dict() for opinion in opiniones]
+        
+        sintesis = opiniones[-1] if opiniones else {}
+        
+        veredicto = {
+            'aprobada': False if veto_por is not None else sintesis.get('aprobada', True),
+            'veto': veto_por is not None,
+            'veto_por': veto_por,
             'opiniones': opiniones,
             'sintesis': sintesis,
             'sugerencias_finales': sintesis.get('sugerencias', [])
         }
+        
+        if abstenciones is not None:
+            veredicto['abstenciones'] = abstenciones
+        
+        return veredicto
+    
+    def revisar_lote(self, decisiones: List[Decision],
+                     contextos: List[Dict], detallado: bool = True) -> Dict:
+        """
+        Revisa muchos mensajes a la vez (auditoría offline de transcripciones).
+        
+        A diferencia de llamar consultar_todas() mensaje por mensaje:
+        1. Cada texto se escanea UNA sola vez con las palabras clave de
+           todas las consejeras.
+        2. Las consejeras se evalúan por columnas: Vega revisa todo el lote,
+           luego cada consejera revisa los mensajes no vetados, y Sage
+           sintetiza al final.
+        
+        Args:
+            decisiones: Decisiones del motor, una por mensaje
+            contextos: Contextos (con 'traduccion'), uno por mensaje
+            detallado: Igual que en consultar_todas()
+        
+        Returns:
+            {
+                'veredictos': List[Dict],   # Mismo formato que consultar_todas
+                'estadisticas': Dict        # Agregados y throughput
+            }
+        """
+        if len(decisiones) != len(contextos):
+            raise ValueError(
+                f"Se esperaban tantos contextos como decisiones: "
+                f"{len(decisiones)} != {len(contextos)}"
+            )
+        
+        inicio = time.perf_counter()
+        total = len(decisiones)
+        
+        # 1. Escanear todos los textos una sola vez
+        escaner = self._obtener_escaner()
+        textos = [
+            contexto.get('traduccion', {}).get('texto_original', '').lower()
+            for contexto in contextos
+        ]
+        contextos_lote = [
+            {**contexto, 'palabras_detectadas': detectadas}
+            for contexto, detectadas in zip(contextos, escaner.escanear_lote(textos))
+        ]
+        
+        opiniones: List[List[Opinion]] = [[] for _ in range(total)]
+        veredictos: List[Optional[Dict]] = [None] * total
+        pendientes = list(range(total))
+        
+        # 2. Vega revisa toda la columna (puede vetar)
+        if self.consejeras:
+            vega = self.consejeras[0]
+            columna = vega.opinar_lote(decisiones, contextos_lote)
+            
+            pendientes = []
+            for i, opinion_vega in enumerate(columna):
+                opiniones[i].append(opinion_vega)
+                if opinion_vega.veto:
+                    veredictos[i] = self._veredicto(opiniones[i], vega.nombre, detallado)
+                else:
+                    pendientes.append(i)
+        
+        # 3. Demás consejeras (excepto Sage), columna por columna
+        decisiones_pendientes = [decisiones[i] for i in pendientes]
+        contextos_pendientes = [contextos_lote[i] for i in pendientes]
+        
+        for consejera in self.consejeras[1:-1]:
+            columna = consejera.opinar_lote(decisiones_pendientes, contextos_pendientes)
+            for i, opinion in zip(pendientes, columna):
+                opiniones[i].append(opinion)
+        
+        # 4. Sage sintetiza cada mensaje no vetado
+        if len(self.consejeras) > 1:
+            sage = self.consejeras[-1]
+            contextos_sage = [
+                ChainMap({'opiniones_consejeras': opiniones[i]}, contexto)
+                for i, contexto in zip(pendientes, contextos_pendientes)
+            ]
+            
+            columna = sage.opinar_lote(decisiones_pendientes, contextos_sage)
+            for i, sintesis in zip(pendientes, columna):
+                opiniones[i].append(sintesis)
+        
+        for i in pendientes:
+            veredictos[i] = self._veredicto(opiniones[i], None, detallado)
+        
+        duracion = time.perf_counter() - inicio
+        
+        return {
+            'veredictos': veredictos,
+            'estadisticas': self._estadisticas_lote(veredictos, duracion)
+        }
+    
+    def _obtener_escaner(self) -> EscanerPalabras:
+        """Construye (una vez) el escáner con las palabras de todas las consejeras."""
+        if self._escaner is None:
+            palabras = set()
+            for consejera in self.consejeras:
+                palabras.update(consejera.palabras_clave())
+            self._escaner = EscanerPalabras(palabras)
+        return self._escaner
+    
+    def _estadisticas_lote(self, veredictos: List[Dict], duracion: float) -> Dict:
+        """Agrega resultados de un lote."""
+        total = len(veredictos)
+        vetadas = sum(1 for v in veredictos if v['veto'])
+        aprobadas = sum(1 for v in veredictos if v['aprobada'])
+        
+        vetos_por_consejera: Dict[str, int] = {}
+        for v in veredictos:
+            if v['veto']:
+                vetos_por_consejera[v['veto_por']] = vetos_por_consejera.get(v['veto_por'], 0) + 1
+        
+        return {
+            'total': total,
+            'aprobadas': aprobadas,
+            'vetadas': vetadas,
+            'rechazadas_sin_veto': total - aprobadas - vetadas,
+            'tasa_aprobacion': round(aprobadas / total, 4) if total else 0.0,
+            'tasa_veto': round(vetadas / total, 4) if total else 0.0,
+            'vetos_por_consejera': vetos_por_consejera,
+            'duracion_segundos': duracion,
+            'mensajes_por_segundo': round(total / duracion, 1) if duracion > 0 else 0.0
+        }
     
     def obtener_consejera(self, nombre: str) -> Consejera:
         """Obtiene una consejera por nombre."""
@@ -131,6 +347,25 @@ class GestorConsejeras:
         for consejera in self.consejeras:
             stats['consejeras'].append(consejera.estadisticas())
         
+        # ¿Qué consejera domina la latencia del turno?
+        ranking = sorted(
+            ((c['nombre'], c['latencia']['total_ms']) for c in stats['consejeras']),
+            key=lambda par: par[1],
+            reverse=True
+        )
+        latencia_total = sum(ms for _, ms in ranking)
+        
+        stats['latencia_total_ms'] = round(latencia_total, 3)
+        stats['ranking_latencia'] = [
+            {
+                'nombre': nombre,
+                'total_ms': ms,
+                'porcentaje': round(ms / latencia_total * 100, 1) if latencia_total > 0 else 0.0
+            }
+            for nombre, ms in ranking
+        ]
+        stats['consejera_mas_lenta'] = ranking[0][0] if latencia_total > 0 else None
+        
         return stats
     
     def __repr__(self) -> str:
@@ -5,11 +5,21 @@ Especialidad: Perspectiva de largo plazo y consecuencias.
 Vigila: TRANSPARENCIA, VERIFICABILIDAD
 Puede vetar: NO
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 from consejeras.base_consejera import Consejera
 from razonamiento.tipos_decision import Decision, TipoDecision
+from consejeras.escaner import TextoAnalizado
+from consejeras.opinion import Opinion
 from core.principios import Principio
 
+# Texto de cada factor: (razonamiento, sugerencia)
+TEXTOS_FACTORES = {
+    'PERMANENCIA': ('Acción con efectos permanentes', 'Considerar reversibilidad'),
+    'IMPACTO_ALTO': ('Alto impacto detectado', 'Verificar comprensión completa'),
+    'PRECEDENTE': ('Esta decisión crea precedente', 'Asegurar consistencia futura'),
+    'AFECTA_APRENDIZAJE': ('Afecta aprendizaje futuro', 'Documentar para mejorar grounding')
+}
+
 class Iris(Consejera):
     """
     Iris - La Visionaria.
@@ -43,51 +53,47 @@ class Iris(Consejera):
             'importante', 'crítico', 'fundamental', 'esencial'
         ]
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def palabras_clave(self) -> Set[str]:
+        """Palabras que busca en el texto."""
+        return set(
+            self.palabras_permanencia +
+            self.palabras_impacto
+        )
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa desde perspectiva de largo plazo.
         
         Considera consecuencias futuras.
         """
-        self.revisiones_realizadas += 1
-        
-        traduccion = contexto.get('traduccion', {})
-        texto = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # Evaluar impacto
-        es_permanente = self._es_accion_permanente(texto)
-        tiene_impacto_alto = self._tiene_impacto_alto(texto, decision)
-        es_precedente = self._es_precedente(decision)
-        afecta_aprendizaje = self._afecta_aprendizaje(decision)
-        
-        if es_permanente or tiene_impacto_alto or es_precedente or afecta_aprendizaje:
-            return self._generar_opinion_vision(
-                decision,
-                es_permanente,
-                tiene_impacto_alto,
-                es_precedente,
-                afecta_aprendizaje
-            )
+        codigos = []
+        if self._es_accion_permanente(texto):
+            codigos.append('PERMANENCIA')
+        if self._tiene_impacto_alto(texto, decision):
+            codigos.append('IMPACTO_ALTO')
+        if self._es_precedente(decision):
+            codigos.append('PRECEDENTE')
+        if self._afecta_aprendizaje(decision):
+            codigos.append('AFECTA_APRENDIZAJE')
+        
+        if codigos:
+            confianza = min(0.55 + (len(codigos) * 0.10), 0.9)
         else:
-            self.opiniones_dadas += 1
-            return {
-                'consejera': self.nombre,
-                'aprobada': True,
-                'veto': False,
-                'opinion': 'Impacto a largo plazo aceptable',
-                'confianza': 0.6,
-                'razonamiento': ['Decisión no crea precedentes problemáticos'],
-                'sugerencias': []
-            }
+            confianza = 0.6
+        
+        return self._opinion(True, confianza, tuple(codigos))
     
-    def _es_accion_permanente(self, texto: str) -> bool:
+    def _es_accion_permanente(self, texto: TextoAnalizado) -> bool:
         """Detecta acciones permanentes."""
-        return any(palabra in texto for palabra in self.palabras_permanencia)
+        return texto.contiene_alguna(self.palabras_permanencia)
     
-    def _tiene_impacto_alto(self, texto: str, decision: Decision) -> bool:
+    def _tiene_impacto_alto(self, texto: TextoAnalizado, decision: Decision) -> bool:
         """Detecta acciones de alto impacto."""
         # Palabras de impacto en texto
-        impacto_texto = any(palabra in texto for palabra in self.palabras_impacto)
+        impacto_texto = texto.contiene_alguna(self.palabras_impacto)
         
         # Decisiones con certeza muy alta son de impacto
         impacto_certeza = decision.certeza >= 0.95
@@ -111,42 +117,39 @@ class Iris(Consejera):
         # Por ahora, decisiones con grounding bajo afectan aprendizaje
         return decision.grounding_promedio < 0.5
     
-    def _generar_opinion_vision(self, decision: Decision,
-                                permanente: bool,
-                                impacto_alto: bool,
-                                precedente: bool,
-                                afecta_aprendizaje: bool) -> Dict:
-        """Genera opinión con visión de futuro."""
-        self.opiniones_dadas += 1
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la opinión de largo plazo."""
+        if opinion.codigos:
+            return self._generar_opinion_vision(opinion)
         
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': 'Impacto a largo plazo aceptable',
+            'confianza': opinion.confianza,
+            'razonamiento': ['Decisión no crea precedentes problemáticos'],
+            'sugerencias': []
+        }
+    
+    def _generar_opinion_vision(self, opinion: Opinion) -> Dict:
+        """Genera opinión con visión de futuro."""
         razonamiento = []
         sugerencias = []
         
-        if permanente:
-            razonamiento.append('Acción con efectos permanentes')
-            sugerencias.append('Considerar reversibilidad')
-        
-        if impacto_alto:
-            razonamiento.append('Alto impacto detectado')
-            sugerencias.append('Verificar comprensión completa')
-        
-        if precedente:
-            razonamiento.append('Esta decisión crea precedente')
-            sugerencias.append('Asegurar consistencia futura')
-        
-        if afecta_aprendizaje:
-            razonamiento.append('Afecta aprendizaje futuro')
-            sugerencias.append('Documentar para mejorar grounding')
+        for codigo in opinion.codigos:
+            razon, sugerencia = TEXTOS_FACTORES[codigo]
+            razonamiento.append(razon)
+            sugerencias.append(sugerencia)
         
-        señales = sum([permanente, impacto_alto, precedente, afecta_aprendizaje])
-        confianza = min(0.55 + (señales * 0.10), 0.9)
+        señales = len(opinion.codigos)
         
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
             'opinion': f'Consideraciones de largo plazo ({señales} factores)',
-            'confianza': confianza,
+            'confianza': opinion.confianza,
             'razonamiento': razonamiento,
             'sugerencias': sugerencias
         }
\ No newline at end of file
@@ -5,11 +5,21 @@ Especialidad: Detectar patrones no obvios y señales sutiles.
 Vigila: Todos los principios (perspectiva holística)
 Puede vetar: NO
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 from consejeras.base_consejera import Consejera
 from razonamiento.tipos_decision import Decision, TipoDecision
+from consejeras.escaner import TextoAnalizado
+from consejeras.opinion import Opinion
 from core.principios import Principio
 
+# Texto de cada patrón: (razonamiento, sugerencia)
+TEXTOS_PATRONES = {
+    'URGENCIA': ('Detectada urgencia inusual', 'Verificar si es petición legítima'),
+    'AMBIGUEDAD': ('Lenguaje demasiado ambiguo', 'Solicitar clarificación'),
+    'EVASION': ('Usuario parece evasivo', 'Proceder con precaución'),
+    'INCOHERENCIA': ('Incoherencia detectada en flujo', 'Revisar decisión cuidadosamente')
+}
+
 class Luna(Consejera):
     """
     Luna - La Intuitiva.
@@ -44,56 +54,55 @@ class Luna(Consejera):
             'después', 'luego', 'tal vez', 'quizás', 'no importa'
         ]
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def palabras_clave(self) -> Set[str]:
+        """Palabras que busca en el texto."""
+        return set(
+            self.palabras_urgencia_sospechosa +
+            self.palabras_ambiguas +
+            self.palabras_evasivas
+        )
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa desde intuición.
         
         Detecta patrones sutiles que otros no ven.
         """
-        self.revisiones_realizadas += 1
-        
         traduccion = contexto.get('traduccion', {})
-        texto = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # Detectar patrones
-        urgencia_sospechosa = self._detectar_urgencia_sospechosa(texto)
-        tiene_ambiguedad = self._detectar_ambiguedad(texto)
-        es_evasivo = self._detectar_evasion(texto)
+        codigos = []
+        if self._detectar_urgencia_sospechosa(texto):
+            codigos.append('URGENCIA')
+        if self._detectar_ambiguedad(texto):
+            codigos.append('AMBIGUEDAD')
+        if self._detectar_evasion(texto):
+            codigos.append('EVASION')
         
         # Detectar incoherencias
-        incoherencia = self._detectar_incoherencia(decision, traduccion)
+        if self._detectar_incoherencia(decision, traduccion):
+            codigos.append('INCOHERENCIA')
         
-        if urgencia_sospechosa or tiene_ambiguedad or es_evasivo or incoherencia:
-            return self._generar_opinion_intuitiva(
-                decision,
-                urgencia_sospechosa,
-                tiene_ambiguedad,
-                es_evasivo,
-                incoherencia
-            )
+        if codigos:
+            confianza = min(0.5 + (len(codigos) * 0.12), 0.9)
         else:
-            self.opiniones_dadas += 1
-            return {
-                'consejera': self.nombre,
-                'aprobada': True,
-                'veto': False,
-                'opinion': 'No detecto patrones preocupantes',
-                'confianza': 0.6,
-                'razonamiento': ['Mensaje parece directo y coherente'],
-                'sugerencias': []
-            }
+            confianza = 0.6
+        
+        # No veta, solo advierte
+        return self._opinion(True, confianza, tuple(codigos))
     
-    def _detectar_urgencia_sospechosa(self, texto: str) -> bool:
+    def _detectar_urgencia_sospechosa(self, texto: TextoAnalizado) -> bool:
         """Detecta urgencia sospechosa."""
-        return any(palabra in texto for palabra in self.palabras_urgencia_sospechosa)
+        return texto.contiene_alguna(self.palabras_urgencia_sospechosa)
     
-    def _detectar_ambiguedad(self, texto: str) -> bool:
+    def _detectar_ambiguedad(self, texto: TextoAnalizado) -> bool:
         """Detecta lenguaje ambiguo."""
-        return any(palabra in texto for palabra in self.palabras_ambiguas)
+        return texto.contiene_alguna(self.palabras_ambiguas)
     
-    def _detectar_evasion(self, texto: str) -> bool:
+    def _detectar_evasion(self, texto: TextoAnalizado) -> bool:
         """Detecta lenguaje evasivo."""
-        return any(palabra in texto for palabra in self.palabras_evasivas)
+        return texto.contiene_alguna(self.palabras_evasivas)
     
     def _detectar_incoherencia(self, decision: Decision, traduccion: Dict) -> bool:
         """Detecta incoherencias entre mensaje y decisión."""
@@ -109,42 +118,39 @@ class Luna(Consejera):
         
         return False
     
-    def _generar_opinion_intuitiva(self, decision: Decision,
-                                   urgencia: bool,
-                                   ambiguedad: bool,
-                                   evasion: bool,
-                                   incoherencia: bool) -> Dict:
-        """Genera opinión intuitiva."""
-        self.opiniones_dadas += 1
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la opinión intuitiva."""
+        if opinion.codigos:
+            return self._generar_opinion_intuitiva(opinion)
         
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': 'No detecto patrones preocupantes',
+            'confianza': opinion.confianza,
+            'razonamiento': ['Mensaje parece directo y coherente'],
+            'sugerencias': []
+        }
+    
+    def _generar_opinion_intuitiva(self, opinion: Opinion) -> Dict:
+        """Genera opinión intuitiva."""
         razonamiento = []
         sugerencias = []
         
-        if urgencia:
-            razonamiento.append('Detectada urgencia inusual')
-            sugerencias.append('Verificar si es petición legítima')
-        
-        if ambiguedad:
-            razonamiento.append('Lenguaje demasiado ambiguo')
-            sugerencias.append('Solicitar clarificación')
-        
-        if evasion:
-            razonamiento.append('Usuario parece evasivo')
-            sugerencias.append('Proceder con precaución')
-        
-        if incoherencia:
-            razonamiento.append('Incoherencia detectada en flujo')
-            sugerencias.append('Revisar decisión cuidadosamente')
+        for codigo in opinion.codigos:
+            razon, sugerencia = TEXTOS_PATRONES[codigo]
+            razonamiento.append(razon)
+            sugerencias.append(sugerencia)
         
-        señales = sum([urgencia, ambiguedad, evasion, incoherencia])
-        confianza = min(0.5 + (señales * 0.12), 0.9)
+        señales = len(opinion.codigos)
         
         return {
             'consejera': self.nombre,
-            'aprobada': True,  # No veta, solo advierte
+            'aprobada': opinion.aprobada,
             'veto': False,
             'opinion': f'Patrones sutiles detectados ({señales} señales)',
-            'confianza': confianza,
+            'confianza': opinion.confianza,
             'razonamiento': razonamiento,
             'sugerencias': sugerencias
         }
\ No newline at end of file
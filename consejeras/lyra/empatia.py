@@ -5,11 +5,23 @@ Especialidad: Detectar necesidades emocionales del usuario.
 Vigila: RESPETO, HUMILDAD
 Puede vetar: NO
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 from consejeras.base_consejera import Consejera
 from razonamiento.tipos_decision import Decision
+from consejeras.escaner import TextoAnalizado
+from consejeras.opinion import Opinion
 from core.principios import Principio
 
+# Texto de cada señal: (razonamiento, sugerencias)
+TEXTOS_SEÑALES = {
+    'FRUSTRACION': ('Usuario muestra frustración',
+                    ('Usar tono más paciente', 'Ofrecer alternativas simples')),
+    'NECESIDAD_AYUDA': ('Usuario solicita ayuda',
+                        ('Ser especialmente claro', 'Ofrecer ejemplos concretos')),
+    'CONFUSION': ('Usuario expresa confusión',
+                  ('Simplificar explicación', 'Verificar comprensión'))
+}
+
 class Lyra(Consejera):
     """
     Lyra - La Empática.
@@ -50,84 +62,83 @@ class Lyra(Consejera):
             'no sé', 'cómo', 'por qué'
         ]
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def palabras_clave(self) -> Set[str]:
+        """Palabras que busca en el texto."""
+        return set(
+            self.palabras_frustracion +
+            self.palabras_necesidad_ayuda +
+            self.palabras_confusion
+        )
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa desde perspectiva empática.
         
         NO veta. Solo sugiere ajustes de tono.
         """
-        self.revisiones_realizadas += 1
-        
-        traduccion = contexto.get('traduccion', {})
-        texto = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # Detectar señales emocionales
-        frustracion = self._detectar_frustracion(texto)
-        necesita_ayuda = self._detectar_necesidad_ayuda(texto)
-        confusion = self._detectar_confusion(texto)
+        codigos = []
+        if self._detectar_frustracion(texto):
+            codigos.append('FRUSTRACION')
+        if self._detectar_necesidad_ayuda(texto):
+            codigos.append('NECESIDAD_AYUDA')
+        if self._detectar_confusion(texto):
+            codigos.append('CONFUSION')
         
-        if frustracion or necesita_ayuda or confusion:
-            return self._generar_opinion_empatica(
-                decision, frustracion, necesita_ayuda, confusion
-            )
+        if codigos:
+            confianza = min(0.6 + (len(codigos) * 0.15), 1.0)
         else:
-            self.opiniones_dadas += 1
-            return {
-                'consejera': self.nombre,
-                'aprobada': True,
-                'veto': False,
-                'opinion': 'Tono apropiado',
-                'confianza': 0.7,
-                'razonamiento': ['Usuario no muestra señales emocionales negativas'],
-                'sugerencias': []
-            }
+            confianza = 0.7
+        
+        return self._opinion(True, confianza, tuple(codigos))
     
-    def _detectar_frustracion(self, texto: str) -> bool:
+    def _detectar_frustracion(self, texto: TextoAnalizado) -> bool:
         """Detecta frustración."""
-        return any(palabra in texto for palabra in self.palabras_frustracion)
+        return texto.contiene_alguna(self.palabras_frustracion)
     
-    def _detectar_necesidad_ayuda(self, texto: str) -> bool:
+    def _detectar_necesidad_ayuda(self, texto: TextoAnalizado) -> bool:
         """Detecta necesidad de ayuda."""
-        return any(palabra in texto for palabra in self.palabras_necesidad_ayuda)
+        return texto.contiene_alguna(self.palabras_necesidad_ayuda)
     
-    def _detectar_confusion(self, texto: str) -> bool:
+    def _detectar_confusion(self, texto: TextoAnalizado) -> bool:
         """Detecta confusión."""
-        return any(palabra in texto for palabra in self.palabras_confusion)
+        return texto.contiene_alguna(self.palabras_confusion)
     
-    def _generar_opinion_empatica(self, decision: Decision,
-                                   frustracion: bool,
-                                   necesita_ayuda: bool,
-                                   confusion: bool) -> Dict:
-        """Genera opinión con sugerencias empáticas."""
-        self.opiniones_dadas += 1
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la opinión empática."""
+        if opinion.codigos:
+            return self._generar_opinion_empatica(opinion)
         
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': 'Tono apropiado',
+            'confianza': opinion.confianza,
+            'razonamiento': ['Usuario no muestra señales emocionales negativas'],
+            'sugerencias': []
+        }
+    
+    def _generar_opinion_empatica(self, opinion: Opinion) -> Dict:
+        """Genera opinión con sugerencias empáticas."""
         razonamiento = []
         sugerencias = []
         
-        if frustracion:
-            razonamiento.append('Usuario muestra frustración')
-            sugerencias.append('Usar tono más paciente')
-            sugerencias.append('Ofrecer alternativas simples')
-        
-        if necesita_ayuda:
-            razonamiento.append('Usuario solicita ayuda')
-            sugerencias.append('Ser especialmente claro')
-            sugerencias.append('Ofrecer ejemplos concretos')
-        
-        if confusion:
-            razonamiento.append('Usuario expresa confusión')
-            sugerencias.append('Simplificar explicación')
-            sugerencias.append('Verificar comprensión')
+        for codigo in opinion.codigos:
+            razon, sugerencias_codigo = TEXTOS_SEÑALES[codigo]
+            razonamiento.append(razon)
+            sugerencias.extend(sugerencias_codigo)
         
-        señales = sum([frustracion, necesita_ayuda, confusion])
-        confianza = min(0.6 + (señales * 0.15), 1.0)
+        señales = len(opinion.codigos)
         
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
             'opinion': f'Usuario necesita apoyo empático ({señales} señales)',
-            'confianza': confianza,
+            'confianza': opinion.confianza,
             'razonamiento': razonamiento,
             'sugerencias': sugerencias
         }
\ No newline at end of file
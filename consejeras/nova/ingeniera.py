@@ -3,8 +3,9 @@ Nova - Consejera Ingeniera.
 
 Especialidad: Soluciones técnicas, optimización, arquitectura.
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 from consejeras.base_consejera import Consejera
+from consejeras.opinion import Opinion
 from razonamiento.tipos_decision import Decision
 
 class Nova(Consejera):
@@ -35,7 +36,14 @@ class Nova(Consejera):
             'lento', 'ineficiente', 'roto'
         ]
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def palabras_clave(self) -> Set[str]:
+        """Palabras que busca en el texto."""
+        return set(
+            self.palabras_tecnicas +
+            self.palabras_problemas
+        )
+    
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa desde perspectiva técnica.
         
@@ -44,32 +52,37 @@ class Nova(Consejera):
         - Problemas a resolver
         - Oportunidades de optimización
         """
-        self.revisiones_realizadas += 1
-        self.opiniones_dadas += 1
-        
-        traduccion = contexto.get('traduccion', {})
-        texto_original = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # Detectar si es consulta técnica
-        es_tecnico = any(palabra in texto_original for palabra in self.palabras_tecnicas)
-        es_problema = any(palabra in texto_original for palabra in self.palabras_problemas)
+        codigos = []
+        if texto.contiene_alguna(self.palabras_tecnicas):
+            codigos.append('CONSULTA_TECNICA')
+        if texto.contiene_alguna(self.palabras_problemas):
+            codigos.append('PROBLEMA_TECNICO')
         
-        if es_tecnico or es_problema:
-            return self._generar_opinion_tecnica(texto_original, es_problema)
-        else:
-            return self._generar_opinion_neutral()
+        confianza = 0.8 if codigos else 0.5
+        return self._opinion(True, confianza, tuple(codigos))
+    
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la opinión técnica."""
+        if opinion.codigos:
+            return self._generar_opinion_tecnica(
+                opinion, 'PROBLEMA_TECNICO' in opinion.codigos
+            )
+        return self._generar_opinion_neutral(opinion)
     
-    def _generar_opinion_tecnica(self, texto: str, es_problema: bool) -> Dict:
+    def _generar_opinion_tecnica(self, opinion: Opinion, es_problema: bool) -> Dict:
         """Genera opinión técnica."""
         if es_problema:
-            opinion = "Detectada consulta técnica sobre un problema. Sugerir enfoque sistemático."
+            texto_opinion = "Detectada consulta técnica sobre un problema. Sugerir enfoque sistemático."
             sugerencias = [
                 "Identificar el problema específico",
                 "Analizar posibles causas",
                 "Proponer soluciones paso a paso"
             ]
         else:
-            opinion = "Detectada consulta técnica. Enfoque en solución clara y estructurada."
+            texto_opinion = "Detectada consulta técnica. Enfoque en solución clara y estructurada."
             sugerencias = [
                 "Explicar conceptos técnicos claramente",
                 "Proporcionar ejemplos concretos",
@@ -78,10 +91,10 @@ class Nova(Consejera):
         
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
-            'opinion': opinion,
-            'confianza': 0.8,
+            'opinion': texto_opinion,
+            'confianza': opinion.confianza,
             'razonamiento': [
                 f"1. Análisis: consulta técnica detectada",
                 f"2. Tipo: {'problema' if es_problema else 'consulta general'}",
@@ -90,14 +103,14 @@ class Nova(Consejera):
             'sugerencias': sugerencias
         }
     
-    def _generar_opinion_neutral(self) -> Dict:
+    def _generar_opinion_neutral(self, opinion: Opinion) -> Dict:
         """Genera opinión neutral (no es su especialidad)."""
         return {
             'consejera': self.nombre,
-            'aprobada': True,
+            'aprobada': opinion.aprobada,
             'veto': False,
             'opinion': 'Sin comentarios técnicos específicos.',
-            'confianza': 0.5,
+            'confianza': opinion.confianza,
             'razonamiento': ["No es consulta técnica"],
             'sugerencias': []
         }
\ No newline at end of file
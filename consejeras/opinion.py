@@ -0,0 +1,87 @@
+"""
+Opinión compacta de una consejera.
+
+En el camino caliente (consultar_todas) cada consejera produce una Opinion:
+banderas, confianza y códigos de razón. El texto legible (opinión,
+razonamiento, sugerencias) se genera SOLO cuando alguien lo pide
+(modo verbose, auditoría, revisar() clásico) y se guarda para no
+renderizarlo dos veces.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from core.principios import Principio
+
+# Claves que se responden sin renderizar texto
+_CAMPOS_DIRECTOS = ('consejera', 'aprobada', 'veto', 'confianza')
+
+@dataclass(slots=True, eq=False)
+class Opinion(Mapping):
+    """
+    Resultado compacto de revisar una decisión.
+
+    Se comporta como el dict clásico de solo lectura: opinion['veto']
+    es inmediato y opinion['sugerencias'] renderiza el texto la primera vez.
+    """
+    consejera: str
+    aprobada: bool
+    veto: bool
+    confianza: float
+    codigos: Tuple[str, ...] = ()                 # Reglas que se activaron
+    principio_violado: Optional[Principio] = None
+    datos: Optional[Dict] = None                  # Lo mínimo para renderizar
+    renderizador: Optional[Callable[['Opinion'], Dict]] = field(default=None, repr=False)
+    _texto: Optional[Dict] = field(default=None, init=False, repr=False)
+
+    def a_dict(self) -> Dict:
+        """
+        Retorna la opinión en el formato dict clásico.
+
+        El dict se genera la primera vez y se reutiliza después.
+        """
+        if self._texto is None:
+            if self.renderizador is not None:
+                self._texto = self.renderizador(self)
+            else:
+                self._texto = {
+                    'consejera': self.consejera,
+                    'aprobada': self.aprobada,
+                    'veto': self.veto,
+                    'opinion': '',
+                    'confianza': self.confianza,
+                    'razonamiento': list(self.codigos),
+                    'sugerencias': []
+                }
+        return self._texto
+
+    @property
+    def renderizada(self) -> bool:
+        """¿Ya se generó el texto legible?"""
+        return self._texto is not None
+
+    def __eq__(self, otra) -> bool:
+        """Compara los campos, sin renderizar el texto de ninguna de las dos."""
+        if not isinstance(otra, Opinion):
+            return NotImplemented
+        return (
+            self.consejera == otra.consejera and
+            self.aprobada == otra.aprobada and
+            self.veto == otra.veto and
+            self.confianza == otra.confianza and
+            self.codigos == otra.codigos and
+            self.principio_violado == otra.principio_violado and
+            self.datos == otra.datos
+        )
+
+    __hash__ = None
+
+    def __getitem__(self, clave: str):
+        if clave in _CAMPOS_DIRECTOS:
+            return getattr(self, clave)
+        return self.a_dict()[clave]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.a_dict())
+
+    def __len__(self) -> int:
+        return len(self.a_dict())
@@ -5,8 +5,9 @@ Especialidad: Sintetizar todas las opiniones y generar decisión final.
 Vigila: Todos los principios
 Puede vetar: NO (pero su palabra es la más importante)
 """
-from typing import Dict, List
+from typing import Dict, List, Mapping
 from consejeras.base_consejera import Consejera
+from consejeras.opinion import Opinion
 from razonamiento.tipos_decision import Decision
 from core.principios import Principio
 
@@ -32,65 +33,83 @@ class Sage(Consejera):
         # Vigila TODOS los principios holísticamente
         self.principios_vigilados = list(Principio)
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa la decisión y sintetiza opiniones previas.
         
         Esta consejera debe recibir las opiniones de TODAS
-        las demás consejeras en el contexto.
+        las demás consejeras en el contexto (Opinion o dict clásico).
+        Solo mira banderas: el texto de las demás no se toca
+        hasta que se renderiza la síntesis.
         """
-        self.revisiones_realizadas += 1
-        
         # Obtener opiniones previas
         opiniones_previas = contexto.get('opiniones_consejeras', [])
         
         if not opiniones_previas:
             # Si no hay opiniones previas, generar opinión simple
-            return self._generar_opinion_simple(decision)
+            return self._opinion(True, 0.7, ('SIN_OPINIONES',))
         
         # Sintetizar opiniones
         return self._sintetizar_opiniones(decision, opiniones_previas)
     
-    def _generar_opinion_simple(self, decision: Decision) -> Dict:
-        """Genera opinión cuando no hay otras consejeras."""
-        self.opiniones_dadas += 1
-        
-        return {
-            'consejera': self.nombre,
-            'aprobada': True,
-            'veto': False,
-            'opinion': 'Decisión parece razonable',
-            'confianza': 0.7,
-            'razonamiento': ['No hay opiniones previas para sintetizar'],
-            'sugerencias': []
-        }
-    
-    def _sintetizar_opiniones(self, decision: Decision, 
-                             opiniones: List[Dict]) -> Dict:
+    def _sintetizar_opiniones(self, decision: Decision,
+                             opiniones: List[Mapping]) -> Opinion:
         """
         Sintetiza opiniones de todas las consejeras.
         
         Proceso:
         1. Verificar si hay vetos (Vega)
         2. Contar aprobaciones/rechazos
-        3. Recopilar todas las sugerencias
-        4. Evaluar nivel de consenso
-        5. Generar síntesis coherente
+        3. Evaluar nivel de consenso
+        
+        Las sugerencias y razonamientos se recopilan al renderizar.
         """
-        self.opiniones_dadas += 1
+        # Copia inmutable: la lista del gestor crece después con la síntesis
+        previas = tuple(opiniones)
         
         # 1. Verificar vetos
-        tiene_veto = any(op.get('veto', False) for op in opiniones)
+        veto_opinion = next((op for op in previas if op.get('veto', False)), None)
+        
+        if veto_opinion is not None:
+            # Si hay veto, Sage no puede aprobar (Sage no veta, pero respeta vetos)
+            return self._opinion(
+                False, 1.0, ('VETO_RESPALDADO',),
+                datos={'veto_de': veto_opinion}
+            )
+        
+        # 2. Contar aprobaciones
+        aprobadas = sum(1 for op in previas if op.get('aprobada', False))
+        total = len(previas)
+        consenso = aprobadas / total if total > 0 else 0
         
-        if tiene_veto:
-            # Si hay veto, Sage no puede aprobar
-            veto_opinion = next(op for op in opiniones if op.get('veto'))
+        datos = {'consenso': consenso, 'previas': previas}
+        
+        # 3. Evaluar consenso
+        if consenso >= 0.8:
+            # Alto consenso - aprobar con confianza
+            return self._opinion(True, min(consenso, 0.95), ('CONSENSO_FUERTE',), datos=datos)
+        elif consenso >= 0.5:
+            # Consenso moderado - aprobar con precaución
+            return self._opinion(True, consenso, ('CONSENSO_MODERADO',), datos=datos)
+        else:
+            # Bajo consenso - precaución
+            return self._opinion(False, 0.8, ('CONSENSO_INSUFICIENTE',), datos=datos)
+    
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto de la síntesis."""
+        codigo = opinion.codigos[0]
+        
+        if codigo == 'SIN_OPINIONES':
+            return self._generar_opinion_simple(opinion)
+        
+        if codigo == 'VETO_RESPALDADO':
+            veto_opinion = opinion.datos['veto_de']
             return {
                 'consejera': self.nombre,
                 'aprobada': False,
-                'veto': False,  # Sage no veta, pero respeta vetos
+                'veto': False,
                 'opinion': f'Veto de {veto_opinion["consejera"]} es válido',
-                'confianza': 1.0,
+                'confianza': opinion.confianza,
                 'razonamiento': [
                     f'{veto_opinion["consejera"]} aplicó veto',
                     'El consejo respalda la decisión de veto'
@@ -98,59 +117,55 @@ class Sage(Consejera):
                 'sugerencias': veto_opinion.get('sugerencias', [])
             }
         
-        # 2. Contar aprobaciones
-        aprobadas = sum(1 for op in opiniones if op.get('aprobada', False))
-        total = len(opiniones)
-        consenso = aprobadas / total if total > 0 else 0
+        previas = opinion.datos['previas']
+        consenso = opinion.datos['consenso']
         
-        # 3. Recopilar sugerencias
+        # Recopilar sugerencias
         todas_sugerencias = []
-        for op in opiniones:
+        for op in previas:
             todas_sugerencias.extend(op.get('sugerencias', []))
         
         # Eliminar duplicados manteniendo orden
         sugerencias_unicas = list(dict.fromkeys(todas_sugerencias))
         
-        # 4. Recopilar razonamientos
+        # Recopilar razonamientos
         razonamientos = []
-        for op in opiniones:
+        for op in previas:
             consejera = op.get('consejera', 'Desconocida')
-            opinion = op.get('opinion', '')
-            razonamientos.append(f'{consejera}: {opinion}')
-        
-        # 5. Generar síntesis
-        if consenso >= 0.8:
-            # Alto consenso - aprobar con confianza
-            return {
-                'consejera': self.nombre,
-                'aprobada': True,
-                'veto': False,
-                'opinion': f'Consenso fuerte ({int(consenso*100)}%)',
-                'confianza': min(consenso, 0.95),
-                'razonamiento': ['Alto consenso entre consejeras'] + razonamientos[:3],
-                'sugerencias': sugerencias_unicas[:3]
-            }
-        
-        elif consenso >= 0.5:
-            # Consenso moderado - aprobar con precaución
-            return {
-                'consejera': self.nombre,
-                'aprobada': True,
-                'veto': False,
-                'opinion': f'Consenso moderado ({int(consenso*100)}%)',
-                'confianza': consenso,
-                'razonamiento': ['Opiniones divididas pero mayoría aprueba'] + razonamientos[:3],
-                'sugerencias': sugerencias_unicas[:5]
-            }
-        
+            texto_opinion = op.get('opinion', '')
+            razonamientos.append(f'{consejera}: {texto_opinion}')
+        
+        if codigo == 'CONSENSO_FUERTE':
+            texto = f'Consenso fuerte ({int(consenso*100)}%)'
+            razonamiento = ['Alto consenso entre consejeras'] + razonamientos[:3]
+            sugerencias = sugerencias_unicas[:3]
+        elif codigo == 'CONSENSO_MODERADO':
+            texto = f'Consenso moderado ({int(consenso*100)}%)'
+            razonamiento = ['Opiniones divididas pero mayoría aprueba'] + razonamientos[:3]
+            sugerencias = sugerencias_unicas[:5]
         else:
-            # Bajo consenso - precaución
-            return {
-                'consejera': self.nombre,
-                'aprobada': False,
-                'veto': False,
-                'opinion': f'Consenso insuficiente ({int(consenso*100)}%)',
-                'confianza': 0.8,
-                'razonamiento': ['Múltiples consejeras expresan preocupación'] + razonamientos,
-                'sugerencias': sugerencias_unicas
-            }
\ No newline at end of file
+            texto = f'Consenso insuficiente ({int(consenso*100)}%)'
+            razonamiento = ['Múltiples consejeras expresan preocupación'] + razonamientos
+            sugerencias = sugerencias_unicas
+        
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': texto,
+            'confianza': opinion.confianza,
+            'razonamiento': razonamiento,
+            'sugerencias': sugerencias
+        }
+    
+    def _generar_opinion_simple(self, opinion: Opinion) -> Dict:
+        """Genera opinión cuando no hay otras consejeras."""
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': 'Decisión parece razonable',
+            'confianza': opinion.confianza,
+            'razonamiento': ['No hay opiniones previas para sintetizar'],
+            'sugerencias': []
+        }
\ No newline at end of file
@@ -3,12 +3,20 @@ Vega - Guardiana de Principios Fundamentales.
 
 VERSIÓN MODULAR - Coordinadora que delega a módulos especializados.
 """
-from typing import Dict
+from typing import Dict, Set
 from consejeras.base_consejera import Consejera
+from consejeras.opinion import Opinion
 from razonamiento.tipos_decision import Decision
 from core.principios import Principio
 from .patrones import PatronesPeligrosos
 
+# Principio que protege cada tipo de riesgo
+MAPEO_PRINCIPIOS = {
+    'ACCION_DESTRUCTIVA': Principio.SEGURIDAD_DATOS,
+    'AUTO_MODIFICACION': Principio.NO_AUTO_MODIFICACION,
+    'VIOLACION_PRIVACIDAD': Principio.PRIVACIDAD
+}
+
 class Vega(Consejera):
     """
     Vega - La Guardiana.
@@ -37,40 +45,44 @@ class Vega(Consejera):
         # Solo Vega tiene poder de VETO
         self.puede_vetar = True
     
-    def revisar(self, decision: Decision, contexto: Dict) -> Dict:
+    def opinar(self, decision: Decision, contexto: Dict) -> Opinion:
         """
         Revisa decisión y aplica VETO si viola principios.
         
         Vega es estricta pero justa.
         Mira el TEXTO directamente (no depende de que Bell entienda).
         """
-        self.revisiones_realizadas += 1
-        
         # Extraer texto original
-        traduccion = contexto.get('traduccion', {})
-        texto_original = traduccion.get('texto_original', '').lower()
+        texto = self._analizar_texto(contexto)
         
         # VERIFICAR todos los riesgos
-        riesgos = self.patrones.detectar_todos_los_riesgos(texto_original)
+        riesgos = self.patrones.detectar_todos_los_riesgos(texto)
         
         if riesgos:
             # HAY RIESGO - Aplicar VETO
-            return self._generar_veto(riesgos[0], texto_original)
+            principio = MAPEO_PRINCIPIOS.get(riesgos[0], Principio.SEGURIDAD_DATOS)
+            return self._opinion(
+                False, 1.0, tuple(riesgos),
+                veto=True,
+                principio_violado=principio,
+                datos={'texto': texto.texto}
+            )
         
         # SIN RIESGO - Aprobar
+        return self._opinion(True, 0.95)
+    
+    def palabras_clave(self) -> Set[str]:
+        """Vega busca las palabras de sus patrones peligrosos."""
+        return self.patrones.palabras_clave()
+    
+    def _renderizar(self, opinion: Opinion) -> Dict:
+        """Genera el texto del veto o de la aprobación."""
+        if opinion.veto:
+            return self._generar_veto(opinion.codigos[0], opinion.datos['texto'])
         return self._generar_aprobacion()
     
     def _generar_veto(self, tipo_riesgo: str, texto: str) -> Dict:
         """Genera respuesta de VETO."""
-        self.vetos_aplicados += 1
-        
-        # Mapear riesgo a principio
-        mapeo_principios = {
-            'ACCION_DESTRUCTIVA': Principio.SEGURIDAD_DATOS,
-            'AUTO_MODIFICACION': Principio.NO_AUTO_MODIFICACION,
-            'VIOLACION_PRIVACIDAD': Principio.PRIVACIDAD
-        }
-        
         mapeo_razones = {
             'ACCION_DESTRUCTIVA': 'Acción destructiva masiva detectada. Requiere confirmación explícita.',
             'AUTO_MODIFICACION': 'Bell no puede modificar su propio código o arquitectura',
@@ -83,7 +95,7 @@ class Vega(Consejera):
             'VIOLACION_PRIVACIDAD': 'No procesar información de credenciales directamente'
         }
         
-        principio = mapeo_principios.get(tipo_riesgo, Principio.SEGURIDAD_DATOS)
+        principio = MAPEO_PRINCIPIOS.get(tipo_riesgo, Principio.SEGURIDAD_DATOS)
         razon = mapeo_razones.get(tipo_riesgo, 'Acción potencialmente peligrosa')
         recomendacion = mapeo_recomendaciones.get(tipo_riesgo, 'Revisar la solicitud')
         
@@ -3,14 +3,23 @@ Patrones de Detección de Vega.
 
 Separa la lógica de detección del flujo principal.
 Permite agregar nuevos patrones sin modificar guardiana.py
+
+Todo riesgo exige una palabra "disparadora" (destructiva, de modificación
+o sensible). Un pre-filtro compilado con todas ellas descarta en una sola
+pasada los mensajes que no contienen ninguna, que son la gran mayoría.
 """
-from typing import Dict, List
+import re
+from typing import Dict, FrozenSet, List, Set, Union
+from consejeras.escaner import TextoAnalizado
 
 class PatronesPeligrosos:
     """
     Biblioteca de patrones que Vega reconoce como peligrosos.
     
     Cada patrón está organizado por tipo de riesgo.
+    
+    Si se modifican las listas de disparadores después de crear la
+    instancia, hay que llamar a recompilar_prefiltro().
     """
     
     def __init__(self):
@@ -49,91 +58,112 @@ class PatronesPeligrosos:
             'leer', 'lee', 'lees', 'escribir', 'escribe', 
             'guardar', 'guarda', 'read', 'write', 'mostrar'
         ]
+        
+        self.recompilar_prefiltro()
     
-    def es_accion_destructiva(self, texto: str) -> bool:
+    def recompilar_prefiltro(self):
+        """
+        Compila el pre-filtro con las palabras disparadoras.
+        
+        Usa la misma semántica de subcadena que los detectores, así que
+        nunca descarta un mensaje que los detectores marcarían.
+        """
+        self._disparadores: FrozenSet[str] = frozenset(
+            p.lower() for p in
+            self.palabras_destructivas + self.palabras_modificacion +
+            self.palabras_sensibles
+        )
+        alternativas = '|'.join(
+            re.escape(p) for p in sorted(self._disparadores, key=len, reverse=True)
+        )
+        self._prefiltro = re.compile(alternativas) if alternativas else None
+    
+    def es_candidato(self, texto: Union[str, TextoAnalizado]) -> bool:
+        """
+        ¿Puede el texto contener algún riesgo?
+        
+        False garantiza que detectar_todos_los_riesgos() no detectaría nada.
+        """
+        texto = self._como_analizado(texto)
+        
+        # Texto ya escaneado por el gestor: basta con mirar el conjunto
+        if texto.detectadas is not None:
+            return not texto.detectadas.isdisjoint(self._disparadores)
+        
+        return self._prefiltro is not None and \
+            self._prefiltro.search(texto.texto) is not None
+    
+    def palabras_clave(self) -> Set[str]:
+        """Todas las palabras que usan los detectores."""
+        return set(
+            self.palabras_destructivas + self.palabras_alcance_total +
+            self.palabras_modificacion + self.palabras_auto_referencia +
+            self.palabras_sensibles + self.palabras_acceso
+        )
+    
+    @staticmethod
+    def _como_analizado(texto: Union[str, TextoAnalizado]) -> TextoAnalizado:
+        """Acepta texto plano o ya analizado por el gestor."""
+        if isinstance(texto, TextoAnalizado):
+            return texto
+        return TextoAnalizado(texto.lower())
+    
+    def es_accion_destructiva(self, texto: Union[str, TextoAnalizado]) -> bool:
         """
         Detecta acciones destructivas masivas.
         
         Patrón: [palabra_destructiva] + [alcance_total]
         Ejemplos: "eliminar todos", "borrar todo", "delete all"
         """
-        texto_lower = texto.lower()
-        
-        tiene_destruccion = any(
-            palabra in texto_lower 
-            for palabra in self.palabras_destructivas
-        )
+        texto = self._como_analizado(texto)
         
-        if tiene_destruccion:
-            tiene_alcance_total = any(
-                palabra in texto_lower 
-                for palabra in self.palabras_alcance_total
-            )
-            
-            if tiene_alcance_total:
-                return True
+        if texto.contiene_alguna(self.palabras_destructivas):
+            return texto.contiene_alguna(self.palabras_alcance_total)
         
         return False
     
-    def es_auto_modificacion(self, texto: str) -> bool:
+    def es_auto_modificacion(self, texto: Union[str, TextoAnalizado]) -> bool:
         """
         Detecta intentos de auto-modificación.
         
         Patrón: [palabra_modificacion] + [auto_referencia]
         Ejemplos: "modifica tu código", "cambia bell"
         """
-        texto_lower = texto.lower()
-        
-        tiene_modificacion = any(
-            palabra in texto_lower 
-            for palabra in self.palabras_modificacion
-        )
+        texto = self._como_analizado(texto)
         
-        if tiene_modificacion:
-            tiene_auto_referencia = any(
-                patron in texto_lower 
-                for patron in self.palabras_auto_referencia
-            )
-            
-            if tiene_auto_referencia:
-                return True
+        if texto.contiene_alguna(self.palabras_modificacion):
+            return texto.contiene_alguna(self.palabras_auto_referencia)
         
         return False
     
-    def viola_privacidad(self, texto: str) -> bool:
+    def viola_privacidad(self, texto: Union[str, TextoAnalizado]) -> bool:
         """
         Detecta violaciones de privacidad.
         
         Patrón: [palabra_sensible] + [palabra_acceso]
         Ejemplos: "lee mi contraseña", "mostrar passwords"
         """
-        texto_lower = texto.lower()
+        texto = self._como_analizado(texto)
         
-        tiene_sensible = any(
-            palabra in texto_lower 
-            for palabra in self.palabras_sensibles
-        )
-        
-        if tiene_sensible:
-            tiene_acceso = any(
-                palabra in texto_lower 
-                for palabra in self.palabras_acceso
-            )
-            
-            if tiene_acceso:
-                return True
+        if texto.contiene_alguna(self.palabras_sensibles):
+            return texto.contiene_alguna(self.palabras_acceso)
         
         return False
     
-    def detectar_todos_los_riesgos(self, texto: str) -> List[str]:
+    def detectar_todos_los_riesgos(self, texto: Union[str, TextoAnalizado]) -> List[str]:
         """
         Detecta todos los riesgos en un texto.
         
         Returns:
             Lista de nombres de riesgos detectados
         """
+        texto = self._como_analizado(texto)
         riesgos = []
         
+        # Caso común: ninguna palabra disparadora → seguro
+        if not self.es_candidato(texto):
+            return riesgos
+        
         if self.es_accion_destructiva(texto):
             riesgos.append('ACCION_DESTRUCTIVA')
         
@@ -0,0 +1,150 @@
+"""
+Instantáneas de Grounding - Lecturas consistentes mientras se aprende.
+
+El aprendizaje escribe confianza_grounding en cada ConceptoAnclado de a
+uno, así que una petición que evalúa capacidades mientras corre un lote
+puede ver la mitad del lote aplicado. El motor de aprendizaje publica,
+al terminar cada lote, una instantánea inmutable y versionada del
+grounding; los lectores toman la instantánea actual una vez y leen solo
+de ella.
+
+- Publicar es copy-on-write: se copia el mapeo anterior, se le aplican
+  los cambios del lote y se reemplaza la referencia (una asignación,
+  atómica en CPython). Los escritores se serializan con un lock.
+- Leer es tomar `publicador.actual`: sin locks.
+- Una instantánea vieja se libera sola cuando ningún lector la tiene
+  (conteo de referencias); `vivas` cuenta las que siguen en memoria.
+"""
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional
+import threading
+import weakref
+
+class InstantaneaGrounding:
+    """Grounding por concepto en una versión dada (inmutable)."""
+
+    __slots__ = ('_version', '_grounding', '_creada', '__weakref__')
+
+    def __init__(self, version: int, grounding: Mapping[str, float]):
+        """
+        Args:
+            version: Número de versión (crece con cada publicación)
+            grounding: concepto_id -> confianza_grounding (se copia)
+        """
+        self._version = version
+        self._grounding = MappingProxyType(dict(grounding))
+        self._creada = datetime.now()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def grounding(self) -> Mapping[str, float]:
+        """Vista de solo lectura concepto_id -> grounding."""
+        return self._grounding
+
+    @property
+    def creada(self) -> datetime:
+        return self._creada
+
+    def obtener(self, concepto_id: str, defecto: Optional[float] = None) -> Optional[float]:
+        """Grounding de un concepto (defecto si no está en la instantánea)."""
+        return self._grounding.get(concepto_id, defecto)
+
+    def grounding_de(self, concepto: Any) -> float:
+        """Grounding de un ConceptoAnclado según esta instantánea."""
+        return self._grounding.get(concepto.id, concepto.confianza_grounding)
+
+    def __getitem__(self, concepto_id: str) -> float:
+        return self._grounding[concepto_id]
+
+    def __contains__(self, concepto_id: str) -> bool:
+        return concepto_id in self._grounding
+
+    def __len__(self) -> int:
+        return len(self._grounding)
+
+    def __repr__(self) -> str:
+        return f"InstantaneaGrounding(version={self._version}, conceptos={len(self._grounding)})"
+
+class PublicadorGrounding:
+    """
+    Referencia a la instantánea de grounding vigente.
+
+    Un solo escritor a la vez (el motor de aprendizaje) y cualquier
+    número de lectores sin lock.
+    """
+
+    def __init__(self, conceptos: Optional[Iterable[Any]] = None):
+        """
+        Args:
+            conceptos: ConceptoAnclado para la instantánea inicial (None = vacía)
+        """
+        self._lock = threading.Lock()
+        self._vivas: 'weakref.WeakSet[InstantaneaGrounding]' = weakref.WeakSet()
+        self.publicaciones = 0
+        self.actual = self._crear(0, {})
+
+        if conceptos is not None:
+            self.publicar_todo(conceptos)
+
+    def _crear(self, version: int, grounding: Mapping[str, float]) -> InstantaneaGrounding:
+        instantanea = InstantaneaGrounding(version, grounding)
+        self._vivas.add(instantanea)
+        return instantanea
+
+    def publicar(self, cambios: Mapping[str, float]) -> InstantaneaGrounding:
+        """
+        Publica una versión nueva con los cambios de un lote.
+
+        Args:
+            cambios: concepto_id -> grounding nuevo (el resto se conserva)
+
+        Returns:
+            La instantánea vigente (la misma si no hubo cambios)
+        """
+        if not cambios:
+            return self.actual
+
+        with self._lock:
+            anterior = self.actual
+            grounding = dict(anterior.grounding)
+            grounding.update(cambios)
+            self.actual = self._crear(anterior.version + 1, grounding)
+            self.publicaciones += 1
+            return self.actual
+
+    def publicar_todo(self, conceptos: Iterable[Any]) -> InstantaneaGrounding:
+        """
+        Publica una versión nueva leída completa de los conceptos.
+
+        Args:
+            conceptos: ConceptoAnclado (con IDs repetidos gana el primero)
+
+        Returns:
+            La instantánea publicada
+        """
+        grounding: Dict[str, float] = {}
+        for concepto in conceptos:
+            grounding.setdefault(concepto.id, concepto.confianza_grounding)
+
+        with self._lock:
+            self.actual = self._crear(self.actual.version + 1, grounding)
+            self.publicaciones += 1
+            return self.actual
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict con versión vigente, conceptos, publicaciones e
+            instantáneas todavía en memoria
+        """
+        actual = self.actual
+        return {
+            'version': actual.version,
+            'conceptos': len(actual),
+            'publicaciones': self.publicaciones,
+            'vivas': len(self._vivas)
+        }
@@ -25,6 +25,7 @@ from generacion.generador_salida import GeneradorSalida
 from bucles import GestorBucles
 from memoria import GestorMemoria
 from aprendizaje import MotorAprendizaje
+from core.instantanea_grounding import PublicadorGrounding
 
 class Belladonna:
     """
@@ -58,7 +59,10 @@ class Belladonna:
         # ===== COMPONENTES FASE 1 =====
         self.gestor = GestorVocabulario()
         self.traductor = TraductorEntrada(self.gestor)
-        self.motor = MotorRazonamiento()
+        
+        # El razonamiento lee el grounding que publica el aprendizaje
+        self.instantaneas = PublicadorGrounding()
+        self.motor = MotorRazonamiento(instantaneas=self.instantaneas)
         self.gestor_consejeras = GestorConsejeras()
         self.consejeras = self.gestor_consejeras.obtener_activas()
         self.generador = GeneradorSalida()
@@ -72,16 +76,18 @@ class Belladonna:
         # ===== COMPONENTES FASE 2 =====
         print("Inicializando subsistemas Fase 2...")
         
-        # Bucles autónomos
-        self.gestor_bucles = GestorBucles()
+        # Bucles autónomos (con arranque en caliente)
+        self.gestor_bucles = GestorBucles(ruta_estado="memoria_bell/estado_bucles.json")
         print("✅ Bucles: 3 bucles configurados (corto, medio, largo)")
+        if self.gestor_bucles.estado_restaurado:
+            print("   • Estado de bucles restaurado de la sesión anterior")
         
         # Memoria persistente
         self.gestor_memoria = GestorMemoria()
         print("✅ Memoria: Sistema de persistencia activo")
         
         # Aprendizaje básico
-        self.motor_aprendizaje = MotorAprendizaje()
+        self.motor_aprendizaje = MotorAprendizaje(instantaneas=self.instantaneas)
         self.motor_aprendizaje.configurar_integraciones(
             vocabulario=self.gestor,
             memoria=self.gestor_memoria,
@@ -109,6 +115,14 @@ class Belladonna:
         self.gestor_bucles.iniciar_todos()
         print(f"   • Bucles: 3 bucles en ejecución")
         
+        # Aprendizaje por uso en segundo plano
+        self.motor_aprendizaje.iniciar_consumidor_usos()
+        print(f"   • Aprendizaje: usos procesados en micro-lotes")
+        
+        # Un ciclo de aprendizaje por cada consolidación del bucle largo
+        self.motor_aprendizaje.iniciar_ciclos_automaticos()
+        print(f"   • Aprendizaje: ciclos al consolidar el bucle largo")
+        
         print("✅ Fase 2 activa")
         print()
         
@@ -126,6 +140,11 @@ class Belladonna:
         self.gestor_bucles.detener_todos()
         print("   • Bucles detenidos")
         
+        # Correr el ciclo pendiente y procesar los usos antes de cerrar la memoria
+        self.motor_aprendizaje.detener_ciclos_automaticos()
+        self.motor_aprendizaje.detener_consumidor_usos()
+        print("   • Aprendizaje: ciclo y usos pendientes procesados")
+        
         # Finalizar sesión de memoria
         self.gestor_memoria.finalizar_sesion()
         print("   • Memoria guardada y sesión finalizada")
@@ -158,7 +177,8 @@ class Belladonna:
         # PASO 3: Consejeras revisan
         revision_final = None
         for consejera in self.consejeras:
-            revision = consejera.revisar(decision, {'traduccion': traduccion})
+            # Opinion compacta: el texto solo se genera si la respuesta lo usa
+            revision = consejera.opinar(decision, {'traduccion': traduccion})
             
             if self.verbose:
                 print(f"[{consejera.nombre}: {'VETO' if revision.get('veto') else 'OK'}]")
@@ -220,6 +240,7 @@ class Belladonna:
         
         Comandos especiales Fase 2:
         - 'bucles': Estado de bucles autónomos
+        - 'bucles perf': Retraso, sobrecarga y jitter de los bucles
         - 'memoria': Estadísticas de memoria
         - 'aprendizaje': Estado del motor de aprendizaje
         - 'fase2': Dashboard completo Fase 2
@@ -239,6 +260,7 @@ class Belladonna:
         print()
         print("  Fase 2:")
         print("    • 'bucles': Estado de bucles autónomos")
+        print("    • 'bucles perf': Salud de los bucles (retraso, jitter)")
         print("    • 'memoria': Estadísticas de memoria")
         print("    • 'aprendizaje': Estado del motor de aprendizaje")
         print("    • 'fase2': Dashboard completo Fase 2")
@@ -289,6 +311,10 @@ class Belladonna:
                         self._mostrar_bucles()
                         continue
                     
+                    elif mensaje.lower() == 'bucles perf':
+                        self._mostrar_rendimiento_bucles()
+                        continue
+                    
                     elif mensaje.lower() == 'memoria':
                         self._mostrar_memoria()
                         continue
@@ -399,6 +425,7 @@ class Belladonna:
         print()
         print("Comandos Fase 2 (NUEVOS):")
         print("  • 'bucles': Ver estado de bucles autónomos")
+        print("  • 'bucles perf': Ver salud de los bucles")
         print("  • 'memoria': Ver estadísticas de memoria")
         print("  • 'aprendizaje': Ver estado del aprendizaje")
         print("  • 'fase2': Dashboard completo de Fase 2")
@@ -454,6 +481,36 @@ class Belladonna:
         print("=" * 70)
         print()
     
+    def _mostrar_rendimiento_bucles(self):
+        """Muestra la salud de los bucles (para dimensionar intervalos)."""
+        print()
+        print("=" * 70)
+        print("BUCLES AUTÓNOMOS - RENDIMIENTO")
+        print("=" * 70)
+        print()
+        
+        for nombre, perf in self.gestor_bucles.obtener_rendimiento().items():
+            duracion = perf['duracion_ms']
+            retraso = perf['retraso_ms']
+            print(f"{nombre} (intervalo {perf['intervalo_segundos']}s):")
+            print(f"  Ejecuciones: {perf['ejecuciones']} "
+                  f"(omitidas {perf['omitidas']}, disparos {perf['disparos']})")
+            print(f"  Duración: prom {duracion['promedio']:.2f}ms, "
+                  f"p95 {duracion['p95']:.2f}ms, máx {duracion['max']:.2f}ms")
+            print(f"  Retraso: prom {retraso['promedio']:.2f}ms, "
+                  f"p95 {retraso['p95']:.2f}ms, máx {retraso['max']:.2f}ms")
+            print(f"  Jitter: {perf['jitter_ms']:.2f}ms")
+            print(f"  Utilización: {perf['utilizacion'] * 100:.2f}% del intervalo")
+            
+            alerta = "⚠️ " if perf['sobrecargas'] else ""
+            print(f"  {alerta}Sobrecargas: {perf['sobrecargas']} "
+                  f"({perf['tasa_sobrecarga'] * 100:.1f}%)")
+            print(f"  Errores: {perf['errores']} ({perf['tasa_error'] * 100:.1f}%)")
+            print()
+        
+        print("=" * 70)
+        print()
+    
     def _mostrar_memoria(self):
         """Muestra estadísticas de memoria."""
         print()
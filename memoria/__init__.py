@@ -6,14 +6,17 @@ Permite a Bell guardar y recuperar información entre sesiones.
 Componentes:
 - GestorMemoria: Interfaz principal de alto nivel
 - AlmacenJSON: Implementación de persistencia en JSON
+- SerieAjustes: Historial de ajustes acotado, indexado por concepto y tiempo
 - tipos_memoria: Enumeraciones y tipos de datos
 """
 from memoria.gestor_memoria import GestorMemoria
 from memoria.almacen import AlmacenJSON
+from memoria.serie_ajustes import SerieAjustes
 from memoria.tipos_memoria import TipoMemoria
 
 __all__ = [
     'GestorMemoria',
     'AlmacenJSON',
+    'SerieAjustes',
     'TipoMemoria'
 ]
\ No newline at end of file
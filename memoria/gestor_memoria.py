@@ -9,6 +9,7 @@ from datetime import datetime
 import uuid
 
 from memoria.almacen import AlmacenJSON
+from memoria.serie_ajustes import SerieAjustes
 from memoria.tipos_memoria import (
     TipoMemoria,
     RegistroConcepto,
@@ -40,6 +41,14 @@ class GestorMemoria:
         self.almacen = AlmacenJSON(directorio)
         self.sesion_actual: Optional[str] = None
         self.sesion_inicio: Optional[str] = None
+        
+        # Ajustes indexados por concepto y tiempo (ajustes.json queda como registro completo).
+        # Lo que no llegó a un segmento antes de cerrar se recupera de ajustes.json
+        self.serie_ajustes = SerieAjustes(
+            directorio=str(self.almacen.directorio_base / 'serie_ajustes'),
+            tamano_segmento=1024
+        )
+        self._indexar_ajustes_existentes(solo_faltantes=True)
     
     # ===== SESIONES =====
     
@@ -85,6 +94,9 @@ class GestorMemoria:
         
         self.sesion_actual = None
         self.sesion_inicio = None
+        
+        # Los ajustes de la sesión quedan en un segmento
+        self.serie_ajustes.volcar()
     
     def _actualizar_contador_sesion(self, campo: str):
         """Actualiza contador en la sesión actual."""
@@ -311,29 +323,118 @@ class GestorMemoria:
             razon: Razón del ajuste
             aplicado: Si se aplicó o no
         """
+        # La serie asigna la clave con que el ajuste se reconoce en ambos registros
+        agregado = self.serie_ajustes.agregar(concepto_id, grounding_anterior, grounding_nuevo, razon, aplicado)
+        
         registro: RegistroAjuste = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': agregado['timestamp'],
             'concepto_id': concepto_id,
             'grounding_anterior': grounding_anterior,
             'grounding_nuevo': grounding_nuevo,
             'razon': razon,
-            'aplicado': aplicado
+            'aplicado': aplicado,
+            'clave': agregado['clave']
         }
         
         self.almacen.guardar('ajustes', registro)
     
+    def guardar_ajustes_grounding(self, ajustes: List[Dict[str, Any]]):
+        """
+        Guarda varios ajustes de grounding con una sola escritura de ajustes.json.
+        
+        Args:
+            ajustes: Dicts con concepto_id, grounding_anterior,
+                grounding_nuevo, razon y (opcional) aplicado
+        """
+        registros: List[RegistroAjuste] = []
+        for ajuste in ajustes:
+            aplicado = ajuste.get('aplicado', True)
+            agregado = self.serie_ajustes.agregar(
+                ajuste['concepto_id'],
+                ajuste['grounding_anterior'],
+                ajuste['grounding_nuevo'],
+                ajuste['razon'],
+                aplicado
+            )
+            registros.append({
+                'timestamp': agregado['timestamp'],
+                'concepto_id': ajuste['concepto_id'],
+                'grounding_anterior': ajuste['grounding_anterior'],
+                'grounding_nuevo': ajuste['grounding_nuevo'],
+                'razon': ajuste['razon'],
+                'aplicado': aplicado,
+                'clave': agregado['clave']
+            })
+        
+        if registros:
+            self.almacen.guardar('ajustes', registros)
+    
     def obtener_ajustes_concepto(self, concepto_id: str) -> List[RegistroAjuste]:
         """
         Obtiene historial de ajustes de un concepto.
         
+        Solo abre los segmentos que contienen al concepto.
+        
         Args:
             concepto_id: ID del concepto
         
         Returns:
             Lista de ajustes
         """
-        ajustes = self.almacen.cargar('ajustes')
-        return [a for a in ajustes if a['concepto_id'] == concepto_id]
+        return self.serie_ajustes.rango(concepto_id=concepto_id)
+    
+    def obtener_ajustes_rango(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        concepto_id: Optional[str] = None
+    ) -> List[RegistroAjuste]:
+        """
+        Obtiene ajustes en un rango de tiempo (búsqueda binaria).
+        
+        Args:
+            desde: Inicio del rango (None = sin límite)
+            hasta: Fin del rango (None = sin límite)
+            concepto_id: Filtrar por concepto (None = todos)
+        
+        Returns:
+            Lista de ajustes en orden temporal
+        """
+        return self.serie_ajustes.rango(
+            desde.timestamp() if desde else None,
+            hasta.timestamp() if hasta else None,
+            concepto_id
+        )
+    
+    def _indexar_ajustes_existentes(self, solo_faltantes: bool = False):
+        """
+        Carga en la serie los ajustes de ajustes.json.
+        
+        Args:
+            solo_faltantes: Saltar los ajustes cuya clave ya está en un
+                segmento. Los ajustes sin clave (de versiones anteriores)
+                solo se cargan si todavía no hay segmentos.
+        """
+        en_disco = self.serie_ajustes.claves_en_disco() if solo_faltantes else set()
+        hay_segmentos = solo_faltantes and bool(self.serie_ajustes.segmentos)
+        
+        for ajuste in self.almacen.cargar('ajustes'):
+            clave = ajuste.get('clave')
+            if clave in en_disco or (clave is None and hay_segmentos):
+                continue
+            try:
+                instante = datetime.fromisoformat(ajuste['timestamp']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                instante = None
+            self.serie_ajustes.agregar(
+                ajuste['concepto_id'],
+                ajuste['grounding_anterior'],
+                ajuste['grounding_nuevo'],
+                ajuste.get('razon', ''),
+                ajuste.get('aplicado', True),
+                instante,
+                clave
+            )
     
     # ===== UTILIDADES =====
     
@@ -388,6 +489,9 @@ class GestorMemoria:
             self.almacen.limpiar(tipo)
         else:
             self.almacen.limpiar_todo()
+        
+        if tipo in (None, 'ajustes'):
+            self.serie_ajustes.limpiar()
     
     def exportar_memoria(self, archivo: str) -> bool:
         """
@@ -411,4 +515,10 @@ class GestorMemoria:
         Returns:
             True si se importó correctamente
         """
-        return self.almacen.importar(archivo)
\ No newline at end of file
+        if not self.almacen.importar(archivo):
+            return False
+        
+        # Reindexar los ajustes con los importados
+        self.serie_ajustes.limpiar()
+        self._indexar_ajustes_existentes()
+        return True
\ No newline at end of file
@@ -0,0 +1,606 @@
+"""
+Serie de Ajustes - Historial de ajustes de grounding como serie temporal.
+
+El historial era una lista de dicts que crecía sin límite y las consultas
+por concepto recorrían todo ajustes.json. La serie guarda cada ajuste
+como una fila de columnas NumPy (concepto, instante, anterior, nuevo,
+razón, aplicado) en un anillo de tamaño fijo:
+
+- Concepto y razón se guardan como códigos (los textos se internan).
+- Un índice por concepto (deque de secuencias) da sus ajustes sin
+  recorrer el anillo.
+- Los instantes no decrecen, así que una consulta por rango de tiempo
+  es una búsqueda binaria (O(log n)).
+
+Con `directorio`, cada `tamano_segmento` ajustes se vuelcan a un
+segmento .npz inmutable antes de que el anillo los pise. Cada serie
+escribe con un origen propio (segmento_<origen>_N.npz, indice_<origen>.json),
+así dos series sobre el mismo directorio no se pisan; al abrir se leen
+todos los índices. Cada ajuste lleva una clave única (origen en los bits
+altos, contador de la serie en los bajos) que se guarda con él y sirve
+para saber qué ajustes de otro registro ya están en disco. Un índice lista los segmentos con su rango de tiempo
+y sus conceptos, así una consulta solo abre los segmentos que pueden
+tener resultados.
+"""
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import numpy as np
+
+VERSION_INDICE = 1
+
+class SerieAjustes:
+    """
+    Anillo columnar de ajustes con índice por concepto y segmentos en disco.
+
+    Los registros se devuelven con el mismo formato que el historial de
+    AjustadorGrounding (timestamp en ISO).
+    """
+
+    def __init__(
+        self,
+        capacidad: int = 10_000,
+        directorio: Optional[str] = None,
+        tamano_segmento: Optional[int] = None
+    ):
+        """
+        Args:
+            capacidad: Ajustes que se mantienen en memoria
+            directorio: Donde guardar segmentos (None = solo memoria)
+            tamano_segmento: Ajustes por segmento (como máximo la capacidad)
+        """
+        self.capacidad = capacidad
+        self.tamano_segmento = min(tamano_segmento or capacidad, capacidad)
+        self.directorio = Path(directorio) if directorio else None
+        self._lock = threading.Lock()
+
+        # Columnas del anillo
+        self._concepto = np.zeros(capacidad, dtype=np.int32)
+        self._instante = np.zeros(capacidad, dtype=np.float64)
+        self._anterior = np.zeros(capacidad, dtype=np.float64)
+        self._nuevo = np.zeros(capacidad, dtype=np.float64)
+        self._razon = np.zeros(capacidad, dtype=np.int32)
+        self._aplicado = np.zeros(capacidad, dtype=bool)
+        self._clave = np.zeros(capacidad, dtype=np.int64)
+
+        # Textos internados
+        self._ids: List[str] = []
+        self._codigo_id: Dict[str, int] = {}
+        self._razones: List[str] = []
+        self._codigo_razon: Dict[str, int] = {}
+
+        # Secuencias: [_inicio, _total) están en memoria, [_volcado, _total) sin volcar
+        self._por_concepto: Dict[int, deque] = {}
+        self._inicio = 0
+        self._total = 0
+        self._volcado = 0
+        self._ultimo_instante = float('-inf')
+
+        # Segmentos en disco (ordenados por 'hasta') y, para los de esta
+        # serie, la secuencia de su primer registro
+        self._origen = uuid.uuid4().hex[:12]
+        self._base_clave = (int(self._origen[:8], 16) >> 1) << 32
+        self._claves = 0
+        self._segmentos: List[Dict[str, Any]] = []
+        self._hasta_segmentos: List[float] = []
+        self._propios: List[Dict[str, Any]] = []
+        self._secuencia_segmento: Dict[str, int] = {}
+        self._solapados = False
+
+        if self.directorio:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            self._segmentos = self._leer_indices()
+            self._hasta_segmentos = [s['hasta'] for s in self._segmentos]
+            # Segmentos de otras series pueden solaparse en el tiempo
+            self._solapados = any(
+                actual['desde'] < anterior['hasta']
+                for anterior, actual in zip(self._segmentos, self._segmentos[1:])
+            )
+            if self._segmentos:
+                self._ultimo_instante = self._segmentos[-1]['hasta']
+
+    # ===== ESCRITURA =====
+
+    def agregar(
+        self,
+        concepto_id: str,
+        grounding_anterior: float,
+        grounding_nuevo: float,
+        razon: str,
+        aplicado: bool = True,
+        instante: Optional[float] = None,
+        clave: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Agrega un ajuste (pisa el más antiguo si el anillo está lleno).
+
+        Args:
+            concepto_id: ID del concepto
+            grounding_anterior: Valor anterior
+            grounding_nuevo: Nuevo valor
+            razon: Razón del ajuste
+            aplicado: Si se aplicó
+            instante: Segundos epoch (None = ahora); nunca retrocede
+            clave: Clave del ajuste (None = una nueva; p.ej. al reindexar)
+
+        Returns:
+            El registro agregado
+        """
+        with self._lock:
+            instante = time.time() if instante is None else instante
+            instante = max(instante, self._ultimo_instante)
+            self._ultimo_instante = instante
+
+            if self._total - self._inicio == self.capacidad:
+                self._descartar_mas_antiguo()
+
+            posicion = self._total % self.capacidad
+            codigo = self._internar(concepto_id, self._ids, self._codigo_id)
+            self._concepto[posicion] = codigo
+            self._instante[posicion] = instante
+            self._anterior[posicion] = grounding_anterior
+            self._nuevo[posicion] = grounding_nuevo
+            self._razon[posicion] = self._internar(razon, self._razones, self._codigo_razon)
+            self._aplicado[posicion] = aplicado
+            if clave is None:
+                clave = self._base_clave | self._claves
+                self._claves += 1
+            self._clave[posicion] = clave
+
+            self._por_concepto.setdefault(codigo, deque()).append(self._total)
+            self._total += 1
+
+            registro = self._registro(posicion)
+
+            if self.directorio and self._total - self._volcado >= self.tamano_segmento:
+                self._volcar()
+
+        return registro
+
+    def agregar_lote(
+        self,
+        concepto_ids: Sequence[str],
+        grounding_anterior: np.ndarray,
+        grounding_nuevo: np.ndarray,
+        razon: str,
+        aplicado: bool = True,
+        instante: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Agrega muchos ajustes con un mismo instante y razón, por columnas.
+
+        Equivale a llamar agregar() por cada concepto, pero escribe el
+        anillo con asignaciones vectorizadas y arma el timestamp una vez.
+
+        Args:
+            concepto_ids: IDs de los conceptos
+            grounding_anterior: Valores anteriores (paralelo a concepto_ids)
+            grounding_nuevo: Nuevos valores (paralelo a concepto_ids)
+            razon: Razón de todos los ajustes
+            aplicado: Si se aplicaron
+            instante: Segundos epoch (None = ahora); nunca retrocede
+
+        Returns:
+            Los registros agregados, en orden
+        """
+        n = len(concepto_ids)
+        if n == 0:
+            return []
+        anteriores = np.asarray(grounding_anterior, dtype=np.float64)
+        nuevos = np.asarray(grounding_nuevo, dtype=np.float64)
+
+        with self._lock:
+            instante = time.time() if instante is None else instante
+            instante = max(instante, self._ultimo_instante)
+            self._ultimo_instante = instante
+
+            codigos = np.fromiter(
+                (self._internar(c, self._ids, self._codigo_id) for c in concepto_ids),
+                dtype=np.int32, count=n
+            )
+            codigo_razon = self._internar(razon, self._razones, self._codigo_razon)
+            claves = self._base_clave | np.arange(self._claves, self._claves + n, dtype=np.int64)
+            self._claves += n
+
+            # Por tramos que no pasen la capacidad ni el próximo volcado
+            hecho = 0
+            while hecho < n:
+                tramo = min(n - hecho, self.capacidad)
+                if self.directorio:
+                    tramo = min(tramo, self.tamano_segmento - (self._total - self._volcado))
+
+                for _ in range(len(self) + tramo - self.capacidad):
+                    self._descartar_mas_antiguo()
+
+                posiciones = np.arange(self._total, self._total + tramo) % self.capacidad
+                self._concepto[posiciones] = codigos[hecho:hecho + tramo]
+                self._instante[posiciones] = instante
+                self._anterior[posiciones] = anteriores[hecho:hecho + tramo]
+                self._nuevo[posiciones] = nuevos[hecho:hecho + tramo]
+                self._razon[posiciones] = codigo_razon
+                self._aplicado[posiciones] = aplicado
+                self._clave[posiciones] = claves[hecho:hecho + tramo]
+
+                for secuencia, codigo in enumerate(codigos[hecho:hecho + tramo].tolist(), self._total):
+                    self._por_concepto.setdefault(codigo, deque()).append(secuencia)
+                self._total += tramo
+                hecho += tramo
+
+                if self.directorio and self._total - self._volcado >= self.tamano_segmento:
+                    self._volcar()
+
+        timestamp = datetime.fromtimestamp(instante).isoformat()
+        aplicado = bool(aplicado)
+        return [
+            {
+                'concepto_id': concepto_id,
+                'grounding_anterior': anterior,
+                'grounding_nuevo': nuevo,
+                'cambio': nuevo - anterior,
+                'razon': razon,
+                'aplicado': aplicado,
+                'timestamp': timestamp,
+                'clave': clave
+            }
+            for concepto_id, anterior, nuevo, clave in zip(
+                concepto_ids, anteriores.tolist(), nuevos.tolist(), claves.tolist()
+            )
+        ]
+
+    def volcar(self):
+        """Escribe a disco los ajustes aún no volcados (p.ej. al cerrar)."""
+        with self._lock:
+            if self.directorio and self._total > self._volcado:
+                self._volcar()
+
+    def clear(self):
+        """Vacía la serie en memoria (lo pendiente se vuelca antes)."""
+        with self._lock:
+            if self.directorio and self._total > self._volcado:
+                self._volcar()
+            self._por_concepto.clear()
+            self._inicio = self._total = self._volcado = 0
+            self._secuencia_segmento.clear()
+
+    def limpiar(self):
+        """Vacía la serie y borra sus segmentos en disco."""
+        with self._lock:
+            self._por_concepto.clear()
+            self._inicio = self._total = self._volcado = 0
+            self._secuencia_segmento.clear()
+
+            if self.directorio:
+                for segmento in self._segmentos:
+                    (self.directorio / segmento['archivo']).unlink(missing_ok=True)
+                for ruta in self.directorio.glob('indice*.json'):
+                    ruta.unlink(missing_ok=True)
+            self._segmentos = []
+            self._hasta_segmentos = []
+            self._propios = []
+            self._solapados = False
+            self._ultimo_instante = float('-inf')
+
+    # ===== CONSULTAS =====
+
+    def __len__(self) -> int:
+        return self._total - self._inicio
+
+    @property
+    def total_registrados(self) -> int:
+        """Ajustes agregados desde la creación (incluye los ya pisados)."""
+        return self._total
+
+    @property
+    def segmentos(self) -> List[Dict[str, Any]]:
+        """Segmentos en disco (archivo, desde, hasta, registros, conceptos)."""
+        return list(self._segmentos)
+
+    @property
+    def registros_en_disco(self) -> int:
+        """Ajustes guardados en segmentos (de esta y otras series)."""
+        return sum(segmento['registros'] for segmento in self._segmentos)
+
+    def claves_en_disco(self) -> set:
+        """Claves de los ajustes guardados en segmentos (de esta y otras series)."""
+        claves = set()
+        with self._lock:
+            for segmento in self._segmentos:
+                with np.load(self.directorio / segmento['archivo']) as datos:
+                    if 'clave' in datos.files:
+                        claves.update(datos['clave'].tolist())
+        return claves
+
+    def registros(self) -> List[Dict[str, Any]]:
+        """Ajustes en memoria, del más antiguo al más reciente."""
+        with self._lock:
+            return [self._registro(s % self.capacidad) for s in range(self._inicio, self._total)]
+
+    def por_concepto(self, concepto_id: str, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Ajustes en memoria de un concepto (vía índice).
+
+        Args:
+            concepto_id: ID del concepto
+            n: Solo los últimos n (None = todos)
+
+        Returns:
+            Lista de registros en orden temporal
+        """
+        with self._lock:
+            codigo = self._codigo_id.get(concepto_id)
+            secuencias = self._por_concepto.get(codigo, ())
+            if n is not None:
+                secuencias = list(secuencias)[-n:] if n > 0 else []
+            return [self._registro(s % self.capacidad) for s in secuencias]
+
+    def rango(
+        self,
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        concepto_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ajustes con instante en [desde, hasta], en disco y en memoria.
+
+        Args:
+            desde: Segundos epoch (None = sin límite)
+            hasta: Segundos epoch (None = sin límite)
+            concepto_id: Filtrar por concepto
+
+        Returns:
+            Lista de registros en orden temporal
+        """
+        desde = float('-inf') if desde is None else desde
+        hasta = float('inf') if hasta is None else hasta
+
+        with self._lock:
+            resultado = self._rango_disco(desde, hasta, concepto_id)
+
+            codigo = self._codigo_id.get(concepto_id) if concepto_id else None
+            if concepto_id and codigo is None:
+                return resultado
+
+            for posiciones in self._rango_memoria(desde, hasta):
+                if codigo is not None:
+                    posiciones = posiciones[self._concepto[posiciones] == codigo]
+                resultado.extend(self._registro(p) for p in posiciones.tolist())
+
+        return resultado
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Estadísticas de los ajustes en memoria (vectorizadas).
+
+        Returns:
+            Dict con total, aplicados, cambio promedio y conceptos distintos
+        """
+        with self._lock:
+            posiciones = np.concatenate(self._tramos()) if len(self) else np.zeros(0, dtype=np.int64)
+            aplicado = self._aplicado[posiciones]
+            cambios = np.abs(self._nuevo[posiciones] - self._anterior[posiciones])[aplicado]
+
+            return {
+                'total': len(posiciones),
+                'aplicados': int(np.count_nonzero(aplicado)),
+                'cambio_promedio': float(cambios.mean()) if len(cambios) else 0.0,
+                'conceptos': len(np.unique(self._concepto[posiciones])),
+                'total_registrados': self._total,
+                'segmentos': len(self._segmentos)
+            }
+
+    # ===== INTERNOS =====
+
+    @staticmethod
+    def _internar(texto: str, textos: List[str], codigos: Dict[str, int]) -> int:
+        """Código de un texto (lo agrega si es nuevo)."""
+        codigo = codigos.get(texto)
+        if codigo is None:
+            codigo = len(textos)
+            codigos[texto] = codigo
+            textos.append(texto)
+        return codigo
+
+    def _descartar_mas_antiguo(self):
+        """Saca del índice el ajuste más antiguo antes de pisarlo."""
+        codigo = int(self._concepto[self._inicio % self.capacidad])
+        secuencias = self._por_concepto[codigo]
+        secuencias.popleft()
+        if not secuencias:
+            del self._por_concepto[codigo]
+        self._inicio += 1
+
+    def _registro(self, posicion: int) -> Dict[str, Any]:
+        """Fila del anillo como dict."""
+        anterior = float(self._anterior[posicion])
+        nuevo = float(self._nuevo[posicion])
+        return {
+            'concepto_id': self._ids[self._concepto[posicion]],
+            'grounding_anterior': anterior,
+            'grounding_nuevo': nuevo,
+            'cambio': nuevo - anterior,
+            'razon': self._razones[self._razon[posicion]],
+            'aplicado': bool(self._aplicado[posicion]),
+            'timestamp': datetime.fromtimestamp(self._instante[posicion]).isoformat(),
+            'clave': int(self._clave[posicion])
+        }
+
+    def _tramos(self) -> List[np.ndarray]:
+        """Posiciones en memoria en orden temporal (uno o dos tramos contiguos)."""
+        inicio = self._inicio % self.capacidad
+        n = len(self)
+        if inicio + n <= self.capacidad:
+            return [np.arange(inicio, inicio + n)]
+        return [np.arange(inicio, self.capacidad), np.arange(0, inicio + n - self.capacidad)]
+
+    def _rango_memoria(self, desde: float, hasta: float) -> List[np.ndarray]:
+        """Posiciones en memoria con instante en [desde, hasta] (búsqueda binaria por tramo)."""
+        resultado = []
+        for tramo in self._tramos():
+            if not len(tramo):
+                continue
+            instantes = self._instante[tramo[0]:tramo[-1] + 1]
+            bajo = np.searchsorted(instantes, desde, side='left')
+            alto = np.searchsorted(instantes, hasta, side='right')
+            if alto > bajo:
+                resultado.append(tramo[bajo:alto])
+        return resultado
+
+    def _rango_disco(
+        self,
+        desde: float,
+        hasta: float,
+        concepto_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Ajustes en segmentos que ya no están en memoria."""
+        resultado = []
+        primero = bisect_left(self._hasta_segmentos, desde)
+
+        for indice in range(primero, len(self._segmentos)):
+            segmento = self._segmentos[indice]
+            if segmento['desde'] > hasta:
+                if self._solapados:
+                    continue
+                break
+            if concepto_id and concepto_id not in segmento['conceptos']:
+                continue
+
+            # Los segmentos de esta serie pueden seguir (en parte) en memoria
+            filas = segmento['registros']
+            secuencia = self._secuencia_segmento.get(segmento['archivo'])
+            if secuencia is not None:
+                filas = max(0, min(filas, self._inicio - secuencia))
+            if filas == 0:
+                continue
+
+            resultado.extend(self._leer_segmento(segmento, filas, desde, hasta, concepto_id))
+
+        if self._solapados:
+            resultado.sort(key=lambda registro: registro['timestamp'])
+        return resultado
+
+    def _leer_segmento(
+        self,
+        segmento: Dict[str, Any],
+        filas: int,
+        desde: float,
+        hasta: float,
+        concepto_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Registros de las primeras `filas` de un segmento que cumplen el filtro."""
+        with np.load(self.directorio / segmento['archivo']) as datos:
+            columnas = {clave: datos[clave] for clave in datos.files}
+
+        instantes = columnas['instante'][:filas]
+        bajo = np.searchsorted(instantes, desde, side='left')
+        alto = np.searchsorted(instantes, hasta, side='right')
+        seleccion = np.arange(bajo, alto)
+
+        ids = columnas['ids'].tolist()
+        if concepto_id:
+            seleccion = seleccion[columnas['concepto'][seleccion] == ids.index(concepto_id)]
+
+        razones = columnas['razones'].tolist()
+        conceptos = columnas['concepto'].tolist()
+        anteriores = columnas['anterior'].tolist()
+        nuevos = columnas['nuevo'].tolist()
+        codigos_razon = columnas['razon'].tolist()
+        aplicados = columnas['aplicado'].tolist()
+        claves = columnas['clave'].tolist() if 'clave' in columnas else [None] * len(conceptos)
+
+        return [
+            {
+                'concepto_id': ids[conceptos[i]],
+                'grounding_anterior': anteriores[i],
+                'grounding_nuevo': nuevos[i],
+                'cambio': nuevos[i] - anteriores[i],
+                'razon': razones[codigos_razon[i]],
+                'aplicado': aplicados[i],
+                'timestamp': datetime.fromtimestamp(instantes[i]).isoformat(),
+                'clave': claves[i]
+            }
+            for i in seleccion.tolist()
+        ]
+
+    def _volcar(self):
+        """Escribe [_volcado, _total) como un segmento nuevo (con el lock tomado)."""
+        posiciones = np.arange(self._volcado, self._total) % self.capacidad
+
+        conceptos, conceptos_locales = np.unique(self._concepto[posiciones], return_inverse=True)
+        razones, razones_locales = np.unique(self._razon[posiciones], return_inverse=True)
+        ids = [self._ids[c] for c in conceptos.tolist()]
+        instantes = self._instante[posiciones]
+
+        archivo = f"segmento_{self._origen}_{len(self._propios):06d}.npz"
+        _escribir_atomico(self.directorio / archivo, lambda f: np.savez(
+            f,
+            ids=np.array(ids),
+            concepto=conceptos_locales.astype(np.int32),
+            instante=instantes,
+            anterior=self._anterior[posiciones],
+            nuevo=self._nuevo[posiciones],
+            razones=np.array([self._razones[r] for r in razones.tolist()]),
+            razon=razones_locales.astype(np.int32),
+            aplicado=self._aplicado[posiciones],
+            clave=self._clave[posiciones]
+        ))
+
+        segmento = {
+            'archivo': archivo,
+            'desde': float(instantes[0]),
+            'hasta': float(instantes[-1]),
+            'registros': len(posiciones),
+            'conceptos': ids
+        }
+        self._secuencia_segmento[archivo] = self._volcado
+        self._segmentos.append(segmento)
+        self._propios.append(segmento)
+        self._hasta_segmentos.append(segmento['hasta'])
+        self._volcado = self._total
+
+        # Cada serie reescribe solo su índice
+        indice = {'version': VERSION_INDICE, 'segmentos': self._propios}
+        _escribir_atomico(
+            self.directorio / f'indice_{self._origen}.json',
+            lambda f: f.write(json.dumps(indice, ensure_ascii=False).encode('utf-8'))
+        )
+
+    def _leer_indices(self) -> List[Dict[str, Any]]:
+        """
+        Segmentos de todos los índices del directorio, ordenados por 'hasta'.
+
+        Se ignoran los índices dañados o de otra versión (incluye el
+        indice.json único de versiones anteriores, que tiene el mismo formato).
+        """
+        segmentos = []
+        for ruta in sorted(self.directorio.glob('indice*.json')):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    indice = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if indice.get('version') != VERSION_INDICE:
+                continue
+            segmentos.extend(indice.get('segmentos', []))
+        segmentos.sort(key=lambda segmento: (segmento['hasta'], segmento['desde']))
+        return segmentos
+
+def _escribir_atomico(ruta: Path, escribir: Callable[[Any], Any]):
+    """Escribe (en binario) a un temporal del mismo directorio y lo reemplaza con os.replace."""
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, prefix=f'.{ruta.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
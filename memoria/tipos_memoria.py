@@ -56,6 +56,7 @@ class RegistroAjuste(TypedDict):
     grounding_nuevo: float
     razon: str
     aplicado: bool
+    clave: int  # Clave en SerieAjustes (falta en registros de versiones anteriores)
 
 class RegistroSesion(TypedDict):
     """Registro de una sesión de conversación."""
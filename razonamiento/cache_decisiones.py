@@ -0,0 +1,84 @@
+"""
+Cache de Decisiones - Reutiliza decisiones ya razonadas.
+
+razonar() es determinista dado lo que entra: intención, confianza de la
+traducción, los conceptos (en orden) y el grounding vigente. La cache
+guarda la Decision de cada combinación, congelada, y la devuelve tal
+cual a los turnos siguientes con la misma entrada. El grounding entra en
+la clave como el número de versión de la instantánea publicada, que
+sube con cada ajuste del aprendizaje: tras un ajuste las claves viejas
+dejan de coincidir y salen de la cache por antigüedad.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import threading
+from razonamiento.tipos_decision import Decision
+
+class CacheDecisiones:
+    """Cache LRU acotada de decisiones congeladas."""
+
+    def __init__(self, capacidad: int = 1024):
+        """
+        Args:
+            capacidad: Decisiones que se conservan (0 = sin cache)
+        """
+        self.capacidad = capacidad
+        self._decisiones: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._decisiones)
+
+    def obtener(self, clave: Hashable) -> Optional[Decision]:
+        """
+        Decisión guardada para una clave (None si no está).
+        """
+        with self._lock:
+            decision = self._decisiones.get(clave)
+            if decision is None:
+                self.fallos += 1
+                return None
+
+            self._decisiones.move_to_end(clave)
+            self.aciertos += 1
+            return decision
+
+    def guardar(self, clave: Hashable, decision: Decision) -> Decision:
+        """
+        Guarda una decisión (congelada).
+
+        Returns:
+            La decisión congelada que devolverán los aciertos
+        """
+        congelada = decision.congelar()
+        if self.capacidad <= 0:
+            return congelada
+
+        with self._lock:
+            self._decisiones[clave] = congelada
+            self._decisiones.move_to_end(clave)
+            while len(self._decisiones) > self.capacidad:
+                self._decisiones.popitem(last=False)
+        return congelada
+
+    def limpiar(self):
+        """Descarta todas las decisiones guardadas."""
+        with self._lock:
+            self._decisiones.clear()
+
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict con tamaño, capacidad, aciertos, fallos y tasa de aciertos
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'tamano': len(self._decisiones),
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
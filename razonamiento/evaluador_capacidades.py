@@ -3,9 +3,21 @@ Evaluador de Capacidades - ¿Bell PUEDE hacer algo?
 
 Este módulo determina si Bell tiene la capacidad REAL de hacer algo
 basándose en el grounding de conceptos.
+
+El grounding se lee de la instantánea publicada por el aprendizaje (si
+hay un PublicadorGrounding): una evaluación toma la instantánea vigente
+una sola vez y no ve lotes de aprendizaje a medio aplicar.
+
+Lo que cada concepto permite hacer (operación principal, nivel de
+grounding) se precalcula en una TablaCapacidades.
 """
-from typing import List, Dict, Optional, Tuple
+from operator import attrgetter
+from typing import List, Optional, Tuple
 from core.concepto_anclado import ConceptoAnclado
+from core.instantanea_grounding import PublicadorGrounding
+from razonamiento.tabla_capacidades import EvaluacionCapacidad, TablaCapacidades
+
+_grounding_registro = attrgetter('grounding')
 
 class EvaluadorCapacidades:
     """
@@ -19,90 +31,68 @@ class EvaluadorCapacidades:
     UMBRAL_GROUNDING_MEDIO = 0.7  # Puede intentar, advertir
     UMBRAL_GROUNDING_BAJO = 0.5   # No puede ejecutar
     
-    def __init__(self):
-        """Inicializa evaluador."""
-        pass
+    def __init__(self, instantaneas: Optional[PublicadorGrounding] = None):
+        """
+        Inicializa evaluador.
+        
+        Args:
+            instantaneas: Publicador de grounding (None = leer de los conceptos)
+        """
+        self.instantaneas = instantaneas
+        self.capacidades = TablaCapacidades(
+            self.UMBRAL_GROUNDING_ALTO,
+            self.UMBRAL_GROUNDING_MEDIO
+        )
+    
+    def _lector_grounding(self):
+        """
+        Función concepto -> grounding sobre la instantánea vigente.
+        
+        Returns:
+            (lector, version) con version None si no hay publicador
+        """
+        if self.instantaneas is None:
+            return (lambda c: c.confianza_grounding), None
+        
+        # Una sola lectura de la referencia: toda la evaluación usa esta versión
+        instantanea = self.instantaneas.actual
+        return instantanea.grounding_de, instantanea.version
     
     def evaluar_capacidad_accion(self, 
-                                 conceptos: List[ConceptoAnclado]) -> Dict:
+                                 conceptos: List[ConceptoAnclado]) -> EvaluacionCapacidad:
         """
         Evalúa si Bell puede realizar una acción basándose en conceptos.
         
+        Cada concepto se resuelve con su registro de la tabla de
+        capacidades; decide el de mayor grounding.
+        
         Args:
             conceptos: Lista de ConceptosAnclados traducidos
             
         Returns:
+            EvaluacionCapacidad, que se lee como el dict
             {
                 'puede_ejecutar': bool,
                 'confianza': float,
                 'operacion': str or None,
                 'concepto_clave': ConceptoAnclado or None,
-                'razon': str,
-                'groundings': List[float]
+                'razon': str (se arma al pedirla),
+                'groundings': List[float],
+                'version_grounding': int or None
             }
         """
+        grounding_de, version = self._lector_grounding()
+        
         if not conceptos:
-            return {
-                'puede_ejecutar': False,
-                'confianza': 0.0,
-                'operacion': None,
-                'concepto_clave': None,
-                'razon': 'No hay conceptos para evaluar',
-                'groundings': []
-            }
+            return EvaluacionCapacidad(None, [], version)
         
-        # Buscar concepto de acción principal (con mayor grounding)
-        concepto_principal = max(conceptos, key=lambda c: c.confianza_grounding)
-        
-        # Extraer groundings
-        groundings = [c.confianza_grounding for c in conceptos]
-        grounding_promedio = sum(groundings) / len(groundings)
-        
-        # ¿Tiene operaciones ejecutables?
-        tiene_operaciones = len(concepto_principal.operaciones) > 0
-        
-        # Decidir
-        if concepto_principal.confianza_grounding >= self.UMBRAL_GROUNDING_ALTO and \
-           tiene_operaciones:
-            # PUEDE ejecutar con confianza
-            operacion = list(concepto_principal.operaciones.keys())[0]
-            return {
-                'puede_ejecutar': True,
-                'confianza': concepto_principal.confianza_grounding,
-                'operacion': operacion,
-                'concepto_clave': concepto_principal,
-                'razon': f'Grounding alto ({concepto_principal.confianza_grounding}) con operación ejecutable',
-                'groundings': groundings
-            }
+        obtener = self.capacidades.obtener
+        registros = [obtener(c, grounding_de(c)) for c in conceptos]
         
-        elif concepto_principal.confianza_grounding >= self.UMBRAL_GROUNDING_MEDIO and \
-             tiene_operaciones:
-            # PUEDE ejecutar con advertencia
-            operacion = list(concepto_principal.operaciones.keys())[0]
-            return {
-                'puede_ejecutar': True,
-                'confianza': concepto_principal.confianza_grounding,
-                'operacion': operacion,
-                'concepto_clave': concepto_principal,
-                'razon': f'Grounding medio ({concepto_principal.confianza_grounding}), puede intentar',
-                'groundings': groundings
-            }
+        # Concepto de acción principal (con mayor grounding)
+        principal = max(registros, key=_grounding_registro)
         
-        else:
-            # NO puede ejecutar
-            if not tiene_operaciones:
-                razon = f'Concepto "{concepto_principal.id}" no tiene operaciones ejecutables'
-            else:
-                razon = f'Grounding muy bajo ({concepto_principal.confianza_grounding})'
-            
-            return {
-                'puede_ejecutar': False,
-                'confianza': concepto_principal.confianza_grounding,
-                'operacion': None,
-                'concepto_clave': concepto_principal,
-                'razon': razon,
-                'groundings': groundings
-            }
+        return EvaluacionCapacidad(principal, [r.grounding for r in registros], version)
     
     def verificar_requisitos(self, 
                             concepto: ConceptoAnclado,
@@ -137,7 +127,8 @@ class EvaluadorCapacidades:
         if not conceptos:
             return 0.0
         
-        groundings = [c.confianza_grounding for c in conceptos]
+        grounding_de, _ = self._lector_grounding()
+        groundings = [grounding_de(c) for c in conceptos]
         
         # Promedio ponderado (dar más peso a groundings altos)
         promedio = sum(groundings) / len(groundings)
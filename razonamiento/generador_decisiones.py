@@ -3,8 +3,9 @@ Generador de Decisiones - Crea objetos Decision.
 
 Toma evaluaciones y las convierte en decisiones estructuradas.
 """
-from typing import List
+from typing import List, Optional
 from core.concepto_anclado import ConceptoAnclado
+from core.instantanea_grounding import PublicadorGrounding
 from razonamiento.tipos_decision import Decision, TipoDecision, RazonRechazo
 from razonamiento.evaluador_capacidades import EvaluadorCapacidades
 
@@ -15,9 +16,14 @@ class GeneradorDecisiones:
     Conecta: Evaluación → Decision estructurada
     """
     
-    def __init__(self):
-        """Inicializa generador."""
-        self.evaluador = EvaluadorCapacidades()
+    def __init__(self, instantaneas: Optional[PublicadorGrounding] = None):
+        """
+        Inicializa generador.
+        
+        Args:
+            instantaneas: Publicador de grounding para el evaluador
+        """
+        self.evaluador = EvaluadorCapacidades(instantaneas)
     
     def generar_decision_capacidad(self,
                                    conceptos: List[ConceptoAnclado],
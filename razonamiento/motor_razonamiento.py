@@ -3,7 +3,10 @@ Motor de Razonamiento - El cerebro de Bell.
 
 Recibe traducción → Genera decisión.
 """
-from typing import Dict
+from typing import Dict, Hashable, List, Optional
+from core.concepto_anclado import ConceptoAnclado
+from core.instantanea_grounding import PublicadorGrounding
+from razonamiento.cache_decisiones import CacheDecisiones
 from razonamiento.tipos_decision import Decision
 from razonamiento.generador_decisiones import GeneradorDecisiones
 
@@ -19,20 +22,80 @@ class MotorRazonamiento:
     Bell NO piensa como humano. Bell evalúa grounding.
     """
     
-    def __init__(self):
-        """Inicializa motor."""
-        self.generador = GeneradorDecisiones()
+    def __init__(
+        self,
+        instantaneas: Optional[PublicadorGrounding] = None,
+        capacidad_cache: int = 1024
+    ):
+        """
+        Inicializa motor.
+        
+        Args:
+            instantaneas: Publicador de grounding del aprendizaje (None =
+                          leer el grounding directo de los conceptos)
+            capacidad_cache: Decisiones reutilizables en memoria (0 = sin cache)
+        """
+        self.instantaneas = instantaneas
+        self.generador = GeneradorDecisiones(instantaneas)
+        self.cache = CacheDecisiones(capacidad_cache)
     
     def razonar(self, traduccion: Dict) -> Decision:
         """
         Razona sobre una traducción y genera una decisión.
         
+        La misma traducción con el mismo grounding da la misma decisión:
+        se devuelve la guardada en la cache (congelada, compartida).
+        
         Args:
             traduccion: Dict retornado por TraductorEntrada
             
         Returns:
-            Decision object
+            Decision object (de solo lectura)
+        """
+        if self.cache.capacidad <= 0:
+            return self._razonar(traduccion)
+        
+        clave = self._clave_cache(traduccion)
+        decision = self.cache.obtener(clave)
+        if decision is None:
+            decision = self.cache.guardar(clave, self._razonar(traduccion))
+        return decision
+    
+    def _clave_cache(self, traduccion: Dict) -> Hashable:
         """
+        Clave de la cache: todo lo que puede cambiar la decisión.
+        
+        - La confianza solo importa por debajo de 0.3 (NO_ENTENDIDO la
+          muestra); por encima da igual su valor.
+        - Los IDs van en orden y con repetidos: desempatan el concepto
+          principal y aparecen en los pasos.
+        - El grounding entra como versión de la instantánea publicada;
+          los conceptos que no están en ella aportan su grounding propio.
+        """
+        conceptos: List[ConceptoAnclado] = traduccion['conceptos']
+        confianza = traduccion['confianza']
+        cubeta_confianza = confianza if confianza < 0.3 else None
+        
+        if self.instantaneas is not None:
+            instantanea = self.instantaneas.actual
+            version = instantanea.version
+            sueltos = tuple(
+                c.confianza_grounding for c in conceptos if c.id not in instantanea
+            )
+        else:
+            version = None
+            sueltos = tuple(c.confianza_grounding for c in conceptos)
+        
+        return (
+            traduccion['intencion'],
+            cubeta_confianza,
+            tuple(c.id for c in conceptos),
+            version,
+            sueltos
+        )
+    
+    def _razonar(self, traduccion: Dict) -> Decision:
+        """Genera la decisión sin pasar por la cache."""
         conceptos = traduccion['conceptos']
         intencion = traduccion['intencion']
         confianza = traduccion['confianza']
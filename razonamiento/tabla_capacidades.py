@@ -0,0 +1,182 @@
+"""
+Tabla de Capacidades - Lo que cada concepto permite hacer, precalculado.
+
+evaluar_capacidad_accion miraba en cada turno las operaciones de cada
+concepto, comparaba su grounding con los umbrales y armaba las razones
+en texto. La tabla guarda por concepto un registro con lo que no cambia
+entre turnos: si tiene operaciones, cuál es la principal y el nivel de
+su grounding. El registro se rehace solo cuando cambia el grounding del
+concepto (o el concepto), así que evaluar es buscar registros y tomar
+el de mayor grounding.
+
+El texto de la razón se arma la primera vez que alguien lo pide y queda
+guardado en el registro.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from core.concepto_anclado import ConceptoAnclado
+
+# Claves del dict clásico de evaluar_capacidad_accion
+_CLAVES_EVALUACION = (
+    'puede_ejecutar', 'confianza', 'operacion', 'concepto_clave',
+    'razon', 'groundings', 'version_grounding'
+)
+
+@dataclass(slots=True, eq=False)
+class CapacidadConcepto:
+    """Capacidad de un concepto con un grounding dado (no se modifica)."""
+    concepto: ConceptoAnclado
+    grounding: float
+    ejecutable: bool                  # ¿Tiene operaciones?
+    operacion: Optional[str]          # Operación principal (la primera)
+    nivel: str                        # 'ALTO', 'MEDIO' o 'BAJO'
+    _razon: Optional[str] = field(default=None, init=False, repr=False)
+
+    @property
+    def puede_ejecutar(self) -> bool:
+        return self.ejecutable and self.nivel != 'BAJO'
+
+    def razon(self) -> str:
+        """Explicación en texto (se arma una sola vez)."""
+        if self._razon is None:
+            if self.puede_ejecutar and self.nivel == 'ALTO':
+                self._razon = f'Grounding alto ({self.grounding}) con operación ejecutable'
+            elif self.puede_ejecutar:
+                self._razon = f'Grounding medio ({self.grounding}), puede intentar'
+            elif not self.ejecutable:
+                self._razon = f'Concepto "{self.concepto.id}" no tiene operaciones ejecutables'
+            else:
+                self._razon = f'Grounding muy bajo ({self.grounding})'
+        return self._razon
+
+class TablaCapacidades:
+    """Registro de capacidad por concepto, rehecho al cambiar su grounding."""
+
+    def __init__(self, umbral_alto: float = 0.9, umbral_medio: float = 0.7):
+        """
+        Args:
+            umbral_alto: Grounding para ejecutar con confianza
+            umbral_medio: Grounding para intentar con advertencia
+        """
+        self.umbral_alto = umbral_alto
+        self.umbral_medio = umbral_medio
+        self._registros: Dict[str, CapacidadConcepto] = {}
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def obtener(self, concepto: ConceptoAnclado, grounding: float) -> CapacidadConcepto:
+        """
+        Registro de un concepto con el grounding vigente.
+
+        Args:
+            concepto: Concepto a evaluar
+            grounding: Su grounding según la instantánea que se está leyendo
+
+        Returns:
+            El registro guardado, o uno nuevo si el grounding cambió
+        """
+        registro = self._registros.get(concepto.id)
+        if registro is not None and registro.grounding == grounding and registro.concepto is concepto:
+            return registro
+
+        # Reemplazar (no modificar): otros threads pueden tener el anterior
+        registro = self._crear(concepto, grounding, registro)
+        self._registros[concepto.id] = registro
+        return registro
+
+    def _crear(
+        self,
+        concepto: ConceptoAnclado,
+        grounding: float,
+        anterior: Optional[CapacidadConcepto]
+    ) -> CapacidadConcepto:
+        if anterior is not None and anterior.concepto is concepto:
+            # Solo cambió el grounding: las operaciones son las mismas
+            ejecutable, operacion = anterior.ejecutable, anterior.operacion
+        else:
+            operacion = next(iter(concepto.operaciones), None)
+            ejecutable = operacion is not None
+
+        if grounding >= self.umbral_alto:
+            nivel = 'ALTO'
+        elif grounding >= self.umbral_medio:
+            nivel = 'MEDIO'
+        else:
+            nivel = 'BAJO'
+
+        return CapacidadConcepto(concepto, grounding, ejecutable, operacion, nivel)
+
+    def precalcular(self, conceptos: List[ConceptoAnclado], grounding_de=None) -> int:
+        """
+        Crea los registros de un vocabulario de antemano.
+
+        Args:
+            conceptos: Conceptos a registrar
+            grounding_de: Función concepto -> grounding (None = atributo)
+
+        Returns:
+            Número de registros en la tabla
+        """
+        for concepto in conceptos:
+            grounding = grounding_de(concepto) if grounding_de else concepto.confianza_grounding
+            self.obtener(concepto, grounding)
+        return len(self._registros)
+
+    def invalidar(self, concepto_id: Optional[str] = None):
+        """
+        Descarta registros (p. ej. si cambiaron las operaciones de un concepto).
+
+        Args:
+            concepto_id: Concepto a descartar (None = todos)
+        """
+        if concepto_id is None:
+            self._registros = {}
+        else:
+            self._registros.pop(concepto_id, None)
+
+@dataclass(slots=True, eq=False)
+class EvaluacionCapacidad(Mapping):
+    """
+    Resultado de evaluar_capacidad_accion.
+
+    Se lee como el dict clásico; evaluacion['razon'] arma el texto recién
+    cuando se pide.
+    """
+    principal: Optional[CapacidadConcepto]
+    groundings: List[float]
+    version_grounding: Optional[int] = None
+
+    @property
+    def puede_ejecutar(self) -> bool:
+        return self.principal is not None and self.principal.puede_ejecutar
+
+    @property
+    def confianza(self) -> float:
+        return self.principal.grounding if self.principal is not None else 0.0
+
+    @property
+    def operacion(self) -> Optional[str]:
+        return self.principal.operacion if self.puede_ejecutar else None
+
+    @property
+    def concepto_clave(self) -> Optional[ConceptoAnclado]:
+        return self.principal.concepto if self.principal is not None else None
+
+    @property
+    def razon(self) -> str:
+        if self.principal is None:
+            return 'No hay conceptos para evaluar'
+        return self.principal.razon()
+
+    def __getitem__(self, clave: str) -> Any:
+        if clave not in _CLAVES_EVALUACION:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_CLAVES_EVALUACION)
+
+    def __len__(self) -> int:
+        return len(_CLAVES_EVALUACION)
@@ -4,7 +4,7 @@ Tipos de Decisiones que Bell puede tomar.
 Una Decision es la salida del Motor de Razonamiento.
 """
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import List, Dict, Any, Optional
 
 class TipoDecision(Enum):
@@ -72,6 +72,37 @@ class Decision:
         """¿Esta decisión rechaza la petición?"""
         return self.tipo in [TipoDecision.NEGATIVA, TipoDecision.NO_ENTENDIDO]
     
+    def congelar(self) -> 'Decision':
+        """
+        Copia inmutable de la decisión (listas como tuplas).
+        
+        Se puede compartir entre turnos y threads (ver CacheDecisiones).
+        """
+        if isinstance(self, DecisionCongelada):
+            return self
+        
+        valores = {}
+        for campo in fields(self):
+            valor = getattr(self, campo.name)
+            valores[campo.name] = tuple(valor) if isinstance(valor, list) else valor
+        
+        congelada = DecisionCongelada(**valores)
+        object.__setattr__(congelada, '_congelada', True)
+        return congelada
+    
     def __repr__(self) -> str:
         return (f"Decision(tipo={self.tipo.name}, certeza={self.certeza:.2f}, "
-                f"ejecutable={self.puede_ejecutar})")
\ No newline at end of file
+                f"ejecutable={self.puede_ejecutar})")
+
+class DecisionCongelada(Decision):
+    """Decision de solo lectura (ver Decision.congelar)."""
+    
+    def __setattr__(self, nombre, valor):
+        if getattr(self, '_congelada', False):
+            raise AttributeError(f"Decision congelada: no se puede modificar '{nombre}'")
+        super().__setattr__(nombre, valor)
+    
+    def __delattr__(self, nombre):
+        if getattr(self, '_congelada', False):
+            raise AttributeError(f"Decision congelada: no se puede borrar '{nombre}'")
+        super().__delattr__(nombre)
\ No newline at end of file
@@ -2,9 +2,11 @@
 Tests para Sistema de Aprendizaje Básico - Fase 2.
 """
 import pytest
+import numpy as np
 from datetime import datetime
 
 from aprendizaje.estrategias import (
+    EstrategiaAprendizaje,
     EstrategiaUsoFrecuente,
     EstrategiaExitoFallido,
     EstrategiaInsights,
@@ -14,7 +16,12 @@ from aprendizaje.estrategias import (
 from aprendizaje.ajustador_grounding import AjustadorGrounding
 from aprendizaje.aplicador_insights import AplicadorInsights
 from aprendizaje.motor_aprendizaje import MotorAprendizaje
+from aprendizaje.tabla_grounding import TablaGrounding
+from aprendizaje.registro_usos import RegistroUsos
+from aprendizaje.programador_ciclos import ProgramadorCiclos
+from aprendizaje.reproductor import codificar_eventos, eventos_desde_jsonl, reproducir
 from core.concepto_anclado import ConceptoAnclado
+from core.instantanea_grounding import PublicadorGrounding
 from core.tipos import TipoConcepto
 
 # ===== TESTS ESTRATEGIAS =====
@@ -171,6 +178,25 @@ def test_ajustador_historial():
     historial = ajustador.obtener_historial()
     assert len(historial) >= 1
 
+def test_ajustador_historial_acotado():
+    """Test: El historial no crece más allá de su capacidad."""
+    ajustador = AjustadorGrounding(EstrategiaUsoFrecuente(umbral_usos=5), capacidad_historial=3)
+    concepto = ConceptoAnclado(
+        id='CONCEPTO_TEST',
+        tipo=TipoConcepto.ACCION_COGNITIVA,
+        palabras_español=['test'],
+        confianza_grounding=0.5
+    )
+    
+    for _ in range(5):
+        propuesta = ajustador.proponer_ajuste(concepto.id, concepto.confianza_grounding, {'usos': 10})
+        ajustador.aplicar_ajuste(concepto, propuesta)
+    
+    historial = ajustador.obtener_historial('CONCEPTO_TEST')
+    assert len(historial) == 3
+    assert historial[-1]['grounding_nuevo'] == pytest.approx(0.75)
+    assert ajustador.obtener_estadisticas()['total_ajustes'] == 3
+
 def test_ajustador_estadisticas():
     """Test: Estadísticas del ajustador."""
     ajustador = AjustadorGrounding(EstrategiaUsoFrecuente(umbral_usos=5))
@@ -284,6 +310,94 @@ def test_aplicador_estadisticas():
     assert stats['insights_procesados'] == 1
     assert stats['acciones_generadas'] >= 1
 
+def test_aplicador_insight_procesado_una_vez():
+    """Test: Un insight repetido entre ciclos se procesa una sola vez."""
+    aplicador = AplicadorInsights()
+    insight = {
+        'tipo': 'CONCEPTO_DOMINANTE',
+        'relevancia': 'ALTA',
+        'datos': {'concepto_id': 'CONCEPTO_A', 'porcentaje': 45},
+        'timestamp': '2025-01-01T10:00:00'
+    }
+    
+    assert len(aplicador.procesar_multiples_insights([insight, dict(insight)])) == 1
+    assert aplicador.procesar_multiples_insights([insight]) == []
+    
+    # Uno que llega tarde (consolidado en otro proceso) con timestamp anterior sigue siendo nuevo
+    tardio = dict(insight, timestamp='2024-12-31T10:00:00')
+    assert aplicador.es_nuevo(tardio)
+    
+    nuevo = dict(insight, timestamp='2025-01-01T11:00:00')
+    assert aplicador.filtrar_nuevos([insight, tardio, nuevo]) == [tardio, nuevo]
+    assert aplicador.obtener_estadisticas()['insights_procesados'] == 1
+
+def test_aplicador_ajuste_recomendado_sin_cuenta_de_usos():
+    """Test: Un ajuste recomendado se reconoce por concepto y ventana, no por su razón."""
+    aplicador = AplicadorInsights()
+    ajuste = {
+        'tipo': 'AUMENTAR_GROUNDING',
+        'concepto_id': 'CONCEPTO_LEER',
+        'razon': 'Usado 10 veces (50.0%)',
+        'ajuste_sugerido': 0.05,
+        'prioridad': 'ALTA',
+        'ventana': 7
+    }
+    
+    assert len(aplicador.procesar_multiples_insights([ajuste])) == 1
+    assert not aplicador.es_nuevo(dict(ajuste, razon='Usado 13 veces (52.0%)'))
+    assert aplicador.es_nuevo(dict(ajuste, ventana=8))
+
+def test_aplicador_acciones_pendientes_por_prioridad():
+    """Test: Pendientes en orden de prioridad, sin duplicados, y se retiran al aplicar."""
+    aplicador = AplicadorInsights()
+    insights = [
+        {'tipo': 'CONCEPTO_DOMINANTE', 'relevancia': 'BAJA', 'datos': {'concepto_id': 'A', 'porcentaje': 31}},
+        {'tipo': 'CERTEZA_BAJA', 'relevancia': 'MEDIA', 'datos': {'certeza_promedio': 0.4}},
+        {'tipo': 'CONCEPTO_DOMINANTE', 'relevancia': 'ALTA', 'datos': {'concepto_id': 'B', 'porcentaje': 45}},
+        {'tipo': 'CONCEPTO_DOMINANTE', 'relevancia': 'ALTA', 'datos': {'concepto_id': 'B', 'porcentaje': 50}}
+    ]
+    aplicador.procesar_multiples_insights(insights)
+    
+    pendientes = aplicador.obtener_acciones_pendientes()
+    assert [a['prioridad'] for a in pendientes] == ['ALTA', 'MEDIA', 'MEDIA']
+    assert len(aplicador.obtener_acciones_pendientes(prioridad_minima='ALTA')) == 1
+    assert len(aplicador.obtener_acciones_pendientes(n=2)) == 2
+    
+    aplicador.marcar_accion_aplicada(pendientes[0])
+    
+    assert len(aplicador.obtener_acciones_pendientes()) == 2
+    assert aplicador.obtener_estadisticas()['acciones_aplicadas'] == 1
+
+def test_aplicador_acciones_pendientes_se_reemplazan_y_vencen():
+    """Test: Una acción nueva reemplaza a la pendiente con su clave; las no aplicadas vencen."""
+    aplicador = AplicadorInsights(vida_pendientes=2)
+    
+    def certeza(valor):
+        return {'tipo': 'CERTEZA_BAJA', 'datos': {'certeza_promedio': valor}}
+    
+    aplicador.procesar_multiples_insights([certeza(0.4)])
+    aplicador.procesar_multiples_insights([certeza(0.3)])
+    pendientes = aplicador.obtener_acciones_pendientes()
+    assert [a['razon'] for a in pendientes] == ['Certeza promedio baja (0.3)']
+    
+    # Nadie aplica las acciones de revisión: vencen a los 2 lotes
+    aplicador.procesar_multiples_insights([])
+    assert len(aplicador.obtener_acciones_pendientes()) == 1
+    aplicador.procesar_multiples_insights([])
+    assert aplicador.obtener_acciones_pendientes() == []
+    assert aplicador.obtener_estadisticas()['acciones_pendientes'] == 0
+
+def test_aplicador_historial_acotado():
+    """Test: El historial de insights y acciones no crece sin límite."""
+    aplicador = AplicadorInsights(max_historial=5)
+    
+    for i in range(20):
+        aplicador.procesar_insight({'tipo': 'CONCEPTO_DOMINANTE', 'datos': {'concepto_id': f'C{i}', 'porcentaje': 45}})
+    
+    assert len(aplicador.insights_procesados) == 5
+    assert len(aplicador.acciones_generadas) == 5
+    assert aplicador.obtener_estadisticas()['acciones_generadas'] == 20
+
 # ===== TESTS MOTOR APRENDIZAJE =====
 
 def test_motor_crear():
@@ -353,5 +467,442 @@ def test_motor_reiniciar_estadisticas():
     
     assert motor.ciclos_ejecutados == 0
 
+# ===== TESTS AJUSTE POR LOTES =====
+
+def _contexto_aleatorio(n, semilla=0):
+    """Grounding y contexto por lotes aleatorios (incluye bordes)."""
+    rng = np.random.default_rng(semilla)
+    grounding = rng.choice([0.0, 0.005, 0.1, 0.5, 0.97, 0.995, 1.0], size=n)
+    grounding = np.where(rng.random(n) < 0.5, rng.random(n), grounding)
+    exitos = rng.integers(0, 8, size=n)
+    fallos = rng.integers(0, 8, size=n)
+    usos = exitos + fallos
+    tasa = np.ones(n)
+    np.divide(exitos, usos, out=tasa, where=usos > 0)
+    contexto = {
+        'usos': usos,
+        'usos_exitosos': exitos,
+        'usos_fallidos': fallos,
+        'tasa_exito': tasa,
+        'ajuste_sugerido': rng.choice([0.0, 0.004, -0.05, 0.1, 0.3], size=n),
+        'direccion': rng.choice(['aumentar', 'disminuir', ''], size=n),
+        'confianza': rng.random(n)
+    }
+    return grounding, contexto
+
+def _escalar(estrategia, grounding, contexto):
+    """Aplica calcular_ajuste concepto por concepto (NaN = sin ajuste)."""
+    resultado = []
+    for i in range(len(grounding)):
+        contexto_i = {k: v[i].item() for k, v in contexto.items()}
+        nuevo = estrategia.calcular_ajuste(f'C{i}', float(grounding[i]), contexto_i)
+        resultado.append(np.nan if nuevo is None else nuevo)
+    return np.array(resultado)
+
+@pytest.mark.parametrize('estrategia', [
+    EstrategiaUsoFrecuente(umbral_usos=5),
+    EstrategiaExitoFallido(),
+    EstrategiaInsights(),
+    EstrategiaConservadora(),
+    EstrategiaConservadora(max_cambio=0.008),
+    EstrategiaComposite([EstrategiaInsights(), EstrategiaUsoFrecuente(umbral_usos=5), EstrategiaExitoFallido()])
+])
+def test_estrategia_lote_igual_a_escalar(estrategia):
+    """Test: calcular_ajuste_lote da lo mismo que calcular_ajuste."""
+    grounding, contexto = _contexto_aleatorio(2000)
+    ids = [f'C{i}' for i in range(len(grounding))]
+    
+    lote = estrategia.calcular_ajuste_lote(ids, grounding, contexto)
+    
+    np.testing.assert_array_equal(lote, _escalar(estrategia, grounding, contexto))
+
+def test_estrategia_lote_por_defecto_recorre_escalar():
+    """Test: Una estrategia sin forma vectorizada usa calcular_ajuste."""
+    class EstrategiaFija(EstrategiaAprendizaje):
+        def calcular_ajuste(self, concepto_id, grounding_actual, contexto):
+            return 0.5 if contexto['usos'] > 3 else None
+    
+    lote = EstrategiaFija().calcular_ajuste_lote(['A', 'B'], np.array([0.2, 0.2]), {'usos': np.array([5, 1])})
+    
+    np.testing.assert_array_equal(lote, [0.5, np.nan])
+
+def test_ajustador_lote_valida_como_escalar():
+    """Test: proponer_ajustes_lote aplica los mismos límites que proponer_ajuste."""
+    ajustador = AjustadorGrounding()
+    grounding, contexto = _contexto_aleatorio(1000, semilla=1)
+    ids = [f'C{i}' for i in range(len(grounding))]
+    
+    lote = ajustador.proponer_ajustes_lote(ids, grounding, contexto)
+    
+    for i in range(len(grounding)):
+        contexto_i = {k: v[i].item() for k, v in contexto.items()}
+        propuesta = ajustador.proponer_ajuste(ids[i], float(grounding[i]), contexto_i)
+        if propuesta is None:
+            assert np.isnan(lote[i])
+        else:
+            assert lote[i] == propuesta['grounding_propuesto']
+
+def test_tabla_grounding_contadores():
+    """Test: La tabla acumula usos y aplica ajustes a los conceptos."""
+    conceptos = [
+        ConceptoAnclado(id=f'CONCEPTO_{i}', tipo=TipoConcepto.ACCION_COGNITIVA,
+                        palabras_español=[f'p{i}'], confianza_grounding=0.5)
+        for i in range(3)
+    ]
+    tabla = TablaGrounding(conceptos)
+    
+    tabla.registrar_uso('CONCEPTO_1', exitoso=True)
+    tabla.registrar_uso('CONCEPTO_1', exitoso=False)
+    assert not tabla.registrar_uso('NO_EXISTE', exitoso=True)
+    
+    contexto = tabla.contexto_lote()
+    assert contexto['usos'].tolist() == [0, 2, 0]
+    assert contexto['tasa_exito'].tolist() == [1.0, 0.5, 1.0]
+    
+    cambiados = tabla.aplicar(np.array([np.nan, 0.6, np.nan]))
+    assert cambiados.tolist() == [1]
+    assert conceptos[1].confianza_grounding == pytest.approx(0.6)
+    assert conceptos[0].confianza_grounding == 0.5
+
+def test_tabla_grounding_agregar_crece_por_bloques():
+    """Test: Agregar conceptos duplica la capacidad y conserva los datos."""
+    def concepto(i):
+        return ConceptoAnclado(id=f'CONCEPTO_{i}', tipo=TipoConcepto.ACCION_COGNITIVA,
+                               palabras_español=[f'p{i}'], confianza_grounding=i / 100)
+    
+    tabla = TablaGrounding([concepto(0)])
+    tabla.registrar_uso('CONCEPTO_0', exitoso=True)
+    buffers = {len(tabla._buffer_grounding)}
+    for i in range(1, 100):
+        assert tabla.agregar(concepto(i)) == i
+        buffers.add(len(tabla._buffer_grounding))
+    
+    assert sorted(buffers) == [16, 32, 64, 128]
+    assert len(tabla.grounding) == len(tabla.usos) == 100
+    assert tabla.grounding.tolist() == pytest.approx([i / 100 for i in range(100)])
+    assert tabla.usos.tolist() == [1] + [0] * 99
+    assert tabla.agregar(concepto(5)) == 5
+
+def test_motor_aprendizaje_por_lotes():
+    """Test: En modo por lotes los usos se ajustan en el ciclo."""
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    
+    gestor_vocab = GestorVocabulario()
+    concepto = gestor_vocab.buscar_por_id('CONCEPTO_LEER')
+    concepto.confianza_grounding = 0.5
+    
+    motor = MotorAprendizaje(aprendizaje_por_lotes=True)
+    motor.configurar_integraciones(vocabulario=gestor_vocab)
+    
+    for _ in range(4):
+        motor.procesar_uso_concepto('CONCEPTO_LEER', exitoso=False)
+    
+    # Solo se acumuló
+    assert concepto.confianza_grounding == 0.5
+    assert motor.obtener_estadisticas()['usos_pendientes'] == 4
+    
+    resultado = motor.ejecutar_ciclo_aprendizaje()
+    
+    assert resultado['ajustes_por_uso'] == 1
+    assert concepto.confianza_grounding == pytest.approx(0.45)
+    assert motor.obtener_estadisticas()['usos_pendientes'] == 0
+    assert motor.obtener_historial_ajustes('CONCEPTO_LEER')[-1]['razon'] == 'Ajuste por uso'
+
+def test_motor_ajustes_de_a_uno_esperan_al_lote():
+    """Test: Ajustes por insight y por uso se aplican bajo el lock de la tabla, sin cruzarse con un lote."""
+    import threading
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    
+    gestor_vocab = GestorVocabulario()
+    concepto = gestor_vocab.buscar_por_id('CONCEPTO_LEER')
+    concepto.confianza_grounding = 0.5
+    motor = MotorAprendizaje()
+    motor.configurar_integraciones(vocabulario=gestor_vocab)
+    recomendacion = {
+        'tipo': 'AUMENTAR_GROUNDING',
+        'concepto_id': 'CONCEPTO_LEER',
+        'ajuste_sugerido': 0.05,
+        'prioridad': 'ALTA',
+        'ventana': 0
+    }
+    
+    for ajustar in (
+        lambda: motor.ejecutar_ciclo_aprendizaje([recomendacion]),
+        lambda: motor.procesar_uso_concepto('CONCEPTO_LEER', exitoso=True)
+    ):
+        antes = concepto.confianza_grounding
+        with motor._lock_tabla:  # Un lote a medio aplicar
+            hilo = threading.Thread(target=ajustar)
+            hilo.start()
+            hilo.join(timeout=0.1)
+            assert hilo.is_alive()
+            assert concepto.confianza_grounding == antes
+        hilo.join()
+        assert concepto.confianza_grounding > antes
+        assert motor.instantaneas.actual['CONCEPTO_LEER'] == concepto.confianza_grounding
+
+# ===== TESTS USOS DIFERIDOS =====
+
+def test_registro_usos_drenar_en_orden():
+    """Test: El registro entrega eventos en orden y respeta su capacidad."""
+    registro = RegistroUsos(capacidad=3)
+    
+    for i in range(4):
+        registro.registrar(f'C{i}', exitoso=True)
+    
+    assert registro.descartados == 1
+    assert [e[0] for e in registro.drenar(2)] == ['C0', 'C1']
+    assert [e[0] for e in registro.drenar()] == ['C2']
+    assert len(registro) == 0
+
+def test_motor_lote_usos_igual_a_uso_por_uso():
+    """Test: Un micro-lote ajusta como el camino por uso con los totales del lote."""
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    
+    gestor_vocab = GestorVocabulario()
+    ids = [c.id for c in gestor_vocab.obtener_todos()[:3]]
+    for concepto in gestor_vocab.obtener_todos()[:3]:
+        concepto.confianza_grounding = 0.5
+    
+    motor = MotorAprendizaje()
+    motor.configurar_integraciones(vocabulario=gestor_vocab)
+    
+    # 3 éxitos, 3 fallos (zona media) y 1 éxito + 2 fallos
+    eventos = [(ids[0], True, 0.0)] * 3 + [(ids[1], True, 0.0), (ids[1], False, 0.0)] * 3 \
+        + [(ids[2], True, 0.0), (ids[2], False, 0.0), (ids[2], False, 0.0)]
+    
+    assert motor.procesar_lote_usos(eventos) == 2
+    
+    groundings = [gestor_vocab.buscar_por_id(i).confianza_grounding for i in ids]
+    assert groundings == pytest.approx([0.53, 0.5, 0.45])
+
+def test_motor_consumidor_usos_en_segundo_plano():
+    """Test: Con el consumidor activo la petición solo registra el uso."""
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    
+    gestor_vocab = GestorVocabulario()
+    concepto = gestor_vocab.buscar_por_id('CONCEPTO_LEER')
+    concepto.confianza_grounding = 0.5
+    
+    motor = MotorAprendizaje()
+    motor.configurar_integraciones(vocabulario=gestor_vocab)
+    motor.iniciar_consumidor_usos(intervalo_segundos=60, tamano_lote=1000)
+    
+    motor.procesar_uso_concepto('CONCEPTO_LEER', exitoso=True)
+    motor.procesar_uso_concepto('CONCEPTO_LEER', exitoso=True)
+    
+    # Todavía en el registro
+    assert concepto.confianza_grounding == 0.5
+    assert len(motor.registro_usos) == 2
+    
+    # Detener procesa lo pendiente en un solo lote
+    motor.detener_consumidor_usos()
+    
+    assert concepto.confianza_grounding == pytest.approx(0.53)
+    stats = motor.obtener_estadisticas()['consumidor_usos']
+    assert stats['eventos_procesados'] == 2
+    assert stats['lotes_procesados'] == 1
+    assert not stats['activo']
+
+# ===== TESTS CICLOS AUTOMATICOS =====
+
+def test_programador_junta_rafaga_en_un_ciclo():
+    """Test: Varias consolidaciones seguidas corren un solo ciclo."""
+    ciclos = []
+    programador = ProgramadorCiclos(
+        lambda consolidaciones: ciclos.append(consolidaciones) or {'ajustes_aplicados': 1}
+    )
+    
+    assert programador.vaciar() is None
+    for i in range(3):
+        programador.notificar({'insights': [{'n': i}], 'ajustes': []})
+    
+    programador.vaciar()
+    
+    assert len(ciclos) == 1
+    assert len(ciclos[0]) == 3
+    stats = programador.obtener_estadisticas()
+    assert stats['ciclos'] == 1
+    assert stats['coalescidas'] == 2
+    assert programador.historial[-1]['consolidaciones'] == 3
+    assert programador.historial[-1]['ajustes_aplicados'] == 1
+
+def test_motor_ciclo_al_consolidar_bucle_largo():
+    """Test: Una consolidación del bucle largo llega al grounding publicado."""
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    from bucles import GestorBucles, RelojVirtual
+    
+    gestor_vocab = GestorVocabulario()
+    concepto = gestor_vocab.buscar_por_id('CONCEPTO_LEER')
+    concepto.confianza_grounding = 0.5
+    
+    gestor_bucles = GestorBucles(reloj=RelojVirtual())
+    motor = MotorAprendizaje()
+    motor.configurar_integraciones(vocabulario=gestor_vocab, bucles=gestor_bucles)
+    assert motor.iniciar_ciclos_automaticos(retardo_coalescencia=60)
+    
+    for _ in range(10):
+        gestor_bucles.registrar_concepto_usado('CONCEPTO_LEER')
+    gestor_bucles.bucle_corto.procesar()
+    gestor_bucles.bucle_largo.procesar()
+    gestor_bucles.bucle_largo.procesar()
+    
+    # Detener corre un solo ciclo con las dos consolidaciones
+    motor.detener_ciclos_automaticos()
+    
+    stats = motor.obtener_estadisticas()['ciclos_automaticos']
+    assert stats['ciclos'] == 1
+    assert stats['notificaciones'] == 2
+    assert concepto.confianza_grounding > 0.5
+    assert motor.instantaneas.actual['CONCEPTO_LEER'] == concepto.confianza_grounding
+    assert motor.ciclos_ejecutados == 1
+    assert not motor.activo
+
+# ===== TESTS INSTANTANEAS GROUNDING =====
+
+def test_publicador_copia_al_escribir():
+    """Test: Publicar crea una versión nueva y no toca las anteriores."""
+    publicador = PublicadorGrounding()
+    v1 = publicador.publicar({'CONCEPTO_A': 0.5, 'CONCEPTO_B': 0.7})
+    v2 = publicador.publicar({'CONCEPTO_A': 0.6})
+    
+    assert (v1.version, v2.version) == (1, 2)
+    assert v1['CONCEPTO_A'] == 0.5
+    assert v2['CONCEPTO_A'] == 0.6
+    assert v2['CONCEPTO_B'] == 0.7
+    assert publicador.actual is v2
+    
+    # Sin cambios no hay versión nueva
+    assert publicador.publicar({}) is v2
+    
+    with pytest.raises(TypeError):
+        v2.grounding['CONCEPTO_A'] = 1.0
+
+def test_publicador_libera_instantaneas_sin_lectores():
+    """Test: Las versiones viejas se liberan cuando nadie las referencia."""
+    import gc
+    
+    publicador = PublicadorGrounding()
+    retenida = publicador.publicar({'CONCEPTO_A': 0.5})
+    for i in range(10):
+        publicador.publicar({'CONCEPTO_A': 0.5 + i / 100})
+    gc.collect()
+    
+    # La vigente y la que retiene el lector
+    assert publicador.obtener_estadisticas()['vivas'] == 2
+    assert retenida['CONCEPTO_A'] == 0.5
+    
+    del retenida
+    gc.collect()
+    assert publicador.obtener_estadisticas()['vivas'] == 1
+
+def test_motor_publica_instantanea_por_lote():
+    """Test: Cada micro-lote aplicado publica una sola versión nueva."""
+    from vocabulario.gestor_vocabulario import GestorVocabulario
+    
+    gestor_vocab = GestorVocabulario()
+    conceptos = gestor_vocab.obtener_todos()[:2]
+    for concepto in conceptos:
+        concepto.confianza_grounding = 0.5
+    
+    motor = MotorAprendizaje()
+    motor.configurar_integraciones(vocabulario=gestor_vocab)
+    antes = motor.instantaneas.actual
+    
+    eventos = [(c.id, True, 0.0) for c in conceptos] * 3
+    assert motor.procesar_lote_usos(eventos) == 2
+    
+    despues = motor.instantaneas.actual
+    assert despues.version == antes.version + 1
+    for concepto in conceptos:
+        assert antes[concepto.id] == 0.5
+        assert despues[concepto.id] == concepto.confianza_grounding == pytest.approx(0.53)
+
+# ===== TESTS REPRODUCTOR =====
+
+def _eventos_aleatorios(n, conceptos, semilla=0):
+    rng = np.random.default_rng(semilla)
+    tasas = rng.uniform(0.2, 0.95, size=conceptos)
+    elegidos = rng.integers(0, conceptos, size=n)
+    return [(f'CONCEPTO_{i}', bool(rng.random() < tasas[i])) for i in elegidos.tolist()]
+
+def test_reproductor_igual_al_motor():
+    """Test: La reproducción da el mismo grounding que el motor con los mismos lotes."""
+    estrategia = EstrategiaExitoFallido()
+    eventos = _eventos_aleatorios(3000, conceptos=20)
+    conceptos = [
+        ConceptoAnclado(id=f'CONCEPTO_{i}', tipo=TipoConcepto.ACCION_COGNITIVA,
+                        palabras_español=[f'p{i}'], confianza_grounding=0.5)
+        for i in range(20)
+    ]
+    
+    class Vocabulario:
+        def obtener_todos(self):
+            return conceptos
+        def buscar_por_id(self, concepto_id):
+            return next((c for c in conceptos if c.id == concepto_id), None)
+    
+    motor = MotorAprendizaje(estrategia)
+    motor.configurar_integraciones(vocabulario=Vocabulario())
+    for desde in range(0, len(eventos), 64):
+        motor.procesar_lote_usos([(c, e, 0.0) for c, e in eventos[desde:desde + 64]])
+    
+    reproduccion = reproducir(
+        {'candidata': estrategia},
+        eventos,
+        grounding_inicial={c.id: 0.5 for c in conceptos},
+        tamano_lote=64
+    )
+    
+    resultado = reproduccion['resultados']['candidata']
+    assert resultado['metricas']['ajustes'] > 0
+    assert resultado['trayectoria'][-1].tolist() == [c.confianza_grounding for c in conceptos]
+
+def test_reproductor_usos_por_lote_opcional():
+    """Test: Con usos_por_lote la reproducción puede evaluar EstrategiaUsoFrecuente."""
+    eventos = _eventos_aleatorios(3000, conceptos=20)
+    estrategias = {'uso_frecuente': EstrategiaUsoFrecuente(umbral_usos=3)}
+    
+    como_en_vivo = reproducir(estrategias, eventos, tamano_lote=64, procesos=0)
+    con_usos = reproducir(estrategias, eventos, tamano_lote=64, procesos=0, usos_por_lote=True)
+    
+    assert como_en_vivo['resultados']['uso_frecuente']['metricas']['ajustes'] == 0
+    assert con_usos['resultados']['uso_frecuente']['metricas']['ajustes'] > 0
+
+def test_reproductor_estrategias_en_procesos():
+    """Test: Varias estrategias en un pool dan lo mismo que en este proceso."""
+    eventos = _eventos_aleatorios(5000, conceptos=30, semilla=1)
+    estrategias = {
+        'normal': EstrategiaExitoFallido(),
+        'suave': EstrategiaExitoFallido(incremento_exito=0.015, decremento_fallo=0.025)
+    }
+    
+    en_pool = reproducir(estrategias, eventos, procesos=2, muestras=10)
+    local = reproducir(estrategias, eventos, procesos=0, muestras=10)
+    
+    for nombre in estrategias:
+        np.testing.assert_array_equal(
+            en_pool['resultados'][nombre]['trayectoria'],
+            local['resultados'][nombre]['trayectoria']
+        )
+        assert en_pool['resultados'][nombre]['metricas']['eventos'] == 5000
+    assert len(local['resultados']['normal']['trayectoria']) <= 12
+
+def test_reproductor_eventos_jsonl(tmp_path):
+    """Test: Lee eventos y decisiones de JSON Lines."""
+    ruta = tmp_path / 'usos.jsonl'
+    ruta.write_text(
+        '{"concepto_id": "A", "exitoso": true}\n'
+        '\n'
+        '{"conceptos_principales": ["B", "A"], "puede_ejecutar": false}\n',
+        encoding='utf-8'
+    )
+    
+    ids, ordinales, exitosos = codificar_eventos(eventos_desde_jsonl(str(ruta)))
+    
+    assert ids == ['A', 'B']
+    assert ordinales.tolist() == [0, 1, 0]
+    assert exitosos.tolist() == [True, False, False]
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
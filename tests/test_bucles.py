@@ -2,12 +2,23 @@
 Tests para Bucles Autónomos - Fase 2.
 """
 import pytest
+import asyncio
+import random
+import threading
 import time
+from collections import Counter
 from bucles.base_bucle import BaseBucle
 from bucles.bucle_corto import BucleCorto
 from bucles.bucle_medio import BucleMedio
 from bucles.bucle_largo import BucleLargo
 from bucles.gestor_bucles import GestorBucles
+from bucles.planificador import Planificador
+from bucles.planificador_asincrono import PlanificadorAsincrono
+from bucles.reloj import RelojVirtual
+from bucles.disparador import Disparador
+from bucles.metricas_bucle import MetricasBucle
+from bucles.buffer_circular import BufferCircular
+from bucles.ventana_temporal import VentanaTemporal, PuntuacionDecaida
 
 # ===== TESTS BASE BUCLE =====
 
@@ -21,6 +32,19 @@ class BucleTest(BaseBucle):
         self.contador += 1
         return {'contador': self.contador}
 
+def bucle_virtual(bucle):
+    """Pone un bucle en un planificador con reloj virtual (sin thread)."""
+    planificador = Planificador(RelojVirtual())
+    bucle.usar_planificador(planificador)
+    return planificador
+
+def esperar_hasta(condicion, limite=2.0):
+    """Espera (con límite) a que se cumpla una condición en el thread real."""
+    fin = time.perf_counter() + limite
+    while not condicion() and time.perf_counter() < fin:
+        time.sleep(0.005)
+    return condicion()
+
 def test_base_bucle_crear():
     """Test: Crear bucle base."""
     bucle = BucleTest()
@@ -31,14 +55,15 @@ def test_base_bucle_crear():
 def test_base_bucle_iniciar_detener():
     """Test: Iniciar y detener bucle."""
     bucle = BucleTest()
+    planificador = bucle_virtual(bucle)
     
     # Iniciar
     assert bucle.iniciar() == True
     assert bucle.esta_activo() == True
     
-    # Esperar para que ejecute al menos una vez
-    time.sleep(1.2)  # Reducido de 1.5 a 1.2
-    assert bucle.contador >= 1
+    # Se ejecuta al iniciar y tras cada intervalo de 1 segundo
+    planificador.avanzar(1)
+    assert bucle.contador == 2
     
     # Detener
     assert bucle.detener() == True
@@ -47,26 +72,475 @@ def test_base_bucle_iniciar_detener():
 def test_base_bucle_estadisticas():
     """Test: Estadísticas de bucle."""
     bucle = BucleTest()
+    planificador = bucle_virtual(bucle)
     bucle.iniciar()
-    time.sleep(1.2)  # Reducido de 1.5 a 1.2
+    planificador.avanzar(1)
     bucle.detener()
     
     stats = bucle.obtener_estadisticas()
-    assert stats['ejecuciones'] >= 1
+    assert stats['ejecuciones'] == 2
     assert stats['nombre'] == "Test"
     assert 'tiempo_promedio_ms' in stats
 
 def test_base_bucle_historial():
     """Test: Historial de ejecuciones."""
     bucle = BucleTest()
+    planificador = bucle_virtual(bucle)
     bucle.iniciar()
-    time.sleep(1.2)  # Reducido de 1.5 a 1.2
+    planificador.avanzar(1)
     bucle.detener()
     
     historial = bucle.obtener_historial()
-    assert len(historial) >= 1
+    assert len(historial) == 2
     assert historial[0]['exito'] == True
 
+# ===== TESTS PLANIFICADOR =====
+
+class BucleRapido(BaseBucle):
+    """Bucle de prueba con intervalo corto."""
+    def __init__(self, nombre, intervalo=0.05):
+        super().__init__(nombre=nombre, intervalo_segundos=intervalo)
+        self.contador = 0
+    
+    def procesar(self):
+        self.contador += 1
+        return {'contador': self.contador}
+
+def test_base_bucle_detener_no_vuelve_a_ejecutar():
+    """Test: Un bucle detenido sale del planificador y no vuelve a ejecutarse."""
+    bucle = BucleTest()
+    planificador = bucle_virtual(bucle)
+    bucle.iniciar()
+    planificador.avanzar(0.5)
+    assert bucle.contador == 1
+    
+    bucle.detener()
+    assert planificador.avanzar(10) == 0
+    assert bucle.contador == 1
+    assert not planificador.contiene(bucle)
+
+def test_planificador_virtual_sin_thread():
+    """Test: Con reloj virtual no se crea thread; avanzar() ejecuta lo vencido."""
+    planificador = Planificador(RelojVirtual())
+    bucles = [BucleRapido(f"B{i}", intervalo=1) for i in range(30)]
+    
+    threads_antes = threading.active_count()
+    for bucle in bucles:
+        bucle.usar_planificador(planificador)
+        bucle.iniciar()
+    assert threading.active_count() == threads_antes
+    
+    assert planificador.avanzar(2) == 90
+    assert all(bucle.contador == 3 for bucle in bucles)
+    planificador.detener()
+
+def test_planificador_un_solo_thread():
+    """Test: Con el reloj del sistema, muchos bucles comparten un único thread."""
+    planificador = Planificador()
+    bucles = [BucleRapido(f"B{i}") for i in range(30)]
+    for bucle in bucles:
+        bucle.usar_planificador(planificador)
+    
+    threads_antes = threading.active_count()
+    for bucle in bucles:
+        bucle.iniciar()
+    
+    assert threading.active_count() == threads_antes + 1
+    assert esperar_hasta(lambda: all(bucle.contador >= 2 for bucle in bucles))
+    
+    # Detener no espera la siguiente ejecución pendiente
+    inicio = time.perf_counter()
+    planificador.detener()
+    assert time.perf_counter() - inicio < 0.1
+    assert not planificador.esta_activo()
+
+def test_planificador_quitar_bucle():
+    """Test: Un bucle detenido deja de ejecutarse; los demás siguen."""
+    planificador = Planificador(RelojVirtual())
+    a = BucleRapido("A", intervalo=1)
+    b = BucleRapido("B", intervalo=1)
+    for bucle in (a, b):
+        bucle.usar_planificador(planificador)
+        bucle.iniciar()
+    
+    planificador.avanzar(2)
+    a.detener()
+    planificador.avanzar(2)
+    
+    assert a.contador == 3
+    assert b.contador == 5
+    assert not planificador.contiene(a)
+    planificador.detener()
+
+class BucleLento(BaseBucle):
+    """Bucle de prueba cuyo procesar() tarda más que su intervalo."""
+    def __init__(self):
+        super().__init__(nombre="Lento", intervalo_segundos=0.01)
+    
+    def procesar(self):
+        time.sleep(0.03)
+        return {}
+
+def test_metricas_sobrecarga_y_retraso():
+    """Test: Se detectan sobrecargas y se mide el retraso de arranque."""
+    bucle = BucleLento()
+    planificador = bucle_virtual(bucle)
+    bucle.iniciar()
+    planificador.avanzar(0.02)
+    bucle.detener()
+    
+    # La duración es real; el reloj virtual no avanza mientras procesa
+    perf = bucle.obtener_rendimiento()
+    assert perf['ejecuciones'] == 3
+    assert perf['sobrecargas'] == perf['ejecuciones']
+    assert perf['duracion_ms']['promedio'] >= 25
+    assert perf['retraso_ms']['max'] == 0
+    assert perf['utilizacion'] > 1
+
+def test_metricas_tasa_error_y_jitter():
+    """Test: Tasa de error y jitter (desviación del retraso)."""
+    metricas = MetricasBucle()
+    for retraso in (1.0, 3.0, 5.0):
+        metricas.registrar(2.0, 60, retraso)
+    metricas.registrar(2.0, 60, 3.0, exito=False)
+    
+    resumen = metricas.resumen(60)
+    assert resumen['tasa_error'] == 0.25
+    assert resumen['retraso_ms']['promedio'] == 3.0
+    assert resumen['jitter_ms'] == pytest.approx(1.633, abs=1e-3)
+    assert resumen['sobrecargas'] == 0
+
+# ===== TESTS DISPARADORES =====
+
+def test_disparador_adelanta_y_fusiona():
+    """Test: Una ráfaga de eventos produce una sola ejecución adelantada."""
+    bucle = BucleRapido("D", intervalo=60)
+    planificador = bucle_virtual(bucle)
+    bucle.configurar_disparador(Disparador(eventos=5))
+    bucle.iniciar()
+    planificador.avanzar(1)
+    assert bucle.contador == 1
+    
+    for _ in range(4):
+        bucle.notificar_evento()
+    planificador.avanzar(1)
+    assert bucle.contador == 1
+    
+    # El quinto evento dispara; los siguientes se fusionan en ese disparo
+    for _ in range(6):
+        bucle.notificar_evento()
+    planificador.avanzar(1)
+    assert bucle.contador == 2
+    assert bucle.estadisticas['disparos'] == 1
+    bucle.detener()
+
+def test_disparador_umbral_e_intervalo_maximo():
+    """Test: El peso acumulado dispara; el intervalo máximo reemplaza al intervalo."""
+    bucle = BucleRapido("U", intervalo=60)
+    planificador = bucle_virtual(bucle)
+    bucle.configurar_disparador(Disparador(umbral=2.0, intervalo_maximo=30))
+    assert bucle.intervalo_segundos == 30
+    
+    bucle.iniciar()
+    planificador.avanzar(1)
+    bucle.notificar_evento(peso=0.5)
+    bucle.notificar_evento(peso=1.5)
+    planificador.avanzar(1)
+    assert bucle.contador == 2
+    
+    # Sin más eventos, corre a los 30s del disparo
+    planificador.avanzar(29)
+    assert bucle.contador == 3
+    bucle.detener()
+
+def test_disparador_solo_con_eventos_omite():
+    """Test: Sin eventos nuevos el bucle no vuelve a procesar."""
+    bucle = BucleRapido("S", intervalo=60)
+    planificador = bucle_virtual(bucle)
+    bucle.configurar_disparador(Disparador(eventos=100, solo_con_eventos=True))
+    bucle.iniciar()
+    planificador.avanzar(3600)
+    bucle.detener()
+    
+    assert bucle.contador == 1
+    assert bucle.estadisticas['omitidas'] == 60
+
+def test_gestor_sin_actividad_sigue_su_intervalo():
+    """Test: Por defecto los bucles corren a su intervalo aunque no haya eventos."""
+    gestor = GestorBucles(reloj=RelojVirtual())
+    gestor.iniciar_todos()
+    gestor.planificador.avanzar(600)
+    assert gestor.bucle_corto.estadisticas['ejecuciones'] == 11
+    assert gestor.bucle_corto.estadisticas['omitidas'] == 0
+    gestor.detener_todos()
+    
+    # Omitir las ejecuciones sin eventos es opcional
+    gestor = GestorBucles(
+        disparadores={'corto': Disparador(eventos=25, solo_con_eventos=True)},
+        reloj=RelojVirtual()
+    )
+    gestor.iniciar_todos()
+    gestor.planificador.avanzar(600)
+    assert gestor.bucle_corto.estadisticas['omitidas'] == 10
+    assert gestor.bucle_medio.estadisticas['omitidas'] == 0
+    gestor.detener_todos()
+
+# ===== TESTS RELOJ VIRTUAL =====
+
+def test_reloj_virtual_una_hora_en_milisegundos():
+    """Test: Una hora simulada se recorre sin sleeps ni threads."""
+    bucle = BucleRapido("H", intervalo=60)
+    planificador = bucle_virtual(bucle)
+    
+    threads_antes = threading.active_count()
+    inicio = time.perf_counter()
+    bucle.iniciar()
+    ejecuciones = planificador.avanzar(3600)
+    
+    assert time.perf_counter() - inicio < 1.0
+    assert threading.active_count() == threads_antes
+    assert ejecuciones == bucle.contador == 61
+    assert planificador.reloj.ahora() == 3600
+    assert bucle.obtener_rendimiento()['retraso_ms']['max'] == 0
+    
+    with pytest.raises(RuntimeError):
+        Planificador().avanzar(1)
+
+def test_gestor_reloj_virtual():
+    """Test: Ventanas, disparos e intervalos del gestor siguen el tiempo simulado."""
+    reloj = RelojVirtual(1000.0)
+    gestor = GestorBucles(reloj=reloj)
+    gestor.iniciar_todos()
+    gestor.planificador.avanzar(0)
+    
+    for _ in range(25):
+        gestor.registrar_concepto_usado("CONCEPTO_LEER")
+    gestor.planificador.avanzar(0)
+    assert gestor.bucle_corto.estadisticas['disparos'] == 1
+    assert gestor.bucle_corto.conceptos_calientes[0]['usos'] == 25
+    
+    # Fuera de la ventana de 5 minutos
+    gestor.planificador.avanzar(400)
+    assert gestor.obtener_conceptos_calientes() == []
+    
+    gestor.planificador.avanzar(3200)
+    assert gestor.bucle_largo.estadisticas['ejecuciones'] == 7
+    gestor.detener_todos()
+
+# ===== TESTS PLANIFICADOR ASÍNCRONO =====
+
+class BuclePesado(BucleRapido):
+    """Bucle de prueba que se marca como pesado."""
+    pesado = True
+    
+    def procesar(self):
+        self.thread = threading.current_thread()
+        return super().procesar()
+
+def test_planificador_asincrono_como_el_de_threads():
+    """Test: Mismo comportamiento que el planificador de threads, sin threads."""
+    async def escenario():
+        planificador = PlanificadorAsincrono(asyncio.get_running_loop())
+        bucles = [BucleRapido(f"B{i}") for i in range(10)]
+        for bucle in bucles:
+            bucle.usar_planificador(planificador)
+        
+        threads_antes = threading.active_count()
+        for bucle in bucles:
+            bucle.iniciar()
+        await asyncio.sleep(0.3)
+        
+        assert threading.active_count() == threads_antes
+        assert all(bucle.contador >= 2 for bucle in bucles)
+        
+        bucles[0].detener()
+        ejecuciones = bucles[0].contador
+        planificador.detener()
+        await asyncio.sleep(0.1)
+        assert bucles[0].contador == ejecuciones
+        assert not planificador.esta_activo()
+    
+    asyncio.run(escenario())
+
+def test_planificador_asincrono_pesado_y_disparos():
+    """Test: Los bucles pesados van al executor; los disparos desde otro thread se fusionan."""
+    async def escenario():
+        planificador = PlanificadorAsincrono(asyncio.get_running_loop())
+        pesado = BuclePesado("P", intervalo=60)
+        pesado.usar_planificador(planificador)
+        pesado.configurar_disparador(Disparador(eventos=3))
+        pesado.iniciar()
+        await asyncio.sleep(0.1)
+        
+        assert pesado.contador == 1
+        assert pesado.thread is not threading.main_thread()
+        
+        # Eventos desde el thread de peticiones
+        emisor = threading.Thread(target=lambda: [pesado.notificar_evento() for _ in range(10)])
+        emisor.start()
+        emisor.join()
+        await asyncio.sleep(0.1)
+        
+        assert pesado.contador == 2
+        assert pesado.estadisticas['disparos'] == 1
+        planificador.detener()
+    
+    asyncio.run(escenario())
+
+def test_gestor_en_event_loop():
+    """Test: GestorBucles corre sus bucles como tareas del event loop."""
+    async def escenario():
+        gestor = GestorBucles(loop=asyncio.get_running_loop())
+        assert isinstance(gestor.planificador, PlanificadorAsincrono)
+        
+        assert all(gestor.iniciar_todos().values())
+        await asyncio.sleep(0.2)
+        assert gestor.bucle_corto.estadisticas['ejecuciones'] == 1
+        assert gestor.bucle_largo.estadisticas['ejecuciones'] == 1
+        
+        assert all(gestor.detener_todos().values())
+        await asyncio.sleep(0.05)
+        assert not gestor.planificador.esta_activo()
+    
+    asyncio.run(escenario())
+
+# ===== TESTS BUFFER CIRCULAR =====
+
+def test_buffer_circular_descarta_viejos():
+    """Test: El buffer conserva solo los últimos N."""
+    buffer = BufferCircular(capacidad=3)
+    for i in range(5):
+        buffer.agregar(i)
+    
+    assert buffer.snapshot() == [2, 3, 4]
+    assert buffer.ultimos(2) == [3, 4]
+    
+    # Cambiar capacidad conserva los más recientes
+    buffer.capacidad = 2
+    assert buffer.snapshot() == [3, 4]
+
+def test_buffer_circular_snapshot_concurrente():
+    """Test: Leer mientras otro thread escribe no falla ni se desborda."""
+    buffer = BufferCircular(capacidad=50)
+    terminado = threading.Event()
+    
+    def escritor():
+        i = 0
+        while not terminado.is_set():
+            buffer.agregar(i)
+            i += 1
+    
+    thread = threading.Thread(target=escritor)
+    thread.start()
+    try:
+        for _ in range(2000):
+            copia = buffer.snapshot()
+            assert len(copia) <= 50
+            # Cada copia es una secuencia consecutiva
+            assert copia == list(range(copia[0], copia[0] + len(copia))) if copia else True
+    finally:
+        terminado.set()
+        thread.join()
+
+# ===== TESTS VENTANAS TEMPORALES =====
+
+class RelojFalso:
+    """Reloj controlable para las ventanas."""
+    def __init__(self):
+        self.ahora = 1000.0
+    
+    def __call__(self):
+        return self.ahora
+
+def test_ventana_temporal_expira_por_tiempo():
+    """Test: Los eventos dejan de contar al salir de la ventana."""
+    reloj = RelojFalso()
+    ventana = VentanaTemporal(60, ancho_bucket=10, reloj=reloj)
+    
+    for _ in range(3):
+        ventana.agregar("A")
+    reloj.ahora += 30
+    ventana.agregar("B")
+    assert ventana.totales() == {"A": 3, "B": 1}
+    
+    reloj.ahora += 40
+    assert ventana.totales() == {"B": 1}
+    
+    reloj.ahora += 60
+    assert ventana.totales() == {}
+    assert len(ventana) == 0
+
+def test_ventana_temporal_equivale_a_recontar():
+    """Test: Los totales incrementales coinciden con recontar los eventos vigentes."""
+    reloj = RelojFalso()
+    ventana = VentanaTemporal(50, ancho_bucket=10, reloj=reloj)
+    rng = random.Random(7)
+    eventos = []
+    
+    for _ in range(1000):
+        reloj.ahora += rng.random() * 3
+        clave = f"C{rng.randint(0, 12)}"
+        ventana.agregar(clave)
+        eventos.append((reloj.ahora, clave))
+        
+        # Vigente: su bucket está entre los últimos 5
+        limite = int(reloj.ahora // 10) - 5
+        vigentes = Counter(c for t, c in eventos if int(t // 10) > limite)
+        assert ventana.totales() == dict(vigentes)
+
+def test_puntuacion_decaida():
+    """Test: La puntuación cae a la mitad cada vida media."""
+    reloj = RelojFalso()
+    puntuaciones = PuntuacionDecaida(vida_media_segundos=60, reloj=reloj)
+    
+    puntuaciones.registrar("A")
+    puntuaciones.registrar("A")
+    reloj.ahora += 60
+    puntuaciones.registrar("B")
+    
+    assert puntuaciones.puntuacion("A") == pytest.approx(1.0)
+    assert puntuaciones.puntuacion("B") == pytest.approx(1.0)
+    
+    # Compactar re-escala sin cambiar valores y descarta los casi nulos
+    reloj.ahora += 600
+    puntuaciones.compactar(minimo=0.01)
+    assert len(puntuaciones) == 0
+
+def test_puntuacion_decaida_mayores_equivale_a_ordenar():
+    """Test: El orden incremental da el mismo top-k que ordenar todo."""
+    reloj = RelojFalso()
+    puntuaciones = PuntuacionDecaida(vida_media_segundos=30, reloj=reloj)
+    rng = random.Random(11)
+    
+    for paso in range(2000):
+        reloj.ahora += rng.random() * 2
+        puntuaciones.registrar(f"C{rng.randint(0, 40)}")
+        if paso % 500 == 499:
+            puntuaciones.compactar(minimo=0.5)
+        
+        if paso % 50 == 0:
+            todas = puntuaciones.puntuaciones()
+            esperado = sorted(todas, key=lambda c: (todas[c], c), reverse=True)[:5]
+            assert [c for c, _ in puntuaciones.mayores(5)] == esperado
+    
+    pares = puntuaciones.mayores(3, admitir=lambda c: c.endswith("7"))
+    assert all(c.endswith("7") for c, _ in pares)
+
+def test_bucle_corto_ventana_por_tiempo():
+    """Test: Los conceptos viejos dejan de ser calientes aunque no haya tráfico."""
+    bucle = BucleCorto()
+    reloj = RelojFalso()
+    bucle.ventana_usos.reloj = reloj
+    bucle.puntuaciones = PuntuacionDecaida(120, reloj=reloj)
+    
+    for _ in range(5):
+        bucle.registrar_concepto_usado("CONCEPTO_LEER")
+    assert bucle.obtener_conceptos_calientes()[0]['usos'] == 5
+    
+    reloj.ahora += 400
+    assert bucle.obtener_conceptos_calientes() == []
+    assert bucle.procesar()['conceptos_analizados'] == 0
+
 # ===== TESTS BUCLE CORTO =====
 
 def test_bucle_corto_crear():
@@ -120,6 +594,17 @@ def test_bucle_corto_conceptos_calientes():
     assert calientes[0]['concepto_id'] == "CONCEPTO_LEER"
     assert calientes[0]['usos'] == 5
 
+def test_bucle_corto_calientes_en_tiempo_real():
+    """Test: Los conceptos calientes están al día sin ejecutar el bucle."""
+    bucle = BucleCorto()
+    
+    for _ in range(4):
+        bucle.registrar_concepto_usado("CONCEPTO_LEER")
+    
+    calientes = bucle.obtener_conceptos_calientes()
+    assert calientes[0]['concepto_id'] == "CONCEPTO_LEER"
+    assert calientes[0]['usos'] == 4
+
 def test_bucle_corto_limitar_ventana():
     """Test: Limitar ventana de conceptos."""
     bucle = BucleCorto()
@@ -220,6 +705,32 @@ def test_bucle_medio_patron_no_entendido():
     # Debe detectar comunicación problemática
     assert any(p['tipo'] == 'COMUNICACION_PROBLEMATICA' for p in patrones)
 
+def test_bucle_medio_patrones_por_tiempo():
+    """Test: Los patrones miran decisiones recientes en el tiempo, no las últimas N."""
+    bucle = BucleMedio()
+    reloj = RelojFalso()
+    bucle.usar_reloj(reloj)
+    
+    for _ in range(3):
+        bucle.registrar_decision({'tipo': 'SALUDO', 'puede_ejecutar': False})
+    bucle.procesar()
+    assert any(p['tipo'] == 'INTERACCION_SOCIAL' for p in bucle.obtener_patrones())
+    
+    # Una ráfaga de otras decisiones diluye a los saludos...
+    for _ in range(20):
+        bucle.registrar_decision({'tipo': 'AFIRMATIVA', 'puede_ejecutar': True})
+    bucle.procesar()
+    assert not any(p['tipo'] == 'INTERACCION_SOCIAL' for p in bucle.obtener_patrones())
+    
+    # ...y tras un rato sin tráfico, dos saludos vuelven a ser el patrón
+    reloj.ahora += 600
+    for _ in range(2):
+        bucle.registrar_decision({'tipo': 'SALUDO', 'puede_ejecutar': False})
+    reloj.ahora += 1
+    bucle.registrar_decision({'tipo': 'AFIRMATIVA', 'puede_ejecutar': True})
+    bucle.procesar()
+    assert any(p['tipo'] == 'INTERACCION_SOCIAL' for p in bucle.obtener_patrones())
+
 # ===== TESTS BUCLE LARGO =====
 
 def test_bucle_largo_crear():
@@ -294,6 +805,115 @@ def test_bucle_largo_ajustes_recomendados():
     assert ajustes[0]['tipo'] == 'AUMENTAR_GROUNDING'
     assert ajustes[0]['concepto_id'] == "CONCEPTO_LEER"
 
+def test_bucle_largo_consolidar_en_proceso():
+    """Test: La consolidación en otro proceso da el mismo resultado."""
+    bucle_corto = BucleCorto()
+    en_linea = BucleLargo()
+    en_proceso = BucleLargo(en_proceso=True)
+    for bucle in (en_linea, en_proceso):
+        bucle.configurar_bucles(bucle_corto, None)
+    
+    for _ in range(10):
+        bucle_corto.registrar_concepto_usado("CONCEPTO_LEER")
+    
+    en_linea.procesar()
+    resultado = en_proceso.procesar()
+    assert resultado['enviada'] == True
+    
+    try:
+        assert en_proceso.esperar_consolidacion(timeout=30)
+        assert en_proceso.obtener_ajustes_recomendados() == en_linea.obtener_ajustes_recomendados()
+        assert len(en_proceso.obtener_insights()) == len(en_linea.obtener_insights())
+    finally:
+        en_proceso.cerrar_proceso()
+
+def test_bucle_largo_entrega_consolidaciones_a_suscriptores():
+    """Test: Cada consolidación con datos llega a los suscriptores."""
+    bucle_corto = BucleCorto()
+    bucle_largo = BucleLargo()
+    bucle_largo.configurar_bucles(bucle_corto, None)
+    
+    recibidas = []
+    def fallar(consolidacion):
+        raise RuntimeError("suscriptor roto")
+    
+    bucle_largo.suscribir(fallar)
+    bucle_largo.suscribir(recibidas.append)
+    
+    for _ in range(10):
+        bucle_corto.registrar_concepto_usado("CONCEPTO_LEER")
+    bucle_corto.procesar()
+    bucle_largo.procesar()
+    
+    # El suscriptor que falla no impide entregar al resto
+    assert len(recibidas) == 1
+    assert recibidas[0]['ajustes'][0]['concepto_id'] == "CONCEPTO_LEER"
+    
+    # Pero su error queda contado y en el historial
+    assert bucle_largo.obtener_estadisticas()['errores_suscriptores'] == 1
+    fallo = bucle_largo.obtener_historial()[-1]
+    assert not fallo['exito']
+    assert fallo['error'] == "suscriptor roto"
+    assert fallo['suscriptor'] == "fallar"
+    
+    bucle_largo.desuscribir(recibidas.append)
+    bucle_largo.procesar()
+    assert len(recibidas) == 1
+
+def test_bucle_largo_entrega_ajuste_una_vez_por_ventana():
+    """Test: Un ajuste recomendado llega una vez por concepto y ventana, aunque cambie su cuenta."""
+    reloj = RelojVirtual(0.0)
+    bucle_corto = BucleCorto(ventana_segundos=300)
+    bucle_largo = BucleLargo()
+    for bucle in (bucle_corto, bucle_largo):
+        bucle.usar_reloj(reloj)
+    bucle_largo.configurar_bucles(bucle_corto, None)
+    
+    recibidas = []
+    bucle_largo.suscribir(recibidas.append)
+    
+    def consolidar_con_usos(n):
+        for _ in range(n):
+            bucle_corto.registrar_concepto_usado("CONCEPTO_LEER")
+        bucle_corto.procesar()
+        bucle_largo.procesar()
+    
+    consolidar_con_usos(10)
+    reloj.avanzar(100)
+    consolidar_con_usos(3)
+    
+    entregados = [a for c in recibidas for a in c['ajustes']]
+    assert [(a['concepto_id'], a['ventana']) for a in entregados] == [("CONCEPTO_LEER", 0)]
+    assert bucle_largo.obtener_ajustes_recomendados()[0]['razon'].startswith("Usado 13 veces")
+    
+    # Con usos de la ventana siguiente se recomienda de nuevo
+    reloj.avanzar(300)
+    consolidar_con_usos(10)
+    assert recibidas[-1]['ajustes'][0]['ventana'] == 1
+
+def test_bucle_largo_ventanas_entregadas_sobreviven_reinicio():
+    """Test: Con el reloj real la ventana es de hora de pared y vale tras restaurar."""
+    def crear():
+        bucle_corto = BucleCorto(ventana_segundos=86400)
+        bucle_largo = BucleLargo()
+        bucle_largo.configurar_bucles(bucle_corto, None)
+        for _ in range(10):
+            bucle_corto.registrar_concepto_usado("CONCEPTO_LEER")
+        bucle_corto.procesar()
+        recibidas = []
+        bucle_largo.suscribir(recibidas.append)
+        return bucle_largo, recibidas
+    
+    antes, recibidas = crear()
+    antes.procesar()
+    assert recibidas[0]['ajustes'][0]['ventana'] == int(time.time() // 86400)
+    
+    # Otro proceso (otro reloj monótono) restaura y no lo vuelve a entregar
+    despues, recibidas = crear()
+    despues.restaurar_estado(antes.exportar_estado())
+    despues.procesar()
+    assert [a for c in recibidas for a in c['ajustes']] == []
+
 # ===== TESTS GESTOR BUCLES =====
 
 def test_gestor_crear():
@@ -306,15 +926,18 @@ def test_gestor_crear():
 
 def test_gestor_iniciar_detener():
     """Test: Iniciar y detener todos los bucles."""
-    gestor = GestorBucles()
+    gestor = GestorBucles(reloj=RelojVirtual())
     
     # Iniciar
     resultados_inicio = gestor.iniciar_todos()
     assert all(resultados_inicio.values())
     
-    time.sleep(0.2)  # Reducido de 0.5 a 0.2 - solo verificar que iniciaron
+    # Cada bucle se ejecuta al iniciar
+    gestor.planificador.avanzar(0)
+    for bucle in (gestor.bucle_corto, gestor.bucle_medio, gestor.bucle_largo):
+        assert bucle.estadisticas['ejecuciones'] == 1
     
-    # Detener (ahora es rápido con sleep interrumpible)
+    # Detener
     resultados_detencion = gestor.detener_todos()
     assert all(resultados_detencion.values())
 
@@ -339,6 +962,86 @@ def test_gestor_registrar_decision():
     
     assert len(gestor.bucle_medio.decisiones_recientes) == 1
 
+def test_gestor_disparadores_por_bucle():
+    """Test: Cada bucle tiene su disparador configurable."""
+    gestor = GestorBucles(disparadores={'medio': None})
+    
+    assert gestor.bucle_corto.disparador.eventos == 25
+    assert gestor.bucle_medio.disparador is None
+    assert gestor.configurar_disparador('largo', Disparador(eventos=3))
+    assert not gestor.configurar_disparador('inexistente', None)
+    
+    estado = gestor.estado_sistema()
+    assert estado['bucles']['largo']['disparador']['eventos'] == 3
+    assert estado['bucles']['medio']['disparador'] is None
+
+def test_gestor_arranque_en_caliente(tmp_path):
+    """Test: El estado de los bucles sobrevive a un reinicio."""
+    ruta = str(tmp_path / "estado_bucles.json")
+    gestor = GestorBucles(ruta_estado=ruta)
+    assert gestor.estado_restaurado == False
+    
+    for _ in range(10):
+        gestor.registrar_concepto_usado("CONCEPTO_LEER")
+    gestor.registrar_decision({'tipo': 'AFIRMATIVA', 'puede_ejecutar': True, 'certeza': 0.9})
+    gestor.bucle_medio.procesar()
+    gestor.bucle_largo.procesar()
+    assert gestor.guardar_estado()
+    
+    # Sin temporales olvidados: la escritura fue atómica
+    assert [p.name for p in tmp_path.iterdir()] == ["estado_bucles.json"]
+    
+    nuevo = GestorBucles(ruta_estado=ruta)
+    assert nuevo.estado_restaurado == True
+    assert nuevo.obtener_conceptos_calientes()[0]['usos'] == 10
+    assert len(nuevo.bucle_medio.decisiones_recientes) == 1
+    assert nuevo.bucle_medio.ventana_decisiones.total(('tipo', 'AFIRMATIVA')) == 1
+    assert nuevo.obtener_insights() == gestor.obtener_insights()
+    assert nuevo.obtener_ajustes_recomendados() == gestor.obtener_ajustes_recomendados()
+
+def test_gestor_estado_danado_se_ignora(tmp_path):
+    """Test: Una instantánea dañada no impide arrancar."""
+    ruta = tmp_path / "estado_bucles.json"
+    ruta.write_text("{no es json", encoding="utf-8")
+    
+    gestor = GestorBucles(ruta_estado=str(ruta))
+    assert gestor.estado_restaurado == False
+    assert gestor.obtener_conceptos_calientes() == []
+
+def test_gestor_error_al_guardar_se_registra(tmp_path):
+    """Test: Un fallo al guardar se lanza o queda en el bucle de persistencia."""
+    (tmp_path / "archivo").write_text("", encoding="utf-8")
+    ruta = str(tmp_path / "archivo" / "estado_bucles.json")  # Su padre no es directorio
+    
+    gestor = GestorBucles(ruta_estado=ruta, reloj=RelojVirtual())
+    with pytest.raises(OSError):
+        gestor.guardar_estado()
+    
+    gestor.iniciar_todos()
+    gestor.planificador.avanzar(60)
+    gestor.detener_todos()
+    
+    persistencia = gestor.bucle_persistencia
+    assert persistencia.estadisticas['errores'] == 2  # Periódica + al detener
+    assert persistencia.obtener_historial()[-1]['exito'] == False
+    assert persistencia.guardar_ahora() == False
+
+def test_ventana_temporal_restaurar_envejece():
+    """Test: Al restaurar, los buckets envejecen lo transcurrido."""
+    reloj = RelojFalso()
+    ventana = VentanaTemporal(60, ancho_bucket=10, reloj=reloj)
+    ventana.agregar("A")
+    reloj.ahora += 30
+    ventana.agregar(("tipo", "B"))
+    exportado = ventana.exportar()
+    
+    otra = VentanaTemporal(60, ancho_bucket=10, reloj=RelojFalso())
+    otra.restaurar(exportado, transcurrido=0)
+    assert otra.totales() == {"A": 1, ("tipo", "B"): 1}
+    
+    otra.restaurar(exportado, transcurrido=35)
+    assert otra.totales() == {("tipo", "B"): 1}
+
 def test_gestor_estado_sistema():
     """Test: Estado del sistema."""
     gestor = GestorBucles()
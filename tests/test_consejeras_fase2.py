@@ -1,6 +1,8 @@
 """
 Tests para Consejeras de Fase 2: Lyra, Luna, Iris, Sage.
 """
+import asyncio
+import time
 import pytest
 from vocabulario.gestor_vocabulario import GestorVocabulario
 from traduccion.traductor_entrada import TraductorEntrada
@@ -9,6 +11,10 @@ from consejeras.lyra import Lyra
 from consejeras.luna import Luna
 from consejeras.iris import Iris
 from consejeras.sage import Sage
+from consejeras.gestor_consejeras import GestorConsejeras
+from consejeras.escaner import EscanerPalabras
+from consejeras.opinion import Opinion
+from consejeras.base_consejera import Consejera, ConsejeraAsincrona
 
 @pytest.fixture
 def sistema():
@@ -274,5 +280,332 @@ def test_todas_consejeras_inicializan():
     
     assert all(not c.puede_vetar for c in [lyra, luna, iris, sage])
 
+# ===== TESTS REVISIÓN POR LOTES =====
+
+MENSAJES_LOTE = [
+    "¿Puedes leer archivos?",
+    "Elimina todos los archivos",
+    "No entiendo nada, esto es muy confuso",
+    "Necesito esto urgente ya ahora mismo",
+    "Modifica tu código",
+    "Esto debe ser permanente y definitivo",
+    "Hola Bell",
+    "Si hay un error entonces el código falla",
+]
+
+def test_escaner_equivale_a_busqueda_por_subcadena():
+    """Test: El escáner detecta lo mismo que 'palabra in texto'."""
+    palabras = ['todo', 'todos', 'no entiendo', 'entiendo', 'ya', 'clave', 'api key']
+    escaner = EscanerPalabras(palabras)
+    
+    textos = [
+        "borra todos ya",
+        "no entiendo la clave",
+        "la api key es todo",
+        "",
+        "nada relevante aqui",
+    ]
+    
+    for texto in textos:
+        esperadas = {p for p in palabras if p in texto}
+        assert escaner.escanear(texto) == esperadas
+
+def test_palabras_clave_declaradas_por_consejera():
+    """Test: Solo entran al escáner las palabras que cada consejera declara."""
+    lyra = Lyra()
+    lyra.mensajes_recientes = ['hola', 'gracias']  # Lista ajena a la detección
+
+    palabras = lyra.palabras_clave()
+    assert 'no entiendo' in palabras and 'ayuda' in palabras
+    assert 'hola' not in palabras
+    assert Sage().palabras_clave() == set()
+
+def test_revisar_lote_equivale_a_consultar_todas(sistema):
+    """Test: revisar_lote da los mismos veredictos que consultar_todas."""
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traducciones = [traductor.traducir(m) for m in MENSAJES_LOTE]
+    decisiones = [motor.razonar(t) for t in traducciones]
+    contextos = [{'traduccion': t} for t in traducciones]
+    
+    gestor_individual = GestorConsejeras()
+    esperados = [
+        gestor_individual.consultar_todas(d, c)
+        for d, c in zip(decisiones, contextos)
+    ]
+    
+    resultado = GestorConsejeras().revisar_lote(decisiones, contextos)
+    
+    assert len(resultado['veredictos']) == len(MENSAJES_LOTE)
+    for veredicto, esperado in zip(resultado['veredictos'], esperados):
+        assert veredicto['aprobada'] == esperado['aprobada']
+        assert veredicto['veto'] == esperado['veto']
+        assert veredicto['veto_por'] == esperado['veto_por']
+        assert [op['opinion'] for op in veredicto['opiniones']] == \
+               [op['opinion'] for op in esperado['opiniones']]
+
+def test_revisar_lote_estadisticas(sistema):
+    """Test: revisar_lote agrega vetos, aprobaciones y throughput."""
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traducciones = [traductor.traducir(m) for m in MENSAJES_LOTE]
+    decisiones = [motor.razonar(t) for t in traducciones]
+    contextos = [{'traduccion': t} for t in traducciones]
+    
+    stats = GestorConsejeras().revisar_lote(decisiones, contextos)['estadisticas']
+    
+    assert stats['total'] == len(MENSAJES_LOTE)
+    assert stats['vetadas'] == 2  # Eliminar todos + modificar código
+    assert stats['vetos_por_consejera'] == {'Vega': 2}
+    assert stats['aprobadas'] + stats['vetadas'] + stats['rechazadas_sin_veto'] == stats['total']
+    assert stats['mensajes_por_segundo'] > 0
+
+def test_revisar_lote_longitudes_distintas():
+    """Test: revisar_lote exige un contexto por decisión."""
+    with pytest.raises(ValueError):
+        GestorConsejeras().revisar_lote([], [{}])
+
+# ===== TESTS TELEMETRÍA =====
+
+def test_telemetria_cuenta_revisiones_consistentemente(sistema):
+    """Test: La clase base cuenta revisiones, opiniones y latencia."""
+    luna = Luna()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traduccion = traductor.traducir("Necesito esto urgente ya ahora mismo")
+    decision = motor.razonar(traduccion)
+    
+    luna.revisar(decision, {'traduccion': traduccion})
+    luna.revisar(decision, {'traduccion': traduccion})
+    
+    stats = luna.estadisticas()
+    assert stats['revisiones'] == 2
+    assert stats['opiniones'] == 2
+    assert stats['reglas']['URGENCIA'] == 2
+    assert sum(stats['latencia']['histograma'].values()) == 2
+    assert stats['latencia']['max_ms'] >= stats['latencia']['promedio_ms'] > 0
+
+def test_telemetria_razones_veto(sistema):
+    """Test: Las razones de veto se agregan por principio."""
+    gestor = GestorConsejeras()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    for mensaje in ["Elimina todos los archivos", "Modifica tu código", "Hola"]:
+        traduccion = traductor.traducir(mensaje)
+        decision = motor.razonar(traduccion)
+        gestor.consultar_todas(decision, {'traduccion': traduccion})
+    
+    vega = gestor.obtener_consejera('Vega').estadisticas()
+    assert vega['revisiones'] == 3
+    assert vega['vetos'] == 2
+    assert vega['razones_veto'] == {'SEGURIDAD_DATOS': 1, 'NO_AUTO_MODIFICACION': 1}
+
+def test_telemetria_global_ranking_latencia(sistema):
+    """Test: estadisticas_globales expone el ranking de latencia."""
+    gestor = GestorConsejeras()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traduccion = traductor.traducir("¿Puedes leer archivos?")
+    decision = motor.razonar(traduccion)
+    gestor.consultar_todas(decision, {'traduccion': traduccion})
+    
+    stats = gestor.estadisticas_globales()
+    assert len(stats['ranking_latencia']) == 7
+    assert stats['consejera_mas_lenta'] == stats['ranking_latencia'][0]['nombre']
+    assert stats['latencia_total_ms'] > 0
+
+# ===== TESTS OPINIÓN COMPACTA =====
+
+def test_opinar_no_renderiza_texto(sistema):
+    """Test: opinar() da banderas y códigos sin generar el texto."""
+    luna = Luna()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traduccion = traductor.traducir("Necesito esto urgente ya ahora mismo")
+    decision = motor.razonar(traduccion)
+    
+    opinion = luna.opinar(decision, {'traduccion': traduccion})
+    
+    assert isinstance(opinion, Opinion)
+    assert 'URGENCIA' in opinion.codigos
+    assert opinion['veto'] == False
+    assert not opinion.renderizada
+    
+    # El texto se genera al pedirlo y coincide con revisar()
+    assert opinion['sugerencias'] == luna.revisar(decision, {'traduccion': traduccion})['sugerencias']
+    assert opinion.renderizada
+
+def test_consultar_todas_no_detallado(sistema):
+    """Test: Sin detalle se devuelven Opinion que renderizan igual."""
+    gestor = GestorConsejeras()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    for mensaje in ["¿Puedes leer archivos?", "Elimina todos los archivos"]:
+        traduccion = traductor.traducir(mensaje)
+        decision = motor.razonar(traduccion)
+        
+        compacto = gestor.consultar_todas(decision, {'traduccion': traduccion}, detallado=False)
+        completo = gestor.consultar_todas(decision, {'traduccion': traduccion})
+        
+        assert compacto['aprobada'] == completo['aprobada']
+        assert compacto['veto'] == completo['veto']
+        assert compacto['sugerencias_finales'] == completo['sugerencias_finales']
+        assert all(isinstance(op, dict) for op in completo['opiniones'])
+        assert all(isinstance(op, Opinion) for op in compacto['opiniones'])
+        assert [op.a_dict() for op in compacto['opiniones']] == completo['opiniones']
+
+def test_opinion_igualdad_sin_renderizar(sistema):
+    """Test: Comparar opiniones mira los campos, no el texto."""
+    luna = Luna()
+    traduccion = sistema['traductor'].traducir("Necesito esto urgente ya ahora mismo")
+    decision = sistema['motor'].razonar(traduccion)
+    
+    a = luna.opinar(decision, {'traduccion': traduccion})
+    b = luna.opinar(decision, {'traduccion': traduccion})
+    
+    assert a == b
+    assert not a.renderizada and not b.renderizada
+    assert a != Luna().opinar(decision, {'traduccion': sistema['traductor'].traducir("Hola Bell")})
+
+def test_sage_sintetiza_opiniones_compactas(sistema):
+    """Test: Sage acepta Opinion sin renderizarlas."""
+    sage = Sage()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    traduccion = traductor.traducir("¿Puedes leer archivos?")
+    decision = motor.razonar(traduccion)
+    
+    opiniones = [
+        Opinion('Nova', True, False, 0.8, ('CONSULTA_TECNICA',)),
+        Opinion('Echo', False, False, 0.5)
+    ]
+    
+    sintesis = sage.opinar(decision, {'traduccion': traduccion, 'opiniones_consejeras': opiniones})
+    
+    assert sintesis.codigos == ('CONSENSO_MODERADO',)
+    assert not any(op.renderizada for op in opiniones)
+    assert 'Nova: ' in sintesis['razonamiento'][1]
+
+# ===== TESTS CONSEJERAS ASÍNCRONAS =====
+
+class ConsejeraLenta(ConsejeraAsincrona):
+    """Consejera falsa que tarda en responder (simula un modelo externo)."""
+    
+    def __init__(self, demora: float):
+        super().__init__("Lenta", "Pruebas")
+        self.demora = demora
+    
+    async def aopinar(self, decision, contexto):
+        await asyncio.sleep(self.demora)
+        return self._opinion(False, 0.9, ('DESACUERDO',))
+    
+    def _renderizar(self, opinion):
+        return {
+            'consejera': self.nombre,
+            'aprobada': opinion.aprobada,
+            'veto': False,
+            'opinion': 'Desacuerdo',
+            'confianza': opinion.confianza,
+            'razonamiento': [],
+            'sugerencias': []
+        }
+
+class ConsejeraBloqueante(Consejera):
+    """Consejera falsa síncrona y lenta (usa el adaptador a hilo)."""
+    
+    def __init__(self):
+        super().__init__("Bloqueante", "Pruebas")
+    
+    def opinar(self, decision, contexto):
+        time.sleep(0.5)
+        return self._opinion(True, 0.5)
+    
+    def _renderizar(self, opinion):
+        return {'consejera': self.nombre, 'aprobada': True, 'veto': False}
+
+def _consultar_con_plazo(gestor, decision, contexto, plazo):
+    """Ejecuta aconsultar_todas y mide la latencia del turno."""
+    async def turno():
+        inicio = time.perf_counter()
+        resultado = await gestor.aconsultar_todas(decision, contexto, plazo=plazo)
+        return resultado, time.perf_counter() - inicio
+    return asyncio.run(turno())
+
+def test_aconsultar_equivale_a_consultar_todas(sistema):
+    """Test: Sin consejeras lentas el resultado es el mismo."""
+    gestor = GestorConsejeras()
+    traductor = sistema['traductor']
+    motor = sistema['motor']
+    
+    for mensaje in MENSAJES_LOTE:
+        traduccion = traductor.traducir(mensaje)
+        decision = motor.razonar(traduccion)
+        contexto = {'traduccion': traduccion}
+        
+        resultado, _ = _consultar_con_plazo(gestor, decision, contexto, plazo=5.0)
+        esperado = gestor.consultar_todas(decision, contexto)
+        
+        assert resultado['abstenciones'] == []
+        assert resultado['opiniones'] == esperado['opiniones']
+
+def test_aconsultar_respeta_plazo(sistema):
+    """Test: Una consejera lenta se cancela y cuenta como abstención."""
+    gestor = GestorConsejeras()
+    lenta = ConsejeraLenta(demora=5.0)
+    gestor.consejeras.insert(-1, lenta)  # Antes de Sage
+    
+    traduccion = sistema['traductor'].traducir("¿Puedes leer archivos?")
+    decision = sistema['motor'].razonar(traduccion)
+    
+    resultado, duracion = _consultar_con_plazo(
+        gestor, decision, {'traduccion': traduccion}, plazo=0.2
+    )
+    
+    assert duracion < 1.0
+    assert resultado['abstenciones'] == ['Lenta']
+    assert 'Lenta' not in [op['consejera'] for op in resultado['opiniones']]
+    assert lenta.estadisticas()['abstenciones'] == 1
+    assert lenta.estadisticas()['revisiones'] == 0
+
+def test_aconsultar_adapta_consejera_sincrona(sistema):
+    """Test: Una consejera síncrona lenta tampoco bloquea el turno."""
+    gestor = GestorConsejeras()
+    bloqueante = ConsejeraBloqueante()
+    gestor.consejeras.insert(-1, bloqueante)
+    
+    traduccion = sistema['traductor'].traducir("¿Puedes leer archivos?")
+    decision = sistema['motor'].razonar(traduccion)
+    
+    resultado, duracion = _consultar_con_plazo(
+        gestor, decision, {'traduccion': traduccion}, plazo=0.2
+    )
+    
+    assert duracion < 0.45
+    assert resultado['abstenciones'] == ['Bloqueante']
+    
+    # El hilo terminó después del plazo: no cuenta como revisión
+    assert bloqueante.estadisticas()['abstenciones'] == 1
+    assert bloqueante.estadisticas()['revisiones'] == 0
+
+def test_consejera_asincrona_adaptador_sincrono(sistema):
+    """Test: Una consejera asíncrona sigue sirviendo en el flujo clásico."""
+    lenta = ConsejeraLenta(demora=0.01)
+    traduccion = sistema['traductor'].traducir("Hola")
+    decision = sistema['motor'].razonar(traduccion)
+    
+    revision = lenta.revisar(decision, {'traduccion': traduccion})
+    
+    assert revision['aprobada'] == False
+    assert lenta.estadisticas()['revisiones'] == 1
+    assert lenta.estadisticas()['reglas'] == {'DESACUERDO': 1}
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
@@ -2,6 +2,7 @@
 Tests para Sistema de Memoria Persistente - Fase 2.
 """
 import pytest
+import numpy as np
 import os
 import shutil
 from datetime import datetime
@@ -9,6 +10,7 @@ from pathlib import Path
 
 from memoria.almacen import AlmacenJSON
 from memoria.gestor_memoria import GestorMemoria
+from memoria.serie_ajustes import SerieAjustes
 
 # Directorio temporal para tests
 TEST_DIR = "test_memoria_temp"
@@ -405,5 +407,160 @@ def test_gestor_limpiar_memoria(limpiar_test_dir):
     gestor.limpiar_memoria()
     assert gestor.almacen.contar('decisiones') == 0
 
+# ===== TESTS SERIE AJUSTES =====
+
+def test_serie_ajustes_anillo_acotado():
+    """Test: El anillo pisa lo más antiguo y el índice por concepto lo sigue."""
+    serie = SerieAjustes(capacidad=4)
+    
+    for i in range(10):
+        serie.agregar(f'C{i % 2}', 0.5, 0.5 + i / 100, 'Uso', instante=1000 + i)
+    
+    assert len(serie) == 4
+    assert serie.total_registrados == 10
+    assert [a['grounding_nuevo'] for a in serie.por_concepto('C0')] == pytest.approx([0.56, 0.58])
+    assert [a['grounding_nuevo'] for a in serie.por_concepto('C1', n=1)] == pytest.approx([0.59])
+    assert serie.estadisticas()['conceptos'] == 2
+
+def test_serie_ajustes_rango_tiempo():
+    """Test: Consulta por rango de tiempo con el anillo dado la vuelta."""
+    serie = SerieAjustes(capacidad=5)
+    
+    for i in range(8):
+        serie.agregar('C0' if i % 3 else 'C1', 0.5, 0.6, 'Uso', instante=100 + i)
+    
+    en_rango = serie.rango(104, 106)
+    assert len(en_rango) == 3
+    assert [a['concepto_id'] for a in serie.rango(104, 106, concepto_id='C1')] == ['C1']
+    assert serie.rango(200, 300) == []
+
+def test_serie_ajustes_segmentos_en_disco(tmp_path):
+    """Test: Lo que el anillo pisa queda en segmentos y se consulta al reabrir."""
+    serie = SerieAjustes(capacidad=4, directorio=str(tmp_path), tamano_segmento=2)
+    for i in range(9):
+        serie.agregar(f'C{i % 3}', 0.5, 0.5 + i / 100, 'Uso', instante=100 + i)
+    
+    # Memoria + disco sin duplicados
+    assert len(serie.rango()) == 9
+    assert [a['grounding_nuevo'] for a in serie.rango(concepto_id='C2')] == pytest.approx([0.52, 0.55, 0.58])
+    
+    serie.volcar()
+    reabierta = SerieAjustes(capacidad=4, directorio=str(tmp_path), tamano_segmento=2)
+    
+    assert len(reabierta) == 0
+    assert len(reabierta.rango(103, 105)) == 3
+    assert [a['concepto_id'] for a in reabierta.rango(concepto_id='C0')] == ['C0', 'C0', 'C0']
+
+def test_serie_ajustes_lote_equivale_a_agregar(tmp_path):
+    """Test: agregar_lote deja la serie (memoria y disco) igual que agregar de a uno."""
+    ids = [f'C{i % 3}' for i in range(11)]
+    anteriores = np.full(11, 0.5)
+    nuevos = 0.5 + np.arange(11) / 100
+    
+    uno = SerieAjustes(capacidad=4, directorio=str(tmp_path / 'uno'), tamano_segmento=3)
+    for i, concepto_id in enumerate(ids):
+        uno.agregar(concepto_id, anteriores[i], nuevos[i], 'Uso', instante=100)
+    lote = SerieAjustes(capacidad=4, directorio=str(tmp_path / 'lote'), tamano_segmento=3)
+    registros = lote.agregar_lote(ids, anteriores, nuevos, 'Uso', instante=100)
+    
+    def sin_clave(registros):
+        return [{k: v for k, v in r.items() if k != 'clave'} for r in registros]
+    
+    assert sin_clave(registros) == sin_clave(uno.rango())
+    assert sin_clave(lote.registros()) == sin_clave(uno.registros())
+    assert sin_clave(lote.por_concepto('C1')) == sin_clave(uno.por_concepto('C1'))
+    assert [r['clave'] for r in lote.rango()] == [r['clave'] for r in registros]
+    assert len({r['clave'] for r in registros}) == 11
+    assert [s['registros'] for s in lote.segmentos] == [s['registros'] for s in uno.segmentos]
+    assert lote.agregar_lote([], np.zeros(0), np.zeros(0), 'Uso') == []
+
+def test_gestor_ajustes_rango(limpiar_test_dir):
+    """Test: Ajustes por rango de fechas e indexado de ajustes.json previo."""
+    gestor = GestorMemoria(TEST_DIR)
+    gestor.guardar_ajuste_grounding('CONCEPTO_LEER', 0.8, 0.85, 'Razón 1', True)
+    gestor.guardar_ajuste_grounding('CONCEPTO_ESCRIBIR', 0.7, 0.75, 'Razón 2', True)
+    
+    ahora = datetime.now()
+    assert len(gestor.obtener_ajustes_rango(hasta=ahora)) == 2
+    assert gestor.obtener_ajustes_rango(desde=ahora.replace(year=ahora.year + 1)) == []
+    
+    # Una memoria nueva sobre el mismo directorio indexa ajustes.json
+    otro = GestorMemoria(TEST_DIR)
+    assert len(otro.obtener_ajustes_concepto('CONCEPTO_LEER')) == 1
+
+def test_gestor_guardar_ajustes_en_lote(limpiar_test_dir):
+    """Test: Un lote de ajustes se escribe en ajustes.json de una vez y queda indexado."""
+    gestor = GestorMemoria(TEST_DIR)
+    escrituras = []
+    guardar = gestor.almacen.guardar
+    gestor.almacen.guardar = lambda tipo, datos: escrituras.append(tipo) or guardar(tipo, datos)
+    
+    gestor.guardar_ajustes_grounding([
+        {'concepto_id': f'C{i}', 'grounding_anterior': 0.5, 'grounding_nuevo': 0.55, 'razon': 'Ajuste por uso'}
+        for i in range(5)
+    ])
+    gestor.guardar_ajustes_grounding([])
+    
+    assert escrituras == ['ajustes']
+    assert gestor.almacen.contar('ajustes') == 5
+    assert len(gestor.obtener_ajustes_concepto('C3')) == 1
+    assert len(GestorMemoria(TEST_DIR).obtener_ajustes_rango()) == 5
+
+def test_gestor_ajustes_sin_volcar_sobreviven_reinicio(limpiar_test_dir):
+    """Test: Tras reiniciar, los ajustes que no llegaron a un segmento se leen de ajustes.json."""
+    gestor = GestorMemoria(TEST_DIR)
+    gestor.serie_ajustes.tamano_segmento = 16
+    for i in range(22):
+        gestor.guardar_ajuste_grounding(f'C{i % 3}', 0.5, 0.6, 'Uso', True)
+    assert gestor.serie_ajustes.registros_en_disco == 16
+    
+    # Sin volcar (p.ej. el proceso terminó sin finalizar la sesión)
+    otro = GestorMemoria(TEST_DIR)
+    assert len(otro.obtener_ajustes_concepto('C0')) == 8
+    assert len(otro.obtener_ajustes_rango()) == 22
+
+def test_gestor_reinicio_no_depende_de_contar_segmentos(limpiar_test_dir):
+    """Test: La recuperación usa la clave de cada ajuste, no cuántos hay en disco."""
+    gestor = GestorMemoria(TEST_DIR)
+    
+    # Ajustes que llegaron a la serie pero no a ajustes.json (falló la escritura)
+    for _ in range(3):
+        gestor.serie_ajustes.agregar('C_PERDIDO', 0.5, 0.6, 'Uso')
+    gestor.serie_ajustes.volcar()
+    
+    # Otra memoria sobre el mismo directorio vuelca lo suyo
+    otra = GestorMemoria(TEST_DIR)
+    otra.guardar_ajuste_grounding('C_OTRA', 0.5, 0.6, 'Uso', True)
+    otra.serie_ajustes.volcar()
+    
+    # Y estos quedan sin volcar
+    gestor.guardar_ajuste_grounding('C0', 0.5, 0.6, 'Uso', True)
+    gestor.guardar_ajuste_grounding('C0', 0.6, 0.7, 'Uso', True)
+    
+    nueva = GestorMemoria(TEST_DIR)
+    assert [a['grounding_nuevo'] for a in nueva.obtener_ajustes_concepto('C0')] == [0.6, 0.7]
+    assert len(nueva.obtener_ajustes_concepto('C_OTRA')) == 1
+    assert len(nueva.obtener_ajustes_rango()) == 6
+
+def test_serie_ajustes_dos_series_mismo_directorio(tmp_path):
+    """Test: Dos series sobre el mismo directorio no pisan sus segmentos ni su índice."""
+    a = SerieAjustes(capacidad=4, directorio=str(tmp_path), tamano_segmento=2)
+    b = SerieAjustes(capacidad=4, directorio=str(tmp_path), tamano_segmento=2)
+    for i in range(4):
+        a.agregar('A', 0.5, 0.6, 'Uso', instante=100 + 2 * i)
+        b.agregar('B', 0.5, 0.6, 'Uso', instante=101 + 2 * i)
+    
+    nombres = {s['archivo'] for s in a.segmentos} | {s['archivo'] for s in b.segmentos}
+    assert len(nombres) == 4
+    
+    reabierta = SerieAjustes(capacidad=4, directorio=str(tmp_path), tamano_segmento=2)
+    assert reabierta.registros_en_disco == 8
+    instantes = [a['timestamp'] for a in reabierta.rango()]
+    assert len(instantes) == 8 and instantes == sorted(instantes)
+    assert [a['concepto_id'] for a in reabierta.rango(101, 103)] == ['B', 'A', 'B']
+    
+    reabierta.limpiar()
+    assert list(tmp_path.iterdir()) == []
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
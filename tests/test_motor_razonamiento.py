@@ -6,6 +6,10 @@ from vocabulario.gestor_vocabulario import GestorVocabulario
 from traduccion.traductor_entrada import TraductorEntrada
 from razonamiento.motor_razonamiento import MotorRazonamiento
 from razonamiento.tipos_decision import TipoDecision
+from core.instantanea_grounding import PublicadorGrounding
+from core.concepto_anclado import ConceptoAnclado
+from core.tipos import TipoConcepto
+from razonamiento.evaluador_capacidades import EvaluadorCapacidades
 
 @pytest.fixture
 def motor():
@@ -76,5 +80,115 @@ def test_grounding_promedio_calculado(motor, traductor):
     
     assert decision.grounding_promedio > 0.0
 
+def test_razonar_lee_instantanea_publicada(traductor):
+    """Test: El razonamiento usa la instantánea, no el grounding a medio ajustar."""
+    gestor = traductor.gestor
+    publicador = PublicadorGrounding(gestor.obtener_todos())
+    motor = MotorRazonamiento(instantaneas=publicador)
+    
+    # Un lote de aprendizaje a medio aplicar (todavía sin publicar)
+    concepto = gestor.buscar_por_id('CONCEPTO_LEER')
+    concepto.confianza_grounding = 0.1
+    
+    decision = motor.razonar(traductor.traducir("¿Puedes leer archivos?"))
+    assert decision.tipo == TipoDecision.AFIRMATIVA
+    assert decision.certeza >= 0.9
+    
+    # Al publicar, la decisión siguiente ve el cambio completo
+    publicador.publicar({'CONCEPTO_LEER': 0.1})
+    evaluacion = motor.generador.evaluador.evaluar_capacidad_accion([concepto])
+    assert evaluacion['puede_ejecutar'] == False
+    assert evaluacion['version_grounding'] == publicador.actual.version
+
+def _concepto(id, grounding, operaciones=None):
+    return ConceptoAnclado(
+        id=id,
+        tipo=TipoConcepto.OPERACION_SISTEMA,
+        palabras_español=[id.lower()],
+        operaciones=operaciones or {},
+        confianza_grounding=grounding
+    )
+
+@pytest.mark.parametrize("grounding, operaciones, puede, razon", [
+    (0.95, {'leer': len}, True, 'Grounding alto (0.95) con operación ejecutable'),
+    (0.8, {'leer': len}, True, 'Grounding medio (0.8), puede intentar'),
+    (0.4, {'leer': len}, False, 'Grounding muy bajo (0.4)'),
+    (0.95, None, False, 'Concepto "CONCEPTO_X" no tiene operaciones ejecutables'),
+])
+def test_evaluacion_desde_tabla_capacidades(grounding, operaciones, puede, razon):
+    """Test: La evaluación por registros conserva decisión y razones."""
+    evaluador = EvaluadorCapacidades()
+    principal = _concepto('CONCEPTO_X', grounding, operaciones)
+    evaluacion = evaluador.evaluar_capacidad_accion([_concepto('CONCEPTO_Y', 0.1), principal])
+    
+    assert evaluacion['puede_ejecutar'] == puede
+    assert evaluacion['concepto_clave'] is principal
+    assert evaluacion['operacion'] == ('leer' if puede else None)
+    assert evaluacion['groundings'] == [0.1, grounding]
+    assert evaluacion['razon'] == razon
+    assert dict(evaluacion)['confianza'] == grounding
+
+def test_tabla_capacidades_rehace_registro_al_cambiar_grounding():
+    """Test: El registro se reutiliza y solo se rehace si cambia el grounding."""
+    evaluador = EvaluadorCapacidades()
+    concepto = _concepto('CONCEPTO_X', 0.95, {'leer': len})
+    
+    primera = evaluador.evaluar_capacidad_accion([concepto])
+    segunda = evaluador.evaluar_capacidad_accion([concepto])
+    assert primera.principal is segunda.principal
+    
+    # La razón no se arma hasta que se pide
+    assert primera.principal._razon is None
+    assert primera['razon'] == segunda['razon']
+    assert primera.principal._razon is not None
+    
+    concepto.confianza_grounding = 0.6
+    tercera = evaluador.evaluar_capacidad_accion([concepto])
+    assert tercera.principal is not primera.principal
+    assert tercera['puede_ejecutar'] == False
+    assert len(evaluador.capacidades) == 1
+
+def test_cache_devuelve_decision_congelada(motor, traductor):
+    """Test: La misma traducción reutiliza la decisión, que no se puede modificar."""
+    primera = motor.razonar(traductor.traducir("¿Puedes leer archivos?"))
+    segunda = motor.razonar(traductor.traducir("¿Puedes leer archivos?"))
+
+    assert segunda is primera
+    assert motor.cache.obtener_estadisticas()['aciertos'] == 1
+    with pytest.raises(AttributeError):
+        primera.certeza = 0.0
+    with pytest.raises(AttributeError):
+        primera.pasos_razonamiento.append("otro paso")
+
+def test_cache_invalida_con_version_de_grounding(traductor):
+    """Test: Una publicación nueva de grounding da una decisión nueva."""
+    gestor = traductor.gestor
+    publicador = PublicadorGrounding(gestor.obtener_todos())
+    motor = MotorRazonamiento(instantaneas=publicador)
+    traduccion = traductor.traducir("¿Puedes leer archivos?")
+
+    antes = motor.razonar(traduccion)
+    assert motor.razonar(traduccion) is antes
+
+    gestor.buscar_por_id('CONCEPTO_LEER').confianza_grounding = 0.1
+    publicador.publicar({'CONCEPTO_LEER': 0.1})
+    despues = motor.razonar(traduccion)
+    assert despues is not antes
+    assert despues.conceptos_principales == ('CONCEPTO_ARCHIVO',)
+
+def test_cache_sin_publicador_usa_grounding_de_conceptos(motor, traductor):
+    """Test: Sin instantáneas, cambiar el grounding de un concepto invalida la entrada."""
+    traduccion = traductor.traducir("¿Puedes leer archivos?")
+    antes = motor.razonar(traduccion)
+
+    traductor.gestor.buscar_por_id('CONCEPTO_LEER').confianza_grounding = 0.1
+    despues = motor.razonar(traduccion)
+    assert despues is not antes
+    assert despues.conceptos_principales == ('CONCEPTO_ARCHIVO',)
+
+    sin_cache = MotorRazonamiento(capacidad_cache=0)
+    assert sin_cache.razonar(traduccion) is not sin_cache.razonar(traduccion)
+    assert len(sin_cache.cache) == 0
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
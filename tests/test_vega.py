@@ -1,11 +1,14 @@
 """
 Tests para Vega - Guardiana de Principios.
 """
+import random
 import pytest
 from vocabulario.gestor_vocabulario import GestorVocabulario
 from traduccion.traductor_entrada import TraductorEntrada
 from razonamiento.motor_razonamiento import MotorRazonamiento
 from consejeras.vega import Vega
+from consejeras.vega.patrones import PatronesPeligrosos
+from consejeras.escaner import EscanerPalabras, TextoAnalizado
 from core.principios import Principio
 
 @pytest.fixture
@@ -105,5 +108,75 @@ def test_vega_no_veta_sin_operacion(sistema_completo):
     assert revision['aprobada'] == True
     assert revision['veto'] == False
 
+# ===== PRE-FILTRO =====
+
+def _riesgos_sin_prefiltro(patrones, texto):
+    """Detector completo, sin pasar por el pre-filtro."""
+    riesgos = []
+    if patrones.es_accion_destructiva(texto):
+        riesgos.append('ACCION_DESTRUCTIVA')
+    if patrones.es_auto_modificacion(texto):
+        riesgos.append('AUTO_MODIFICACION')
+    if patrones.viola_privacidad(texto):
+        riesgos.append('VIOLACION_PRIVACIDAD')
+    return riesgos
+
+def _texto_aleatorio(rng, vocabulario):
+    """Mezcla palabras clave, fragmentos de ellas y relleno."""
+    relleno = ['hola', 'archivo', 'por favor', 'mi', 'el', 'la', 'ahora', 'x']
+    partes = []
+    for _ in range(rng.randint(0, 8)):
+        opcion = rng.random()
+        if opcion < 0.3:
+            partes.append(rng.choice(vocabulario))
+        elif opcion < 0.5:
+            palabra = rng.choice(vocabulario)
+            inicio = rng.randint(0, len(palabra) - 1)
+            partes.append(palabra[inicio:rng.randint(inicio + 1, len(palabra))])
+        else:
+            partes.append(rng.choice(relleno))
+    separador = rng.choice([' ', '', ', '])
+    return separador.join(partes)
+
+def test_prefiltro_equivale_al_detector():
+    """Test: Con y sin pre-filtro se detectan los mismos riesgos."""
+    patrones = PatronesPeligrosos()
+    vocabulario = sorted(patrones.palabras_clave())
+    escaner = EscanerPalabras(vocabulario)
+    rng = random.Random(1234)
+    
+    candidatos = 0
+    for _ in range(3000):
+        texto = _texto_aleatorio(rng, vocabulario)
+        esperado = _riesgos_sin_prefiltro(patrones, texto)
+        
+        assert patrones.detectar_todos_los_riesgos(texto) == esperado
+        
+        # Mismo resultado si el gestor ya escaneó el texto
+        analizado = TextoAnalizado(texto, escaner.escanear(texto))
+        assert patrones.detectar_todos_los_riesgos(analizado) == esperado
+        
+        if esperado:
+            assert patrones.es_candidato(texto)
+        candidatos += patrones.es_candidato(texto)
+    
+    # El generador produce ambos casos
+    assert 0 < candidatos < 3000
+
+def test_prefiltro_descarta_mensaje_seguro():
+    """Test: Un mensaje sin disparadores no es candidato."""
+    patrones = PatronesPeligrosos()
+    
+    assert not patrones.es_candidato("¿puedes leer todos los archivos?")
+    assert patrones.es_candidato("borra todo")
+
+def test_prefiltro_recompilar():
+    """Test: Nuevos disparadores se aplican tras recompilar."""
+    patrones = PatronesPeligrosos()
+    patrones.palabras_destructivas.append('purga')
+    patrones.recompilar_prefiltro()
+    
+    assert patrones.detectar_todos_los_riesgos("purga todo") == ['ACCION_DESTRUCTIVA']
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file